@@ -696,29 +696,28 @@ async def get_document_clustering(
     Returns a list of nodes for 3D visualization.
     """
     try:
-        # 1. Fetch embeddings
-        points = vector_service.get_all_embeddings(limit=limit)
-        
-        if not points:
-            return []
+        import numpy as np
+        from sklearn.decomposition import PCA
 
-        # 2. Prepare data for PCA
+        # 1. Stream embeddings page by page as float32 blocks
         ids = []
-        vectors = []
+        blocks = []
         payloads = []
-        
-        for p in points:
-            if p.get("vector"):
-                ids.append(p["id"])
-                vectors.append(p["vector"])
-                payloads.append(p["payload"])
-        
-        if not vectors:
+
+        for block in vector_service.iter_embedding_blocks(limit=limit):
+            if block.vectors is None or block.vectors.size == 0:
+                continue
+            ids.extend(block.ids)
+            blocks.append(block.vectors)
+            payloads.extend(block.payloads)
+
+        if not blocks:
             return []
-            
+
+        # 2. Prepare data for PCA
+        vectors = np.concatenate(blocks, axis=0)
+
         # 3. Run PCA (if enough points)
-        import numpy as np
-        from sklearn.decomposition import PCA
         
         n_samples = len(vectors)
         n_components = 3
@@ -1,4 +1,6 @@
-from fastapi import APIRouter, Depends, Query
+from typing import Dict
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
 from ..models.api import (
     QueryResponse,
@@ -8,6 +10,7 @@ from ..security.authz import Principal
 from ..security.dependencies import (
     authorize_query,
 )
+from .retrieval import query_filters
 
 router = APIRouter()
 
@@ -17,8 +20,32 @@ def query_legal_data(
     _principal: Principal = Depends(authorize_query),
     service: RetrievalService = Depends(get_retrieval_service),
     mode: RetrievalMode = Query(RetrievalMode.SEMANTIC, description="Retrieval mode"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=50),
+    filters: Dict[str, str] | None = Depends(query_filters),
+    rerank: bool = Query(False),
+    cursor: str | None = Query(None, description="next_cursor from the previous page of this query"),
+    debug: bool = Query(False, description="Bypass caches and report per-stage timings in meta"),
 ) -> QueryResponse:
-    return service.query(query, mode)
+    """One page of evidence as a single response; ``/query/stream`` streams the same page.
+
+    Both routes take the same paging and ``filters[...]`` parameters. Only the default
+    ``mode`` differs: this route has always answered in semantic mode.
+    """
+
+    try:
+        return service.query(
+            query,
+            page=page,
+            page_size=page_size,
+            filters=filters,
+            rerank=rerank,
+            mode=mode,
+            cursor=cursor,
+            debug=debug,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
 from backend.app.services.legal_research_service import (
     LegalResearchService, get_legal_research_service,
@@ -1,6 +1,11 @@
-from fastapi import APIRouter, Depends, Query
+from typing import Dict
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 
 from ..models.api import (
+    QueryBatchRequest,
+    QueryBatchResponse,
     QueryResponse,
 )
 from ..services.retrieval import RetrievalMode, RetrievalService, get_retrieval_service
@@ -17,8 +22,13 @@ def query_retrieval_data(
     _principal: Principal = Depends(authorize_query),
     service: RetrievalService = Depends(get_retrieval_service),
     mode: RetrievalMode = Query(RetrievalMode.PRECISION, description="Retrieval mode"),
+    cursor: str | None = Query(None, description="next_cursor from the previous page of this query"),
+    debug: bool = Query(False, description="Bypass caches and report per-stage timings in meta"),
 ) -> QueryResponse:
-    return service.query(query, mode)
+    try:
+        return service.query(query, mode=mode, cursor=cursor, debug=debug)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
 
 
 class RetrievalRequest(QueryResponse):
@@ -32,3 +42,80 @@ def query_retrieval_post(
     service: RetrievalService = Depends(get_retrieval_service),
 ) -> QueryResponse:
     return service.query(request.query, request.mode)
+
+
+@router.post("/query/batch", response_model=QueryBatchResponse)
+def query_batch(
+    request: QueryBatchRequest,
+    _principal: Principal = Depends(authorize_query),
+    service: RetrievalService = Depends(get_retrieval_service),
+) -> QueryBatchResponse:
+    try:
+        results = service.query_many(
+            request.questions,
+            page=request.page,
+            page_size=request.page_size,
+            filters=request.filters or None,
+            rerank=request.rerank,
+            mode=RetrievalMode(request.mode),
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return QueryBatchResponse(results=[result.to_dict() for result in results])
+
+
+def query_filters(
+    case_id: str | None = Query(None, alias="filters[case_id]"),
+    source: str | None = Query(None, alias="filters[source]"),
+    doc_type: str | None = Query(None, alias="filters[doc_type]"),
+    entity: str | None = Query(None, alias="filters[entity]"),
+    keyword: str | None = Query(
+        None, alias="filters[keyword]", description='Keyword expression: "phrases", a NEAR/n b, title:/body:/metadata:'
+    ),
+) -> Dict[str, str] | None:
+    """The ``filters[...]`` query parameters shared by ``/query`` and ``/query/stream``."""
+
+    filters = {
+        key: value
+        for key, value in (
+            ("case_id", case_id),
+            ("source", source),
+            ("doc_type", doc_type),
+            ("entity", entity),
+            ("keyword", keyword),
+        )
+        if value
+    }
+    return filters or None
+
+
+@router.get("/query/stream")
+def query_stream(
+    q: str = Query(..., min_length=3, description="Natural language question"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(10, ge=1, le=50),
+    filters: Dict[str, str] | None = Depends(query_filters),
+    rerank: bool = Query(False),
+    mode: RetrievalMode = Query(RetrievalMode.PRECISION, description="Retrieval mode"),
+    cursor: str | None = Query(None, description="next_cursor from the previous page of this query"),
+    debug: bool = Query(False, description="Bypass caches and report per-stage timings in the final frame"),
+    _principal: Principal = Depends(authorize_query),
+    service: RetrievalService = Depends(get_retrieval_service),
+) -> StreamingResponse:
+    """Stream the page ``GET /query`` returns for the same parameters, as JSON lines."""
+
+    try:
+        events = service.stream_query(
+            q,
+            page=page,
+            page_size=page_size,
+            filters=filters,
+            rerank=rerank,
+            mode=mode,
+            cursor=cursor,
+            debug=debug,
+            attributes={"mode": mode.value, "stream": True},
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return StreamingResponse((event + "\n" for event in events), media_type="application/jsonl")
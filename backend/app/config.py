@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import sys
 from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Literal, Optional
@@ -46,12 +47,32 @@ class Settings(BaseSettings):
     neo4j_uri: str = Field(default="neo4j://localhost:7687")
     neo4j_user: str = Field(default="neo4j")
     neo4j_password: str = Field(default="neo4j")
+    graph_entity_min_similarity: float = Field(default=0.3, ge=0.0, le=1.0)
+    graph_entity_min_fulltext_score: float = Field(default=0.5, ge=0.0)
+    graph_write_batch_size: int = Field(default=500, ge=1)
+    graph_write_flush_seconds: float = Field(default=2.0, gt=0.0)
 
     qdrant_url: Optional[str] = Field(default="http://qdrant:6333")
     qdrant_path: Optional[str] = Field(default=None)
 
-    vector_backend: Literal["qdrant", "chroma", "memory"] = Field(default="qdrant")
+    vector_backend: Literal["qdrant", "chroma", "memory", "memory-hnsw"] = Field(default="qdrant")
     vector_dir: Path = Field(default=Path("storage/vector"))
+    vector_hnsw_m: int = Field(default=16, ge=2)
+    vector_hnsw_ef_construction: int = Field(default=200, ge=1)
+    vector_hnsw_ef_search: int = Field(default=64, ge=1)
+    vector_memory_quantization: Literal["none", "int8"] = Field(default="none")
+    vector_memory_rescore_path: Optional[Path] = Field(default=None)
+    vector_memory_rescore_candidates: int = Field(default=4, ge=1)
+    vector_memory_snapshot_dir: Optional[Path] = Field(default=None)
+    vector_memory_snapshot_interval_seconds: float = Field(default=2.0, ge=0.0)
+    vector_memory_compaction_ratio: float = Field(default=0.25, gt=0.0, le=1.0)
+    vector_sparse_hybrid: bool = Field(default=False)
+    vector_sparse_average_length: float = Field(default=256.0, gt=0.0)
+    vector_sparse_prefetch: int = Field(default=4, ge=1)
+    vector_scroll_batch_size: int = Field(default=256, ge=1)
+    vector_upsert_batch_size: int = Field(default=256, ge=1)
+    vector_upsert_parallelism: int = Field(default=4, ge=1)
+    vector_upsert_wait: bool = Field(default=False)
     ingestion_chroma_dir: Path = Field(default=Path("storage/chroma"))
     chroma_collection: str = Field(default="cocounsel_documents")
     ingestion_llama_cache_dir: Path = Field(default=Path("storage/llama_cache"))
@@ -271,6 +292,10 @@ class Settings(BaseSettings):
     caselaw_endpoint: str = Field(default="https://api.case.law/v1/cases/")
     caselaw_api_key: Optional[str] = Field(default=None)
     caselaw_max_results: int = Field(default=10, ge=0, le=100)
+    case_law_deadline_seconds: float = Field(default=2.5, gt=0.0)
+    case_law_cache_ttl_seconds: float = Field(default=900.0, ge=0.0)
+    case_law_cache_max_entries: int = Field(default=256, ge=0)
+    case_law_max_connections: int = Field(default=20, ge=1)
 
     sql_database_uri: Optional[str] = Field(default=None, description="Connection URI for the SQL database (e.g., 'sqlite:///./sql_app.db').")
     govinfo_api_key: Optional[str] = Field(default=None) # Added for GovInfo API
@@ -278,7 +303,28 @@ class Settings(BaseSettings):
 
     retrieval_max_search_window: int = Field(default=60)
     retrieval_graph_hop_window: int = Field(default=12)
+    retrieval_graph_hops: int = Field(default=1, ge=1)
     retrieval_cross_encoder_model: Optional[str] = Field(default=None)
+    retrieval_reranker_batch_size: int = Field(default=32, ge=1)
+    retrieval_reranker_max_length: int = Field(default=512, ge=16)
+    retrieval_reranker_backend: Literal["torch", "torch-int8", "onnx"] = Field(default="torch")
+    retrieval_reranker_onnx_file: Optional[str] = Field(default=None)
+    retrieval_reranker_cache_size: int = Field(default=8192, ge=0)
+    # Opt-in: legs that miss the deadline are dropped from fusion and listed in the response meta.
+    retrieval_concurrent_retrievers: bool = Field(default=False)
+    retrieval_retriever_timeout_seconds: float = Field(default=2.0, gt=0.0)
+    # Three retriever legs for each of AnyIO's 40 default request threads.
+    retrieval_retriever_workers: int = Field(default=120, ge=1)
+    retrieval_cache_max_entries: int = Field(default=256, ge=0)
+    retrieval_cache_ttl_seconds: float = Field(default=300.0, ge=0.0)
+    # Set when running several workers so ingestion in one invalidates every worker's caches;
+    # None keeps the corpus version in-process, which is only correct with a single worker.
+    retrieval_corpus_version_path: Optional[Path] = Field(default=None)
+    retrieval_embedding_cache_size: int = Field(default=2048, ge=0)
+    retrieval_embedding_cache_dir: Optional[Path] = Field(default=None)
+    retrieval_keyword_index_dir: Optional[Path] = Field(default=None)
+    retrieval_keyword_bm25_k1: float = Field(default=1.2, ge=0.0)
+    retrieval_keyword_bm25_b: float = Field(default=0.75, ge=0.0, le=1.0)
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -324,4 +370,8 @@ def get_settings() -> Settings:
 
 def reset_settings_cache() -> None:
     get_settings.cache_clear()
+    # The shared retrieval service captures settings-derived backends; it only exists once its module is loaded.
+    retrieval = sys.modules.get("backend.app.services.retrieval")
+    if retrieval is not None:
+        retrieval.reset_retrieval_service()
 
@@ -3,14 +3,18 @@ from .services.ingestion import (
     get_ingestion_worker,
     shutdown_ingestion_worker,
 )
+from .services.external_http import reset_external_http_pool
+from .services.retrieval import warm_retrieval_service
 
 def register_events(app):
     @app.on_event("startup")
     def start_background_workers() -> None:
         get_ingestion_worker()
+        warm_retrieval_service()
         get_agents_service()
 
 
     @app.on_event("shutdown")
     def stop_background_workers() -> None:
         shutdown_ingestion_worker(timeout=5.0)
+        reset_external_http_pool()
@@ -131,6 +131,10 @@ class QueryPaginationModel(BaseModel):
     has_next: bool
     mode: Literal["precision", "recall"]
     reranker: str
+    next_cursor: str | None = None
+    timings: Dict[str, float] | None = None
+    timed_out_retrievers: List[str] = Field(default_factory=list)
+    starved_retrievers: List[str] = Field(default_factory=list)
 
 
 class QueryResponse(BaseModel):
@@ -140,6 +144,21 @@ class QueryResponse(BaseModel):
     meta: QueryPaginationModel
 
 
+class QueryBatchRequest(BaseModel):
+    questions: List[str] = Field(min_length=1, max_length=32, description="Questions answered in one batch")
+    page: int = Field(default=1, ge=1)
+    page_size: int = Field(default=10, ge=1, le=50)
+    filters: Dict[str, str] = Field(
+        default_factory=dict, description="Filters shared by every question (case_id, source, doc_type, entity, keyword)"
+    )
+    rerank: bool = False
+    mode: Literal["precision", "recall"] = "precision"
+
+
+class QueryBatchResponse(BaseModel):
+    results: List[QueryResponse]
+
+
 class OutcomeProbabilityModel(BaseModel):
     label: str
     probability: float
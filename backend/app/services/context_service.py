@@ -3,7 +3,9 @@ from typing import List, Optional
 from backend.app.config import Settings
 from backend.ingestion.settings import build_runtime_config
 from backend.app.services.knowledge_graph_service import get_knowledge_graph_service, KnowledgeGraphService
+from backend.app.services.embedding_cache import embedding_namespace, get_query_embedding_cache
 from llama_index.core import VectorStoreIndex, StorageContext
+from llama_index.core.schema import QueryBundle
 from llama_index.vector_stores.qdrant import QdrantVectorStore
 import qdrant_client
 
@@ -84,7 +86,12 @@ class ContextService:
                 embed_model=embed_model
             )
             
-            nodes = retriever.retrieve(query)
+            query_embedding = get_query_embedding_cache().embed(
+                embed_model,
+                query,
+                namespace=embedding_namespace(self.runtime_config.embedding),
+            )
+            nodes = retriever.retrieve(QueryBundle(query_str=query, embedding=query_embedding))
             
             results = []
             for node in nodes:
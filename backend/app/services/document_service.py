@@ -16,8 +16,11 @@ from backend.app.services.retrieval_engine import (
     GraphRetrieverAdapter,
     KeywordRetrieverAdapter
 )
+from backend.app.services.query_cache import bump_corpus_version
 from backend.app.services.vector import VectorService
 from backend.app.services.graph import GraphService
+from backend.app.services.keyword_index import get_keyword_index, index_document_keywords
+from backend.app.utils.storage import sha256_id
 import logging
 
 logger = logging.getLogger(__name__)
@@ -52,7 +55,7 @@ class DocumentService:
             
             vector_adapter = VectorRetrieverAdapter(self.vector_service, embed_model)
             graph_adapter = GraphRetrieverAdapter(self.graph_service)
-            keyword_adapter = KeywordRetrieverAdapter(self.document_store)
+            keyword_adapter = KeywordRetrieverAdapter(self.document_store, get_keyword_index())
             
             self.query_engine = HybridQueryEngine(
                 vector=vector_adapter,
@@ -101,11 +104,32 @@ class DocumentService:
 
     def _simple_keyword_search(self, query: str, top_k: int = 10, case_id: str = "default_case") -> List[Dict[str, Any]]:
         """
-        Simple keyword search implementation as fallback.
+        Keyword search fallback. Uses the keyword index (phrases, NEAR/n, field scoping)
+        over the case's documents and only scans file names when the index finds nothing.
         """
+        documents = {
+            self._keyword_doc_id(doc): doc for doc in self.document_store.list_all_documents(case_id)
+        }
+        index = get_keyword_index()
+        if documents and len(index):
+            results: List[Dict[str, Any]] = []
+            seen = set()
+            # Chunks do not all carry a case_id, so the case is scoped by its stored documents.
+            # Several chunks of one document can match; over-fetch and keep the best per document.
+            for _, payload in index.search(query, top_k=top_k * 4, doc_ids=documents.keys()):
+                doc_id = str(payload["doc_id"])
+                if doc_id in seen:
+                    continue
+                seen.add(doc_id)
+                results.append(documents[doc_id])
+                if len(results) >= top_k:
+                    break
+            if results:
+                return results
+
         results = []
         query_lower = query.lower()
-        for doc in self.document_store.list_all_documents(case_id):
+        for doc in documents.values():
             # Basic matching on filename or content if available
             # Note: list_all_documents returns metadata dicts
             if query_lower in doc.get("file_name", "").lower():
@@ -265,6 +289,9 @@ class DocumentService:
                 runtime_config=current_config,
             )
             
+            if pipeline_result and pipeline_result.documents:
+                self._index_keywords(doc_id, source, pipeline_result)
+
             # Check for suspicious documents and trigger deep forensics
             if pipeline_result and pipeline_result.documents:
                 for doc_result in pipeline_result.documents:
@@ -335,6 +362,39 @@ class DocumentService:
             # Cleanup staged file after ingestion (optional)
             pass
 
+    def _index_keywords(self, doc_id: str, source: IngestionSource, pipeline_result: Any) -> None:
+        """
+        Adds the pipeline's chunks to the keyword index so phrase and proximity searches find them.
+        Chunks are keyed like the ingestion service keys them: by staged file and pipeline chunk_index.
+        """
+        try:
+            index = get_keyword_index()
+            for document in pipeline_result.documents:
+                index_document_keywords(
+                    index,
+                    document.loaded.path,
+                    (
+                        {
+                            "text": node.text,
+                            "chunk_index": node.chunk_index,
+                            "title": source.metadata.get("file_name"),
+                            "case_id": source.metadata.get("case_id"),
+                            "doc_type": source.metadata.get("doc_type"),
+                            "source_type": source.type.lower(),
+                        }
+                        for node in document.nodes
+                    ),
+                )
+            index.flush()
+        except Exception as e:
+            logger.error(f"Failed to update keyword index for {doc_id}: {e}", exc_info=True)
+
+    def _keyword_doc_id(self, document: Dict[str, Any]) -> str:
+        """
+        Id of a stored document's chunks in the keyword index (see _index_keywords).
+        """
+        return sha256_id(self.materialized_root / document["id"] / document.get("file_name", ""))
+
     def get_document(self, case_id: str, doc_type: str, doc_id: str, version: Optional[str] = None) -> Optional[str]:
         return self.document_store.get_document(doc_type, case_id, doc_id, version)
 
@@ -355,6 +415,17 @@ class DocumentService:
 
     def delete_document(self, case_id: str, doc_type: str, doc_id: str, version: Optional[str] = None):
         self.document_store.delete_document(doc_type, case_id, doc_id, version)
+        if version is None:
+            # Removing every version retires the document's chunks from the search indexes too.
+            if self.vector_service is not None:
+                self.vector_service.delete_by_document(doc_id)
+            try:
+                index = get_keyword_index()
+                index.remove_document(doc_id)
+                index.flush()
+            except Exception as e:
+                logger.error(f"Failed to remove {doc_id} from keyword index: {e}", exc_info=True)
+        bump_corpus_version()
 
     def list_all_documents(self, case_id: str) -> List[dict]:
         """
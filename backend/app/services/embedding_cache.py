@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import logging
+import os
+from collections import OrderedDict
+from hashlib import sha256
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+from opentelemetry import metrics
+
+from ..config import get_settings
+
+_logger = logging.getLogger(__name__)
+_meter = metrics.get_meter(__name__)
+_embedding_cache_counter = _meter.create_counter(
+    "query_embedding_cache_lookups_total",
+    unit="1",
+    description="Query embedding cache lookups labelled by outcome (memory, disk, miss)",
+)
+
+
+def embedding_namespace(config: Any) -> str:
+    """Derive a cache namespace from an ingestion ``EmbeddingConfig`` (provider, model, dimensions)."""
+
+    provider = getattr(config, "provider", "unknown")
+    provider_id = getattr(provider, "value", provider)
+    return f"{provider_id}:{getattr(config, 'model', 'unknown')}:{getattr(config, 'dimensions', None) or 'native'}"
+
+
+def compute_query_embedding(embedding_model: Any, text: str) -> Sequence[float]:
+    if hasattr(embedding_model, "get_query_embedding"):
+        return embedding_model.get_query_embedding(text)
+    return embedding_model.get_text_embedding(text)
+
+
+def compute_query_embeddings(embedding_model: Any, texts: Sequence[str]) -> List[Sequence[float]]:
+    """Embed several queries with one provider call where the model offers a query batch.
+
+    Document embeddings (``get_text_embedding_batch``) are never used: many models embed
+    queries differently, so without ``get_query_embedding_batch`` each text gets its
+    own ``get_query_embedding`` call.
+    """
+
+    if len(texts) > 1 and hasattr(embedding_model, "get_query_embedding_batch"):
+        return list(embedding_model.get_query_embedding_batch(list(texts)))
+    return [compute_query_embedding(embedding_model, text) for text in texts]
+
+
+class QueryEmbeddingCache:
+    """LRU of float32 query vectors with an optional on-disk ``.npy`` tier.
+
+    Entries are keyed by the embedding namespace (provider/model/dimensions) and the
+    SHA-256 of the query text so switching models never serves stale vectors.
+    """
+
+    def __init__(self, max_entries: int = 2048, directory: Path | None = None) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self.directory = Path(directory) if directory else None
+        self._entries: "OrderedDict[tuple[str, str], np.ndarray]" = OrderedDict()
+        self._lock = Lock()
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def embed(self, embedding_model: Any, text: str, *, namespace: str) -> List[float]:
+        key = (namespace, sha256(text.encode("utf-8")).hexdigest())
+        vector = self._get_memory(key)
+        if vector is not None:
+            _embedding_cache_counter.add(1, attributes={"outcome": "memory"})
+            return vector.tolist()
+        vector = self._read_disk(key)
+        if vector is not None:
+            _embedding_cache_counter.add(1, attributes={"outcome": "disk"})
+            self._put_memory(key, vector)
+            return vector.tolist()
+        _embedding_cache_counter.add(1, attributes={"outcome": "miss"})
+        vector = np.asarray(compute_query_embedding(embedding_model, text), dtype=np.float32)
+        self._put_memory(key, vector)
+        self._write_disk(key, vector)
+        return vector.tolist()
+
+    def embed_many(self, embedding_model: Any, texts: Sequence[str], *, namespace: str) -> List[List[float]]:
+        """Batch variant of :meth:`embed`; all cache misses are embedded in a single call."""
+
+        vectors: List[np.ndarray | None] = []
+        missing: "OrderedDict[tuple[str, str], str]" = OrderedDict()
+        for text in texts:
+            key = (namespace, sha256(text.encode("utf-8")).hexdigest())
+            vector = self._get_memory(key)
+            outcome = "memory"
+            if vector is None:
+                vector = self._read_disk(key)
+                outcome = "disk"
+                if vector is not None:
+                    self._put_memory(key, vector)
+            if vector is None:
+                outcome = "miss"
+                missing.setdefault(key, text)
+            _embedding_cache_counter.add(1, attributes={"outcome": outcome})
+            vectors.append(vector)
+        computed: Dict[tuple[str, str], np.ndarray] = {}
+        if missing:
+            embeddings = compute_query_embeddings(embedding_model, list(missing.values()))
+            for key, embedding in zip(missing, embeddings):
+                vector = np.asarray(embedding, dtype=np.float32)
+                computed[key] = vector
+                self._put_memory(key, vector)
+                self._write_disk(key, vector)
+        results: List[List[float]] = []
+        for text, vector in zip(texts, vectors):
+            if vector is None:
+                vector = computed[(namespace, sha256(text.encode("utf-8")).hexdigest())]
+            results.append(vector.tolist())
+        return results
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def _get_memory(self, key: tuple[str, str]) -> np.ndarray | None:
+        with self._lock:
+            vector = self._entries.get(key)
+            if vector is not None:
+                self._entries.move_to_end(key)
+            return vector
+
+    def _put_memory(self, key: tuple[str, str], vector: np.ndarray) -> None:
+        if self.max_entries == 0:
+            return
+        with self._lock:
+            self._entries[key] = vector
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _disk_path(self, key: tuple[str, str]) -> Path | None:
+        if self.directory is None:
+            return None
+        namespace, digest = key
+        bucket = sha256(namespace.encode("utf-8")).hexdigest()[:16]
+        return self.directory / bucket / f"{digest}.npy"
+
+    def _read_disk(self, key: tuple[str, str]) -> np.ndarray | None:
+        path = self._disk_path(key)
+        if path is None or not path.exists():
+            return None
+        try:
+            return np.load(path, allow_pickle=False)
+        except (OSError, ValueError) as exc:
+            _logger.warning("Discarding unreadable query embedding cache entry", exc_info=exc, extra={"path": str(path)})
+            return None
+
+    def _write_disk(self, key: tuple[str, str], vector: np.ndarray) -> None:
+        path = self._disk_path(key)
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npy")
+            np.save(temp_path, vector, allow_pickle=False)
+            os.replace(temp_path, path)
+        except OSError as exc:  # pragma: no cover - disk full / permissions
+            _logger.warning("Failed to persist query embedding", exc_info=exc, extra={"path": str(path)})
+
+
+_QUERY_EMBEDDING_CACHE_LOCK = Lock()
+_QUERY_EMBEDDING_CACHE: QueryEmbeddingCache | None = None
+
+
+def get_query_embedding_cache() -> QueryEmbeddingCache:
+    global _QUERY_EMBEDDING_CACHE
+    with _QUERY_EMBEDDING_CACHE_LOCK:
+        if _QUERY_EMBEDDING_CACHE is None:
+            settings = get_settings()
+            _QUERY_EMBEDDING_CACHE = QueryEmbeddingCache(
+                settings.retrieval_embedding_cache_size,
+                settings.retrieval_embedding_cache_dir,
+            )
+        return _QUERY_EMBEDDING_CACHE
+
+
+def reset_query_embedding_cache() -> None:
+    global _QUERY_EMBEDDING_CACHE
+    with _QUERY_EMBEDDING_CACHE_LOCK:
+        _QUERY_EMBEDDING_CACHE = None
+
+
+__all__ = [
+    "QueryEmbeddingCache",
+    "compute_query_embedding",
+    "compute_query_embeddings",
+    "embedding_namespace",
+    "get_query_embedding_cache",
+    "reset_query_embedding_cache",
+]
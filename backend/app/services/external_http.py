@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from concurrent.futures import Future
+from threading import Event, Lock, Thread
+from typing import Awaitable, Callable, TypeVar
+
+import httpx
+
+from ..config import get_settings
+
+_logger = logging.getLogger(__name__)
+_T = TypeVar("_T")
+
+
+class AsyncHttpPool:
+    """Background event loop that owns one connection-pooled ``httpx.AsyncClient``.
+
+    Synchronous callers hand coroutines to :meth:`submit` and receive a
+    ``concurrent.futures.Future``, so outbound calls can run while the calling
+    thread does other work, and keep-alive connections are shared by every caller.
+    """
+
+    def __init__(self, *, max_connections: int = 20, timeout: float = 10.0) -> None:
+        self.max_connections = max(1, int(max_connections))
+        self.timeout = timeout
+        self._loop = asyncio.new_event_loop()
+        self._client: httpx.AsyncClient | None = None
+        self._ready = Event()
+        self._thread = Thread(target=self._run, name="external-http", daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Shared client; only use it from coroutines running on this pool's loop."""
+
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+            )
+        return self._client
+
+    def submit(self, factory: Callable[[], Awaitable[_T]]) -> "Future[_T]":
+        """Schedule ``factory()`` on the pool loop; cancelling the future cancels the task."""
+
+        async def _call() -> _T:
+            return await factory()
+
+        return asyncio.run_coroutine_threadsafe(_call(), self._loop)
+
+    def run(self, factory: Callable[[], Awaitable[_T]], *, timeout: float | None = None) -> _T:
+        return self.submit(factory).result(timeout=timeout)
+
+    def close(self) -> None:
+        if self._loop.is_closed():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(timeout=5.0)
+        except Exception as exc:  # pragma: no cover - best-effort shutdown
+            _logger.debug("Failed to shut down pooled HTTP client", exc_info=exc)
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5.0)
+        if not self._thread.is_alive():
+            self._loop.close()
+
+    async def _shutdown(self) -> None:
+        # Let cancelled requests unwind before the loop stops so none are left pending.
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.aclose()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.call_soon(self._ready.set)
+        self._loop.run_forever()
+
+
+_POOL_LOCK = Lock()
+_POOL: AsyncHttpPool | None = None
+
+
+def get_external_http_pool() -> AsyncHttpPool:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            settings = get_settings()
+            _POOL = AsyncHttpPool(max_connections=settings.case_law_max_connections)
+        return _POOL
+
+
+def reset_external_http_pool() -> None:
+    """Close the shared pool so the next caller builds a new one from current settings."""
+
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.close()
+
+
+__all__ = [
+    "AsyncHttpPool",
+    "get_external_http_pool",
+    "reset_external_http_pool",
+]
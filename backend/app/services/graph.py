@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 import re
+from time import monotonic
 from typing import Any, Dict, Iterable, List, Literal, Optional, Sequence, Set, Tuple
 
 try:  # pragma: no cover - optional dependency for runtime graph enrichment
@@ -19,6 +20,8 @@ except ModuleNotFoundError:  # pragma: no cover - fallback for tests
 
 from ..config import get_settings
 from .errors import WorkflowAbort, WorkflowComponent, WorkflowError, WorkflowSeverity
+from .graph_adjacency import EdgeAdjacencyIndex
+from .trigram_index import TrigramIndex
 
 try:  # Optional NetworkX support for analytics/community detection
     import networkx as nx  # type: ignore
@@ -467,6 +470,9 @@ class GraphStrategyBrief:
 
 
 class GraphService:
+    _SEARCHABLE_ENTITY_TYPES = {"Entity", "Organization", "Person", "Location", "Event"}
+    _ENTITY_FULLTEXT_INDEX = "entity_names"
+
     def __init__(self) -> None:
         self.settings = get_settings()
         self.mode = "neo4j" if self.settings.neo4j_uri != "memory://" else "memory"
@@ -480,9 +486,13 @@ class GraphService:
         self._knowledge_index: Any | None = None
         self._node_cache: Dict[str, GraphNode] = {}
         self._edge_cache: Dict[Tuple[str, str, str, str | None], GraphEdge] = {}
+        # Adjacency over _edge_cache (both modes) and, in memory mode, over _edges.
+        self._cache_adjacency = EdgeAdjacencyIndex()
+        self._adjacency = EdgeAdjacencyIndex()
         self._community_cache: GraphCommunitySummary | None = None
         self._strategy_cache: GraphStrategyBrief | None = None
         self._nx_graph = nx.DiGraph() if nx is not None else None
+        self._entity_names = TrigramIndex()
         if self.mode == "neo4j":
             try:
                 self.driver = GraphDatabase.driver(
@@ -511,6 +521,10 @@ class GraphService:
         def run(tx) -> None:
             tx.run("CREATE CONSTRAINT document_id IF NOT EXISTS FOR (d:Document) REQUIRE d.id IS UNIQUE")
             tx.run("CREATE CONSTRAINT entity_id IF NOT EXISTS FOR (e:Entity) REQUIRE e.id IS UNIQUE")
+            tx.run(
+                f"CREATE FULLTEXT INDEX {self._ENTITY_FULLTEXT_INDEX} IF NOT EXISTS "
+                "FOR (e:Entity) ON EACH [e.label, e.aliases]"
+            )
         with self.driver.session() as session:
             session.execute_write(run)
 
@@ -559,7 +573,8 @@ class GraphService:
             )
             if self.mode == "memory":
                 key = (root_id, "ONTOLOGY_CHILD", child_id, None)
-                self._edges.setdefault(key, relation)
+                if key not in self._edges:
+                    self._store_edge(key, relation)
             self._record_edge(relation)
 
     # region Upserts
@@ -571,7 +586,10 @@ class GraphService:
             )
             with self.driver.session() as session:
                 session.execute_write(lambda tx: tx.run(query, id=doc_id, title=title, metadata=metadata))
-        else:
+        self._apply_document(doc_id, title, metadata)
+
+    def _apply_document(self, doc_id: str, title: str, metadata: Dict[str, object]) -> None:
+        if self.mode == "memory":
             self._nodes[doc_id] = GraphNode(id=doc_id, type="Document", properties={"title": title, **metadata})
         self._register_node(doc_id, "Document", {"title": title, **metadata})
 
@@ -585,8 +603,15 @@ class GraphService:
                 session.execute_write(
                     lambda tx: tx.run(query, id=entity_id, type=entity_type, properties=properties)
                 )
-        else:
+        self._apply_entity(entity_id, entity_type, properties)
+
+    def _apply_entity(self, entity_id: str, entity_type: str, properties: Dict[str, object]) -> None:
+        if self.mode == "memory":
             self._nodes[entity_id] = GraphNode(id=entity_id, type=entity_type, properties=properties)
+            if entity_type in self._SEARCHABLE_ENTITY_TYPES:
+                self._entity_names.add(entity_id, self._entity_names_of(properties))
+            else:
+                self._entity_names.remove(entity_id)
         self._register_node(entity_id, entity_type, properties)
 
     def merge_relation(
@@ -611,6 +636,28 @@ class GraphService:
                         properties=properties,
                     )
                 )
+        self._apply_relation(source_id, relation_type, target_id, properties)
+
+    def batch(
+        self, *, max_rows: int | None = None, max_delay_seconds: float | None = None
+    ) -> "GraphWriteBatch":
+        """Return a :class:`GraphWriteBatch` using the ``graph_write_*`` settings as defaults."""
+
+        return GraphWriteBatch(
+            self,
+            max_rows=max_rows or self.settings.graph_write_batch_size,
+            max_delay_seconds=(
+                self.settings.graph_write_flush_seconds if max_delay_seconds is None else max_delay_seconds
+            ),
+        )
+
+    def _apply_relation(
+        self,
+        source_id: str,
+        relation_type: str,
+        target_id: str,
+        properties: Dict[str, object],
+    ) -> None:
         key = self._edge_key(source_id, relation_type, target_id, properties)
         if self.mode == "memory":
             existing = self._edges.get(key)
@@ -629,7 +676,7 @@ class GraphService:
                     type=relation_type,
                     properties=properties,
                 )
-            self._edges[key] = edge
+            self._store_edge(key, edge)
         else:
             existing = self._edge_cache.get(key)
             if existing:
@@ -701,57 +748,138 @@ class GraphService:
         if node_id not in self._nodes:
             raise KeyError(node_id)
         neighbor_nodes = {node_id: self._nodes[node_id]}
-        edges = [
-            edge
-            for edge in self._edges.values()
-            if edge.source == node_id or edge.target == node_id
-        ]
+        edges = [self._edges[key] for key in self._adjacency.incident(node_id)]
         for edge in edges:
             neighbor_nodes.setdefault(edge.source, self._nodes.get(edge.source, GraphNode(edge.source, "Unknown", {})))
             neighbor_nodes.setdefault(edge.target, self._nodes.get(edge.target, GraphNode(edge.target, "Unknown", {})))
             self._record_edge(edge)
         return list(neighbor_nodes.values()), edges
 
-    def subgraph(self, node_ids: Iterable[str]) -> GraphSubgraph:
+    def subgraph(
+        self, node_ids: Iterable[str], *, hops: int = 1, fanout: int | None = None
+    ) -> GraphSubgraph:
+        """Expand every seed ``hops`` steps out in a single batched traversal.
+
+        Each node expanded on a hop contributes at most ``fanout`` of its edges (all of
+        them when ``None``). Neo4j runs the whole expansion as one query; memory mode
+        runs the same breadth-first walk over the adjacency index. Unknown seeds are
+        skipped.
+        """
+
         unique_ids = list(dict.fromkeys(node_ids))
-        if not unique_ids:
+        if not unique_ids or hops < 1:
             return GraphSubgraph()
-        aggregated_nodes: Dict[str, GraphNode] = {}
-        aggregated_edges: Dict[Tuple[str, str, str, str | None], GraphEdge] = {}
-        for node_id in unique_ids:
-            try:
-                node_list, edge_list = self.neighbors(node_id)
-            except KeyError:
-                continue
-            for node in node_list:
-                aggregated_nodes[node.id] = node
-            for edge in edge_list:
+        if self.mode == "neo4j":
+            return self._neo4j_subgraph(unique_ids, hops, fanout)
+        nodes: Dict[str, GraphNode] = {
+            node_id: self._nodes[node_id] for node_id in unique_ids if node_id in self._nodes
+        }
+        edges: Dict[Tuple[str, str, str, str | None], GraphEdge] = {}
+        frontier = list(nodes)
+        for _ in range(hops):
+            next_frontier: List[str] = []
+            for node_id in frontier:
+                incident = self._adjacency.incident(node_id)
+                for key in incident if fanout is None else incident[:fanout]:
+                    edge = self._edges[key]
+                    if key not in edges:
+                        edges[key] = edge
+                        self._record_edge(edge)
+                    other_id = edge.target if edge.source == node_id else edge.source
+                    if other_id not in nodes:
+                        nodes[other_id] = self._nodes.get(other_id, GraphNode(other_id, "Unknown", {}))
+                        next_frontier.append(other_id)
+            if not next_frontier:
+                break
+            frontier = next_frontier
+        return GraphSubgraph(nodes=nodes, edges=edges)
+
+    def _neo4j_subgraph(self, seeds: List[str], hops: int, fanout: int | None) -> GraphSubgraph:
+        # One aggregating subquery per hop keeps the frontier as a list, so a node with
+        # no further neighbours does not drop the rows collected on earlier hops.
+        hop_clause = (
+            "CALL { WITH frontier UNWIND frontier AS f "
+            "CALL { WITH f MATCH (f)-[r]-(m) RETURN r, m"
+            + (" LIMIT $fanout" if fanout is not None else "")
+            + " } RETURN collect(DISTINCT r) AS hop_rels, collect(DISTINCT m) AS hop_nodes } "
+            "WITH seen, rels + [r IN hop_rels WHERE NOT r IN rels] AS rels, "
+            "[m IN hop_nodes WHERE NOT m IN seen] AS frontier "
+            "WITH frontier, seen + frontier AS seen, rels "
+        )
+        query = (
+            "MATCH (seed) WHERE seed.id IN $seeds "
+            "WITH collect(DISTINCT seed) AS frontier "
+            "WITH frontier, frontier AS seen, [] AS rels "
+            + hop_clause * hops
+            + "RETURN [n IN seen | {id: n.id, labels: labels(n), properties: properties(n)}] AS nodes, "
+            "[r IN rels | {source: startNode(r).id, target: endNode(r).id, type: type(r), "
+            "properties: properties(r)}] AS edges"
+        )
+        with self.driver.session() as session:
+            records = session.execute_read(
+                lambda tx: list(tx.run(query, seeds=seeds, fanout=fanout))
+            )
+        subgraph = GraphSubgraph()
+        for record in records:
+            for raw in record["nodes"]:
+                labels = list(raw.get("labels") or [])
+                node = GraphNode(
+                    id=raw["id"],
+                    type=labels[0] if labels else "Unknown",
+                    properties=dict(raw.get("properties") or {}),
+                )
+                subgraph.nodes[node.id] = node
+                self._register_node(node.id, node.type, node.properties)
+            for raw in record["edges"]:
+                edge = GraphEdge(
+                    source=raw["source"],
+                    target=raw["target"],
+                    type=raw["type"],
+                    properties=dict(raw.get("properties") or {}),
+                )
                 key = self._edge_key(edge.source, edge.type, edge.target, edge.properties)
-                existing = aggregated_edges.get(key)
-                if existing is None:
-                    aggregated_edges[key] = edge
-                else:
-                    merged = self._merge_properties(existing.properties, edge.properties)
-                    aggregated_edges[key] = GraphEdge(
+                existing = subgraph.edges.get(key)
+                if existing is not None:
+                    edge = GraphEdge(
                         source=edge.source,
                         target=edge.target,
                         type=edge.type,
-                        properties=merged,
+                        properties=self._merge_properties(existing.properties, edge.properties),
                     )
-        return GraphSubgraph(nodes=aggregated_nodes, edges=aggregated_edges)
+                subgraph.edges[key] = edge
+                self._record_edge(edge)
+        return subgraph
 
     def search_entities(self, query: str, limit: int = 5) -> List[GraphNode]:
+        """Fuzzy entity lookup by label and aliases, best match first.
+
+        Memory mode ranks the trigram index maintained by :meth:`upsert_entity`; Neo4j
+        mode queries the ``entity_names`` full-text index with fuzzy terms that must all
+        match, keeping hits scored at least ``graph_entity_min_fulltext_score``.
+        """
+
         if not query:
             return []
-        term = query.lower()
         if self.mode == "neo4j":
+            search = self._fulltext_query(query)
+            if not search:
+                return []
             stmt = (
-                "MATCH (e:Entity) WHERE toLower(e.label) CONTAINS $term "
-                "RETURN e LIMIT $limit"
+                "CALL db.index.fulltext.queryNodes($index, $search) YIELD node, score "
+                "WHERE score >= $min_score "
+                "RETURN node AS e, score ORDER BY score DESC LIMIT $limit"
             )
             with self.driver.session() as session:
                 result = session.execute_read(
-                    lambda tx: list(tx.run(stmt, term=term, limit=limit))
+                    lambda tx: list(
+                        tx.run(
+                            stmt,
+                            index=self._ENTITY_FULLTEXT_INDEX,
+                            search=search,
+                            min_score=self.settings.graph_entity_min_fulltext_score,
+                            limit=limit,
+                        )
+                    )
                 )
             nodes: List[GraphNode] = []
             for record in result:
@@ -764,15 +892,35 @@ class GraphService:
                     )
                 )
             return nodes
-        matches: List[GraphNode] = []
-        for node in self._nodes.values():
-            if node.type not in {"Entity", "Organization", "Person", "Location", "Event"}:
-                continue
-            label = str(node.properties.get("label", "")).lower()
-            if term in label:
-                matches.append(node)
-        matches.sort(key=lambda node: node.properties.get("label", ""))
-        return matches[:limit]
+        ranked = self._entity_names.search(
+            query, limit=limit, min_similarity=self.settings.graph_entity_min_similarity
+        )
+        return [self._nodes[entity_id] for _, entity_id in ranked if entity_id in self._nodes]
+
+    @staticmethod
+    def _entity_names_of(properties: Dict[str, object]) -> List[str]:
+        names = [str(properties["label"])] if properties.get("label") else []
+        aliases = properties.get("aliases")
+        if isinstance(aliases, str):
+            names.append(aliases)
+        elif isinstance(aliases, (list, tuple, set)):
+            names.extend(str(alias) for alias in aliases if alias)
+        return names
+
+    @staticmethod
+    def _fulltext_query(query: str) -> str:
+        """Lucene query requiring every word fuzzily, plus an optional prefix clause for the last word.
+
+        Lucene ORs bare terms, so each fuzzy term carries ``+`` to stop a stray hit on one
+        word of a longer question from matching.
+        """
+
+        words = re.findall(r"[^\W_]+", query.casefold())
+        if not words:
+            return ""
+        terms = [f"+{word}~" for word in words]
+        terms.append(f"{words[-1]}*")
+        return " ".join(terms)
 
     def document_entities(self, doc_ids: Iterable[str]) -> Dict[str, List[GraphNode]]:
         ids = list(dict.fromkeys(doc_ids))
@@ -797,6 +945,14 @@ class GraphService:
                 )
                 mapping.setdefault(record["doc_id"], []).append(graph_node)
             return mapping
+        for doc_id in ids:
+            for key in self._adjacency.outgoing(doc_id):
+                if key[1] != "MENTIONS":
+                    continue
+                node = self._nodes.get(key[2])
+                if node is not None:
+                    mapping[doc_id].append(node)
+        return mapping
 
     def run_cypher(self, query: str, params: Dict[str, Any] = None) -> List[Dict[str, Any]]:
         """Executes a raw Cypher query and returns a list of dictionaries."""
@@ -807,17 +963,6 @@ class GraphService:
             result = session.execute_read(lambda tx: list(tx.run(query, **(params or {}))))
             return [dict(record) for record in result]
 
-        for edge in self._edges.values():
-            if edge.type != "MENTIONS":
-                continue
-            if edge.source not in mapping:
-                continue
-            node = self._nodes.get(edge.target)
-            if node is None:
-                continue
-            mapping[edge.source].append(node)
-        return mapping
-
     def get_property_graph_store(self) -> Any:
         return self._property_graph
 
@@ -955,7 +1100,7 @@ class GraphService:
 
     def describe_schema(self) -> str:
         node_types = sorted({node.type for node in self._node_cache.values()} or {"Unknown"})
-        relation_types = sorted({edge.type for edge in self._edge_cache.values()})
+        relation_types = self._cache_adjacency.relation_types()
         return (
             "Node types: "
             + ", ".join(node_types)
@@ -1010,9 +1155,7 @@ class GraphService:
             opposing: List[GraphArgumentLink] = []
             neutral: List[GraphArgumentLink] = []
             documents: Set[str] = set()
-            for edge in self._edge_cache.values():
-                if edge.source != node_id and edge.target != node_id:
-                    continue
+            for edge in (self._edge_cache[key] for key in self._cache_adjacency.incident(node_id)):
                 other_id = edge.target if edge.source == node_id else edge.source
                 other = self._node_cache.get(other_id) or GraphNode(other_id, "Unknown", {})
                 relation_label = str(edge.properties.get("predicate") or edge.type)
@@ -1376,10 +1519,7 @@ class GraphService:
         return sorted(degree_map.items(), key=lambda item: item[1], reverse=True)[:limit]
 
     def _degree_map(self) -> Dict[str, int]:
-        counts: Dict[str, int] = {}
-        for edge in self._edge_cache.values():
-            counts[edge.source] = counts.get(edge.source, 0) + 1
-            counts[edge.target] = counts.get(edge.target, 0) + 1
+        counts = self._cache_adjacency.degrees()
         if not counts and hasattr(self, "_nodes"):
             for node_id in getattr(self, "_nodes").keys():
                 counts.setdefault(node_id, 0)
@@ -1387,9 +1527,8 @@ class GraphService:
 
     def _collect_documents_for_node(self, node_id: str) -> Set[str]:
         documents: Set[str] = set()
-        for edge in self._edge_cache.values():
-            if edge.source == node_id or edge.target == node_id:
-                documents.update(self._extract_documents_from_edge(edge))
+        for key in self._cache_adjacency.incident(node_id):
+            documents.update(self._extract_documents_from_edge(self._edge_cache[key]))
         return documents
 
     def _build_leverage_reason(
@@ -1486,6 +1625,7 @@ class GraphService:
     def _record_edge(self, edge: GraphEdge) -> None:
         key = self._edge_key(edge.source, edge.type, edge.target, edge.properties)
         self._edge_cache[key] = edge
+        self._cache_adjacency.add(key)
         self._strategy_cache = None
         if self._property_graph is not None:
             try:
@@ -1509,6 +1649,10 @@ class GraphService:
                 **{"type": edge.type, "properties": dict(edge.properties)},
             )
 
+    def _store_edge(self, key: Tuple[str, str, str, str | None], edge: GraphEdge) -> None:
+        self._edges[key] = edge
+        self._adjacency.add(key)
+
     def _create_property_graph_store(self) -> Any:
         if self.mode == "neo4j" and _LlamaNeo4jPropertyGraphStore is not None:
             try:
@@ -1772,6 +1916,158 @@ class GraphService:
     # endregion
 
 
+class GraphWriteBatch:
+    """Buffer node and relationship upserts and write them as ``UNWIND`` statements.
+
+    Rows are coalesced by node id and edge key, so repeated mentions within a batch
+    become one row (edge properties merged the way :meth:`GraphService.merge_relation`
+    merges them locally). :meth:`flush` writes every pending row in one Neo4j
+    transaction: documents, then entities, then one statement per relationship type,
+    since Cypher cannot parameterise a relationship type. The session is opened on
+    the first flush and reused until :meth:`close`.
+
+    A flush also happens automatically once ``max_rows`` rows are pending or the
+    oldest pending row is ``max_delay_seconds`` old; the age is checked as rows are
+    added, there is no background timer. In memory mode there are no round-trips to
+    save, so every call is applied to the graph immediately.
+    """
+
+    _RELATION_TYPE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+    def __init__(self, service: GraphService, *, max_rows: int, max_delay_seconds: float) -> None:
+        self.service = service
+        self.max_rows = max(1, max_rows)
+        self.max_delay_seconds = max_delay_seconds
+        self._documents: Dict[str, Tuple[str, Dict[str, object]]] = {}
+        self._entities: Dict[str, Tuple[str, Dict[str, object]]] = {}
+        self._relations: Dict[Tuple[str, str, str, str | None], Tuple[str, str, str, Dict[str, object]]] = {}
+        self._oldest: float | None = None
+        self._session: Any | None = None
+        self.flushes = 0
+
+    def __enter__(self) -> "GraphWriteBatch":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, traceback: Any) -> None:
+        try:
+            if exc_type is None:
+                self.flush()
+        finally:
+            self.close()
+
+    @property
+    def pending(self) -> int:
+        return len(self._documents) + len(self._entities) + len(self._relations)
+
+    def upsert_document(self, doc_id: str, title: str, metadata: Dict[str, object]) -> None:
+        if self.service.mode != "neo4j":
+            self.service.upsert_document(doc_id, title, metadata)
+            return
+        _, existing = self._documents.get(doc_id, ("", {}))
+        self._documents[doc_id] = (title, {**existing, **metadata})
+        self._pending_added()
+
+    def upsert_entity(self, entity_id: str, entity_type: str, properties: Dict[str, object]) -> None:
+        if self.service.mode != "neo4j":
+            self.service.upsert_entity(entity_id, entity_type, properties)
+            return
+        _, existing = self._entities.get(entity_id, ("", {}))
+        self._entities[entity_id] = (entity_type, {**existing, **properties})
+        self._pending_added()
+
+    def merge_relation(
+        self,
+        source_id: str,
+        relation_type: str,
+        target_id: str,
+        properties: Dict[str, object],
+    ) -> None:
+        if self.service.mode != "neo4j":
+            self.service.merge_relation(source_id, relation_type, target_id, properties)
+            return
+        if not self._RELATION_TYPE.match(relation_type):
+            raise ValueError(f"Invalid relationship type '{relation_type}'")
+        key = self.service._edge_key(source_id, relation_type, target_id, properties)
+        existing = self._relations.get(key)
+        if existing:
+            merged = self.service._merge_properties(existing[3], properties)
+        else:
+            # Copy list values so merging later rows never appends to the caller's lists.
+            merged = {name: list(value) if isinstance(value, list) else value for name, value in properties.items()}
+        self._relations[key] = (source_id, relation_type, target_id, merged)
+        self._pending_added()
+
+    def flush(self) -> int:
+        """Write every pending row in one transaction; returns the number of rows written.
+
+        The buffers are only cleared once the transaction commits, so a failed flush
+        leaves every row pending for the next attempt.
+        """
+
+        count = self.pending
+        if count == 0:
+            return 0
+        documents, entities, relations = self._documents, self._entities, self._relations
+        by_type: Dict[str, List[Dict[str, object]]] = {}
+        for source_id, relation_type, target_id, properties in relations.values():
+            by_type.setdefault(relation_type, []).append(
+                {"source_id": source_id, "target_id": target_id, "properties": properties}
+            )
+
+        def write(tx) -> None:
+            if documents:
+                tx.run(
+                    "UNWIND $rows AS row MERGE (d:Document {id: row.id}) "
+                    "SET d.title = row.title, d += row.metadata",
+                    rows=[
+                        {"id": doc_id, "title": title, "metadata": metadata}
+                        for doc_id, (title, metadata) in documents.items()
+                    ],
+                )
+            if entities:
+                tx.run(
+                    "UNWIND $rows AS row MERGE (e:Entity {id: row.id}) "
+                    "SET e.type = row.type, e += row.properties",
+                    rows=[
+                        {"id": entity_id, "type": entity_type, "properties": properties}
+                        for entity_id, (entity_type, properties) in entities.items()
+                    ],
+                )
+            for relation_type, rows in by_type.items():
+                tx.run(
+                    "UNWIND $rows AS row MATCH (s {id: row.source_id}), (t {id: row.target_id}) "
+                    f"MERGE (s)-[r:{relation_type}]->(t) SET r += row.properties",
+                    rows=rows,
+                )
+
+        if self._session is None:
+            self._session = self.service.driver.session()
+        self._session.execute_write(write)
+        self._documents, self._entities, self._relations = {}, {}, {}
+        self._oldest = None
+        self.flushes += 1
+        # Local caches follow only once the transaction has committed.
+        for doc_id, (title, metadata) in documents.items():
+            self.service._apply_document(doc_id, title, metadata)
+        for entity_id, (entity_type, properties) in entities.items():
+            self.service._apply_entity(entity_id, entity_type, properties)
+        for source_id, relation_type, target_id, properties in relations.values():
+            self.service._apply_relation(source_id, relation_type, target_id, properties)
+        return count
+
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def _pending_added(self) -> None:
+        now = monotonic()
+        if self._oldest is None:
+            self._oldest = now
+        if self.pending >= self.max_rows or now - self._oldest >= self.max_delay_seconds:
+            self.flush()
+
+
 _graph_service: GraphService | None = None
 
 
@@ -1783,6 +2079,9 @@ def get_graph_service() -> GraphService:
 
 
 def reset_graph_service() -> None:
+    from .retrieval import reset_retrieval_service
+
     global _graph_service
     _graph_service = None
+    reset_retrieval_service()
 
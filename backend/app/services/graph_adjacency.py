@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from typing import Dict, Iterator, List, Tuple
+
+EdgeKey = Tuple[str, str, str, "str | None"]
+
+
+class EdgeAdjacencyIndex:
+    """Forward, reverse and per-type indexes over a dictionary of graph edges.
+
+    Keys are the ``(source, type, target, doc_id)`` tuples the graph service already
+    uses for its edge dictionaries, so the index only stores keys and the edges
+    themselves stay in the owning dictionary. Each index is an insertion-ordered dict
+    used as a set, which keeps neighbourhood results deterministic. Looking up the
+    edges of a node costs O(degree) instead of a scan over every edge.
+    """
+
+    def __init__(self) -> None:
+        self._outgoing: Dict[str, Dict[EdgeKey, None]] = {}
+        self._incoming: Dict[str, Dict[EdgeKey, None]] = {}
+        self._by_type: Dict[str, Dict[EdgeKey, None]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(keys) for keys in self._by_type.values())
+
+    def add(self, key: EdgeKey) -> None:
+        source, relation_type, target, _ = key
+        self._outgoing.setdefault(source, {})[key] = None
+        self._incoming.setdefault(target, {})[key] = None
+        self._by_type.setdefault(relation_type, {})[key] = None
+
+    def discard(self, key: EdgeKey) -> None:
+        source, relation_type, target, _ = key
+        for index, name in ((self._outgoing, source), (self._incoming, target), (self._by_type, relation_type)):
+            keys = index.get(name)
+            if keys is not None:
+                keys.pop(key, None)
+                if not keys:
+                    del index[name]
+
+    def outgoing(self, node_id: str) -> List[EdgeKey]:
+        return list(self._outgoing.get(node_id, ()))
+
+    def incoming(self, node_id: str) -> List[EdgeKey]:
+        return list(self._incoming.get(node_id, ()))
+
+    def incident(self, node_id: str) -> List[EdgeKey]:
+        """Edges touching ``node_id`` in either direction; a self-loop is listed once."""
+
+        keys = dict(self._outgoing.get(node_id, {}))
+        keys.update(self._incoming.get(node_id, {}))
+        return list(keys)
+
+    def of_type(self, relation_type: str) -> List[EdgeKey]:
+        return list(self._by_type.get(relation_type, ()))
+
+    def relation_types(self) -> List[str]:
+        return sorted(self._by_type)
+
+    def degree(self, node_id: str) -> int:
+        """Edge endpoints at ``node_id``; a self-loop counts twice, as in an edge scan."""
+
+        return len(self._outgoing.get(node_id, ())) + len(self._incoming.get(node_id, ()))
+
+    def degrees(self) -> Dict[str, int]:
+        return {node_id: self.degree(node_id) for node_id in self.nodes()}
+
+    def nodes(self) -> Iterator[str]:
+        """Every node with at least one edge, sources first."""
+
+        yield from self._outgoing
+        for node_id in self._incoming:
+            if node_id not in self._outgoing:
+                yield node_id
+
+
+__all__ = ["EdgeAdjacencyIndex", "EdgeKey"]
@@ -31,10 +31,11 @@ from ..storage.job_store import JobStore
 from ..storage.timeline_store import TimelineEvent, TimelineStore
 from ..utils.audit import AuditEvent, get_audit_trail
 from ..utils.credentials import CredentialRegistry
+from ..utils.storage import sha256_id
 from ..utils.text import find_dates, sentence_containing
 from ..utils.triples import EntitySpan, Triple, normalise_entity_id
 from .forensics import ForensicsReport, ForensicsService
-from .graph import GraphService, get_graph_service
+from .graph import GraphService, GraphWriteBatch, get_graph_service
 from .ingestion_sources import MaterializedSource, build_connector
 from .ingestion_worker import (
     IngestionJobAlreadyQueued,
@@ -42,8 +43,17 @@ from .ingestion_worker import (
     IngestionTask,
     IngestionWorker,
 )
+from .keyword_index import Bm25Index, get_keyword_index, index_document_keywords
+from .privilege import PrivilegeClassifierService, get_privilege_classifier_service
+from .query_cache import bump_corpus_version
 from .timeline import EnrichmentStats, TimelineService
-from .vector import VectorService, get_vector_service
+from .vector import (
+    DOCUMENT_VERSION_FIELD,
+    VectorService,
+    entity_filter_keys,
+    get_vector_service,
+    vector_point_id,
+)
 from backend.ingestion.metrics import record_job_transition, record_queue_event
 from backend.ingestion.loader_registry import LoaderRegistry
 from backend.ingestion.ocr import OcrEngine
@@ -141,6 +151,8 @@ class IngestionService:
         forensics_service: ForensicsService | None = None,
         executor: ThreadPoolExecutor | None = None,
         worker: IngestionWorker | None = None,
+        keyword_index: Bm25Index | None = None,
+        privilege_classifier: PrivilegeClassifierService | None = None,
     ) -> None:
         self.logger = LOGGER
         self.settings = get_settings()
@@ -150,6 +162,8 @@ class IngestionService:
         self.job_store = job_store or JobStore(self.settings.job_store_dir)
         self.document_store = document_store or DocumentStore(self.settings.document_storage_path, self.settings.encryption_key)
         self.forensics_service = forensics_service or ForensicsService()
+        self.keyword_index = keyword_index if keyword_index is not None else get_keyword_index()
+        self.privilege_classifier = privilege_classifier or get_privilege_classifier_service()
         self.credential_registry = CredentialRegistry(self.settings.credentials_registry_path)
         self.executor = executor or _DEFAULT_EXECUTOR
         self.worker = worker
@@ -831,6 +845,8 @@ class IngestionService:
                 )
                 self._transition_job(job_record, "failed")
                 self.job_store.write_job(job_id, job_record)
+                if all_documents:
+                    bump_corpus_version()
                 self.logger.warning(
                     "Ingestion failed with HTTP error",
                     extra={"job_id": job_id, "status_code": exc.status_code},
@@ -864,6 +880,8 @@ class IngestionService:
                 )
                 self._transition_job(job_record, "failed")
                 self.job_store.write_job(job_id, job_record)
+                if all_documents:
+                    bump_corpus_version()
                 self.logger.exception("Unexpected ingestion failure", extra={"job_id": job_id})
                 self._audit_job_event(
                     job_id,
@@ -885,6 +903,7 @@ class IngestionService:
 
         if all_events:
             self.timeline_store.append(all_events)
+        bump_corpus_version()
         enrichment_stats = self._refresh_timeline_enrichments()
         community_summary = self.graph_service.compute_community_summary(graph_nodes)
         job_record["status_details"].setdefault("graph", {})["communities"] = community_summary.to_dict()
@@ -1298,113 +1317,168 @@ class IngestionService:
         skipped: List[Dict[str, str]] = []
         graph_mutation = GraphMutation()
         reports: List[ForensicsReport] = []
+        # One writer per source: small documents share batches, large ones are split.
+        vector_writer = self.vector_service.writer()
+        vector_versions: List[Tuple[str, str]] = []
+        graph_batch = self.graph_service.batch()
 
-        for doc_result in pipeline_result.documents:
-            path = doc_result.loaded.path
-            checksum = doc_result.loaded.checksum
-            doc_id = sha256_id(path)
-            if self._document_checksum_matches(doc_id, checksum):
-                skipped.append(
+        try:
+            for doc_result in pipeline_result.documents:
+                path = doc_result.loaded.path
+                checksum = doc_result.loaded.checksum
+                doc_id = sha256_id(path)
+                if self._document_checksum_matches(doc_id, checksum):
+                    skipped.append(
+                        {
+                            "path": str(path),
+                            "reason": "unchanged_checksum",
+                        }
+                    )
+                    self.logger.info(
+                        "Skipping document with unchanged checksum",
+                        extra={"doc_id": doc_id, "path": str(path)},
+                    )
+                    continue
+
+                doc_type = self._infer_doc_type(path)
+                metadata = dict(doc_result.loaded.metadata)
+                metadata.update(
                     {
-                        "path": str(path),
-                        "reason": "unchanged_checksum",
+                        "checksum_sha256": checksum,
+                        "chunk_count": len(doc_result.nodes),
+                        "embedding_model": self.runtime_config.embedding.model,
+                        "embedding_provider": self.runtime_config.embedding.provider.value,
+                        "ocr_engine": doc_result.loaded.ocr.engine if doc_result.loaded.ocr else None,
+                        "ocr_confidence": doc_result.loaded.ocr.confidence if doc_result.loaded.ocr else None,
                     }
                 )
-                self.logger.info(
-                    "Skipping document with unchanged checksum",
-                    extra={"doc_id": doc_id, "path": str(path)},
+
+                document = self._register_document(
+                    path,
+                    doc_type=doc_type,
+                    origin=origin,
+                    source_type=source_type,
+                    extra_metadata=metadata,
                 )
-                continue
+                graph_mutation.record_node(document.id)
 
-            doc_type = self._infer_doc_type(path)
-            metadata = dict(doc_result.loaded.metadata)
-            metadata.update(
-                {
-                    "checksum_sha256": checksum,
+                entity_pairs = self._entity_pairs(doc_result.entities)
+                metadata_updates: Dict[str, object] = {
+                    "entity_ids": [entity_id for entity_id, _ in entity_pairs],
+                    "entity_labels": [label for _, label in entity_pairs],
                     "chunk_count": len(doc_result.nodes),
-                    "embedding_model": self.runtime_config.embedding.model,
-                    "embedding_provider": self.runtime_config.embedding.provider.value,
-                    "ocr_engine": doc_result.loaded.ocr.engine if doc_result.loaded.ocr else None,
-                    "ocr_confidence": doc_result.loaded.ocr.confidence if doc_result.loaded.ocr else None,
+                    "checksum_sha256": checksum,
                 }
-            )
 
-            document = self._register_document(
-                path,
-                doc_type=doc_type,
-                origin=origin,
-                source_type=source_type,
-                extra_metadata=metadata,
-            )
-            graph_mutation.record_node(document.id)
-
-            entity_pairs = self._entity_pairs(doc_result.entities)
-            metadata_updates: Dict[str, object] = {
-                "entity_ids": [entity_id for entity_id, _ in entity_pairs],
-                "entity_labels": [label for _, label in entity_pairs],
-                "chunk_count": len(doc_result.nodes),
-                "checksum_sha256": checksum,
-            }
-
-            points: List[qmodels.PointStruct] = []
-            node_snapshots: List[Dict[str, Any]] = []
-            for node in doc_result.nodes:
-                payload = {
-                    **node.metadata,
-                    "doc_id": document.id,
-                    "chunk_index": node.chunk_index,
-                    "text": node.text,
-                    "origin": origin,
-                    "source_type": source_type,
-                    "doc_type": doc_type,
-                }
-                embedding_norm = float(np.linalg.norm(node.embedding)) if node.embedding else 0.0
-                payload["embedding_norm"] = embedding_norm
-                points.append(
-                    qmodels.PointStruct(
-                        id=str(uuid4()),
-                        vector=list(node.embedding),
-                        payload=payload,
-                    )
+                entity_keys = entity_filter_keys(
+                    metadata_updates["entity_ids"], metadata_updates["entity_labels"]
                 )
-                node_snapshots.append(
-                    {
-                        "node_id": node.node_id,
+                case_id = materialized.source.metadata.get("case_id")
+                points: List[qmodels.PointStruct] = []
+                node_snapshots: List[Dict[str, Any]] = []
+                for node in doc_result.nodes:
+                    payload = {
+                        **node.metadata,
+                        "doc_id": document.id,
                         "chunk_index": node.chunk_index,
                         "text": node.text,
-                        "metadata": node.metadata,
-                        "embedding": list(node.embedding),
+                        "origin": origin,
+                        "source_type": source_type,
+                        "doc_type": doc_type,
+                        "entity_keys": entity_keys,
+                        DOCUMENT_VERSION_FIELD: checksum,
                     }
-                )
+                    if case_id is not None:
+                        payload["case_id"] = str(case_id)
+                    embedding_norm = float(np.linalg.norm(node.embedding)) if node.embedding else 0.0
+                    payload["embedding_norm"] = embedding_norm
+                    points.append(
+                        qmodels.PointStruct(
+                            id=vector_point_id(document.id, node.chunk_index),
+                            vector=list(node.embedding),
+                            payload=payload,
+                        )
+                    )
+                    node_snapshots.append(
+                        {
+                            "node_id": node.node_id,
+                            "chunk_index": node.chunk_index,
+                            "text": node.text,
+                            "metadata": node.metadata,
+                            "embedding": list(node.embedding),
+                        }
+                    )
 
-            if points:
-                self.vector_service.upsert(points)
+                for span in doc_result.entities:
+                    self._commit_entity(document.id, span, graph_mutation, graph_batch)
 
-            for span in doc_result.entities:
-                self._commit_entity(document.id, span, graph_mutation)
+                self._commit_triples(document.id, doc_result.triples, graph_mutation, graph_batch)
+                # One graph transaction per document; very large documents also flush on size or age.
+                graph_batch.flush()
 
-            self._commit_triples(document.id, doc_result.triples, graph_mutation)
-            timeline_events = self._build_timeline_events(document.id, doc_result.loaded.text)
-            events.extend(timeline_events)
-            metadata_updates["timeline_events"] = len(timeline_events)
+                # Classified after the document's graph edges exist. Each chunk stores its own score, so
+                # retrieval screens off-page chunks exactly as classifying them at query time would; the
+                # document record keeps the highest, which is what graph-linked documents are judged by.
+                privilege_metadata = {**metadata, **metadata_updates, "title": document.title, "doc_id": document.id}
+                chunk_decisions = self.privilege_classifier.classify_many(
+                    (document.id, str(point.payload.get("text") or ""), privilege_metadata) for point in points
+                )
+                for point, chunk_decision in zip(points, chunk_decisions):
+                    point.payload.update(self.privilege_classifier.stored_fields(chunk_decision))
+                privilege_decision = max(
+                    [
+                        self.privilege_classifier.classify(document.id, doc_result.loaded.text, privilege_metadata),
+                        *chunk_decisions,
+                    ],
+                    key=lambda decision: decision.score,
+                )
+                metadata_updates.update(self.privilege_classifier.stored_fields(privilege_decision))
+
+                vector_writer.add(points)
+                vector_versions.append((document.id, checksum))
+                # Replaces any chunks from a previous version of this document.
+                index_document_keywords(
+                    self.keyword_index,
+                    path,
+                    (
+                        {
+                            **point.payload,
+                            "title": document.title,
+                            "entity_ids": metadata_updates["entity_ids"],
+                            "entity_labels": metadata_updates["entity_labels"],
+                        }
+                        for point in points
+                    ),
+                )
+                timeline_events = self._build_timeline_events(document.id, doc_result.loaded.text)
+                events.extend(timeline_events)
+                metadata_updates["timeline_events"] = len(timeline_events)
 
-            if doc_result.loaded.ocr and doc_result.loaded.ocr.tokens:
-                metadata_updates["ocr_token_count"] = len(doc_result.loaded.ocr.tokens)
+                if doc_result.loaded.ocr and doc_result.loaded.ocr.tokens:
+                    metadata_updates["ocr_token_count"] = len(doc_result.loaded.ocr.tokens)
 
-            self._update_document_metadata(document.id, metadata_updates)
+                self._update_document_metadata(document.id, metadata_updates)
 
-            report = self._build_forensics_report(
-                doc_type,
-                document.id,
-                path,
-                nodes=node_snapshots,
-                ingestion_metadata=metadata,
-            )
-            if report is not None:
-                reports.append(report)
+                report = self._build_forensics_report(
+                    doc_type,
+                    document.id,
+                    path,
+                    nodes=node_snapshots,
+                    ingestion_metadata=metadata,
+                )
+                if report is not None:
+                    reports.append(report)
 
-            documents.append(document)
+                documents.append(document)
+            vector_writer.flush()
+        finally:
+            vector_writer.close()
+            graph_batch.close()
 
+        # Chunks from a superseded version (e.g. a document that got shorter) are dropped once the new one is written.
+        for doc_id, version in vector_versions:
+            self.vector_service.delete_by_document(doc_id, keep_version=version)
+        self.keyword_index.flush()
         documents.sort(
             key=lambda item: (
                 item.metadata.get("ocr_confidence") is not None,
@@ -1414,14 +1488,16 @@ class IngestionService:
         )
         return documents, events, skipped, graph_mutation, reports
 
-    def _commit_entity(self, doc_id: str, span: EntitySpan, mutation: GraphMutation) -> None:
+    def _commit_entity(
+        self, doc_id: str, span: EntitySpan, mutation: GraphMutation, graph: GraphWriteBatch
+    ) -> None:
         entity_id = normalise_entity_id(span.label)
         properties: Dict[str, object] = {
             "label": span.label,
             "type": span.entity_type,
         }
-        self.graph_service.upsert_entity(entity_id, span.entity_type, properties)
-        self.graph_service.merge_relation(
+        graph.upsert_entity(entity_id, span.entity_type, properties)
+        graph.merge_relation(
             doc_id,
             "MENTIONS",
             entity_id,
@@ -1435,12 +1511,12 @@ class IngestionService:
         mutation.record_edge(doc_id, "MENTIONS", entity_id, doc_id)
 
     def _commit_triples(
-        self, doc_id: str, triples: List[Triple], mutation: GraphMutation
+        self, doc_id: str, triples: List[Triple], mutation: GraphMutation, graph: GraphWriteBatch
     ) -> None:
         for triple in triples:
             subject_id = normalise_entity_id(triple.subject.label)
             object_id = normalise_entity_id(triple.obj.label)
-            self.graph_service.upsert_entity(
+            graph.upsert_entity(
                 subject_id,
                 triple.subject.entity_type,
                 {
@@ -1448,7 +1524,7 @@ class IngestionService:
                     "type": triple.subject.entity_type,
                 },
             )
-            self.graph_service.upsert_entity(
+            graph.upsert_entity(
                 object_id,
                 triple.obj.entity_type,
                 {
@@ -1456,7 +1532,7 @@ class IngestionService:
                     "type": triple.obj.entity_type,
                 },
             )
-            self.graph_service.merge_relation(
+            graph.merge_relation(
                 subject_id,
                 triple.predicate,
                 object_id,
@@ -1721,11 +1797,6 @@ def shutdown_ingestion_worker(timeout: float | None = None) -> None:
 atexit.register(shutdown_ingestion_worker)
 
 
-def sha256_id(path: Path) -> str:
-    value = str(path.resolve()).encode("utf-8")
-    return sha256(value).hexdigest()
-
-
 def sha256_file(path: Path) -> str:
     hasher = sha256()
     with path.open("rb") as handle:
@@ -0,0 +1,849 @@
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import math
+import os
+import re
+from bisect import bisect_left
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from itertools import accumulate
+from pathlib import Path
+from threading import Lock, RLock
+from typing import AbstractSet, Any, Dict, Iterable, List, Mapping, Set, Tuple
+
+from ..config import get_settings
+from ..utils.storage import sha256_id
+
+_logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"[A-Za-z0-9']+")
+_QUERY_RE = re.compile(
+    r'(?:(?P<phrase_scope>title|body|metadata):)?"(?P<phrase>[^"]*)"'
+    r'|NEAR/(?P<distance>\d+)(?![^\s"])'
+    r'|(?:(?P<word_scope>title|body|metadata):)?(?P<word>[^\s"]+)',
+    re.IGNORECASE,
+)
+_SNAPSHOT_FORMAT = 2
+_SNAPSHOT_MANIFEST = "manifest.json"
+_SNAPSHOT_POSTINGS = "postings.bin"
+_SNAPSHOT_POSITIONS = "positions.bin"
+_SNAPSHOT_LEXICON = "lexicon.json"
+_SNAPSHOT_CHUNKS = "chunks.jsonl"
+_SNAPSHOT_JOURNAL = "journal.jsonl"
+_PAYLOAD_FIELDS = (
+    "doc_id",
+    "chunk_index",
+    "text",
+    "title",
+    "origin",
+    "source_type",
+    "doc_type",
+    "case_id",
+    "entity_ids",
+    "entity_labels",
+)
+_METADATA_FIELDS = ("doc_type", "source_type", "case_id", "entity_labels")
+
+
+def tokenize(text: str) -> List[str]:
+    return [token.lower() for token in _TOKEN_RE.findall(text)]
+
+
+def encode_varints(values: Iterable[int]) -> bytes:
+    """LEB128-encode non-negative integers, seven bits per byte."""
+
+    encoded = bytearray()
+    for value in values:
+        while value >= 0x80:
+            encoded.append((value & 0x7F) | 0x80)
+            value >>= 7
+        encoded.append(value)
+    return bytes(encoded)
+
+
+def decode_varints(data: bytes | bytearray) -> List[int]:
+    values: List[int] = []
+    value = 0
+    shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        values.append(value)
+        value = 0
+        shift = 0
+    return values
+
+
+@dataclass(frozen=True)
+class PhraseClause:
+    """Consecutive ``tokens`` that must occur in the ``scope`` field (body, title or metadata)."""
+
+    scope: str
+    tokens: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class ProximityClause:
+    """``left NEAR/distance right``: at most ``distance`` words between the two operands, in either order."""
+
+    scope: str
+    left: Tuple[str, ...]
+    right: Tuple[str, ...]
+    distance: int
+
+
+@dataclass
+class KeywordQuery:
+    """A parsed keyword query: free ``terms`` ranked by BM25 plus positional constraints."""
+
+    terms: List[str] = field(default_factory=list)
+    phrases: List[PhraseClause] = field(default_factory=list)
+    proximity: List[ProximityClause] = field(default_factory=list)
+
+    @property
+    def constrained(self) -> bool:
+        return bool(self.phrases or self.proximity)
+
+    def scoring_terms(self) -> List[str]:
+        """Body terms that contribute to the BM25 score, including those inside body clauses."""
+
+        tokens = list(self.terms)
+        for phrase in self.phrases:
+            if phrase.scope == "body":
+                tokens.extend(phrase.tokens)
+        for clause in self.proximity:
+            if clause.scope == "body":
+                tokens.extend(clause.left + clause.right)
+        return list(dict.fromkeys(tokens))
+
+
+def parse_keyword_query(text: str) -> KeywordQuery:
+    """Parse quoted phrases, ``a NEAR/n b`` proximity and ``title:``/``body:``/``metadata:`` scoping.
+
+    Quoted or field-scoped operands become required clauses; the remaining words are
+    optional BM25 terms. Operators are case-insensitive; anything unparseable is a word.
+    """
+
+    items: List[int | Tuple[str | None, Tuple[str, ...], bool]] = []
+    for match in _QUERY_RE.finditer(text):
+        if match.group("distance") is not None:
+            items.append(int(match.group("distance")))
+        elif match.group("phrase") is not None:
+            scope = match.group("phrase_scope")
+            items.append((scope and scope.lower(), tuple(tokenize(match.group("phrase"))), True))
+        else:
+            scope = match.group("word_scope")
+            items.append((scope and scope.lower(), tuple(tokenize(match.group("word"))), False))
+    query = KeywordQuery()
+    consumed: Set[int] = set()
+    for index, item in enumerate(items):
+        if not isinstance(item, int) or index == 0 or index == len(items) - 1:
+            continue
+        left, right = items[index - 1], items[index + 1]
+        if isinstance(left, int) or isinstance(right, int) or not left[1] or not right[1]:
+            continue
+        query.proximity.append(ProximityClause(left[0] or right[0] or "body", left[1], right[1], item))
+        consumed.update((index - 1, index + 1))
+    for index, item in enumerate(items):
+        if isinstance(item, int) or index in consumed or not item[1]:
+            continue
+        scope, tokens, quoted = item
+        if quoted or scope:
+            query.phrases.append(PhraseClause(scope or "body", tokens))
+        else:
+            query.terms.extend(tokens)
+    return query
+
+
+def _field_tokens(payload: Mapping[str, object]) -> Dict[str, List[str]]:
+    metadata: List[str] = []
+    for name in _METADATA_FIELDS:
+        value = payload.get(name)
+        if isinstance(value, (list, tuple)):
+            metadata.extend(str(item) for item in value)
+        elif value is not None:
+            metadata.append(str(value))
+    return {
+        "body": tokenize(str(payload.get("text") or "")),
+        "title": tokenize(str(payload.get("title") or "")),
+        "metadata": tokenize(" ".join(metadata)),
+    }
+
+
+@dataclass
+class _Term:
+    """Posting list of one term: varint ``(doc gap, tf)`` pairs plus the stats its score bound needs."""
+
+    postings: bytearray = field(default_factory=bytearray)
+    df: int = 0
+    last_doc: int = -1
+    max_tf: int = 0
+    min_length: int = 0
+
+
+@dataclass
+class _Positions:
+    """Positional posting list of one field term: varint ``(doc gap, count, position gaps...)`` runs."""
+
+    postings: bytearray = field(default_factory=bytearray)
+    last_doc: int = -1
+
+
+@dataclass
+class _Chunk:
+    key: str
+    doc_id: str
+    length: int
+    payload: Dict[str, object]
+    live: bool = True
+
+
+@dataclass
+class _QueryTerm:
+    idf: float
+    bound: float
+    docs: List[int]
+    tfs: List[int]
+
+
+class Bm25Index:
+    """Chunk-level inverted index scored with Okapi BM25.
+
+    Each term keeps one append-only posting list of delta-encoded chunk numbers and
+    term frequencies. Chunks are numbered in insertion order, so adding a document
+    only appends to the lists of its own terms. Replacing or removing a document
+    tombstones its chunks; once a quarter of the chunks are dead the postings are
+    rewritten without them. Document frequencies include tombstoned chunks until then.
+
+    Top-k queries use MaxScore pruning. Query terms are ordered by their score upper
+    bound, and terms whose combined bound cannot lift a chunk into the current top
+    k only get probed, by binary search, for chunks that a rarer term already matched.
+
+    Alongside the BM25 postings every body, title and metadata term keeps a positional
+    list, which answers the phrase, ``NEAR/n`` and field clauses of
+    :func:`parse_keyword_query`. Constrained queries intersect those lists first and
+    only score the chunks that satisfy every clause.
+
+    With a ``directory`` the index is persisted as a compact snapshot (postings blobs,
+    lexicon and chunk records) plus a JSON-lines journal of the changes made since.
+    :meth:`flush` appends to the journal and only rewrites the snapshot once the
+    journal outgrows it or after a compaction.
+    """
+
+    _DECODED_CACHE_TERMS = 4096
+    _MIN_COMPACTION_DEAD = 64
+
+    def __init__(self, *, k1: float = 1.2, b: float = 0.75, directory: Path | None = None) -> None:
+        self.k1 = float(k1)
+        self.b = float(b)
+        self.directory = Path(directory) if directory else None
+        self._terms: Dict[str, _Term] = {}
+        self._positions: Dict[str, _Positions] = {}
+        self._chunks: List[_Chunk] = []
+        self._chunks_by_document: Dict[str, List[int]] = {}
+        self._live_count = 0
+        self._live_length = 0
+        self._dead_count = 0
+        self._decoded: "OrderedDict[str, Tuple[List[int], List[int]]]" = OrderedDict()
+        self._decoded_positions: "OrderedDict[str, Tuple[List[int], List[List[int]]]]" = OrderedDict()
+        self._journal: List[Dict[str, Any]] = []
+        self._journal_records = 0
+        self._snapshot_chunks = 0
+        self._needs_snapshot = True
+        self._lock = RLock()
+        if self.directory is not None:
+            self._load(self.directory)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._live_count
+
+    def replace_document(self, doc_id: str, chunks: Iterable[Dict[str, object]]) -> None:
+        """Index ``chunks`` (payload dicts with ``text`` and ``chunk_index``) as the whole of ``doc_id``."""
+
+        with self._lock:
+            if self._remove(doc_id):
+                self._journal.append({"op": "delete", "doc_id": doc_id})
+            for position, chunk in enumerate(chunks):
+                payload = {name: chunk[name] for name in _PAYLOAD_FIELDS if chunk.get(name) is not None}
+                payload["doc_id"] = doc_id
+                fields = _field_tokens(payload)
+                if not fields["body"]:
+                    continue
+                key = f"{doc_id}::{payload.get('chunk_index', position)}"
+                self._add(key, doc_id, payload, fields)
+                self._journal.append({"op": "add", "key": key, "doc_id": doc_id, "payload": payload})
+            self._maybe_compact()
+
+    def remove_document(self, doc_id: str) -> None:
+        with self._lock:
+            if self._remove(doc_id):
+                self._journal.append({"op": "delete", "doc_id": doc_id})
+                self._maybe_compact()
+
+    def document_chunks(self, doc_id: str) -> List[Dict[str, object]]:
+        """Payloads of ``doc_id``'s live chunks, in ``chunk_index`` order."""
+
+        with self._lock:
+            payloads = [
+                dict(self._chunks[docno].payload)
+                for docno in self._chunks_by_document.get(doc_id, ())
+                if self._chunks[docno].live
+            ]
+        return sorted(payloads, key=lambda payload: int(payload.get("chunk_index") or 0))
+
+    def search(
+        self,
+        query: str,
+        *,
+        top_k: int,
+        filters: Mapping[str, str] | None = None,
+        doc_ids: AbstractSet[str] | None = None,
+    ) -> List[Tuple[float, Dict[str, object]]]:
+        """Return up to ``top_k`` ``(score, payload)`` pairs, best first.
+
+        ``query`` uses the :func:`parse_keyword_query` syntax. ``filters`` restricts
+        results to chunks whose payload fields equal the given values and ``doc_ids``
+        to chunks of the given documents.
+        """
+
+        with self._lock:
+            if top_k <= 0 or self._live_count == 0:
+                return []
+            parsed = parse_keyword_query(query)
+            average_length = self._live_length / self._live_count
+            terms = self._query_terms(parsed.scoring_terms(), average_length)
+            if parsed.constrained:
+                ranked = self._rank_candidates(
+                    self._constrained_docs(parsed), terms, top_k, average_length, filters, doc_ids
+                )
+            else:
+                ranked = self._max_score(terms, top_k, average_length, filters, doc_ids)
+            return [(score, dict(self._chunks[docno].payload)) for score, docno in ranked]
+
+    def match_documents(self, query: str, *, filters: Mapping[str, str] | None = None) -> Set[str]:
+        """Return the ids of documents with a chunk satisfying every clause of ``query``.
+
+        A query without phrase, proximity or field clauses matches any of its terms.
+        """
+
+        with self._lock:
+            parsed = parse_keyword_query(query)
+            if parsed.constrained:
+                docnos = self._constrained_docs(parsed)
+            else:
+                docnos = set()
+                for term in dict.fromkeys(parsed.terms):
+                    if term in self._terms:
+                        docnos.update(self._postings(term)[0])
+            return {
+                chunk.doc_id
+                for chunk in (self._chunks[docno] for docno in docnos)
+                if chunk.live and self._matches(chunk, filters)
+            }
+
+    def flush(self) -> None:
+        """Persist changes made since the last flush when the index has a directory."""
+
+        with self._lock:
+            if self.directory is None:
+                self._journal.clear()
+                return
+            if not self._journal and not self._needs_snapshot:
+                return
+            self.directory.mkdir(parents=True, exist_ok=True)
+            if self._needs_snapshot or self._journal_records + len(self._journal) > max(self._snapshot_chunks, 256):
+                self._write_snapshot(self.directory)
+            else:
+                with (self.directory / _SNAPSHOT_JOURNAL).open("a", encoding="utf-8") as handle:
+                    for record in self._journal:
+                        handle.write(json.dumps(record, default=str) + "\n")
+                self._journal_records += len(self._journal)
+            self._journal.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._terms.clear()
+            self._positions.clear()
+            self._chunks.clear()
+            self._chunks_by_document.clear()
+            self._decoded.clear()
+            self._decoded_positions.clear()
+            self._journal.clear()
+            self._live_count = 0
+            self._live_length = 0
+            self._dead_count = 0
+            self._needs_snapshot = True
+
+    def _saturation(self, tf: int, length: int, average_length: float) -> float:
+        norm = self.k1 * (1.0 - self.b + self.b * length / average_length)
+        return tf * (self.k1 + 1.0) / (tf + norm)
+
+    @staticmethod
+    def _matches(
+        chunk: _Chunk, filters: Mapping[str, str] | None, doc_ids: AbstractSet[str] | None = None
+    ) -> bool:
+        if doc_ids is not None and chunk.doc_id not in doc_ids:
+            return False
+        return not filters or all(str(chunk.payload.get(name)) == value for name, value in filters.items())
+
+    def _query_terms(self, tokens: Iterable[str], average_length: float) -> List[_QueryTerm]:
+        terms: List[_QueryTerm] = []
+        for term in tokens:
+            info = self._terms.get(term)
+            if info is None:
+                continue
+            idf = math.log1p((max(self._live_count - info.df, 0) + 0.5) / (info.df + 0.5))
+            docs, tfs = self._postings(term)
+            bound = idf * self._saturation(info.max_tf, info.min_length, average_length)
+            terms.append(_QueryTerm(idf=idf, bound=bound, docs=docs, tfs=tfs))
+        return terms
+
+    def _constrained_docs(self, query: KeywordQuery) -> Set[int]:
+        """Chunk numbers satisfying every phrase and proximity clause, tombstones included."""
+
+        candidates: Set[int] | None = None
+        for phrase in query.phrases:
+            candidates = set(self._phrase_starts(phrase.scope, phrase.tokens, candidates))
+            if not candidates:
+                return set()
+        for clause in query.proximity:
+            left = self._phrase_starts(clause.scope, clause.left, candidates)
+            right = self._phrase_starts(clause.scope, clause.right, set(left))
+            candidates = {
+                docno
+                for docno, starts in right.items()
+                if self._within(left[docno], len(clause.left), starts, len(clause.right), clause.distance)
+            }
+            if not candidates:
+                return set()
+        return candidates or set()
+
+    def _phrase_starts(
+        self, scope: str, tokens: Tuple[str, ...], within: Set[int] | None
+    ) -> Dict[int, List[int]]:
+        """Map chunk numbers (limited to ``within``) to the positions where ``tokens`` start."""
+
+        lists: List[Tuple[List[int], List[List[int]]]] = []
+        for token in tokens:
+            decoded = self._positional(f"{scope}:{token}")
+            if decoded is None:
+                return {}
+            lists.append(decoded)
+        rarest = min(lists, key=lambda decoded: len(decoded[0]))[0]
+        docnos = set(rarest) if within is None else within.intersection(rarest)
+        for docs, _ in lists:
+            if docs is not rarest:
+                docnos.intersection_update(docs)
+        matches: Dict[int, List[int]] = {}
+        for docno in docnos:
+            runs = [positions[bisect_left(docs, docno)] for docs, positions in lists]
+            following = [set(run) for run in runs[1:]]
+            starts = [
+                start
+                for start in runs[0]
+                if all(start + offset in positions for offset, positions in enumerate(following, 1))
+            ]
+            if starts:
+                matches[docno] = starts
+        return matches
+
+    @staticmethod
+    def _within(left: List[int], left_length: int, right: List[int], right_length: int, distance: int) -> bool:
+        """Whether some operand occurrences have at most ``distance`` words between them (sorted start positions)."""
+
+        for start in left:
+            index = bisect_left(right, start)
+            if index < len(right) and right[index] - (start + left_length) <= distance:
+                return True
+            if index > 0 and start - (right[index - 1] + right_length) <= distance:
+                return True
+        return False
+
+    def _rank_candidates(
+        self,
+        candidates: Set[int],
+        terms: List[_QueryTerm],
+        top_k: int,
+        average_length: float,
+        filters: Mapping[str, str] | None,
+        doc_ids: AbstractSet[str] | None = None,
+    ) -> List[Tuple[float, int]]:
+        """Score an already matched chunk set exhaustively; clause matches are few enough to probe."""
+
+        k1_plus_one = self.k1 + 1.0
+        scored: List[Tuple[float, int]] = []
+        for docno in candidates:
+            chunk = self._chunks[docno]
+            if not chunk.live or not self._matches(chunk, filters, doc_ids):
+                continue
+            norm = self.k1 * (1.0 - self.b + self.b * chunk.length / average_length)
+            score = 0.0
+            for term in terms:
+                position = bisect_left(term.docs, docno)
+                if position < len(term.docs) and term.docs[position] == docno:
+                    tf = term.tfs[position]
+                    score += term.idf * tf * k1_plus_one / (tf + norm)
+            scored.append((score, -docno))
+        return [(score, -negative) for score, negative in heapq.nlargest(top_k, scored)]
+
+    def _max_score(
+        self,
+        terms: List[_QueryTerm],
+        top_k: int,
+        average_length: float,
+        filters: Mapping[str, str] | None = None,
+        doc_ids: AbstractSet[str] | None = None,
+    ) -> List[Tuple[float, int]]:
+        terms.sort(key=lambda term: term.bound)
+        prefix_bounds = list(accumulate(term.bound for term in terms))
+        positions = [0] * len(terms)
+        heap: List[Tuple[float, int]] = []
+        threshold = 0.0
+        # terms[:essential] can no longer produce a top-k chunk on their own.
+        essential = 0
+        k1_plus_one = self.k1 + 1.0
+        while True:
+            if len(heap) >= top_k:
+                while essential < len(terms) and prefix_bounds[essential] <= threshold:
+                    essential += 1
+            candidate = min(
+                (
+                    terms[index].docs[positions[index]]
+                    for index in range(essential, len(terms))
+                    if positions[index] < len(terms[index].docs)
+                ),
+                default=None,
+            )
+            if candidate is None:
+                break
+            chunk = self._chunks[candidate]
+            norm = self.k1 * (1.0 - self.b + self.b * chunk.length / average_length)
+            score = 0.0
+            for index in range(essential, len(terms)):
+                term = terms[index]
+                position = positions[index]
+                if position < len(term.docs) and term.docs[position] == candidate:
+                    tf = term.tfs[position]
+                    score += term.idf * tf * k1_plus_one / (tf + norm)
+                    positions[index] = position + 1
+            if not chunk.live or not self._matches(chunk, filters, doc_ids):
+                continue
+            for index in range(essential - 1, -1, -1):
+                if score + prefix_bounds[index] <= threshold:
+                    break
+                term = terms[index]
+                position = bisect_left(term.docs, candidate, positions[index])
+                positions[index] = position
+                if position < len(term.docs) and term.docs[position] == candidate:
+                    tf = term.tfs[position]
+                    score += term.idf * tf * k1_plus_one / (tf + norm)
+            if len(heap) < top_k:
+                heapq.heappush(heap, (score, -candidate))
+            elif score > heap[0][0]:
+                heapq.heapreplace(heap, (score, -candidate))
+            else:
+                continue
+            if len(heap) >= top_k:
+                threshold = heap[0][0]
+        return [(score, -negative) for score, negative in sorted(heap, reverse=True)]
+
+    def _postings(self, term: str) -> Tuple[List[int], List[int]]:
+        cached = self._decoded.get(term)
+        if cached is not None:
+            self._decoded.move_to_end(term)
+            return cached
+        values = decode_varints(self._terms[term].postings)
+        docs = list(accumulate(values[0::2], initial=-1))[1:]
+        decoded = (docs, values[1::2])
+        self._decoded[term] = decoded
+        while len(self._decoded) > self._DECODED_CACHE_TERMS:
+            self._decoded.popitem(last=False)
+        return decoded
+
+    def _positional(self, key: str) -> Tuple[List[int], List[List[int]]] | None:
+        cached = self._decoded_positions.get(key)
+        if cached is not None:
+            self._decoded_positions.move_to_end(key)
+            return cached
+        info = self._positions.get(key)
+        if info is None:
+            return None
+        decoded = self._decode_positions(info)
+        self._decoded_positions[key] = decoded
+        while len(self._decoded_positions) > self._DECODED_CACHE_TERMS:
+            self._decoded_positions.popitem(last=False)
+        return decoded
+
+    @staticmethod
+    def _decode_positions(info: _Positions) -> Tuple[List[int], List[List[int]]]:
+        values = decode_varints(info.postings)
+        docs: List[int] = []
+        positions: List[List[int]] = []
+        docno = -1
+        index = 0
+        while index < len(values):
+            docno += values[index]
+            count = values[index + 1]
+            docs.append(docno)
+            positions.append(list(accumulate(values[index + 2 : index + 2 + count])))
+            index += 2 + count
+        return docs, positions
+
+    def _add(
+        self, key: str, doc_id: str, payload: Dict[str, object], fields: Dict[str, List[str]] | None = None
+    ) -> None:
+        fields = fields or _field_tokens(payload)
+        counts = Counter(fields["body"])
+        docno = len(self._chunks)
+        length = len(fields["body"])
+        self._chunks.append(_Chunk(key=key, doc_id=doc_id, length=length, payload=payload))
+        self._chunks_by_document.setdefault(doc_id, []).append(docno)
+        self._live_count += 1
+        self._live_length += length
+        for term, tf in counts.items():
+            info = self._terms.get(term)
+            if info is None:
+                info = self._terms[term] = _Term()
+            self._append_posting(info, docno, tf, length)
+            self._decoded.pop(term, None)
+        for scope, tokens in fields.items():
+            occurrences: Dict[str, List[int]] = {}
+            for position, token in enumerate(tokens):
+                occurrences.setdefault(token, []).append(position)
+            for token, positions in occurrences.items():
+                field_term = f"{scope}:{token}"
+                positional = self._positions.get(field_term)
+                if positional is None:
+                    positional = self._positions[field_term] = _Positions()
+                self._append_positions(positional, docno, positions)
+                self._decoded_positions.pop(field_term, None)
+
+    @staticmethod
+    def _append_positions(info: _Positions, docno: int, positions: List[int]) -> None:
+        gaps = [positions[0], *(current - previous for previous, current in zip(positions, positions[1:]))]
+        info.postings += encode_varints((docno - info.last_doc, len(positions), *gaps))
+        info.last_doc = docno
+
+    @staticmethod
+    def _append_posting(info: _Term, docno: int, tf: int, length: int) -> None:
+        info.postings += encode_varints((docno - info.last_doc, tf))
+        info.last_doc = docno
+        info.df += 1
+        info.max_tf = max(info.max_tf, tf)
+        info.min_length = min(info.min_length, length) if info.df > 1 else length
+
+    def _remove(self, doc_id: str) -> bool:
+        docnos = self._chunks_by_document.pop(doc_id, None)
+        if not docnos:
+            return False
+        for docno in docnos:
+            chunk = self._chunks[docno]
+            if chunk.live:
+                chunk.live = False
+                self._live_count -= 1
+                self._live_length -= chunk.length
+                self._dead_count += 1
+        return True
+
+    def _maybe_compact(self) -> None:
+        if self._dead_count >= max(self._MIN_COMPACTION_DEAD, len(self._chunks) // 4):
+            self._compact()
+
+    def _compact(self) -> None:
+        """Renumber live chunks densely and rewrite every posting list without tombstones."""
+
+        renumbered: Dict[int, int] = {}
+        chunks: List[_Chunk] = []
+        for docno, chunk in enumerate(self._chunks):
+            if chunk.live:
+                renumbered[docno] = len(chunks)
+                chunks.append(chunk)
+        terms: Dict[str, _Term] = {}
+        for term, info in self._terms.items():
+            values = decode_varints(info.postings)
+            docs = list(accumulate(values[0::2], initial=-1))[1:]
+            compacted = _Term()
+            for docno, tf in zip(docs, values[1::2]):
+                target = renumbered.get(docno)
+                if target is not None:
+                    self._append_posting(compacted, target, tf, chunks[target].length)
+            if compacted.df:
+                terms[term] = compacted
+        self._terms = terms
+        positional: Dict[str, _Positions] = {}
+        for key, term_positions in self._positions.items():
+            compacted_positions = _Positions()
+            for docno, positions in zip(*self._decode_positions(term_positions)):
+                target = renumbered.get(docno)
+                if target is not None:
+                    self._append_positions(compacted_positions, target, positions)
+            if compacted_positions.postings:
+                positional[key] = compacted_positions
+        self._positions = positional
+        self._chunks = chunks
+        self._chunks_by_document = {}
+        for docno, chunk in enumerate(chunks):
+            self._chunks_by_document.setdefault(chunk.doc_id, []).append(docno)
+        self._dead_count = 0
+        self._decoded.clear()
+        self._decoded_positions.clear()
+        # Chunk numbers changed, so the journal can no longer be replayed onto the old snapshot.
+        self._journal.clear()
+        self._needs_snapshot = True
+
+    def _write_snapshot(self, directory: Path) -> None:
+        blob = bytearray()
+        lexicon: Dict[str, List[int]] = {}
+        for term, info in self._terms.items():
+            lexicon[term] = [len(blob), len(info.postings), info.df, info.last_doc, info.max_tf, info.min_length]
+            blob += info.postings
+        positions_blob = bytearray()
+        positions_lexicon: Dict[str, List[int]] = {}
+        for key, positions in self._positions.items():
+            positions_lexicon[key] = [len(positions_blob), len(positions.postings), positions.last_doc]
+            positions_blob += positions.postings
+        lines = [
+            json.dumps(
+                {"key": chunk.key, "doc_id": chunk.doc_id, "length": chunk.length, "live": chunk.live, "payload": chunk.payload},
+                default=str,
+            )
+            for chunk in self._chunks
+        ]
+        self._atomic_write(directory / _SNAPSHOT_POSTINGS, bytes(blob))
+        self._atomic_write(directory / _SNAPSHOT_POSITIONS, bytes(positions_blob))
+        self._atomic_write(
+            directory / _SNAPSHOT_LEXICON,
+            json.dumps({"terms": lexicon, "positions": positions_lexicon}).encode("utf-8"),
+        )
+        self._atomic_write(directory / _SNAPSHOT_CHUNKS, ("\n".join(lines) + "\n" if lines else "").encode("utf-8"))
+        self._atomic_write(directory / _SNAPSHOT_JOURNAL, b"")
+        manifest = {"format": _SNAPSHOT_FORMAT, "chunks": len(self._chunks), "terms": len(self._terms)}
+        self._atomic_write(directory / _SNAPSHOT_MANIFEST, json.dumps(manifest).encode("utf-8"))
+        self._snapshot_chunks = len(self._chunks)
+        self._journal_records = 0
+        self._needs_snapshot = False
+
+    def _load(self, directory: Path) -> None:
+        manifest_path = directory / _SNAPSHOT_MANIFEST
+        if not manifest_path.exists():
+            return
+        try:
+            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+            if manifest.get("format") != _SNAPSHOT_FORMAT:
+                _logger.warning("Ignoring keyword index snapshot with unknown format", extra={"manifest": manifest})
+                return
+            blob = (directory / _SNAPSHOT_POSTINGS).read_bytes()
+            positions_blob = (directory / _SNAPSHOT_POSITIONS).read_bytes()
+            lexicon = json.loads((directory / _SNAPSHOT_LEXICON).read_text(encoding="utf-8"))
+            for key, (offset, size, last_doc) in lexicon["positions"].items():
+                self._positions[key] = _Positions(
+                    postings=bytearray(positions_blob[offset : offset + size]), last_doc=last_doc
+                )
+            for term, (offset, size, df, last_doc, max_tf, min_length) in lexicon["terms"].items():
+                self._terms[term] = _Term(
+                    postings=bytearray(blob[offset : offset + size]),
+                    df=df,
+                    last_doc=last_doc,
+                    max_tf=max_tf,
+                    min_length=min_length,
+                )
+            with (directory / _SNAPSHOT_CHUNKS).open("r", encoding="utf-8") as handle:
+                for line in handle:
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    chunk = _Chunk(
+                        key=record["key"],
+                        doc_id=record["doc_id"],
+                        length=int(record["length"]),
+                        payload=record["payload"],
+                        live=bool(record["live"]),
+                    )
+                    self._chunks.append(chunk)
+                    if chunk.live:
+                        self._chunks_by_document.setdefault(chunk.doc_id, []).append(len(self._chunks) - 1)
+                        self._live_count += 1
+                        self._live_length += chunk.length
+                    else:
+                        self._dead_count += 1
+            self._snapshot_chunks = len(self._chunks)
+            journal_path = directory / _SNAPSHOT_JOURNAL
+            if journal_path.exists():
+                with journal_path.open("r", encoding="utf-8") as handle:
+                    for line in handle:
+                        if not line.strip():
+                            continue
+                        record = json.loads(line)
+                        if record["op"] == "add":
+                            self._add(record["key"], record["doc_id"], record["payload"])
+                        else:
+                            self._remove(record["doc_id"])
+                        self._journal_records += 1
+        except (OSError, ValueError, KeyError) as exc:
+            _logger.warning("Discarding unreadable keyword index snapshot", exc_info=exc, extra={"directory": str(directory)})
+            self.clear()
+            return
+        self._needs_snapshot = False
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes) -> None:
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+
+
+_KEYWORD_INDEX_LOCK = Lock()
+_KEYWORD_INDEX: Bm25Index | None = None
+
+
+def get_keyword_index() -> Bm25Index:
+    global _KEYWORD_INDEX
+    with _KEYWORD_INDEX_LOCK:
+        if _KEYWORD_INDEX is None:
+            settings = get_settings()
+            _KEYWORD_INDEX = Bm25Index(
+                k1=settings.retrieval_keyword_bm25_k1,
+                b=settings.retrieval_keyword_bm25_b,
+                directory=settings.retrieval_keyword_index_dir,
+            )
+        return _KEYWORD_INDEX
+
+
+def reset_keyword_index() -> None:
+    global _KEYWORD_INDEX
+    with _KEYWORD_INDEX_LOCK:
+        _KEYWORD_INDEX = None
+
+
+def index_document_keywords(index: Bm25Index, path: Path, chunks: Iterable[Dict[str, object]]) -> str:
+    """Replace the chunks of the document ingested from ``path`` and return its id.
+
+    Every ingestion path writes the index through here, so a document is keyed by
+    :func:`sha256_id` of its file (the id its vectors use) and each chunk by its pipeline
+    ``chunk_index``; re-ingesting a file replaces its chunks instead of adding a copy.
+    """
+
+    doc_id = sha256_id(path)
+    index.replace_document(doc_id, chunks)
+    return doc_id
+
+
+__all__ = [
+    "Bm25Index",
+    "KeywordQuery",
+    "PhraseClause",
+    "ProximityClause",
+    "decode_varints",
+    "encode_varints",
+    "get_keyword_index",
+    "index_document_keywords",
+    "parse_keyword_query",
+    "reset_keyword_index",
+    "tokenize",
+]
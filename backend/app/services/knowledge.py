@@ -14,6 +14,7 @@ from opentelemetry import metrics, trace
 from opentelemetry.trace import Status, StatusCode
 
 from ..config import get_settings
+from ..services.embedding_cache import embedding_namespace, get_query_embedding_cache
 from ..services.graph import GraphService, get_graph_service
 from ..security.authz import Principal
 from ..storage.knowledge_store import KnowledgeProfileStore
@@ -55,9 +56,11 @@ _knowledge_progress_counter = _meter.create_counter(
 
 try:  # pragma: no cover - optional dependency guard
     from llama_index.core import Document, VectorStoreIndex
+    from llama_index.core.schema import QueryBundle
 except ModuleNotFoundError:  # pragma: no cover - fallback when llama-index missing
     Document = None  # type: ignore
     VectorStoreIndex = None  # type: ignore
+    QueryBundle = None  # type: ignore
 
 
 @dataclass(frozen=True)
@@ -481,7 +484,12 @@ class KnowledgeService:
             if self._index is not None:
                 with self._index_lock:
                     retriever = self._index.as_retriever(similarity_top_k=max(5, limit * 2))
-                    retrieved = retriever.retrieve(query)
+                    query_embedding = get_query_embedding_cache().embed(
+                        self._embedding_model,
+                        query,
+                        namespace=embedding_namespace(self._runtime.embedding),
+                    )
+                    retrieved = retriever.retrieve(QueryBundle(query_str=query, embedding=query_embedding))
                 for node in retrieved:
                     metadata = getattr(node, "metadata", {}) or {}
                     lesson_id = metadata.get("lesson_id")
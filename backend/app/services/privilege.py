@@ -22,6 +22,9 @@ _GRAPH_PRIVILEGE_KEYWORDS: Tuple[str, ...] = (
     "REPRESENTS",
     "CONFIDENTIAL",
 )
+# Document-level decision stored on chunk payloads and document records at ingestion.
+PRIVILEGE_LABEL_FIELD = "privilege_label"
+PRIVILEGE_SCORE_FIELD = "privilege_score"
 
 
 @dataclass
@@ -152,6 +155,35 @@ class PrivilegeClassifierService:
             decisions.append(self.classify(doc_id, text, metadata))
         return decisions
 
+    def stored_fields(self, decision: PrivilegeDecision) -> Dict[str, object]:
+        """Payload/record fields that persist ``decision``; read back with :meth:`from_stored_fields`."""
+
+        return {
+            PRIVILEGE_LABEL_FIELD: decision.label,
+            PRIVILEGE_SCORE_FIELD: round(decision.score, 4),
+        }
+
+    def from_stored_fields(self, doc_id: str, fields: Dict[str, object]) -> PrivilegeDecision | None:
+        """Rebuild a decision from :meth:`stored_fields`, relabelled against the current threshold."""
+
+        raw_score = fields.get(PRIVILEGE_SCORE_FIELD)
+        if raw_score is None:
+            return None
+        try:
+            score = float(raw_score)
+        except (TypeError, ValueError):
+            return None
+        label = str(fields.get(PRIVILEGE_LABEL_FIELD) or "unknown")
+        if label != "unknown":
+            label = "privileged" if score >= self.threshold else "non_privileged"
+        return PrivilegeDecision(
+            doc_id=doc_id,
+            label=label,
+            score=score,
+            explanation=f"stored at ingestion, confidence={score:.2f}",
+            source="ingestion",
+        )
+
     def aggregate(self, decisions: List[PrivilegeDecision]) -> PrivilegeSummary:
         if not decisions:
             return PrivilegeSummary(label="unknown", score=0.0, flagged=[], rationale="No evidence scored.")
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import logging
+import os
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from threading import Lock
+from time import monotonic, time_ns
+from typing import Callable, Generic, Hashable, Iterator, Tuple, TypeVar
+
+from ..config import get_settings
+
+try:  # pragma: no cover - platform specific
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no flock; bumps there are unlocked
+    fcntl = None  # type: ignore[assignment]
+
+_T = TypeVar("_T")
+
+_logger = logging.getLogger(__name__)
+_CORPUS_VERSION_LOCK = Lock()
+_CORPUS_VERSION = 0
+# Other workers' bumps become visible within this many seconds of being written.
+_SHARED_REFRESH_SECONDS = 0.5
+_shared_checked_at = float("-inf")
+
+
+def get_corpus_version() -> int:
+    """Return the corpus version, shared by every worker process through ``retrieval_corpus_version_path``.
+
+    The version file holds one integer, re-read at most every ``_SHARED_REFRESH_SECONDS``
+    so building a cache key rarely touches settings or the filesystem. The value seen
+    by a process never goes backwards, even if the file is deleted or rotated. Without
+    a path the counter is process-local, which is only safe with a single worker.
+    """
+
+    global _CORPUS_VERSION, _shared_checked_at
+    now = monotonic()
+    if now - _shared_checked_at < _SHARED_REFRESH_SECONDS:
+        return _CORPUS_VERSION
+    with _CORPUS_VERSION_LOCK:
+        _shared_checked_at = now
+        path = get_settings().retrieval_corpus_version_path
+        if path is not None:
+            _CORPUS_VERSION = max(_CORPUS_VERSION, _read_version(path))
+        return _CORPUS_VERSION
+
+
+def bump_corpus_version() -> int:
+    """Advance the corpus version so cached retrieval results keyed on the old value stop matching."""
+
+    global _CORPUS_VERSION, _shared_checked_at
+    path = get_settings().retrieval_corpus_version_path
+    with _CORPUS_VERSION_LOCK:
+        value = _CORPUS_VERSION + 1
+        if path is not None:
+            try:
+                with _version_file_lock(path):
+                    if path.exists():
+                        value = max(value, _read_version(path) + 1)
+                    else:
+                        # Seeding from the clock keeps a new or recreated file ahead of every value handed out.
+                        value = max(value, time_ns())
+                    _write_version(path, value)
+            except OSError as exc:
+                _logger.warning("Failed to bump the shared corpus version", exc_info=exc, extra={"path": str(path)})
+        _CORPUS_VERSION = value
+        _shared_checked_at = monotonic()
+        return value
+
+
+def _read_version(path: Path) -> int:
+    try:
+        return int(path.read_text(encoding="utf-8").strip() or 0)
+    except FileNotFoundError:
+        return 0
+    except (OSError, ValueError) as exc:
+        _logger.warning("Unreadable corpus version file", exc_info=exc, extra={"path": str(path)})
+        return 0
+
+
+def _write_version(path: Path, value: int) -> None:
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    temp_path.write_text(str(value), encoding="utf-8")
+    os.replace(temp_path, path)
+
+
+@contextmanager
+def _version_file_lock(path: Path) -> Iterator[None]:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fcntl is None:
+        yield
+        return
+    with path.with_name(f"{path.name}.lock").open("a") as handle:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+class QueryResultCache(Generic[_T]):
+    """Thread-safe LRU cache whose entries also expire after a fixed time-to-live."""
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl_seconds: float,
+        *,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        self.max_entries = max(0, int(max_entries))
+        self.ttl_seconds = float(ttl_seconds)
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, _T]]" = OrderedDict()
+        self._lock = Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def get(self, key: Hashable) -> _T | None:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: _T) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+__all__ = [
+    "QueryResultCache",
+    "bump_corpus_version",
+    "get_corpus_version",
+]
@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import logging
+from collections import OrderedDict
+from hashlib import sha256
+from threading import Lock
+from time import perf_counter
+from typing import Any, Dict, List, Sequence, Tuple
+
+from opentelemetry import metrics
+from qdrant_client.http import models as qmodels
+
+from ..config import get_settings
+from .query_cache import get_corpus_version
+
+_logger = logging.getLogger(__name__)
+_meter = metrics.get_meter(__name__)
+_pair_cache_counter = _meter.create_counter(
+    "reranker_pair_cache_lookups_total",
+    unit="1",
+    description="Cross-encoder (query, chunk) score lookups labelled by outcome (hit, miss)",
+)
+_predict_duration = _meter.create_histogram(
+    "reranker_predict_duration_ms",
+    unit="ms",
+    description="Latency of one batched cross-encoder scoring call",
+)
+
+_PairKey = Tuple[int, str, str]
+_MAX_PAIRS_BUCKET = 1024
+
+
+def chunk_key(point: qmodels.ScoredPoint) -> str:
+    """Stable identity of a retrieved chunk: document, chunk index and point id."""
+
+    payload = point.payload or {}
+    doc_id = payload.get("doc_id") or payload.get("id")
+    chunk_index = payload.get("chunk_index")
+    return f"{doc_id or point.id}::{chunk_index if chunk_index is not None else 'na'}::{point.id}"
+
+
+def _pairs_bucket(count: int) -> str:
+    """Round a pair count up to a power of two so it stays a bounded metric attribute."""
+
+    if count > _MAX_PAIRS_BUCKET:
+        return f">{_MAX_PAIRS_BUCKET}"
+    return str(1 << max(count - 1, 0).bit_length())
+
+
+class CrossEncoderReranker:
+    """Cross-encoder reranker with batched scoring and an LRU of (query, chunk) scores.
+
+    The model loads on first use or on :meth:`warm_up`. ``backend`` selects the
+    execution path: ``torch`` (default), ``torch-int8`` (dynamic int8 quantisation of
+    the linear layers for CPU inference) or ``onnx`` (sentence-transformers' ONNX
+    Runtime backend, optionally pointing ``onnx_file`` at a pre-quantised export).
+    Pair scores are keyed by corpus version, query hash and chunk id, so cached
+    scores are dropped once an ingestion job changes the corpus.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        *,
+        batch_size: int = 32,
+        max_length: int = 512,
+        backend: str = "torch",
+        onnx_file: str | None = None,
+        cache_size: int = 8192,
+    ) -> None:
+        self.model_name = model_name
+        self.batch_size = max(1, int(batch_size))
+        self.max_length = max(1, int(max_length))
+        self.backend = backend
+        self.onnx_file = onnx_file
+        self.cache_size = max(0, int(cache_size))
+        self._model: Any = None
+        self._load_error: Exception | None = None
+        self._load_lock = Lock()
+        self._scores: "OrderedDict[_PairKey, float]" = OrderedDict()
+        self._scores_lock = Lock()
+
+    def load(self) -> Any:
+        """Return the loaded model, or ``None`` when it cannot be loaded in this environment."""
+
+        if self._model is not None or self._load_error is not None:
+            return self._model
+        with self._load_lock:
+            if self._model is None and self._load_error is None:
+                try:
+                    self._model = self._build_model()
+                except Exception as exc:  # pragma: no cover - optional dependency / model download failure
+                    self._load_error = exc
+                    _logger.warning(
+                        "Cross-encoder unavailable; falling back to fusion order",
+                        exc_info=exc,
+                        extra={"model": self.model_name, "backend": self.backend},
+                    )
+        return self._model
+
+    def warm_up(self) -> bool:
+        """Load the model and run one pair through it so the first query skips start-up cost."""
+
+        model = self.load()
+        if model is None:
+            return False
+        self._predict(model, [("warm-up", "warm-up")])
+        return True
+
+    def score(self, query: str, points: Sequence[qmodels.ScoredPoint]) -> List[float] | None:
+        """Score ``points`` against ``query``, predicting only pairs missing from the LRU."""
+
+        if not points:
+            return []
+        model = self.load()
+        if model is None:
+            return None
+        query_digest = sha256(" ".join(query.split()).encode("utf-8")).hexdigest()
+        version = get_corpus_version()
+        keys = [(version, query_digest, chunk_key(point)) for point in points]
+        scores: List[float | None] = [self._cached_score(key) for key in keys]
+        missing = [position for position, score in enumerate(scores) if score is None]
+        _pair_cache_counter.add(len(points) - len(missing), attributes={"outcome": "hit"})
+        _pair_cache_counter.add(len(missing), attributes={"outcome": "miss"})
+        if missing:
+            pairs = [(query, str((points[position].payload or {}).get("text", ""))) for position in missing]
+            predicted = self._predict(model, pairs)
+            for position, value in zip(missing, predicted):
+                scores[position] = value
+                self._store_score(keys[position], value)
+        return [float(score) for score in scores]  # type: ignore[arg-type]
+
+    def rerank(self, query: str, points: List[qmodels.ScoredPoint]) -> List[qmodels.ScoredPoint] | None:
+        """Return ``points`` ordered by cross-encoder score, or ``None`` if the model is unavailable."""
+
+        scores = self.score(query, points)
+        if scores is None:
+            return None
+        rescored = sorted(zip(scores, points), key=lambda item: item[0], reverse=True)
+        reordered: List[qmodels.ScoredPoint] = []
+        for score, point in rescored:
+            payload = dict(point.payload or {})
+            payload["cross_encoder_score"] = score
+            reordered.append(
+                qmodels.ScoredPoint(id=point.id, score=score, payload=payload, version=point.version)
+            )
+        return reordered
+
+    def clear(self) -> None:
+        with self._scores_lock:
+            self._scores.clear()
+
+    def __len__(self) -> int:
+        with self._scores_lock:
+            return len(self._scores)
+
+    def _predict(self, model: Any, pairs: List[Tuple[str, str]]) -> List[float]:
+        start = perf_counter()
+        raw = model.predict(pairs, batch_size=self.batch_size, show_progress_bar=False)
+        _predict_duration.record(
+            (perf_counter() - start) * 1000.0,
+            attributes={"backend": self.backend, "pairs": _pairs_bucket(len(pairs))},
+        )
+        return [float(value) for value in raw]
+
+    def _build_model(self) -> Any:  # pragma: no cover - requires sentence-transformers
+        from sentence_transformers import CrossEncoder  # type: ignore
+
+        kwargs: Dict[str, Any] = {"max_length": self.max_length}
+        if self.backend == "onnx":
+            kwargs["backend"] = "onnx"
+            if self.onnx_file:
+                kwargs["model_kwargs"] = {"file_name": self.onnx_file}
+        model = CrossEncoder(self.model_name, **kwargs)
+        if self.backend == "torch-int8":
+            import torch
+
+            model.model = torch.quantization.quantize_dynamic(model.model, {torch.nn.Linear}, dtype=torch.qint8)
+        return model
+
+    def _cached_score(self, key: _PairKey) -> float | None:
+        with self._scores_lock:
+            score = self._scores.get(key)
+            if score is not None:
+                self._scores.move_to_end(key)
+            return score
+
+    def _store_score(self, key: _PairKey, score: float) -> None:
+        if self.cache_size == 0:
+            return
+        with self._scores_lock:
+            self._scores[key] = score
+            self._scores.move_to_end(key)
+            while len(self._scores) > self.cache_size:
+                self._scores.popitem(last=False)
+
+
+_RERANKER_LOCK = Lock()
+_RERANKER: CrossEncoderReranker | None = None
+
+
+def get_reranker() -> CrossEncoderReranker | None:
+    """Shared reranker for ``retrieval_cross_encoder_model``; ``None`` when no model is configured."""
+
+    global _RERANKER
+    with _RERANKER_LOCK:
+        if _RERANKER is None:
+            settings = get_settings()
+            if not settings.retrieval_cross_encoder_model:
+                return None
+            _RERANKER = CrossEncoderReranker(
+                settings.retrieval_cross_encoder_model,
+                batch_size=settings.retrieval_reranker_batch_size,
+                max_length=settings.retrieval_reranker_max_length,
+                backend=settings.retrieval_reranker_backend,
+                onnx_file=settings.retrieval_reranker_onnx_file,
+                cache_size=settings.retrieval_reranker_cache_size,
+            )
+        return _RERANKER
+
+
+def reset_reranker() -> None:
+    global _RERANKER
+    with _RERANKER_LOCK:
+        _RERANKER = None
+
+
+__all__ = [
+    "CrossEncoderReranker",
+    "chunk_key",
+    "get_reranker",
+    "reset_reranker",
+]
@@ -1,15 +1,23 @@
 from __future__ import annotations
 
+import asyncio
+import base64
+import binascii
 import json
 import logging
 import math
 import re
-from dataclasses import dataclass, field
+from concurrent.futures import Future, wait as wait_futures
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar, copy_context
+from dataclasses import dataclass, field, replace
 from enum import Enum
+from hashlib import sha256
 from itertools import zip_longest
-from time import perf_counter
-from typing import Any, Callable, Dict, Iterable, Iterator, List, Set, Tuple
-from urllib.parse import urljoin
+from threading import Lock
+from time import monotonic, perf_counter
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+from urllib.parse import parse_qs, urlencode, urljoin, urlsplit, urlunsplit
 
 try:  # pragma: no cover - optional dependency for vector retrieval
     from qdrant_client.http import models as qmodels
@@ -57,13 +65,18 @@ from ..security.privilege_policy import (
 from ..storage.document_store import DocumentStore
 from ..storage.timeline_store import TimelineStore
 from ..utils.triples import extract_entities, normalise_entity_id
+from .embedding_cache import compute_query_embedding, embedding_namespace, get_query_embedding_cache
+from .external_http import AsyncHttpPool, get_external_http_pool
 from .forensics import ForensicsService, get_forensics_service
 from .graph import GraphEdge, GraphNode, GraphService, GraphSubgraph, get_graph_service
+from .keyword_index import get_keyword_index
 from .privilege import (
     PrivilegeClassifierService,
     PrivilegeDecision,
     get_privilege_classifier_service,
 )
+from .query_cache import QueryResultCache, get_corpus_version
+from .reranker import chunk_key, get_reranker
 from .retrieval_engine import (
     GraphRetrieverAdapter,
     HybridQueryEngine,
@@ -71,6 +84,7 @@ from .retrieval_engine import (
     KeywordRetrieverAdapter,
     VectorRetrieverAdapter,
 )
+from .stage_timing import collect_stage_timings, timed_stage
 from .vector import VectorService, get_vector_service
 
 
@@ -87,6 +101,26 @@ _retrieval_query_duration = _meter.create_histogram(
     unit="ms",
     description="Latency of retrieval queries",
 )
+_retrieval_cache_hits_counter = _meter.create_counter(
+    "retrieval_cache_hits_total",
+    unit="1",
+    description="Retrieval queries answered from the query-result cache",
+)
+_retrieval_cache_misses_counter = _meter.create_counter(
+    "retrieval_cache_misses_total",
+    unit="1",
+    description="Retrieval queries that missed the query-result cache",
+)
+_retrieval_candidate_cache_counter = _meter.create_counter(
+    "retrieval_candidate_cache_lookups_total",
+    unit="1",
+    description="Fused candidate list lookups for paged queries labelled by outcome (hit, miss)",
+)
+_external_case_law_timeout_counter = _meter.create_counter(
+    "retrieval_external_case_law_timeouts_total",
+    unit="1",
+    description="External case-law searches cut off at the deadline, labelled by adapter",
+)
 _retrieval_results_histogram = _meter.create_histogram(
     "retrieval_results_returned",
     unit="1",
@@ -125,60 +159,203 @@ class RetrievalMode(str, Enum):
     SEMANTIC = "semantic"
 
 
-class CourtListenerCaseLawAdapter:
-    """Lightweight CourtListener client that emits scored opinion payloads."""
+class _ExternalCaseLawAdapter:
+    """Async, pooled and cached search against an external case-law API.
+
+    Requests run on the shared :class:`AsyncHttpPool` loop and its keep-alive
+    client unless ``client_factory`` supplies a dedicated ``httpx.AsyncClient``.
+    Numbered follow-up pages are fetched concurrently; cursor-paginated APIs are
+    walked one page at a time. Complete result lists are cached per normalised
+    query and limit for ``cache_ttl_seconds``. Points are appended to the caller's
+    ``sink`` as pages arrive, so a search cancelled at a deadline still leaves
+    its partial results behind.
+    """
 
     _MAX_PAGE_SIZE = 100
     _MAX_PAGES = 3
+    _NAME = "External case law"
 
     def __init__(
         self,
         endpoint: str,
-        token: str | None,
         *,
         timeout: float = 10.0,
-        client_factory: Callable[[], httpx.Client] | None = None,
+        client_factory: Callable[[], httpx.AsyncClient] | None = None,
+        pool: AsyncHttpPool | None = None,
+        cache_ttl_seconds: float = 0.0,
+        cache_max_entries: int = 0,
     ) -> None:
         self.endpoint = endpoint.rstrip("/") + "/"
-        self.token = token
         self.timeout = timeout
-        self._client_factory = client_factory or (lambda: httpx.Client(timeout=self.timeout))
+        self._client_factory = client_factory
+        self._client: httpx.AsyncClient | None = None
+        self._pool = pool
+        self._cache: QueryResultCache[List[qmodels.ScoredPoint]] = QueryResultCache(
+            cache_max_entries, cache_ttl_seconds
+        )
+
+    @property
+    def pool(self) -> AsyncHttpPool:
+        if self._pool is None:
+            self._pool = get_external_http_pool()
+        return self._pool
 
     def search(self, query: str, *, limit: int) -> List[qmodels.ScoredPoint]:
+        return self.pool.run(lambda: self.search_async(query, limit=limit))
+
+    def submit(
+        self, query: str, *, limit: int, sink: List[qmodels.ScoredPoint]
+    ) -> "Future[List[qmodels.ScoredPoint]]":
+        """Start a search in the background; ``sink`` fills up as pages arrive."""
+
+        return self.pool.submit(lambda: self.search_async(query, limit=limit, sink=sink))
+
+    async def search_async(
+        self,
+        query: str,
+        *,
+        limit: int,
+        sink: List[qmodels.ScoredPoint] | None = None,
+    ) -> List[qmodels.ScoredPoint]:
+        points: List[qmodels.ScoredPoint] = sink if sink is not None else []
+        limit = self._effective_limit(limit)
         if not query.strip() or limit <= 0:
             return []
-        params = {"q": query, "page_size": min(max(limit, 1), self._MAX_PAGE_SIZE)}
+        cache_key = (" ".join(query.split()).casefold(), limit)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            points.extend(cached)
+            return list(cached)
+        client = self._http_client()
         headers = self._headers()
-        points: List[qmodels.ScoredPoint] = []
-        next_url = self.endpoint
-        page = 0
+        complete = False
         try:
-            with self._client_factory() as client:
-                while next_url and len(points) < limit and page < self._MAX_PAGES:
-                    response = client.get(
-                        next_url,
-                        params=params if page == 0 else None,
-                        headers=headers,
-                    )
-                    if response.status_code >= 400:
-                        _logger.warning(
-                            "CourtListener request failed", extra={"url": next_url, "status": response.status_code}
-                        )
-                        break
-                    payload = response.json()
-                    results = payload.get("results") or []
-                    for item in results:
-                        point = self._point_from_result(item, query, len(points))
-                        if point is None:
-                            continue
-                        points.append(point)
-                        if len(points) >= limit:
+            payload = await self._get_page(client, self.endpoint, headers, self._params(query, limit))
+            next_url = self._consume(payload, query, limit, points) if payload is not None else None
+            pages = 1
+            while next_url and len(points) < limit and pages < self._MAX_PAGES:
+                urls = self._following_pages(next_url, self._MAX_PAGES - pages)
+                requests = [asyncio.ensure_future(self._get_page(client, url, headers)) for url in urls]
+                try:
+                    for request in requests:
+                        payload = await request
+                        pages += 1
+                        next_url = self._consume(payload, query, limit, points) if payload is not None else None
+                        if next_url is None or len(points) >= limit:
                             break
-                    next_url = payload.get("next")
-                    page += 1
+                finally:
+                    for request in requests:
+                        request.cancel()
+            complete = payload is not None
         except httpx.HTTPError as exc:  # pragma: no cover - network failure path
-            _logger.warning("CourtListener adapter error", exc_info=exc, extra={"query": query})
-        return points
+            _logger.warning(f"{self._NAME} adapter error", exc_info=exc, extra={"query": query})
+        if complete:
+            self._cache.put(cache_key, list(points))
+        return list(points)
+
+    def _http_client(self) -> httpx.AsyncClient:
+        if self._client_factory is None:
+            return self.pool.client
+        if self._client is None:
+            self._client = self._client_factory()
+        return self._client
+
+    async def _get_page(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        headers: Dict[str, str],
+        params: Dict[str, object] | None = None,
+    ) -> Dict[str, Any] | None:
+        response = await client.get(url, params=params, headers=headers, timeout=self.timeout)
+        if response.status_code >= 400:
+            _logger.warning(f"{self._NAME} request failed", extra={"url": url, "status": response.status_code})
+            return None
+        return response.json()
+
+    def _consume(
+        self,
+        payload: Dict[str, Any],
+        query: str,
+        limit: int,
+        points: List[qmodels.ScoredPoint],
+    ) -> str | None:
+        for item in payload.get("results") or []:
+            if len(points) >= limit:
+                break
+            point = self._point_from_result(item, query, len(points))
+            if point is not None:
+                points.append(point)
+        next_url = payload.get("next")
+        return str(next_url) if next_url else None
+
+    @staticmethod
+    def _following_pages(next_url: str, remaining: int) -> List[str]:
+        """Expand a numbered ``page=N`` link into the next ``remaining`` page URLs."""
+
+        parts = urlsplit(next_url)
+        query = parse_qs(parts.query)
+        page_values = query.get("page") or []
+        if remaining <= 1 or len(page_values) != 1 or not page_values[0].isdigit():
+            return [next_url]
+        first = int(page_values[0])
+        urls: List[str] = []
+        for number in range(first, first + remaining):
+            query["page"] = [str(number)]
+            urls.append(urlunsplit(parts._replace(query=urlencode(query, doseq=True))))
+        return urls
+
+    def _effective_limit(self, limit: int) -> int:
+        return limit
+
+    def _params(self, query: str, limit: int) -> Dict[str, object]:
+        raise NotImplementedError
+
+    def _headers(self) -> Dict[str, str]:
+        raise NotImplementedError
+
+    def _point_from_result(
+        self, item: Dict[str, object], query: str, rank: int
+    ) -> qmodels.ScoredPoint | None:
+        raise NotImplementedError
+
+    @staticmethod
+    def _holding_from_text(text: str) -> str:
+        cleaned = " ".join(text.split())
+        if not cleaned:
+            return ""
+        sentence_end = cleaned.find(".")
+        return cleaned if sentence_end == -1 else cleaned[: sentence_end + 1]
+
+
+class CourtListenerCaseLawAdapter(_ExternalCaseLawAdapter):
+    """Lightweight CourtListener client that emits scored opinion payloads."""
+
+    _NAME = "CourtListener"
+
+    def __init__(
+        self,
+        endpoint: str,
+        token: str | None,
+        *,
+        timeout: float = 10.0,
+        client_factory: Callable[[], httpx.AsyncClient] | None = None,
+        pool: AsyncHttpPool | None = None,
+        cache_ttl_seconds: float = 0.0,
+        cache_max_entries: int = 0,
+    ) -> None:
+        super().__init__(
+            endpoint,
+            timeout=timeout,
+            client_factory=client_factory,
+            pool=pool,
+            cache_ttl_seconds=cache_ttl_seconds,
+            cache_max_entries=cache_max_entries,
+        )
+        self.token = token
+
+    def _params(self, query: str, limit: int) -> Dict[str, object]:
+        return {"q": query, "page_size": min(max(limit, 1), self._MAX_PAGE_SIZE)}
 
     def _headers(self) -> Dict[str, str]:
         headers = {"User-Agent": "CoCounsel-Retrieval/1.0", "Accept": "application/json"}
@@ -227,19 +404,11 @@ class CourtListenerCaseLawAdapter:
             text = ""
         return text[:2000]
 
-    @staticmethod
-    def _holding_from_text(text: str) -> str:
-        cleaned = " ".join(text.split())
-        if not cleaned:
-            return ""
-        sentence_end = cleaned.find(".")
-        return cleaned if sentence_end == -1 else cleaned[: sentence_end + 1]
-
 
-class CaseLawApiAdapter:
+class CaseLawApiAdapter(_ExternalCaseLawAdapter):
     """Adapter for the Harvard CaseLaw API (api.case.law)."""
 
-    _MAX_PAGE_SIZE = 100
+    _NAME = "CaseLaw API"
 
     def __init__(
         self,
@@ -247,52 +416,34 @@ class CaseLawApiAdapter:
         api_key: str | None,
         *,
         timeout: float = 10.0,
-        client_factory: Callable[[], httpx.Client] | None = None,
+        client_factory: Callable[[], httpx.AsyncClient] | None = None,
+        pool: AsyncHttpPool | None = None,
         max_results: int = 10,
+        cache_ttl_seconds: float = 0.0,
+        cache_max_entries: int = 0,
     ) -> None:
-        self.endpoint = endpoint.rstrip("/") + "/"
+        super().__init__(
+            endpoint,
+            timeout=timeout,
+            client_factory=client_factory,
+            pool=pool,
+            cache_ttl_seconds=cache_ttl_seconds,
+            cache_max_entries=cache_max_entries,
+        )
         self.api_key = api_key
-        self.timeout = timeout
         self.max_results = max_results
-        self._client_factory = client_factory or (lambda: httpx.Client(timeout=self.timeout))
 
-    def search(self, query: str, *, limit: int) -> List[qmodels.ScoredPoint]:
-        if not query.strip() or limit <= 0 or self.max_results == 0:
-            return []
-        limit = min(limit, self.max_results)
-        params = {"search": query, "page_size": min(limit, self._MAX_PAGE_SIZE)}
+    def _effective_limit(self, limit: int) -> int:
+        return min(limit, self.max_results)
+
+    def _params(self, query: str, limit: int) -> Dict[str, object]:
+        return {"search": query, "page_size": min(limit, self._MAX_PAGE_SIZE)}
+
+    def _headers(self) -> Dict[str, str]:
         headers = {"User-Agent": "CoCounsel-Retrieval/1.0", "Accept": "application/json"}
         if self.api_key:
             headers["Authorization"] = f"Token {self.api_key}"
-        points: List[qmodels.ScoredPoint] = []
-        next_url = self.endpoint
-        try:
-            with self._client_factory() as client:
-                while next_url and len(points) < limit:
-                    response = client.get(
-                        next_url,
-                        params=params if next_url == self.endpoint else None,
-                        headers=headers,
-                    )
-                    if response.status_code >= 400:
-                        _logger.warning(
-                            "CaseLaw API request failed",
-                            extra={"url": next_url, "status": response.status_code},
-                        )
-                        break
-                    payload = response.json()
-                    results = payload.get("results") or []
-                    for item in results:
-                        point = self._point_from_result(item, query, len(points))
-                        if point is None:
-                            continue
-                        points.append(point)
-                        if len(points) >= limit:
-                            break
-                    next_url = payload.get("next")
-        except httpx.HTTPError as exc:  # pragma: no cover - network failure path
-            _logger.warning("CaseLaw adapter error", exc_info=exc, extra={"query": query})
-        return points
+        return headers
 
     def _point_from_result(
         self, item: Dict[str, object], query: str, rank: int
@@ -340,14 +491,6 @@ class CaseLawApiAdapter:
             return body.strip()[:2000]
         return ""
 
-    @staticmethod
-    def _holding_from_text(text: str) -> str:
-        cleaned = " ".join(text.split())
-        if not cleaned:
-            return ""
-        sentence_end = cleaned.find(".")
-        return cleaned if sentence_end == -1 else cleaned[: sentence_end + 1]
-
 
 @dataclass
 class Citation:
@@ -422,9 +565,13 @@ class QueryMeta:
     llm_model: str
     embedding_provider: str
     embedding_model: str
+    next_cursor: str | None = None
+    timings: Dict[str, float] | None = None
+    timed_out_retrievers: List[str] = field(default_factory=list)
+    starved_retrievers: List[str] = field(default_factory=list)
 
     def to_dict(self) -> Dict[str, object]:
-        return {
+        payload: Dict[str, object] = {
             "page": self.page,
             "page_size": self.page_size,
             "total_items": self.total_items,
@@ -436,6 +583,16 @@ class QueryMeta:
             "embedding_provider": self.embedding_provider,
             "embedding_model": self.embedding_model,
         }
+        if self.next_cursor:
+            payload["next_cursor"] = self.next_cursor
+        if self.timings is not None:
+            payload["timings"] = self.timings
+        # Retriever legs dropped from fusion, so a partial answer is distinguishable from a full one.
+        if self.timed_out_retrievers:
+            payload["timed_out_retrievers"] = list(self.timed_out_retrievers)
+        if self.starved_retrievers:
+            payload["starved_retrievers"] = list(self.starved_retrievers)
+        return payload
 
 
 @dataclass
@@ -460,6 +617,50 @@ class QueryResult:
         return payload
 
 
+@dataclass
+class _LookupCache:
+    """Document-store, timeline and graph reads memoised for one query or one query batch."""
+
+    documents: Dict[str, Dict[str, object]] = field(default_factory=dict)
+    document_entities: Dict[str, List[GraphNode]] = field(default_factory=dict)
+    inventory: List[Dict[str, object]] | None = None
+    timeline_events: List[Any] | None = None
+
+
+@dataclass
+class _PendingCaseLaw:
+    """External case-law searches in flight for one query, each with its partial-result sink."""
+
+    question: str
+    deadline: float
+    searches: List[Tuple[str, "Future[List[qmodels.ScoredPoint]]", List[qmodels.ScoredPoint]]] = field(
+        default_factory=list
+    )
+
+
+@dataclass
+class _CandidateSet:
+    """Fused and filtered candidates for one question, shared by every page of its results."""
+
+    results: List[qmodels.ScoredPoint]
+    vector_seed: List[qmodels.ScoredPoint]
+    relation_statements: List[Tuple[str, str | None]]
+    external_points: List[qmodels.ScoredPoint]
+    reranker: str
+    timed_out_retrievers: List[str]
+    starved_retrievers: List[str]
+    search_window: int
+    fused_count: int
+
+    def covers(self, search_window: int) -> bool:
+        """True when a page needing ``search_window`` candidates can be served from this set."""
+
+        return self.search_window >= search_window or self.fused_count < self.search_window
+
+
+_LOOKUP_CACHE: ContextVar[_LookupCache | None] = ContextVar("retrieval_lookup_cache", default=None)
+
+
 class RetrievalService:
     def __init__(
         self,
@@ -495,22 +696,57 @@ class RetrievalService:
         configure_global_settings(self.runtime_config)
         self.embedding_model = create_embedding_model(self.runtime_config.embedding)
         self.timeline_store = TimelineStore(self.settings.timeline_path)
-        cross_encoder_model = getattr(self.settings, "retrieval_cross_encoder_model", None)
         self.query_engine = HybridQueryEngine(
-            VectorRetrieverAdapter(self.vector_service, self.embedding_model),
-            GraphRetrieverAdapter(self.graph_service),
-            KeywordRetrieverAdapter(self.document_store),
-            cross_encoder_model=cross_encoder_model,
+            VectorRetrieverAdapter(
+                self.vector_service,
+                self.embedding_model,
+                embedding_cache=get_query_embedding_cache(),
+                embedding_namespace=embedding_namespace(self.runtime_config.embedding),
+            ),
+            GraphRetrieverAdapter(
+                self.graph_service,
+                hops=self.settings.retrieval_graph_hops,
+                fanout=self.settings.retrieval_graph_hop_window,
+            ),
+            KeywordRetrieverAdapter(self.document_store, get_keyword_index()),
+            reranker=get_reranker(),
+            concurrent=self.settings.retrieval_concurrent_retrievers,
+            retriever_timeout=self.settings.retrieval_retriever_timeout_seconds,
         )
         self.courtlistener_adapter = CourtListenerCaseLawAdapter(
             self.settings.courtlistener_endpoint,
             self.settings.courtlistener_token,
+            cache_ttl_seconds=self.settings.case_law_cache_ttl_seconds,
+            cache_max_entries=self.settings.case_law_cache_max_entries,
         )
         self.caselaw_adapter = CaseLawApiAdapter(
             self.settings.caselaw_endpoint,
             self.settings.caselaw_api_key,
             max_results=self.settings.caselaw_max_results,
+            cache_ttl_seconds=self.settings.case_law_cache_ttl_seconds,
+            cache_max_entries=self.settings.case_law_cache_max_entries,
+        )
+        self.result_cache: QueryResultCache[QueryResult] = QueryResultCache(
+            self.settings.retrieval_cache_max_entries,
+            self.settings.retrieval_cache_ttl_seconds,
         )
+        self.candidate_cache: QueryResultCache[_CandidateSet] = QueryResultCache(
+            self.settings.retrieval_cache_max_entries,
+            self.settings.retrieval_cache_ttl_seconds,
+        )
+
+    def warm_up(self) -> None:
+        """Prime the embedding model and reranker so the first query does not pay their start-up cost."""
+
+        with _tracer.start_as_current_span("retrieval.warm_up"):
+            try:
+                compute_query_embedding(self.embedding_model, "warm-up")
+            except Exception as exc:  # pragma: no cover - provider/network failure path
+                _logger.warning("Retrieval warm-up failed", exc_info=exc)
+            try:
+                self.query_engine.warm_up()
+            except Exception as exc:  # pragma: no cover - model download/initialisation failure
+                _logger.warning("Reranker warm-up failed", exc_info=exc)
 
     def query(
         self,
@@ -521,9 +757,277 @@ class RetrievalService:
         filters: Dict[str, str] | None = None,
         rerank: bool = False,
         mode: RetrievalMode = RetrievalMode.PRECISION,
+        cursor: str | None = None,
+        debug: bool = False,
     ) -> QueryResult:
+        """Answer ``question`` with one page of evidence.
+
+        ``cursor`` is the ``next_cursor`` of a previous page of the same question; it
+        selects the following page and serves it from that page's fused candidates.
+        ``debug`` bypasses the result and candidate caches and reports per-stage
+        milliseconds in ``meta.timings``.
+        """
+
         if not isinstance(mode, RetrievalMode):
             mode = RetrievalMode(mode)
+        page, reuse_candidates = self._resolve_cursor(
+            question, cursor, page=page, filters=filters, rerank=rerank, mode=mode
+        )
+        cache_key = self._result_cache_key(
+            question, page=page, page_size=page_size, filters=filters, rerank=rerank, mode=mode
+        )
+        cache_attrs = {"mode": mode.value, "rerank": rerank}
+        cached = None if debug else self.result_cache.get(cache_key)
+        if cached is not None:
+            _retrieval_cache_hits_counter.add(1, attributes=cache_attrs)
+            return cached
+        _retrieval_cache_misses_counter.add(1, attributes=cache_attrs)
+        with self._lookup_scope():
+            result = self._execute_query(
+                question,
+                page=page,
+                page_size=page_size,
+                filters=filters,
+                rerank=rerank,
+                mode=mode,
+                reuse_candidates=reuse_candidates,
+                debug=debug,
+            )
+        # Results that need privilege review are recomputed so every request is audited.
+        if not debug and not (result.policy or {}).get("requires_review"):
+            self.result_cache.put(cache_key, result)
+        return result
+
+    def query_many(
+        self,
+        questions: Sequence[str],
+        *,
+        page: int = 1,
+        page_size: int = 10,
+        filters: Dict[str, str] | None = None,
+        rerank: bool = False,
+        mode: RetrievalMode = RetrievalMode.PRECISION,
+    ) -> List[QueryResult]:
+        """Answer several questions with shared paging/filter options, one result per question.
+
+        Cache misses are embedded in one call and searched with one batched vector
+        request; document and graph lookups are shared across the whole batch.
+        """
+
+        if not isinstance(mode, RetrievalMode):
+            mode = RetrievalMode(mode)
+        cache_attrs = {"mode": mode.value, "rerank": rerank}
+        results: List[QueryResult | None] = []
+        pending: Dict[Tuple[object, ...], List[int]] = {}
+        pending_questions: List[str] = []
+        for position, question in enumerate(questions):
+            cache_key = self._result_cache_key(
+                question, page=page, page_size=page_size, filters=filters, rerank=rerank, mode=mode
+            )
+            cached = self.result_cache.get(cache_key)
+            if cached is not None:
+                _retrieval_cache_hits_counter.add(1, attributes=cache_attrs)
+                results.append(cached)
+                continue
+            _retrieval_cache_misses_counter.add(1, attributes=cache_attrs)
+            results.append(None)
+            if cache_key not in pending:
+                pending[cache_key] = []
+                pending_questions.append(question)
+            pending[cache_key].append(position)
+        if not pending:
+            return [result for result in results if result is not None]
+
+        with _tracer.start_as_current_span("retrieval.query_batch") as span:
+            span.set_attribute("retrieval.batch.size", len(questions))
+            span.set_attribute("retrieval.batch.pending", len(pending_questions))
+            _, vector_window, _, _ = self._search_windows(page, page_size, mode)
+            vector_batches = self.query_engine.retrieve_vectors_many(
+                pending_questions,
+                vector_window=vector_window,
+                vector_filters=self._normalise_filters(filters or {}) or None,
+            )
+            with self._lookup_scope():
+                for (cache_key, positions), question, vector_points in zip(
+                    pending.items(), pending_questions, vector_batches
+                ):
+                    result = self._execute_query(
+                        question,
+                        page=page,
+                        page_size=page_size,
+                        filters=filters,
+                        rerank=rerank,
+                        mode=mode,
+                        vector_points=vector_points,
+                    )
+                    if not (result.policy or {}).get("requires_review"):
+                        self.result_cache.put(cache_key, result)
+                    for position in positions:
+                        results[position] = result
+        return [result for result in results if result is not None]
+
+    @classmethod
+    def _result_cache_key(
+        cls,
+        question: str,
+        *,
+        page: int,
+        page_size: int,
+        filters: Dict[str, str] | None,
+        rerank: bool,
+        mode: RetrievalMode,
+    ) -> Tuple[object, ...]:
+        return cls._candidate_cache_key(question, filters=filters, rerank=rerank, mode=mode) + (page, page_size)
+
+    @staticmethod
+    def _candidate_cache_key(
+        question: str,
+        *,
+        filters: Dict[str, str] | None,
+        rerank: bool,
+        mode: RetrievalMode,
+    ) -> Tuple[object, ...]:
+        """Key of the fused candidate list, shared by every page of the same question."""
+
+        normalised_question = " ".join(question.split()).casefold()
+        normalised_filters = tuple(
+            sorted(
+                (str(key), str(value).strip().casefold())
+                for key, value in (filters or {}).items()
+                if value
+            )
+        )
+        return (
+            get_corpus_version(),
+            normalised_question,
+            normalised_filters,
+            mode.value,
+            bool(rerank),
+        )
+
+    def _resolve_cursor(
+        self,
+        question: str,
+        cursor: str | None,
+        *,
+        page: int,
+        filters: Dict[str, str] | None,
+        rerank: bool,
+        mode: RetrievalMode,
+    ) -> Tuple[int, bool]:
+        """Return the page to serve and whether the cached candidate list must be reused."""
+
+        if not cursor:
+            return page, False
+        digest, cursor_page = self._decode_cursor(cursor)
+        candidate_key = self._candidate_cache_key(question, filters=filters, rerank=rerank, mode=mode)
+        # A cursor minted before the corpus changed no longer matches and re-runs retrieval.
+        return cursor_page, digest == self._cursor_digest(candidate_key)
+
+    @staticmethod
+    def _cursor_digest(candidate_key: Tuple[object, ...]) -> str:
+        return sha256(repr(candidate_key).encode("utf-8")).hexdigest()[:16]
+
+    @classmethod
+    def _encode_cursor(cls, candidate_key: Tuple[object, ...], page: int) -> str:
+        payload = f"{cls._cursor_digest(candidate_key)}|{page}"
+        return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple[str, int]:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        try:
+            raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+            digest, page_raw = raw.split("|", 1)
+            page = int(page_raw)
+        except (ValueError, binascii.Error) as exc:
+            raise ValueError("Invalid pagination cursor") from exc
+        if page < 1:
+            raise ValueError("Invalid pagination cursor")
+        return digest, page
+
+    @staticmethod
+    def _normalise_filters(filters: Dict[str, str]) -> Dict[str, str]:
+        """Trim request filters, lower-casing the enumerated ones, and drop empty values."""
+
+        normalised: Dict[str, str] = {}
+        for key in ("case_id", "source", "doc_type", "entity"):
+            value = (filters.get(key) or "").strip()
+            if value:
+                normalised[key] = value.lower() if key in {"source", "doc_type"} else value
+        return normalised
+
+    def _search_windows(self, page: int, page_size: int, mode: RetrievalMode) -> Tuple[int, int, int, int]:
+        """Return the (fused, vector, graph, keyword) candidate windows for a page request."""
+
+        base_window = max(page * page_size * 2, page_size * 4)
+        if mode is RetrievalMode.RECALL:
+            base_window = max(page * page_size * 3, page_size * 6)
+        search_window = min(self.settings.retrieval_max_search_window, base_window)
+
+        vector_window = min(search_window, max(page_size * 3, page_size))
+        graph_window = min(self.settings.retrieval_graph_hop_window, 6)
+        keyword_window = 5
+        if mode is RetrievalMode.RECALL:
+            vector_window = min(search_window, max(page_size * 4, page_size * 2))
+            graph_window = min(self.settings.retrieval_graph_hop_window * 2, 12)
+            keyword_window = 10
+        return search_window, vector_window, graph_window, keyword_window
+
+    @contextmanager
+    def _lookup_scope(self) -> Iterator[_LookupCache]:
+        """Share document-store and graph lookups until the outermost scope exits."""
+
+        current = _LOOKUP_CACHE.get()
+        if current is not None:
+            yield current
+            return
+        lookups = _LookupCache()
+        token = _LOOKUP_CACHE.set(lookups)
+        try:
+            yield lookups
+        finally:
+            _LOOKUP_CACHE.reset(token)
+
+    @staticmethod
+    def _lookups() -> _LookupCache:
+        return _LOOKUP_CACHE.get() or _LookupCache()
+
+    @staticmethod
+    def _stage_timings_snapshot(timings: Dict[str, float] | None, total_ms: float) -> Dict[str, float] | None:
+        if timings is None:
+            return None
+        snapshot = {stage: round(elapsed, 3) for stage, elapsed in sorted(timings.items())}
+        snapshot["total"] = round(total_ms, 3)
+        return snapshot
+
+    def _execute_query(self, question: str, **options: Any) -> QueryResult:
+        for kind, payload in self._query_events(question, **options):
+            if kind == "result":
+                return payload
+        raise RuntimeError("retrieval pipeline finished without a result")  # pragma: no cover
+
+    def _query_events(
+        self,
+        question: str,
+        *,
+        page: int,
+        page_size: int,
+        filters: Dict[str, str] | None,
+        rerank: bool,
+        mode: RetrievalMode,
+        vector_points: List[qmodels.ScoredPoint] | None = None,
+        reuse_candidates: bool = False,
+        debug: bool = False,
+    ) -> Iterator[Tuple[str, Any]]:
+        """Run one page of a query, yielding ``(kind, payload)`` stages as they complete.
+
+        ``head`` carries meta, citations and the policy verdict once fusion and the
+        privilege gate are done, ``answer`` carries answer text deltas, and the last
+        stage is always ``result`` with the finished :class:`QueryResult`. With
+        ``debug`` the result's meta also carries the per-stage timings.
+        """
+
         if page < 1:
             raise ValueError("page must be greater than or equal to 1")
         if page_size < 1 or page_size > 50:
@@ -540,31 +1044,35 @@ class RetrievalService:
             "websearch",
         }
 
-        with _tracer.start_as_current_span("retrieval.query") as span:
+        with _tracer.start_as_current_span("retrieval.query") as span, (
+            collect_stage_timings() if debug else nullcontext()
+        ) as timings:
             span.set_attribute("retrieval.page", page)
             span.set_attribute("retrieval.page_size", page_size)
             span.set_attribute("retrieval.rerank", rerank)
             span.set_attribute("retrieval.mode", mode.value)
 
-            source_filter = filters.get("source")
-            entity_filter = filters.get("entity")
-            if source_filter:
-                source_filter = source_filter.strip().lower()
-                if source_filter not in allowed_sources:
-                    message = f"Unsupported source filter '{source_filter}'"
-                    span.record_exception(ValueError(message))
-                    span.set_status(Status(StatusCode.ERROR, message))
-                    raise ValueError(message)
-            else:
-                source_filter = None
-            if entity_filter:
-                entity_filter = entity_filter.strip()
-            else:
-                entity_filter = None
+            vector_filters = self._normalise_filters(filters)
+            source_filter = vector_filters.get("source")
+            entity_filter = vector_filters.get("entity")
+            case_filter = vector_filters.get("case_id")
+            doc_type_filter = vector_filters.get("doc_type")
+            if source_filter and source_filter not in allowed_sources:
+                message = f"Unsupported source filter '{source_filter}'"
+                span.record_exception(ValueError(message))
+                span.set_status(Status(StatusCode.ERROR, message))
+                raise ValueError(message)
+            field_filters = {
+                key: vector_filters[key] for key in ("case_id", "doc_type") if key in vector_filters
+            }
+            keyword_filter = (filters.get("keyword") or "").strip() or None
 
             span.set_attribute("retrieval.filters.source", source_filter or "")
             span.set_attribute("retrieval.filters.entity", entity_filter or "")
-            span.set_attribute("retrieval.filters.applied", bool(source_filter or entity_filter))
+            span.set_attribute("retrieval.filters.case_id", case_filter or "")
+            span.set_attribute("retrieval.filters.doc_type", doc_type_filter or "")
+            span.set_attribute("retrieval.filters.keyword", keyword_filter or "")
+            span.set_attribute("retrieval.filters.applied", bool(vector_filters or keyword_filter))
 
             max_window = self.settings.retrieval_max_search_window
             span.set_attribute("retrieval.search_window.max", max_window)
@@ -574,53 +1082,35 @@ class RetrievalService:
                 span.set_status(Status(StatusCode.ERROR, message))
                 raise ValueError(message)
 
-            base_window = max(page * page_size * 2, page_size * 4)
-            if mode is RetrievalMode.RECALL:
-                base_window = max(page * page_size * 3, page_size * 6)
-            search_window = min(max_window, base_window)
+            search_window, vector_window, graph_window, keyword_window = self._search_windows(
+                page, page_size, mode
+            )
             span.set_attribute("retrieval.search_window", search_window)
 
-            vector_window = min(search_window, max(page_size * 3, page_size))
-            graph_window = min(self.settings.retrieval_graph_hop_window, 6)
-            keyword_window = 5
-            if mode is RetrievalMode.RECALL:
-                vector_window = min(search_window, max(page_size * 4, page_size * 2))
-                graph_window = min(self.settings.retrieval_graph_hop_window * 2, 12)
-                keyword_window = 10
-
-            external_points: List[qmodels.ScoredPoint] = []
-            with _tracer.start_as_current_span("retrieval.hybrid") as hybrid_span:
-                bundle: HybridRetrievalBundle = self.query_engine.retrieve(
+            candidate_key = self._candidate_cache_key(question, filters=filters, rerank=rerank, mode=mode)
+            candidates = None if debug else self.candidate_cache.get(candidate_key)
+            cached_candidates = candidates is not None and (reuse_candidates or candidates.covers(search_window))
+            _retrieval_candidate_cache_counter.add(
+                1, attributes={"outcome": "hit" if cached_candidates else "miss"}
+            )
+            span.set_attribute("retrieval.candidates.cached", cached_candidates)
+            if candidates is None or not cached_candidates:
+                candidates = self._retrieve_candidates(
                     question,
-                    top_k=search_window,
+                    search_window=search_window,
                     vector_window=vector_window,
                     graph_window=graph_window,
                     keyword_window=keyword_window,
                     use_cross_encoder=bool(rerank and mode is RetrievalMode.PRECISION),
+                    vector_filters=vector_filters,
+                    vector_points=vector_points,
+                    field_filters=field_filters,
+                    keyword_query=keyword_filter,
                 )
-                hybrid_span.set_attribute("retrieval.vector_candidates", len(bundle.vector_points))
-                hybrid_span.set_attribute("retrieval.graph_candidates", len(bundle.graph_points))
-                hybrid_span.set_attribute("retrieval.keyword_candidates", len(bundle.keyword_points))
-                hybrid_span.set_attribute("retrieval.fused_candidates", len(bundle.fused_points))
-                hybrid_span.set_attribute("retrieval.reranker", bundle.reranker)
-
-            with _tracer.start_as_current_span("retrieval.external_case_law") as external_span:
-                external_points = self._retrieve_external_case_law(
-                    question,
-                    top_k=search_window,
-                    source_filter=source_filter,
-                )
-                external_span.set_attribute("retrieval.external.count", len(external_points))
-                if external_points:
-                    bundle = self._join_external_results(bundle, external_points, search_window)
-                    external_points = bundle.external_points
-            external_points = getattr(bundle, "external_points", external_points)
+                self.candidate_cache.put(candidate_key, candidates)
 
-            with _tracer.start_as_current_span("retrieval.vector_search") as vector_span:
-                vector_span.set_attribute("retrieval.vector.count", len(bundle.vector_points))
-                vector_span.set_attribute("retrieval.vector.window", vector_window)
-
-            filtered_results = self._apply_filters(bundle.fused_points, source_filter, entity_filter)
+            filtered_results = candidates.results
+            external_points = candidates.external_points
             span.set_attribute("retrieval.filtered_results", len(filtered_results))
 
             metric_attrs: Dict[str, object] = {
@@ -628,9 +1118,11 @@ class RetrievalService:
                 "filter_source": source_filter or "any",
                 "filter_entity": bool(entity_filter),
                 "mode": mode.value,
-                "reranker": bundle.reranker,
+                "reranker": candidates.reranker,
             }
             metric_attrs["external_results"] = len(external_points)
+            metric_attrs["timed_out_retrievers"] = len(candidates.timed_out_retrievers)
+            metric_attrs["starved_retrievers"] = len(candidates.starved_retrievers)
 
             total_items = len(filtered_results)
             if total_items == 0:
@@ -651,77 +1143,127 @@ class RetrievalService:
                     total_items=0,
                     has_next=False,
                     mode=mode,
-                    reranker=bundle.reranker,
+                    reranker=candidates.reranker,
                     llm_provider=self.llm_provider_id,
                     llm_model=self.llm_model_id,
                     embedding_provider=self.embedding_provider_id,
                     embedding_model=self.embedding_model_id,
+                    timings=self._stage_timings_snapshot(timings, duration_ms),
+                    timed_out_retrievers=list(candidates.timed_out_retrievers),
+                    starved_retrievers=list(candidates.starved_retrievers),
                 )
                 answer = "No supporting evidence found for the supplied query."
-                return QueryResult(
+                yield "result", QueryResult(
                     answer=answer,
                     citations=[],
                     trace=empty_trace,
                     meta=meta,
                     has_evidence=False,
                 )
+                return
 
             start = (page - 1) * page_size
             end = min(start + page_size, total_items)
             has_next = end < total_items
 
-            vector_seed = self._apply_filters(bundle.vector_points, source_filter, entity_filter)
-            vector_entities = self._collect_entities(vector_seed[:graph_window])
-            entity_ids = self._augment_entity_ids(question, vector_entities)
-            with _tracer.start_as_current_span("retrieval.trace_build") as trace_span:
-                trace_span.set_attribute("retrieval.trace.entity_ids", len(entity_ids))
-                trace_full, trace_relations, doc_scope, privilege_decisions = self._build_trace(
-                    filtered_results, entity_ids
-                )
-                trace_span.set_attribute("retrieval.trace.nodes", len(trace_full.graph.get("nodes", [])))
-                trace_span.set_attribute("retrieval.trace.edges", len(trace_full.graph.get("edges", [])))
-            relation_statements = self._merge_relation_statements(trace_relations, bundle.relation_statements)
-            citations_full = self._build_citations(filtered_results)
-
+            # Only the requested page is enriched; the window-wide doc scope comes from payload fields
+            # and the window-wide privilege screen from decisions stored at ingestion.
             page_results = filtered_results[start:end]
-            citations_page = citations_full[start:end] if end > start else []
-            doc_ids_page: Set[str] = set()
-            for point in page_results:
-                payload = point.payload or {}
-                doc_id = payload.get("doc_id")
-                if doc_id is not None:
-                    doc_ids_page.add(str(doc_id))
+            doc_ids_page = self._result_doc_ids(page_results)
+            window_doc_ids = self._result_doc_ids(filtered_results)
+            meta = QueryMeta(
+                page=page,
+                page_size=page_size,
+                total_items=total_items,
+                has_next=has_next,
+                mode=mode,
+                reranker=candidates.reranker,
+                llm_provider=self.llm_provider_id,
+                llm_model=self.llm_model_id,
+                embedding_provider=self.embedding_provider_id,
+                embedding_model=self.embedding_model_id,
+                next_cursor=self._encode_cursor(candidate_key, page + 1) if has_next else None,
+                timed_out_retrievers=list(candidates.timed_out_retrievers),
+                starved_retrievers=list(candidates.starved_retrievers),
+            )
 
+            vector_entities = self._collect_entities(candidates.vector_seed[:graph_window])
+            entity_ids = self._augment_entity_ids(question, vector_entities)
+            with timed_stage("trace_build") as trace_span:
+                trace_span.set_attribute("retrieval.trace.entity_ids", len(entity_ids))
+                trace_span.set_attribute("retrieval.trace.results", len(page_results))
+                graph_trace, trace_relations, graph_doc_ids = self._graph_trace(entity_ids)
+                trace_span.set_attribute("retrieval.trace.nodes", len(graph_trace.get("nodes", [])))
+                trace_span.set_attribute("retrieval.trace.edges", len(graph_trace.get("edges", [])))
+            doc_scope = window_doc_ids | graph_doc_ids
+
+            # The policy gate covers the whole window and graph-linked documents before anything
+            # from the page leaves the service. Only the page gets the full classifier pass.
             span_context = span.get_span_context()
             correlation_id = None
             if span_context is not None and span_context.trace_id != 0:
                 correlation_id = f"{span_context.trace_id:032x}"
-            policy_decision = self.privilege_policy_engine.enforce(
-                privilege_decisions.values(),
-                query=question,
-                context={
-                    "page": page,
-                    "page_size": page_size,
-                    "doc_scope": sorted(doc_scope),
-                    "filters": {key: value for key, value in filters.items() if value},
-                },
-                correlation_id=correlation_id,
-            )
+            with timed_stage("privilege"):
+                privilege_page, page_decisions = self._build_privilege_trace(page_results)
+                privilege_decisions = self._screen_privilege(filtered_results, graph_doc_ids, page_decisions)
+                policy_decision = self.privilege_policy_engine.enforce(
+                    privilege_decisions.values(),
+                    query=question,
+                    context={
+                        "page": page,
+                        "page_size": page_size,
+                        "doc_scope": sorted(doc_scope),
+                        "filters": {key: value for key, value in filters.items() if value},
+                    },
+                    correlation_id=correlation_id,
+                )
             policy_payload = policy_decision.to_dict()
             span.set_attribute("retrieval.policy.status", policy_decision.status)
             span.set_attribute("retrieval.policy.flagged", len(policy_decision.flagged_documents))
             span.set_attribute("retrieval.policy.blocked", policy_decision.blocked)
             metric_attrs["policy_status"] = policy_decision.status
             metric_attrs["policy_flagged"] = len(policy_decision.flagged_documents)
+            privilege_label = privilege_page.get("aggregate", {}).get("label", "unknown")
+            privilege_flagged = privilege_page.get("aggregate", {}).get("flagged", [])
+            span.set_attribute("retrieval.privilege.label", privilege_label)
+            span.set_attribute("retrieval.privilege.flagged", len(privilege_flagged))
+            metric_attrs["privilege_label"] = privilege_label
+            metric_attrs["privilege_flagged"] = bool(privilege_flagged)
+
+            citations_page = self._build_citations(page_results)
+            yield "head", {
+                "meta": meta,
+                "citations": citations_page,
+                "policy": policy_payload,
+                "has_evidence": True,
+            }
 
-            vector_trace_page = trace_full.vector[start:end] if end > start else []
-            forensics_trace_page = [
-                entry for entry in trace_full.forensics if entry.get("document_id") in doc_ids_page
+            relation_statements = self._merge_relation_statements(trace_relations, candidates.relation_statements)
+            relation_statements_page = [
+                statement
+                for statement, doc_id in relation_statements
+                if doc_id is None or doc_id in doc_ids_page
             ]
+
+            answer_parts: List[str] = []
+            # When streamed, this stage also spans the time the client takes to read each delta.
+            with timed_stage("answer"):
+                for delta in self._compose_answer_stream(question, page_results, relation_statements_page):
+                    answer_parts.append(delta)
+                    yield "answer", delta
+            if start >= total_items:
+                suffix = (
+                    f" No additional supporting evidence available for page {page}; "
+                    "adjust pagination or filters to view existing evidence."
+                )
+                answer_parts.append(suffix)
+                yield "answer", suffix
+            answer = "".join(answer_parts)
+
             if doc_ids_page:
                 graph_edges_page = [
                     edge
-                    for edge in trace_full.graph.get("edges", [])
+                    for edge in graph_trace.get("edges", [])
                     if (
                         edge.get("properties", {}).get("doc_id") in doc_ids_page
                         or edge.get("source") in doc_ids_page
@@ -735,35 +1277,17 @@ class RetrievalService:
                 }
                 graph_nodes_page = [
                     node
-                    for node in trace_full.graph.get("nodes", [])
+                    for node in graph_trace.get("nodes", [])
                     if node.get("id") in graph_node_ids
                 ]
             else:
                 graph_edges_page = []
                 graph_nodes_page = []
 
-            relation_statements_page = [
-                statement
-                for statement, doc_id in relation_statements
-                if doc_id is None or doc_id in doc_ids_page
-            ]
-
-            privilege_full = trace_full.privilege or {
-                "decisions": [],
-                "aggregate": {"label": "unknown", "score": 0.0, "flagged": []},
-            }
-            privilege_page = self._page_privilege_trace(privilege_full, doc_ids_page)
-
-            trace_full.graph["events"] = self._timeline_events_for_docs(
-                doc_scope,
-                privilege_decisions,
-                policy_decision,
-            )
-
             trace_page = Trace(
-                vector=vector_trace_page,
+                vector=[self._vector_trace_entry(point) for point in page_results],
                 graph={"nodes": graph_nodes_page, "edges": graph_edges_page},
-                forensics=forensics_trace_page,
+                forensics=self._build_forensics_trace(page_results),
                 privilege=privilege_page,
                 policy=policy_payload,
             )
@@ -772,20 +1296,6 @@ class RetrievalService:
                 privilege_decisions,
                 policy_decision,
             )
-            trace_full.policy = policy_payload
-            privilege_label = privilege_page.get("aggregate", {}).get("label", "unknown")
-            privilege_flagged = privilege_page.get("aggregate", {}).get("flagged", [])
-            span.set_attribute("retrieval.privilege.label", privilege_label)
-            span.set_attribute("retrieval.privilege.flagged", len(privilege_flagged))
-            metric_attrs["privilege_label"] = privilege_label
-            metric_attrs["privilege_flagged"] = bool(privilege_flagged)
-
-            answer = self._compose_answer(question, page_results, relation_statements_page)
-            if start >= total_items:
-                answer = (
-                    f"{answer} No additional supporting evidence available for page {page}; "
-                    "adjust pagination or filters to view existing evidence."
-                )
 
             authoritative_holdings = self._authoritative_holdings(external_points)
             contradictions = self._detect_contradictions(answer, authoritative_holdings)
@@ -800,19 +1310,6 @@ class RetrievalService:
                 metric_attrs["contradictions"] = len(contradictions)
                 self._log_contradictions(question, answer, contradictions)
 
-            meta = QueryMeta(
-                page=page,
-                page_size=page_size,
-                total_items=total_items,
-                has_next=has_next,
-                mode=mode,
-                reranker=bundle.reranker,
-                llm_provider=self.llm_provider_id,
-                llm_model=self.llm_model_id,
-                embedding_provider=self.embedding_provider_id,
-                embedding_model=self.embedding_model_id,
-            )
-
             has_evidence = True
             metric_attrs["has_evidence"] = has_evidence
             duration_ms = (perf_counter() - start_time) * 1000.0
@@ -823,8 +1320,10 @@ class RetrievalService:
             _mode_queries_counter.add(1, attributes=metric_attrs)
             _retrieval_query_duration.record(duration_ms, attributes=metric_attrs)
             _retrieval_results_histogram.record(total_items, attributes=metric_attrs)
+            if timings is not None:
+                meta = replace(meta, timings=self._stage_timings_snapshot(timings, duration_ms))
 
-            return QueryResult(
+            yield "result", QueryResult(
                 answer=answer,
                 citations=citations_page,
                 trace=trace_page,
@@ -833,9 +1332,95 @@ class RetrievalService:
                 policy=policy_payload,
             )
 
+    def _retrieve_candidates(
+        self,
+        question: str,
+        *,
+        search_window: int,
+        vector_window: int,
+        graph_window: int,
+        keyword_window: int,
+        use_cross_encoder: bool,
+        vector_filters: Dict[str, str],
+        vector_points: List[qmodels.ScoredPoint] | None,
+        field_filters: Dict[str, str],
+        keyword_query: str | None = None,
+    ) -> _CandidateSet:
+        source_filter = vector_filters.get("source")
+        entity_filter = vector_filters.get("entity")
+        external_points: List[qmodels.ScoredPoint] = []
+        # External searches run on the shared HTTP loop while the internal retrievers work.
+        pending_case_law = self._start_external_case_law(
+            question,
+            top_k=search_window,
+            source_filter=source_filter,
+        )
+        with _tracer.start_as_current_span("retrieval.hybrid") as hybrid_span:
+            bundle: HybridRetrievalBundle = self.query_engine.retrieve(
+                question,
+                top_k=search_window,
+                vector_window=vector_window,
+                graph_window=graph_window,
+                keyword_window=keyword_window,
+                use_cross_encoder=use_cross_encoder,
+                vector_filters=vector_filters,
+                vector_points=vector_points,
+                keyword_query=keyword_query,
+            )
+            hybrid_span.set_attribute("retrieval.vector_candidates", len(bundle.vector_points))
+            hybrid_span.set_attribute("retrieval.vector.window", vector_window)
+            hybrid_span.set_attribute("retrieval.graph_candidates", len(bundle.graph_points))
+            hybrid_span.set_attribute("retrieval.keyword_candidates", len(bundle.keyword_points))
+            hybrid_span.set_attribute("retrieval.fused_candidates", len(bundle.fused_points))
+            hybrid_span.set_attribute("retrieval.reranker", bundle.reranker)
+            hybrid_span.set_attribute("retrieval.timed_out_retrievers", list(bundle.timed_out_retrievers))
+            hybrid_span.set_attribute("retrieval.starved_retrievers", list(bundle.starved_retrievers))
+
+        with timed_stage("external_case_law") as external_span:
+            external_points = self._collect_external_case_law(pending_case_law, top_k=search_window)
+            external_span.set_attribute("retrieval.external.count", len(external_points))
+            if external_points:
+                bundle = self._join_external_results(bundle, external_points, search_window)
+                external_points = bundle.external_points
+        external_points = getattr(bundle, "external_points", external_points)
+        # The keyword filter keeps only documents whose indexed text satisfies the expression.
+        document_ids = self.query_engine.keyword.matching_documents(keyword_query) if keyword_query else None
+
+        return _CandidateSet(
+            results=self._apply_filters(
+                bundle.fused_points,
+                source_filter,
+                entity_filter,
+                field_filters=field_filters,
+                document_ids=document_ids,
+            ),
+            vector_seed=self._apply_filters(
+                bundle.vector_points,
+                source_filter,
+                entity_filter,
+                field_filters=field_filters,
+                document_ids=document_ids,
+            ),
+            relation_statements=list(bundle.relation_statements),
+            external_points=list(external_points),
+            reranker=bundle.reranker,
+            timed_out_retrievers=list(bundle.timed_out_retrievers),
+            starved_retrievers=list(bundle.starved_retrievers),
+            search_window=search_window,
+            fused_count=len(bundle.fused_points),
+        )
+
+    @staticmethod
+    def _result_doc_ids(results: Iterable[qmodels.ScoredPoint]) -> Set[str]:
+        return {
+            str(point.payload.get("doc_id"))
+            for point in results
+            if point.payload and point.payload.get("doc_id") is not None
+        }
+
     def _build_citations(self, results: List[qmodels.ScoredPoint]) -> List[Citation]:
         citations: List[Citation] = []
-        doc_cache: Dict[str, Dict[str, object]] = {}
+        doc_cache = self._lookups().documents
         for point in results:
             payload = point.payload or {}
             raw_doc_id = payload.get("doc_id")
@@ -876,25 +1461,33 @@ class RetrievalService:
     def _compose_answer(
         self, question: str, results: List[qmodels.ScoredPoint], relation_statements: List[str]
     ) -> str:
+        return "".join(self._compose_answer_stream(question, results, relation_statements))
+
+    def _compose_answer_stream(
+        self, question: str, results: List[qmodels.ScoredPoint], relation_statements: List[str]
+    ) -> Iterator[str]:
+        """Yield the answer in the order it is assembled so streams can forward each part."""
+
         if not results:
             if relation_statements:
-                return self._format_graph_answer(relation_statements)
-            return "No supporting evidence found for the supplied query."
+                yield self._format_graph_answer(relation_statements)
+                return
+            yield "No supporting evidence found for the supplied query."
+            return
         top = results[0]
         payload = top.payload or {}
         text = payload.get("text", "")
         if not text and relation_statements:
-            return self._format_graph_answer(relation_statements)
+            yield self._format_graph_answer(relation_statements)
+            return
         if not text:
-            return "Unable to locate textual evidence despite stored vector payloads."
-        snippet = text[:400]
+            yield "Unable to locate textual evidence despite stored vector payloads."
+            return
+        yield "Based on retrieved context, the most relevant information is: "
+        yield text[:400]
         if relation_statements:
             graph_summary = "; ".join(relation_statements[:3])
-            return (
-                f"Based on retrieved context, the most relevant information is: {snippet}. "
-                f"Graph analysis highlights: {graph_summary}."
-            )
-        return f"Based on retrieved context, the most relevant information is: {snippet}"
+            yield f". Graph analysis highlights: {graph_summary}."
 
     def _format_graph_answer(self, relation_statements: List[str]) -> str:
         summary = "; ".join(relation_statements[:3])
@@ -907,18 +1500,31 @@ class RetrievalService:
         top_k: int,
         source_filter: str | None,
     ) -> List[qmodels.ScoredPoint]:
-        adapters: List[tuple[str, object]] = []
+        pending = self._start_external_case_law(question, top_k=top_k, source_filter=source_filter)
+        return self._collect_external_case_law(pending, top_k=top_k)
+
+    def _start_external_case_law(
+        self,
+        question: str,
+        *,
+        top_k: int,
+        source_filter: str | None,
+    ) -> _PendingCaseLaw | None:
+        adapters: List[tuple[str, _ExternalCaseLawAdapter]] = []
         if source_filter in (None, "courtlistener"):
             adapters.append(("courtlistener", self.courtlistener_adapter))
         if source_filter in (None, "caselaw"):
             adapters.append(("caselaw", self.caselaw_adapter))
         if not adapters:
-            return []
-        inventory = self.document_store.list_documents()
-        aggregated: List[qmodels.ScoredPoint] = []
+            return None
+        pending = _PendingCaseLaw(
+            question=question,
+            deadline=monotonic() + self.settings.case_law_deadline_seconds,
+        )
         for label, adapter in adapters:
+            sink: List[qmodels.ScoredPoint] = []
             try:
-                points = adapter.search(question, limit=top_k)
+                future = adapter.submit(question, limit=top_k, sink=sink)
             except Exception as exc:  # pragma: no cover - defensive path
                 _logger.warning(
                     "External case law adapter failed",
@@ -926,6 +1532,46 @@ class RetrievalService:
                     extra={"adapter": label, "question": question},
                 )
                 continue
+            pending.searches.append((label, future, sink))
+        return pending
+
+    def _collect_external_case_law(
+        self,
+        pending: _PendingCaseLaw | None,
+        *,
+        top_k: int,
+    ) -> List[qmodels.ScoredPoint]:
+        if pending is None or not pending.searches:
+            return []
+        wait_futures(
+            [future for _, future, _ in pending.searches],
+            timeout=max(0.0, pending.deadline - monotonic()),
+        )
+        lookups = self._lookups()
+        if lookups.inventory is None:
+            lookups.inventory = self.document_store.list_documents()
+        inventory = lookups.inventory
+        aggregated: List[qmodels.ScoredPoint] = []
+        for label, future, sink in pending.searches:
+            if not future.done():
+                # Keep whatever pages arrived before the deadline instead of blocking the query.
+                future.cancel()
+                points = list(sink)
+                _external_case_law_timeout_counter.add(1, attributes={"adapter": label})
+                _logger.warning(
+                    "External case law adapter missed deadline",
+                    extra={"adapter": label, "question": pending.question, "partial_results": len(points)},
+                )
+            else:
+                try:
+                    points = future.result()
+                except Exception as exc:  # pragma: no cover - defensive path
+                    _logger.warning(
+                        "External case law adapter failed",
+                        exc_info=exc,
+                        extra={"adapter": label, "question": pending.question},
+                    )
+                    continue
             reconciled = self._reconcile_external_evidence(points, inventory)
             aggregated.extend(reconciled)
         aggregated.sort(key=lambda point: float(point.score or 0.0), reverse=True)
@@ -1130,10 +1776,7 @@ class RetrievalService:
 
     @staticmethod
     def _point_key(point: qmodels.ScoredPoint) -> str:
-        payload = point.payload or {}
-        doc_id = payload.get("doc_id") or payload.get("id")
-        chunk_index = payload.get("chunk_index")
-        return f"{doc_id or point.id}::{chunk_index if chunk_index is not None else 'na'}::{point.id}"
+        return chunk_key(point)
 
     def _augment_privilege_metadata(
         self, payload: Dict[str, object], doc_id: str
@@ -1144,10 +1787,7 @@ class RetrievalService:
             linked_id = metadata.get("linked_doc_id")
             linked_record: Dict[str, object] | None = None
             if linked_id:
-                try:
-                    linked_record = self.document_store.read_document(str(linked_id))
-                except FileNotFoundError:
-                    linked_record = None
+                linked_record = self._document_record(str(linked_id), self._lookups().documents) or None
             if linked_record:
                 metadata.setdefault("linked_doc_title", linked_record.get("title") or linked_record.get("name"))
                 metadata.setdefault("linked_doc_source_type", linked_record.get("source_type"))
@@ -1388,8 +2028,22 @@ class RetrievalService:
     def _build_trace(
         self, results: List[qmodels.ScoredPoint], entity_ids: List[str]
     ) -> Tuple[Trace, List[Tuple[str, str | None]], Set[str], Dict[str, PrivilegeDecision]]:
-        vector_trace = [self._vector_trace_entry(point) for point in results]
-        forensics_trace = self._build_forensics_trace(results)
+        graph_trace, relation_statements, graph_doc_ids = self._graph_trace(entity_ids)
+        doc_scope = self._result_doc_ids(results) | graph_doc_ids
+        privilege_trace, privilege_decisions = self._build_privilege_trace(results)
+        trace = Trace(
+            vector=[self._vector_trace_entry(point) for point in results],
+            graph=graph_trace,
+            forensics=self._build_forensics_trace(results),
+            privilege=privilege_trace,
+        )
+        return trace, relation_statements, doc_scope, privilege_decisions
+
+    def _graph_trace(
+        self, entity_ids: List[str]
+    ) -> Tuple[Dict[str, Any], List[Tuple[str, str | None]], Set[str]]:
+        """Return the subgraph payload, relation statements and linked doc ids for ``entity_ids``."""
+
         subgraph: GraphSubgraph = self.graph_service.subgraph(entity_ids)
         node_map: Dict[str, GraphNode] = dict(subgraph.nodes)
         edge_bucket: Dict[Tuple[str, str, str, str | None], GraphEdge] = dict(subgraph.edges)
@@ -1408,26 +2062,13 @@ class RetrievalService:
                 continue
             statement_seen.add(statement_key)
             relation_statements.append(statement_key)
-        graph_trace = subgraph.to_payload()
-        doc_ids_from_results: Set[str] = {
-            str(point.payload.get("doc_id"))
-            for point in results
-            if point.payload and point.payload.get("doc_id") is not None
-        }
-        doc_scope = doc_ids_from_results | subgraph.document_ids()
+        graph_trace: Dict[str, Any] = subgraph.to_payload()
         graph_trace["communities"] = [
             community.to_dict()
             for community in self.graph_service.communities_for_nodes(node_map.keys())
         ]
         graph_trace.setdefault("events", [])
-        privilege_trace, privilege_decisions = self._build_privilege_trace(results)
-        trace = Trace(
-            vector=vector_trace,
-            graph=graph_trace,
-            forensics=forensics_trace,
-            privilege=privilege_trace,
-        )
-        return trace, relation_statements, doc_scope, privilege_decisions
+        return graph_trace, relation_statements, subgraph.document_ids()
 
     def _vector_trace_entry(self, point: qmodels.ScoredPoint) -> Dict[str, object]:
         payload = point.payload or {}
@@ -1494,34 +2135,69 @@ class RetrievalService:
                 decision_map[key] = decision
         return self.privilege_classifier.format_trace(decisions), decision_map
 
-    def _page_privilege_trace(
-        self, privilege_trace: Dict[str, object], doc_ids: Set[str]
-    ) -> Dict[str, object]:
-        if not doc_ids:
-            return {"decisions": [], "aggregate": privilege_trace.get("aggregate", {})}
-        decisions_payload = privilege_trace.get("decisions", [])
-        filtered_payload = [
-            decision
-            for decision in decisions_payload
-            if str(decision.get("doc_id")) in doc_ids
-        ]
-        decisions = [
-            PrivilegeDecision(
-                doc_id=str(item.get("doc_id", "")),
-                label=str(item.get("label", "unknown")),
-                score=float(item.get("score", 0.0)),
-                explanation=str(item.get("explanation", "")),
-                source=str(item.get("source", "classifier")),
-                signals=dict(item.get("signals", {})),
-                context=dict(item.get("context", {})),
-            )
-            for item in filtered_payload
-        ]
-        summary = self.privilege_classifier.aggregate(decisions)
-        return {
-            "decisions": filtered_payload,
-            "aggregate": summary.to_dict(),
-        }
+    def _screen_privilege(
+        self,
+        results: List[qmodels.ScoredPoint],
+        graph_doc_ids: Set[str],
+        page_decisions: Dict[str, PrivilegeDecision],
+    ) -> Dict[str, PrivilegeDecision]:
+        """Privilege decisions for every document in the window or reached through the graph.
+
+        Page documents keep their full decisions. Other window chunks use the score each chunk
+        stored at ingestion and are classified when they have none. Graph-linked documents are
+        also judged by their record's score, the highest of their chunks; documents ingested
+        before scores were stored are classified chunk by chunk from the keyword index.
+        """
+
+        decisions: Dict[str, PrivilegeDecision] = dict(page_decisions)
+
+        def _keep(decision: PrivilegeDecision | None) -> None:
+            if decision is None:
+                return
+            existing = decisions.get(decision.doc_id)
+            if existing is None or decision.score > existing.score:
+                decisions[decision.doc_id] = decision
+
+        unscored: List[qmodels.ScoredPoint] = []
+        for point in results:
+            payload = point.payload or {}
+            doc_id = payload.get("doc_id")
+            if doc_id is None or str(doc_id) in page_decisions:
+                continue
+            decision = self.privilege_classifier.from_stored_fields(str(doc_id), payload)
+            if decision is None:
+                unscored.append(point)
+            else:
+                _keep(decision)
+        if unscored:
+            _, classified = self._build_privilege_trace(unscored)
+            for decision in classified.values():
+                _keep(decision)
+        for doc_id in sorted(graph_doc_ids):
+            try:
+                record = self.document_store.read_document(doc_id)
+            except FileNotFoundError:
+                record = {}
+            decision = self.privilege_classifier.from_stored_fields(doc_id, record)
+            if decision is None:
+                decision = self._classify_unscored_document(doc_id, record)
+            _keep(decision)
+        return decisions
+
+    def _classify_unscored_document(self, doc_id: str, record: Dict[str, object]) -> PrivilegeDecision:
+        chunks = get_keyword_index().document_chunks(doc_id)
+        if chunks:
+            points = [
+                qmodels.ScoredPoint(
+                    id=f"{doc_id}::{payload.get('chunk_index')}", version=0, score=0.0, payload=payload
+                )
+                for payload in chunks
+            ]
+            _, classified = self._build_privilege_trace(points)
+            if doc_id in classified:
+                return classified[doc_id]
+        _logger.warning("Graph document has no stored privilege score or indexed text", extra={"doc_id": doc_id})
+        return self.privilege_classifier.classify(doc_id, "", {**record, "doc_id": doc_id})
 
     def _build_forensics_trace(
         self, results: List[qmodels.ScoredPoint]
@@ -1539,11 +2215,7 @@ class RetrievalService:
             seen.add(doc_id)
             doc_type = payload.get("type")
             if doc_type is None:
-                try:
-                    record = self.document_store.read_document(doc_id)
-                except FileNotFoundError:
-                    record = {}
-                doc_type = record.get("type")
+                doc_type = self._document_record(doc_id, self._lookups().documents).get("type")
             artifact = self._artifact_name_for_type(doc_type)
             if artifact is None:
                 continue
@@ -1572,7 +2244,10 @@ class RetrievalService:
     ) -> List[Dict[str, object]]:
         if not doc_ids:
             return []
-        events = self.timeline_store.read_all()
+        lookups = self._lookups()
+        if lookups.timeline_events is None:
+            lookups.timeline_events = self.timeline_store.read_all()
+        events = lookups.timeline_events
         payload: List[Dict[str, object]] = []
         privilege_decisions = privilege_decisions or {}
         flagged_docs = {
@@ -1613,16 +2288,34 @@ class RetrievalService:
         results: List[qmodels.ScoredPoint],
         source_filter: str | None,
         entity_filter: str | None,
+        *,
+        field_filters: Dict[str, str] | None = None,
+        document_ids: Set[str] | None = None,
     ) -> List[qmodels.ScoredPoint]:
-        if source_filter is None and entity_filter is None:
+        """Drop fused points that fail the query filters.
+
+        The vector leg already had these filters pushed into its search; graph, keyword
+        and external points still need checking here against payloads and document records.
+        ``document_ids``, when given, is the set of documents the keyword filter matched.
+        """
+
+        if source_filter is None and entity_filter is None and not field_filters and document_ids is None:
             return results
         filtered: List[qmodels.ScoredPoint] = []
-        doc_cache: Dict[str, Dict[str, object]] = {}
-        entity_cache: Dict[str, List[GraphNode]] = {}
+        lookups = self._lookups()
+        doc_cache = lookups.documents
+        entity_cache = lookups.document_entities
         for point in results:
             payload = point.payload or {}
             raw_doc = payload.get("doc_id")
             doc_id = str(raw_doc) if raw_doc is not None else None
+            if document_ids is not None and doc_id not in document_ids:
+                continue
+            if field_filters and not all(
+                self._matches_field(payload, field, value, doc_id, doc_cache)
+                for field, value in field_filters.items()
+            ):
+                continue
             if source_filter and not self._matches_source(payload, source_filter, doc_id, doc_cache):
                 continue
             if entity_filter and not self._matches_entity(payload, entity_filter, doc_id, entity_cache, doc_cache):
@@ -1650,6 +2343,31 @@ class RetrievalService:
         record_source = str(doc_cache[doc_id].get("source_type", "")).lower()
         return record_source == source_filter
 
+    def _matches_field(
+        self,
+        payload: Dict[str, object],
+        field: str,
+        expected: str,
+        doc_id: str | None,
+        doc_cache: Dict[str, Dict[str, object]],
+    ) -> bool:
+        # case_id compares exactly; doc_type arrives lower-cased like the stored values.
+        def _normalise(value: object) -> str:
+            text = str(value)
+            return text if field == "case_id" else text.lower()
+
+        if payload.get(field) is not None:
+            return _normalise(payload[field]) == expected
+        if doc_id is None:
+            return False
+        if doc_id not in doc_cache:
+            try:
+                doc_cache[doc_id] = self.document_store.read_document(doc_id)
+            except FileNotFoundError:
+                doc_cache[doc_id] = {}
+        record_value = doc_cache[doc_id].get(field)
+        return record_value is not None and _normalise(record_value) == expected
+
     def _matches_entity(
         self,
         payload: Dict[str, object],
@@ -1784,6 +2502,98 @@ class RetrievalService:
             return title
         return fallback
 
+    def stream_query(
+        self,
+        question: str,
+        *,
+        page: int = 1,
+        page_size: int = 10,
+        filters: Dict[str, str] | None = None,
+        rerank: bool = False,
+        mode: RetrievalMode = RetrievalMode.PRECISION,
+        cursor: str | None = None,
+        debug: bool = False,
+        attributes: Dict[str, object],
+    ) -> Iterator[str]:
+        """Stream a query as JSON frames while it runs.
+
+        The ``meta`` frame (with page citations and the policy verdict) is produced as
+        soon as fusion and the privilege gate complete, ``answer`` frames follow as the
+        answer is composed, and the trace arrives in the trailing ``final`` frame.
+        Validation and policy errors are raised here, before the first frame. With
+        ``debug`` the ``final`` frame's meta carries the per-stage timings.
+        """
+
+        if not isinstance(mode, RetrievalMode):
+            mode = RetrievalMode(mode)
+        page, reuse_candidates = self._resolve_cursor(
+            question, cursor, page=page, filters=filters, rerank=rerank, mode=mode
+        )
+        cache_key = self._result_cache_key(
+            question, page=page, page_size=page_size, filters=filters, rerank=rerank, mode=mode
+        )
+        cache_attrs = {"mode": mode.value, "rerank": rerank}
+        cached = None if debug else self.result_cache.get(cache_key)
+        if cached is not None:
+            _retrieval_cache_hits_counter.add(1, attributes=cache_attrs)
+            return self.stream_result(cached, attributes=attributes)
+        _retrieval_cache_misses_counter.add(1, attributes=cache_attrs)
+
+        started = perf_counter()
+
+        def _stages() -> Iterator[Tuple[str, Any]]:
+            with self._lookup_scope():
+                yield from self._query_events(
+                    question,
+                    page=page,
+                    page_size=page_size,
+                    filters=filters,
+                    rerank=rerank,
+                    mode=mode,
+                    reuse_candidates=reuse_candidates,
+                    debug=debug,
+                )
+
+        # Every step runs in one copied context so the query span and lookup scope stay
+        # valid when the server advances the iterator from different worker threads.
+        context = copy_context()
+        stages = _stages()
+        first_stage = context.run(next, stages)
+
+        def _iterator() -> Iterator[str]:
+            emitted = 0
+            head_sent = False
+            stage: Tuple[str, Any] | None = first_stage
+            try:
+                while stage is not None:
+                    kind, payload = stage
+                    if kind == "head":
+                        head_sent = True
+                        _retrieval_partial_latency.record((perf_counter() - started) * 1000.0, attributes=attributes)
+                        event = self._meta_event(payload["meta"], payload["has_evidence"])
+                        event["citations"] = [citation.to_dict() for citation in payload["citations"]]
+                        event["policy"] = payload["policy"]
+                        yield json.dumps(event)
+                    elif kind == "answer":
+                        yield json.dumps({"type": "answer", "delta": payload})
+                        emitted += 1
+                    elif kind == "result":
+                        if not head_sent:
+                            _retrieval_partial_latency.record(
+                                (perf_counter() - started) * 1000.0, attributes=attributes
+                            )
+                            yield json.dumps(self._meta_event(payload.meta, payload.has_evidence))
+                        if not debug and not (payload.policy or {}).get("requires_review"):
+                            self.result_cache.put(cache_key, payload)
+                        yield json.dumps(self._final_event(payload))
+                    stage = context.run(next, stages, None)
+            finally:
+                # Close the stages in their own context if the client disconnects mid-stream.
+                context.run(stages.close)
+            _retrieval_stream_chunks_counter.add(emitted, attributes=attributes)
+
+        return _iterator()
+
     def stream_result(
         self,
         result: QueryResult,
@@ -1791,14 +2601,11 @@ class RetrievalService:
         attributes: Dict[str, object],
         chunk_size: int = 160,
     ) -> Iterator[str]:
+        """Replay an already computed result in the same frame format as :meth:`stream_query`."""
+
         def _iterator() -> Iterator[str]:
             start = perf_counter()
-            meta_event = {
-                "type": "meta",
-                "meta": result.meta.to_dict(),
-                "hasEvidence": result.has_evidence,
-            }
-            meta_payload = json.dumps(meta_event)
+            meta_payload = json.dumps(self._meta_event(result.meta, result.has_evidence))
             first_latency = (perf_counter() - start) * 1000.0
             _retrieval_partial_latency.record(first_latency, attributes=attributes)
             yield meta_payload
@@ -1810,21 +2617,56 @@ class RetrievalService:
                     continue
                 yield json.dumps({"type": "answer", "delta": chunk})
                 emitted += 1
-            final_event = {
-                "type": "final",
-                "answer": result.answer,
-                "citations": [citation.to_dict() for citation in result.citations],
-                "traces": result.trace.to_dict(),
-                "meta": result.meta.to_dict(),
-            }
-            if result.policy is not None:
-                final_event["policy"] = result.policy
-            yield json.dumps(final_event)
+            yield json.dumps(self._final_event(result))
             _retrieval_stream_chunks_counter.add(emitted, attributes=attributes)
 
         return _iterator()
 
+    @staticmethod
+    def _meta_event(meta: QueryMeta, has_evidence: bool) -> Dict[str, object]:
+        return {"type": "meta", "meta": meta.to_dict(), "hasEvidence": has_evidence}
+
+    @staticmethod
+    def _final_event(result: QueryResult) -> Dict[str, object]:
+        final_event: Dict[str, object] = {
+            "type": "final",
+            "answer": result.answer,
+            "citations": [citation.to_dict() for citation in result.citations],
+            "traces": result.trace.to_dict(),
+            "meta": result.meta.to_dict(),
+        }
+        if result.policy is not None:
+            final_event["policy"] = result.policy
+        return final_event
+
+
+_RETRIEVAL_LOCK = Lock()
+_RETRIEVAL_SERVICE: RetrievalService | None = None
+
 
 def get_retrieval_service() -> RetrievalService:
-    return RetrievalService()
+    global _RETRIEVAL_SERVICE
+    service = _RETRIEVAL_SERVICE
+    if service is not None:
+        return service
+    with _RETRIEVAL_LOCK:
+        if _RETRIEVAL_SERVICE is None:
+            _RETRIEVAL_SERVICE = RetrievalService()
+        return _RETRIEVAL_SERVICE
+
+
+def warm_retrieval_service() -> RetrievalService:
+    """Build the shared service ahead of the first request and prime its models."""
+
+    service = get_retrieval_service()
+    service.warm_up()
+    return service
+
+
+def reset_retrieval_service() -> None:
+    """Drop the shared service so the next request rebuilds it from current settings."""
+
+    global _RETRIEVAL_SERVICE
+    with _RETRIEVAL_LOCK:
+        _RETRIEVAL_SERVICE = None
 
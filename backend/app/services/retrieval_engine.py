@@ -1,15 +1,25 @@
 from __future__ import annotations
 
+import contextvars
+import logging
 import math
 import re
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from dataclasses import dataclass, field
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
 
 from qdrant_client.http import models as qmodels
 
+from ..config import get_settings
 from ..storage.document_store import DocumentStore
 from ..utils.triples import extract_entities, normalise_entity_id
+from .embedding_cache import QueryEmbeddingCache, compute_query_embedding, compute_query_embeddings
 from .graph import GraphEdge, GraphNode, GraphService
+from .keyword_index import Bm25Index
+from .reranker import CrossEncoderReranker, chunk_key
+from .stage_timing import timed_stage
 from .vector import VectorService
 
 try:  # pragma: no cover - optional dependency
@@ -28,6 +38,39 @@ except ModuleNotFoundError:  # pragma: no cover - fallback shims
         score: float
 
 
+_logger = logging.getLogger(__name__)
+
+_RETRIEVER_EXECUTOR: ThreadPoolExecutor | None = None
+_RETRIEVER_EXECUTOR_LOCK = Lock()
+
+
+def get_retriever_executor() -> ThreadPoolExecutor:
+    """Pool shared by every engine's concurrent legs, sized by ``retrieval_retriever_workers``."""
+
+    global _RETRIEVER_EXECUTOR
+    with _RETRIEVER_EXECUTOR_LOCK:
+        if _RETRIEVER_EXECUTOR is None:
+            _RETRIEVER_EXECUTOR = ThreadPoolExecutor(
+                max_workers=get_settings().retrieval_retriever_workers,
+                thread_name_prefix="hybrid-retriever",
+            )
+        return _RETRIEVER_EXECUTOR
+
+
+class _RetrieverLeg:
+    """Callable wrapper recording when a leg leaves the executor queue and starts running."""
+
+    __slots__ = ("func", "started")
+
+    def __init__(self, func: Callable[[], Any]) -> None:
+        self.func = func
+        self.started: float | None = None
+
+    def __call__(self) -> Any:
+        self.started = monotonic()
+        return self.func()
+
+
 @dataclass
 class HybridRetrievalBundle:
     fused_points: List[qmodels.ScoredPoint]
@@ -38,30 +81,97 @@ class HybridRetrievalBundle:
     reranker: str
     fusion_scores: Dict[str, float]
     external_points: List[qmodels.ScoredPoint] = field(default_factory=list)
+    timed_out_retrievers: List[str] = field(default_factory=list)
+    starved_retrievers: List[str] = field(default_factory=list)
 
 
 class VectorRetrieverAdapter:
-    """Adapter that exposes VectorService results as LlamaIndex-style nodes."""
+    """Adapter that exposes VectorService results as LlamaIndex-style nodes.
+
+    When the vector service has sparse vectors enabled every search is a dense plus
+    sparse hybrid, so the leg already covers lexical matching (see :attr:`lexical`).
+    """
 
-    def __init__(self, vector_service: VectorService, embedding_model) -> None:
+    def __init__(
+        self,
+        vector_service: VectorService,
+        embedding_model,
+        *,
+        embedding_cache: QueryEmbeddingCache | None = None,
+        embedding_namespace: str = "default",
+    ) -> None:
         self.vector_service = vector_service
         self.embedding_model = embedding_model
+        self.embedding_cache = embedding_cache
+        self.embedding_namespace = embedding_namespace
 
-    def retrieve(self, query: str, *, top_k: int) -> List[qmodels.ScoredPoint]:
-        query_vector = self._embed_query(query)
-        return self.vector_service.search(query_vector, top_k=top_k)
+    @property
+    def lexical(self) -> bool:
+        return bool(getattr(self.vector_service, "sparse_enabled", False))
+
+    def embed(self, query: str) -> List[float]:
+        with timed_stage("embed"):
+            return self._embed_query(query)
+
+    def retrieve(
+        self,
+        query: str,
+        *,
+        top_k: int,
+        filters: Dict[str, str] | None = None,
+        query_vector: Sequence[float] | None = None,
+    ) -> List[qmodels.ScoredPoint]:
+        """Search for ``query``; ``query_vector`` is its embedding when already computed."""
+
+        if query_vector is None:
+            query_vector = self.embed(query)
+        with timed_stage("vector_search"):
+            if self.lexical:
+                return self.vector_service.hybrid_search_many([query_vector], [query], top_k, filters=filters or None)[0]
+            if filters:
+                return self.vector_service.search(query_vector, top_k=top_k, filters=filters)
+            return self.vector_service.search(query_vector, top_k=top_k)
+
+    def retrieve_many(
+        self,
+        queries: Sequence[str],
+        *,
+        top_k: int,
+        filters: Dict[str, str] | None = None,
+    ) -> List[List[qmodels.ScoredPoint]]:
+        """Embed every query in one call and search them with one batched vector request."""
+
+        with timed_stage("embed"):
+            if self.embedding_cache is not None:
+                vectors = self.embedding_cache.embed_many(
+                    self.embedding_model, queries, namespace=self.embedding_namespace
+                )
+            else:
+                vectors = [list(vector) for vector in compute_query_embeddings(self.embedding_model, queries)]
+        with timed_stage("vector_search"):
+            if self.lexical:
+                return self.vector_service.hybrid_search_many(vectors, list(queries), top_k, filters=filters or None)
+            return self.vector_service.search_many(vectors, top_k=top_k, filters=filters or None)
 
     def _embed_query(self, query: str) -> List[float]:
-        if hasattr(self.embedding_model, "get_query_embedding"):
-            return list(self.embedding_model.get_query_embedding(query))
-        return list(self.embedding_model.get_text_embedding(query))
+        if self.embedding_cache is not None:
+            return self.embedding_cache.embed(self.embedding_model, query, namespace=self.embedding_namespace)
+        return list(compute_query_embedding(self.embedding_model, query))
 
 
 class GraphRetrieverAdapter:
-    """Emit graph relation statements as scored points."""
+    """Emit graph relation statements as scored points.
+
+    All matched entities are expanded together with one ``subgraph`` call, so a query
+    costs a single graph round-trip however many entities it mentions.
+    """
 
-    def __init__(self, graph_service: GraphService) -> None:
+    def __init__(
+        self, graph_service: GraphService, *, hops: int = 1, fanout: int | None = None
+    ) -> None:
         self.graph_service = graph_service
+        self.hops = hops
+        self.fanout = fanout
 
     def retrieve(self, query: str, *, top_k: int) -> Tuple[List[qmodels.ScoredPoint], List[Tuple[str, str | None]]]:
         entities = self.graph_service.search_entities(query, limit=top_k)
@@ -69,34 +179,35 @@ class GraphRetrieverAdapter:
             entities = self._entities_from_question(query, limit=top_k)
         relation_statements: List[Tuple[str, str | None]] = []
         points: List[qmodels.ScoredPoint] = []
-        for entity in entities[:top_k]:
-            subgraph = self.graph_service.subgraph([entity.id])
-            node_map: Dict[str, GraphNode] = dict(subgraph.nodes)
-            for edge in subgraph.edges.values():
-                statement = _format_relation_statement(edge, node_map)
-                if not statement:
-                    continue
-                doc_id_raw = edge.properties.get("doc_id")
-                doc_id = str(doc_id_raw) if doc_id_raw is not None else None
-                relation_statements.append((statement, doc_id))
-                point_id = f"graph::{edge.source}::{edge.type}::{edge.target}::{doc_id or 'unknown'}"
-                payload = {
-                    "doc_id": doc_id,
-                    "text": statement,
-                    "relation_type": edge.type,
-                    "source_type": edge.properties.get("source_type", "graph"),
-                    "entity_ids": [edge.source, edge.target],
-                    "entity_labels": _entity_labels(edge, node_map),
-                    "retriever": "graph",
-                }
-                points.append(
-                    qmodels.ScoredPoint(
-                        id=point_id,
-                        score=0.6,
-                        payload=payload,
-                        version=1,
-                    )
+        subgraph = self.graph_service.subgraph(
+            [entity.id for entity in entities[:top_k]], hops=self.hops, fanout=self.fanout
+        )
+        node_map: Dict[str, GraphNode] = dict(subgraph.nodes)
+        for edge in subgraph.edges.values():
+            statement = _format_relation_statement(edge, node_map)
+            if not statement:
+                continue
+            doc_id_raw = edge.properties.get("doc_id")
+            doc_id = str(doc_id_raw) if doc_id_raw is not None else None
+            relation_statements.append((statement, doc_id))
+            point_id = f"graph::{edge.source}::{edge.type}::{edge.target}::{doc_id or 'unknown'}"
+            payload = {
+                "doc_id": doc_id,
+                "text": statement,
+                "relation_type": edge.type,
+                "source_type": edge.properties.get("source_type", "graph"),
+                "entity_ids": [edge.source, edge.target],
+                "entity_labels": _entity_labels(edge, node_map),
+                "retriever": "graph",
+            }
+            points.append(
+                qmodels.ScoredPoint(
+                    id=point_id,
+                    score=0.6,
+                    payload=payload,
+                    version=1,
                 )
+            )
         return points[:top_k], relation_statements[: top_k * 2]
 
     def _entities_from_question(self, query: str, limit: int) -> List[GraphNode]:
@@ -118,14 +229,21 @@ class GraphRetrieverAdapter:
 
 
 class KeywordRetrieverAdapter:
-    """Keyword/BM25-style scoring using document metadata stored locally."""
+    """BM25 over the chunk inverted index, with a document-metadata overlap fallback.
+
+    The fallback scans the document store and only runs while ``index`` is missing
+    or empty, e.g. for a corpus ingested before the index was introduced.
+    """
 
     _TOKEN_RE = re.compile(r"[A-Za-z0-9']+")
 
-    def __init__(self, document_store: DocumentStore) -> None:
+    def __init__(self, document_store: DocumentStore, index: Bm25Index | None = None) -> None:
         self.document_store = document_store
+        self.index = index
 
     def retrieve(self, query: str, *, top_k: int) -> List[qmodels.ScoredPoint]:
+        if self.index is not None and len(self.index):
+            return self._retrieve_indexed(query, top_k)
         tokens = {token.lower() for token in self._TOKEN_RE.findall(query)}
         if not tokens:
             return []
@@ -162,6 +280,21 @@ class KeywordRetrieverAdapter:
             )
         return points
 
+    def _retrieve_indexed(self, query: str, top_k: int) -> List[qmodels.ScoredPoint]:
+        points: List[qmodels.ScoredPoint] = []
+        for score, payload in self.index.search(query, top_k=top_k):
+            payload["retriever"] = "keyword"
+            point_id = f"keyword::{payload.get('doc_id', 'unknown')}::{payload.get('chunk_index', 'na')}"
+            points.append(qmodels.ScoredPoint(id=point_id, score=float(score), payload=payload, version=1))
+        return points
+
+    def matching_documents(self, query: str) -> Set[str] | None:
+        """Ids of documents satisfying every clause of ``query``, or ``None`` without a populated index."""
+
+        if self.index is None or not len(self.index):
+            return None
+        return self.index.match_documents(query)
+
     def _document_tokens(self, document: Dict[str, object]) -> set[str]:
         corpus_parts: List[str] = []
         for key in ("title", "summary", "description"):
@@ -192,14 +325,21 @@ class HybridQueryEngine:
         *,
         rrf_constant: float = 60.0,
         cross_encoder_model: str | None = None,
+        reranker: CrossEncoderReranker | None = None,
+        concurrent: bool = False,
+        retriever_timeout: float | None = None,
+        executor: ThreadPoolExecutor | None = None,
     ) -> None:
         self.vector = vector
         self.graph = graph
         self.keyword = keyword
         self.rrf_constant = rrf_constant
-        self._cross_encoder_model = cross_encoder_model
-        self._cross_encoder = None
-        self._cross_encoder_error: Exception | None = None
+        self.concurrent = concurrent
+        self.retriever_timeout = retriever_timeout
+        self.executor = executor or get_retriever_executor()
+        if reranker is None and cross_encoder_model:
+            reranker = CrossEncoderReranker(cross_encoder_model)
+        self.reranker = reranker
 
     def retrieve(
         self,
@@ -210,22 +350,55 @@ class HybridQueryEngine:
         graph_window: int,
         keyword_window: int,
         use_cross_encoder: bool,
+        vector_filters: Dict[str, str] | None = None,
+        vector_points: List[qmodels.ScoredPoint] | None = None,
+        keyword_query: str | None = None,
     ) -> HybridRetrievalBundle:
-        vector_points = self.vector.retrieve(query, top_k=vector_window)
-        graph_points, relation_statements = self.graph.retrieve(query, top_k=graph_window)
-        keyword_points = self.keyword.retrieve(query, top_k=keyword_window)
+        """Run the retrievers and fuse them; ``vector_filters`` are pushed into the vector search.
+
+        ``vector_points`` supplies results already fetched by :meth:`retrieve_vectors_many`,
+        in which case the vector leg is skipped. ``keyword_query`` replaces the question
+        for the keyword leg, e.g. with a phrase or proximity expression. A lexical (sparse
+        hybrid) vector leg makes the keyword leg redundant, so it only runs for such
+        expressions.
+        """
+
+        vector_kwargs: Dict[str, Any] = {"filters": vector_filters} if vector_filters else {}
+        legs: Dict[str, Callable[[], Any]] = {
+            "vector": lambda: self.vector.retrieve(query, top_k=vector_window, **vector_kwargs),
+            "graph": lambda: _timed("graph", lambda: self.graph.retrieve(query, top_k=graph_window)),
+            "keyword": lambda: _timed("keyword", lambda: self.keyword.retrieve(keyword_query or query, top_k=keyword_window)),
+        }
+        deferred: Dict[str, Callable[[], Callable[[], Any]]] = {}
+        if vector_points is not None:
+            del legs["vector"]
+        elif self.concurrent and hasattr(self.vector, "embed"):
+            # The query is embedded on this thread while the other legs run, so the vector
+            # leg's deadline covers only its search.
+            del legs["vector"]
+            deferred["vector"] = lambda: self._vector_search_leg(query, vector_window, vector_kwargs)
+        if keyword_query is None and getattr(self.vector, "lexical", False):
+            del legs["keyword"]
+        outcomes, timed_out, starved = self._run_retrievers(legs, deferred)
+        if vector_points is not None:
+            outcomes["vector"] = vector_points
+        vector_points = outcomes.get("vector", [])
+        graph_points, relation_statements = outcomes.get("graph", ([], []))
+        keyword_points: List[qmodels.ScoredPoint] = outcomes.get("keyword", [])
         candidates = {
             "vector": vector_points,
             "graph": graph_points,
             "keyword": keyword_points,
         }
-        fused, contributions = self._fuse(candidates, top_k)
+        with timed_stage("fusion"):
+            fused, contributions = self._fuse(candidates, top_k)
         reranker_label = "rrf"
         if use_cross_encoder:
-            reranker = self._ensure_cross_encoder()
-            if reranker is not None:
-                fused = self._rerank_with_cross_encoder(reranker, query, fused)
-                reranker_label = "cross_encoder"
+            with timed_stage("rerank"):
+                reranker = self._ensure_cross_encoder()
+                if reranker is not None:
+                    fused = self._rerank_with_cross_encoder(reranker, query, fused)
+                    reranker_label = "cross_encoder"
         return HybridRetrievalBundle(
             fused_points=fused,
             vector_points=vector_points,
@@ -235,8 +408,93 @@ class HybridQueryEngine:
             reranker=reranker_label,
             fusion_scores=contributions,
             external_points=[],
+            timed_out_retrievers=timed_out,
+            starved_retrievers=starved,
         )
 
+    def retrieve_vectors_many(
+        self,
+        queries: Sequence[str],
+        *,
+        vector_window: int,
+        vector_filters: Dict[str, str] | None = None,
+    ) -> List[List[qmodels.ScoredPoint]]:
+        """Fetch the vector leg for a batch of queries, batched when the adapter supports it."""
+
+        vector_kwargs: Dict[str, Any] = {"filters": vector_filters} if vector_filters else {}
+        retrieve_many = getattr(self.vector, "retrieve_many", None)
+        if retrieve_many is not None:
+            return retrieve_many(queries, top_k=vector_window, **vector_kwargs)
+        return [self.vector.retrieve(query, top_k=vector_window, **vector_kwargs) for query in queries]
+
+    def _vector_search_leg(
+        self, query: str, vector_window: int, vector_kwargs: Dict[str, Any]
+    ) -> Callable[[], Any]:
+        query_vector = self.vector.embed(query)
+        return lambda: self.vector.retrieve(query, top_k=vector_window, query_vector=query_vector, **vector_kwargs)
+
+    def _run_retrievers(
+        self,
+        legs: Dict[str, Callable[[], Any]],
+        deferred: Dict[str, Callable[[], Callable[[], Any]]] | None = None,
+    ) -> Tuple[Dict[str, Any], List[str], List[str]]:
+        """Run each retriever leg, concurrently when enabled, dropping legs that miss the deadline.
+
+        ``deferred`` legs are built on the calling thread once ``legs`` are submitted, e.g. by
+        embedding the query, and that preparation does not count against their deadline.
+        A leg's deadline starts when it leaves the executor queue, so time spent waiting for
+        a worker does not count against it. A leg still queued after one timeout is cancelled
+        and reported as starved rather than timed out. A leg that overruns once started cannot
+        be interrupted; it finishes on its worker and its result is discarded.
+        """
+
+        if not self.concurrent:
+            legs = {**legs, **{name: build() for name, build in (deferred or {}).items()}}
+            return {name: leg() for name, leg in legs.items()}, [], []
+        running: Dict[str, Tuple[_RetrieverLeg, float, Future]] = {}
+
+        def _submit(name: str, func: Callable[[], Any]) -> None:
+            leg = _RetrieverLeg(func)
+            # Each leg runs in a copy of the caller's context so tracing spans keep their parent.
+            running[name] = (leg, monotonic(), self.executor.submit(contextvars.copy_context().run, leg))
+
+        for name, func in legs.items():
+            _submit(name, func)
+        for name, build in (deferred or {}).items():
+            _submit(name, build())
+        outcomes: Dict[str, Any] = {}
+        timed_out: List[str] = []
+        starved: List[str] = []
+        for name, (leg, submitted, future) in running.items():
+            if self.retriever_timeout is None:
+                outcomes[name] = future.result()
+                continue
+            started = leg.started
+            while True:
+                limit = (submitted if started is None else started) + self.retriever_timeout
+                try:
+                    outcomes[name] = future.result(timeout=max(0.0, limit - monotonic()))
+                    break
+                except FutureTimeoutError:
+                    pass
+                if started is not None:
+                    timed_out.append(name)
+                    _logger.warning(
+                        "Retriever exceeded its deadline and was dropped from fusion",
+                        extra={"retriever": name, "timeout_s": self.retriever_timeout},
+                    )
+                    break
+                if future.cancel():
+                    starved.append(name)
+                    _logger.warning(
+                        "Retriever never left the executor queue and was dropped from fusion",
+                        extra={"retriever": name, "queued_s": round(monotonic() - submitted, 3)},
+                    )
+                    break
+                # Picked up while we waited; its own deadline starts now at the latest.
+                started = leg.started or monotonic()
+        return outcomes, timed_out, starved
+
     def _fuse(
         self,
         candidates: Dict[str, List[qmodels.ScoredPoint]],
@@ -247,7 +505,7 @@ class HybridQueryEngine:
         contributors: Dict[str, set[str]] = {}
         for retriever, points in candidates.items():
             for rank, point in enumerate(points, start=1):
-                key = _point_key(point)
+                key = chunk_key(point)
                 exemplars.setdefault(key, point)
                 contributors.setdefault(key, set()).add(retriever)
                 scores[key] = scores.get(key, 0.0) + 1.0 / (self.rrf_constant + rank)
@@ -270,60 +528,34 @@ class HybridQueryEngine:
             fused_scores[key] = scores[key]
         return fused, fused_scores
 
-    def _ensure_cross_encoder(self):  # pragma: no cover - exercised when dependency available
-        if self._cross_encoder_model is None:
-            return None
-        if self._cross_encoder is not None:
-            return self._cross_encoder
-        if self._cross_encoder_error is not None:
-            return None
-        try:
-            from sentence_transformers import CrossEncoder  # type: ignore
-        except ModuleNotFoundError as exc:  # pragma: no cover - optional dependency
-            self._cross_encoder_error = exc
-            return None
-        try:
-            self._cross_encoder = CrossEncoder(self._cross_encoder_model)
-        except Exception as exc:  # pragma: no cover - dependency initialisation failure
-            self._cross_encoder_error = exc
+    def warm_up(self) -> None:
+        """Load the cross-encoder ahead of the first reranked query, when one is configured."""
+
+        if self.reranker is not None:
+            self.reranker.warm_up()
+
+    def _ensure_cross_encoder(self) -> CrossEncoderReranker | None:
+        if self.reranker is None or self.reranker.load() is None:
             return None
-        return self._cross_encoder
+        return self.reranker
 
     def _rerank_with_cross_encoder(
         self,
-        reranker,
+        reranker: CrossEncoderReranker,
         query: str,
         points: List[qmodels.ScoredPoint],
-    ) -> List[qmodels.ScoredPoint]:  # pragma: no cover - requires optional dependency
-        if not points:
-            return points
-        pairs = [[query, str(point.payload.get("text", ""))] for point in points]
+    ) -> List[qmodels.ScoredPoint]:
         try:
-            scores = reranker.predict(pairs)
-        except Exception:  # pragma: no cover - prediction failure fallback
+            reordered = reranker.rerank(query, points)
+        except Exception as exc:  # pragma: no cover - prediction failure fallback
+            _logger.warning("Cross-encoder scoring failed; keeping fusion order", exc_info=exc)
             return points
-        rescored = list(zip(scores, points))
-        rescored.sort(key=lambda item: float(item[0]), reverse=True)
-        reordered: List[qmodels.ScoredPoint] = []
-        for score, point in rescored:
-            payload = dict(point.payload or {})
-            payload["cross_encoder_score"] = float(score)
-            reordered.append(
-                qmodels.ScoredPoint(
-                    id=point.id,
-                    score=float(score),
-                    payload=payload,
-                    version=point.version,
-                )
-            )
-        return reordered
+        return points if reordered is None else reordered
 
 
-def _point_key(point: qmodels.ScoredPoint) -> str:
-    payload = point.payload or {}
-    doc_id = payload.get("doc_id") or payload.get("id")
-    chunk_index = payload.get("chunk_index")
-    return f"{doc_id or point.id}::{chunk_index if chunk_index is not None else 'na'}::{point.id}"
+def _timed(stage: str, call: Callable[[], Any]) -> Any:
+    with timed_stage(stage):
+        return call()
 
 
 def _entity_labels(edge: GraphEdge, node_map: Dict[str, GraphNode]) -> List[str]:
@@ -277,8 +277,10 @@ class SettingsService:
 
     def _invalidate_caches(self) -> None:
         from .. import reset_provider_registry_cache
+        from .retrieval import reset_retrieval_service
 
         reset_provider_registry_cache()
+        reset_retrieval_service()
 
 
 def get_settings_service() -> SettingsService:
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import heapq
+import math
+import zlib
+from collections import Counter
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from qdrant_client.http import models as qmodels
+
+from .keyword_index import tokenize
+
+SPARSE_VECTOR_NAME = "text-sparse"
+# Qdrant's server-side RRF scores a hit as 1 / (rank + 2) with zero-based ranks.
+RRF_RANK_OFFSET = 2
+
+
+class SparseTextEncoder:
+    """Turn text into hashed sparse term vectors for lexical matching in the vector store.
+
+    Tokens map to uint32 indices through CRC-32, and document weights use BM25
+    term-frequency saturation against a fixed ``average_length``. IDF is left out on
+    purpose: Qdrant applies it server-side through the collection's IDF modifier and
+    :class:`InMemorySparseIndex` derives it from its own postings, so stored vectors
+    never need re-encoding as the corpus grows.
+    """
+
+    def __init__(self, *, k1: float = 1.2, b: float = 0.75, average_length: float = 256.0) -> None:
+        self.k1 = float(k1)
+        self.b = float(b)
+        self.average_length = float(average_length)
+
+    @staticmethod
+    def term_index(token: str) -> int:
+        return zlib.crc32(token.encode("utf-8"))
+
+    def encode_document(self, text: str) -> qmodels.SparseVector:
+        counts = Counter(tokenize(text))
+        length = sum(counts.values())
+        norm = self.k1 * (1.0 - self.b + self.b * length / self.average_length)
+        weights: Dict[int, float] = {}
+        for token, tf in counts.items():
+            index = self.term_index(token)
+            weights[index] = weights.get(index, 0.0) + tf * (self.k1 + 1.0) / (tf + norm)
+        return self._sparse(weights)
+
+    def encode_query(self, text: str) -> qmodels.SparseVector:
+        return self._sparse({self.term_index(token): 1.0 for token in tokenize(text)})
+
+    @staticmethod
+    def _sparse(weights: Dict[int, float]) -> qmodels.SparseVector:
+        indices = sorted(weights)
+        return qmodels.SparseVector(indices=indices, values=[weights[index] for index in indices])
+
+
+class InMemorySparseIndex:
+    """Inverted index of sparse vectors scored like a Qdrant sparse vector with the IDF modifier."""
+
+    def __init__(self) -> None:
+        self._postings: Dict[int, Dict[str, float]] = {}
+        self._vectors: Dict[str, qmodels.SparseVector] = {}
+
+    def __len__(self) -> int:
+        return len(self._vectors)
+
+    def upsert(self, point_id: str, vector: qmodels.SparseVector) -> None:
+        self.delete([point_id])
+        self._vectors[point_id] = vector
+        for index, weight in zip(vector.indices, vector.values):
+            self._postings.setdefault(index, {})[point_id] = weight
+
+    def delete(self, point_ids: Iterable[str]) -> None:
+        for point_id in point_ids:
+            vector = self._vectors.pop(point_id, None)
+            if vector is None:
+                continue
+            for index in vector.indices:
+                postings = self._postings.get(index)
+                if postings is not None:
+                    postings.pop(point_id, None)
+                    if not postings:
+                        del self._postings[index]
+
+    def search(
+        self,
+        query: qmodels.SparseVector,
+        top_k: int,
+        *,
+        accept: Callable[[str], bool] | None = None,
+    ) -> List[Tuple[float, str]]:
+        """Return up to ``top_k`` ``(score, point_id)`` pairs; ``accept`` drops filtered-out points."""
+
+        total = len(self._vectors)
+        scores: Dict[str, float] = {}
+        for index, query_weight in zip(query.indices, query.values):
+            postings = self._postings.get(index)
+            if not postings:
+                continue
+            idf = math.log1p((total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for point_id, weight in postings.items():
+                scores[point_id] = scores.get(point_id, 0.0) + query_weight * idf * weight
+        candidates = (
+            (score, point_id) for point_id, score in scores.items() if accept is None or accept(point_id)
+        )
+        return heapq.nlargest(top_k, candidates)
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], limit: int) -> List[Tuple[float, str]]:
+    """Fuse ranked id lists the way Qdrant's ``Fusion.RRF`` does, best first."""
+
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, point_id in enumerate(ranking):
+            scores[point_id] = scores.get(point_id, 0.0) + 1.0 / (rank + RRF_RANK_OFFSET)
+    return sorted(((score, point_id) for point_id, score in scores.items()), key=lambda item: -item[0])[:limit]
+
+
+__all__ = [
+    "InMemorySparseIndex",
+    "RRF_RANK_OFFSET",
+    "SPARSE_VECTOR_NAME",
+    "SparseTextEncoder",
+    "reciprocal_rank_fusion",
+]
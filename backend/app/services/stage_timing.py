@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Dict, Iterator
+
+from opentelemetry import metrics, trace
+from opentelemetry.trace import Span
+
+_tracer = trace.get_tracer(__name__)
+_meter = metrics.get_meter(__name__)
+_stage_duration = _meter.create_histogram(
+    "retrieval_stage_duration_ms",
+    unit="ms",
+    description="Latency of individual retrieval pipeline stages, labelled by stage",
+)
+
+_STAGE_TIMINGS: ContextVar[Dict[str, float] | None] = ContextVar("retrieval_stage_timings", default=None)
+
+
+@contextmanager
+def timed_stage(stage: str) -> Iterator[Span]:
+    """Run a pipeline stage inside a ``retrieval.<stage>`` span and record its latency.
+
+    The duration always goes to the ``retrieval_stage_duration_ms`` histogram and is
+    added to the timings collected by an enclosing :func:`collect_stage_timings`.
+    """
+
+    with _tracer.start_as_current_span(f"retrieval.{stage}") as span:
+        started = perf_counter()
+        try:
+            yield span
+        finally:
+            elapsed_ms = (perf_counter() - started) * 1000.0
+            span.set_attribute("retrieval.stage.duration_ms", elapsed_ms)
+            _stage_duration.record(elapsed_ms, attributes={"stage": stage})
+            timings = _STAGE_TIMINGS.get()
+            if timings is not None:
+                timings[stage] = timings.get(stage, 0.0) + elapsed_ms
+
+
+@contextmanager
+def collect_stage_timings() -> Iterator[Dict[str, float]]:
+    """Collect per-stage milliseconds for everything timed inside this scope.
+
+    Worker threads started with a copy of the current context add to the same dict,
+    so concurrently executed retrievers are reported as well.
+    """
+
+    timings: Dict[str, float] = {}
+    token = _STAGE_TIMINGS.set(timings)
+    try:
+        yield timings
+    finally:
+        _STAGE_TIMINGS.reset(token)
+
+
+__all__ = ["collect_stage_timings", "timed_stage"]
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import re
+from collections import Counter
+from threading import RLock
+from typing import Dict, Iterable, List, Set, Tuple
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+
+def normalise_name(text: str) -> str:
+    return " ".join(_WORD_RE.findall(text.casefold()))
+
+
+def trigrams(text: str) -> Set[str]:
+    """Trigrams of each word, padded with two leading and one trailing blank as pg_trgm does."""
+
+    grams: Set[str] = set()
+    for word in _WORD_RE.findall(text.casefold()):
+        padded = f"  {word} "
+        grams.update(padded[index : index + 3] for index in range(len(padded) - 2))
+    return grams
+
+
+class TrigramIndex:
+    """Inverted trigram index over entity names for fuzzy lookup.
+
+    Every key (an entity id) owns one or more names, typically its label and aliases.
+    A query only touches the posting lists of its own trigrams, so the cost follows
+    how many names share trigrams with the query rather than the size of the graph.
+    Names are ranked by trigram Jaccard similarity; a name that contains the whole
+    normalised query scores 1.0 so exact substring matches always come first.
+    """
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, Set[int]] = {}
+        self._names: Dict[int, Tuple[str, str, int]] = {}
+        self._name_ids: Dict[str, List[int]] = {}
+        self._next_id = 0
+        self._lock = RLock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._name_ids)
+
+    def add(self, key: str, names: Iterable[str]) -> None:
+        """Index ``names`` for ``key``, replacing whatever was indexed for it before."""
+
+        with self._lock:
+            self.remove(key)
+            name_ids: List[int] = []
+            for name in dict.fromkeys(normalise_name(str(name)) for name in names):
+                grams = trigrams(name)
+                if not grams:
+                    continue
+                name_id = self._next_id
+                self._next_id += 1
+                self._names[name_id] = (key, name, len(grams))
+                for gram in grams:
+                    self._postings.setdefault(gram, set()).add(name_id)
+                name_ids.append(name_id)
+            if name_ids:
+                self._name_ids[key] = name_ids
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            for name_id in self._name_ids.pop(key, []):
+                _, name, _ = self._names.pop(name_id)
+                for gram in trigrams(name):
+                    postings = self._postings.get(gram)
+                    if postings is not None:
+                        postings.discard(name_id)
+                        if not postings:
+                            del self._postings[gram]
+
+    def search(self, query: str, *, limit: int, min_similarity: float = 0.3) -> List[Tuple[float, str]]:
+        """Return up to ``limit`` ``(similarity, key)`` pairs, best first, each key once."""
+
+        query_grams = trigrams(query)
+        normalised = normalise_name(query)
+        if not query_grams or limit <= 0:
+            return []
+        with self._lock:
+            overlaps: Counter[int] = Counter()
+            for gram in query_grams:
+                overlaps.update(self._postings.get(gram, ()))
+            best: Dict[str, Tuple[float, str]] = {}
+            for name_id, shared in overlaps.items():
+                key, name, size = self._names[name_id]
+                if normalised in name:
+                    similarity = 1.0
+                else:
+                    similarity = shared / (len(query_grams) + size - shared)
+                    if similarity < min_similarity:
+                        continue
+                current = best.get(key)
+                if current is None or (similarity, name) > current:
+                    best[key] = (similarity, name)
+        ranked = sorted(best.items(), key=lambda item: (-item[1][0], item[1][1], item[0]))
+        return [(similarity, key) for key, (similarity, _) in ranked[:limit]]
+
+
+__all__ = ["TrigramIndex", "normalise_name", "trigrams"]
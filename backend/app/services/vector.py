@@ -1,57 +1,773 @@
 from __future__ import annotations
 
-import math
-from typing import Dict, Iterable, List, Sequence
+import json
+import logging
+import os
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from threading import RLock, Timer
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Sequence, Set, Tuple
 
 import importlib
+import numpy as np
 from qdrant_client import QdrantClient
 from qdrant_client.http import models as qmodels
 
 from ..config import get_settings
+from .sparse_vectors import (
+    SPARSE_VECTOR_NAME,
+    InMemorySparseIndex,
+    SparseTextEncoder,
+    reciprocal_rank_fusion,
+)
+
+_logger = logging.getLogger(__name__)
+
+_UPSERT_EXECUTOR = ThreadPoolExecutor(max_workers=8, thread_name_prefix="vector-upsert")
+_POINT_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "co-counsel/vector-point")
+_MIN_COMPACTION_DEAD = 64
+
+_SNAPSHOT_FORMAT = 1
+_SNAPSHOT_MANIFEST = "manifest.json"
+_SNAPSHOT_LIVE = "live.u8"
+_SNAPSHOT_POINTS = "points.jsonl"
+
+# Request-level filter names and the payload fields they are pushed down to.
+VECTOR_FILTER_FIELDS: Dict[str, str] = {
+    "case_id": "case_id",
+    "source": "source_type",
+    "doc_type": "doc_type",
+    "entity": "entity_keys",
+}
+_CASE_SENSITIVE_FILTERS = {"case_id"}
+# Payload fields with a keyword index: the request filters plus the owning document and its version.
+DOCUMENT_ID_FIELD = "doc_id"
+DOCUMENT_VERSION_FIELD = "doc_version"
+_INDEXED_PAYLOAD_FIELDS = (*VECTOR_FILTER_FIELDS.values(), DOCUMENT_ID_FIELD)
+
+
+def vector_payload_filters(filters: Mapping[str, object] | None) -> Dict[str, List[str]]:
+    """Translate request filters into ``{payload_field: allowed_values}``, dropping empty values.
+
+    Values may be a string or a sequence of strings; every filter except ``case_id``
+    is compared case-insensitively, matching how the payload fields are written.
+    """
+
+    translated: Dict[str, List[str]] = {}
+    for name, raw in (filters or {}).items():
+        if name not in VECTOR_FILTER_FIELDS:
+            raise ValueError(f"Unsupported vector filter '{name}'")
+        values = [raw] if isinstance(raw, str) else list(raw or [])
+        cleaned = [str(value).strip() for value in values if value is not None and str(value).strip()]
+        if name not in _CASE_SENSITIVE_FILTERS:
+            cleaned = [value.casefold() for value in cleaned]
+        if cleaned:
+            translated[VECTOR_FILTER_FIELDS[name]] = sorted(set(cleaned))
+    return translated
+
+
+def vector_point_id(doc_id: str, chunk_index: int) -> str:
+    """Deterministic point id for a document chunk, so re-ingesting overwrites the same point."""
+
+    return str(uuid.uuid5(_POINT_ID_NAMESPACE, f"{doc_id}:{chunk_index}"))
+
+
+def entity_filter_keys(entity_ids: Iterable[str], entity_labels: Iterable[str]) -> List[str]:
+    """Build the ``entity_keys`` payload field: entity ids, full labels and label words, casefolded."""
+
+    keys: Set[str] = {str(entity_id).casefold() for entity_id in entity_ids if entity_id}
+    for label in entity_labels:
+        folded = str(label).casefold().strip()
+        if folded:
+            keys.add(folded)
+            keys.update(folded.split())
+    return sorted(keys)
+
+
+@dataclass(slots=True)
+class EmbeddingBlock:
+    """One page of stored points: ids, a ``(n, dimensions)`` float32 matrix and payloads.
+
+    ``vectors`` is ``None`` when the page was read without vectors.
+    """
+
+    ids: List[str]
+    vectors: np.ndarray | None
+    payloads: List[Dict[str, object]]
+
+
+def project_payload(payload: Mapping[str, object] | None, fields: Sequence[str] | None) -> Dict[str, object]:
+    """Return ``payload`` restricted to ``fields`` (all of it when ``fields`` is ``None``)."""
+
+    payload = payload or {}
+    if fields is None:
+        return dict(payload)
+    return {field: payload[field] for field in fields if field in payload}
+
+
+class _MappedFloatMatrix:
+    """Growable float32 row matrix backed by a memory-mapped scratch file.
+
+    With ``source`` the rows are a copy-on-write mapping of that file (a snapshot) and
+    only move to the scratch file at ``path`` when the matrix first has to grow.
+    """
+
+    def __init__(self, path: Path, dimensions: int, capacity: int, *, source: Path | None = None) -> None:
+        self.path = Path(path)
+        self.dimensions = dimensions
+        self._source = source
+        if source is not None:
+            self._rows = np.memmap(source, dtype=np.float32, mode="c", shape=(capacity, dimensions))
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._rows = np.memmap(self.path, dtype=np.float32, mode="w+", shape=(capacity, dimensions))
+
+    @property
+    def rows(self) -> np.ndarray:
+        return self._rows
+
+    def __getitem__(self, rows: Any) -> np.ndarray:
+        return self._rows[rows]
+
+    def __setitem__(self, row: int, values: np.ndarray) -> None:
+        self._rows[row] = values
+
+    def resize(self, capacity: int) -> None:
+        if self._source is not None:
+            borrowed, self._source = self._rows, None
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._rows = np.memmap(self.path, dtype=np.float32, mode="w+", shape=(capacity, self.dimensions))
+            count = min(capacity, borrowed.shape[0])
+            self._rows[:count] = borrowed[:count]
+            return
+        self._rows.flush()
+        del self._rows
+        with self.path.open("r+b") as handle:
+            handle.truncate(capacity * self.dimensions * np.dtype(np.float32).itemsize)
+        self._rows = np.memmap(self.path, dtype=np.float32, mode="r+", shape=(capacity, self.dimensions))
 
 
 class InMemoryVectorIndex:
-    """Deterministic cosine-similarity vector index for offline/testing modes."""
+    """Deterministic cosine-similarity vector index for offline/testing modes.
+
+    Vectors live in one contiguous float32 matrix whose rows are pre-normalised, so a
+    query is a single matrix-vector product followed by an ``argpartition`` top-k. The
+    original norms are kept alongside so raw vectors can be reconstructed on demand.
+    Deleted rows are tombstoned in a liveness mask rather than moved.
+
+    With ``quantization="int8"`` the heap holds one int8 code per dimension plus a
+    per-row scale instead of the float matrix. Candidates are ranked on the codes and,
+    when ``rescore_path`` is set, the best ``top_k * rescore_candidates`` are rescored
+    against full-precision rows kept in a memory-mapped file at that path.
 
-    def __init__(self, dimensions: int) -> None:
+    :meth:`snapshot` persists the index as raw row files plus a JSON-lines id/payload
+    sidecar; later calls only append new rows and patch rows changed in between.
+    :meth:`load_snapshot` maps those files copy-on-write instead of reading them,
+    including the full-precision rows, which only move to ``rescore_path`` once the
+    index grows.
+
+    The payload fields in :data:`VECTOR_FILTER_FIELDS` are kept in an inverted index so
+    filtered searches build their candidate mask without scanning payloads.
+    """
+
+    _INITIAL_CAPACITY = 1024
+    _SCORE_BLOCK_ROWS = 16384
+
+    def __init__(
+        self,
+        dimensions: int,
+        *,
+        quantization: str = "none",
+        rescore_path: Path | None = None,
+        rescore_candidates: int = 4,
+    ) -> None:
+        if quantization not in {"none", "int8"}:
+            raise ValueError(f"Unsupported in-memory vector quantization: {quantization}")
         self.dimensions = dimensions
-        self._store: Dict[str, tuple[List[float], Dict[str, object]]] = {}
+        self.quantization = quantization
+        self.rescore_candidates = max(1, rescore_candidates)
+        self._matrix: np.ndarray | None = None
+        self._codes: np.ndarray | None = None
+        self._scales: np.ndarray | None = None
+        self._full: _MappedFloatMatrix | None = None
+        if quantization == "int8":
+            self._codes = np.zeros((self._INITIAL_CAPACITY, dimensions), dtype=np.int8)
+            self._scales = np.zeros(self._INITIAL_CAPACITY, dtype=np.float32)
+            if rescore_path is not None:
+                self._full = _MappedFloatMatrix(rescore_path, dimensions, self._INITIAL_CAPACITY)
+        else:
+            self._matrix = np.zeros((self._INITIAL_CAPACITY, dimensions), dtype=np.float32)
+        self._norms = np.zeros(self._INITIAL_CAPACITY, dtype=np.float32)
+        self._live = np.zeros(self._INITIAL_CAPACITY, dtype=bool)
+        self._size = 0
+        self._live_count = 0
+        self._ids: List[str] = []
+        self._payloads: List[Dict[str, object]] = []
+        self._row_by_id: Dict[str, int] = {}
+        self._payload_rows: Dict[str, Dict[str, Set[int]]] = {field: {} for field in _INDEXED_PAYLOAD_FIELDS}
+        self._persisted_rows = 0
+        self._dirty_rows: set[int] = set()
+        self._dirty_live: set[int] = set()
+        self._sidecar_records = 0
+        self._renumbered = False
+
+    def __len__(self) -> int:
+        return self._live_count
+
+    @property
+    def dead_rows(self) -> int:
+        """Tombstoned rows still occupying storage until :meth:`compact` runs."""
+
+        return self._size - self._live_count
 
     def upsert(self, points: Iterable[qmodels.PointStruct]) -> None:
         for point in points:
-            vector = list(point.vector)
-            if len(vector) != self.dimensions:
-                raise ValueError("Vector dimensionality mismatch for in-memory index")
+            vector = self._validated_vector(point.vector)
+            point_id = str(point.id)
             payload = dict(point.payload or {})
-            self._store[str(point.id)] = (vector, payload)
+            row = self._row_by_id.get(point_id)
+            if row is None:
+                row = self._append_row(point_id, payload)
+            else:
+                self._replace_payload(row, payload)
+            self._write_vector(row, vector)
 
-    def search(self, vector: Sequence[float], top_k: int) -> List[qmodels.ScoredPoint]:
-        query = list(vector)
-        if len(query) != self.dimensions:
-            raise ValueError("Query dimensionality mismatch for in-memory index")
-        results: List[qmodels.ScoredPoint] = []
-        for point_id, (stored_vector, payload) in self._store.items():
-            score = self._cosine_similarity(query, stored_vector)
+    def delete(self, point_ids: Iterable[str]) -> int:
+        removed = 0
+        for point_id in point_ids:
+            row = self._row_by_id.pop(str(point_id), None)
+            if row is None:
+                continue
+            self._live[row] = False
+            if row < self._persisted_rows:
+                self._dirty_live.add(row)
+            self._unindex_payload(row)
+            self._payloads[row] = {}
+            self._live_count -= 1
+            removed += 1
+        return removed
+
+    def document_point_ids(self, doc_id: str, *, keep_version: str | None = None) -> List[str]:
+        """Live point ids whose payload ``doc_id`` matches, skipping points at ``keep_version``."""
+
+        rows = sorted(self._payload_rows[DOCUMENT_ID_FIELD].get(str(doc_id), ()))
+        return [
+            self._ids[row]
+            for row in rows
+            if keep_version is None or self._payloads[row].get(DOCUMENT_VERSION_FIELD) != keep_version
+        ]
+
+    def compact(self) -> int:
+        """Drop tombstoned rows and renumber live rows densely; returns the number reclaimed.
+
+        Row numbers change, so the next :meth:`snapshot` rewrites every file.
+        """
+
+        reclaimed = self.dead_rows
+        if reclaimed == 0:
+            return 0
+        keep = np.flatnonzero(self._live[: self._size])
+        count = keep.shape[0]
+        capacity = self._INITIAL_CAPACITY
+        while capacity < count:
+            capacity *= 2
+        if self._matrix is not None:
+            self._matrix = self._compacted(self._matrix, keep, capacity)
+        if self._codes is not None and self._scales is not None:
+            self._codes = self._compacted(self._codes, keep, capacity)
+            self._scales = self._compacted(self._scales, keep, capacity)
+        if self._full is not None:
+            # Fancy indexing copies the kept rows before they are written back in place.
+            self._full.rows[:count] = self._full.rows[keep]
+            self._full.resize(capacity)
+        self._norms = self._compacted(self._norms, keep, capacity)
+        self._live = np.zeros(capacity, dtype=bool)
+        self._live[:count] = True
+        self._ids = [self._ids[row] for row in keep]
+        self._payloads = [self._payloads[row] for row in keep]
+        self._size = count
+        self._live_count = count
+        self._row_by_id = {point_id: row for row, point_id in enumerate(self._ids)}
+        self._payload_rows = {field: {} for field in _INDEXED_PAYLOAD_FIELDS}
+        for row in range(count):
+            self._index_payload(row)
+        self._dirty_rows.clear()
+        self._dirty_live.clear()
+        self._renumbered = True
+        return reclaimed
+
+    def search(
+        self,
+        vector: Sequence[float],
+        top_k: int,
+        *,
+        filters: Mapping[str, List[str]] | None = None,
+        with_vectors: bool = False,
+    ) -> List[qmodels.ScoredPoint]:
+        """Rank live points by cosine similarity.
+
+        ``filters`` uses the ``{payload_field: allowed_values}`` shape returned by
+        :func:`vector_payload_filters`; rows failing it are masked out before ranking.
+        """
+
+        return self._exact_search_many([vector], top_k, filters=filters, with_vectors=with_vectors)[0]
+
+    def search_many(
+        self,
+        vectors: Sequence[Sequence[float]],
+        top_k: int,
+        *,
+        filters: Mapping[str, List[str]] | None = None,
+        with_vectors: bool = False,
+    ) -> List[List[qmodels.ScoredPoint]]:
+        """Run :meth:`search` for several queries with one matrix-matrix product."""
+
+        return self._exact_search_many(vectors, top_k, filters=filters, with_vectors=with_vectors)
+
+    def _exact_search_many(
+        self,
+        vectors: Sequence[Sequence[float]],
+        top_k: int,
+        *,
+        filters: Mapping[str, List[str]] | None,
+        with_vectors: bool,
+    ) -> List[List[qmodels.ScoredPoint]]:
+        queries = [self._normalised_query(vector) for vector in vectors]
+        if not queries or self._live_count == 0 or top_k <= 0:
+            return [[] for _ in queries]
+        rows: np.ndarray | None = None
+        mask: np.ndarray | None = None
+        if filters:
+            mask = self._filter_mask(filters)
+            candidates = int(np.count_nonzero(mask))
+            if candidates == 0:
+                return [[] for _ in queries]
+            if candidates * 4 < self._size:
+                # Selective filters score only the matching rows instead of masking a full scan.
+                rows = np.flatnonzero(mask)
+        else:
+            candidates = self._live_count
+            if self._live_count < self._size:
+                mask = self._live[: self._size]
+        query_matrix = np.stack(queries, axis=1)
+        scores = self._scores(query_matrix, rows)
+        if rows is None and mask is not None:
+            scores = np.where(mask[:, None], scores, -np.inf)
+        limit = min(top_k, candidates)
+        results: List[List[qmodels.ScoredPoint]] = []
+        for column, query in enumerate(queries):
+            column_scores = scores[:, column]
+            if self._full is None:
+                positions = self._top_rows(column_scores, limit)
+                exact = column_scores[positions]
+            else:
+                # Ascending order keeps the memory-mapped reads sequential and ties in insertion order.
+                shortlist = np.sort(self._top_rows(column_scores, min(limit * self.rescore_candidates, candidates)))
+                rescored = self._full[shortlist if rows is None else rows[shortlist]] @ query
+                order = np.argsort(-rescored, kind="stable")[:limit]
+                positions, exact = shortlist[order], rescored[order]
+            selected = positions if rows is None else rows[positions]
             results.append(
-                qmodels.ScoredPoint(
-                    id=point_id,
-                    score=score,
-                    payload=payload,
-                    version=0,
-                    vector=stored_vector,
-                )
+                [self._scored_point(int(row), float(score), with_vectors) for row, score in zip(selected, exact)]
             )
-        results.sort(key=lambda item: item.score, reverse=True)
-        return results[:top_k]
+        return results
+
+    def points(self) -> Iterator[Tuple[str, List[float], Dict[str, object]]]:
+        """Yield ``(id, vector, payload)`` for every live point in insertion order."""
+
+        for row in range(self._size):
+            if self._live[row]:
+                yield self._ids[row], self._raw_vector(row).tolist(), self._payloads[row]
+
+    def blocks(
+        self,
+        batch_size: int,
+        *,
+        fields: Sequence[str] | None = None,
+        with_vectors: bool = True,
+    ) -> Iterator[EmbeddingBlock]:
+        """Yield live points in insertion order, at most ``batch_size`` per block.
+
+        Vectors are gathered a block at a time, so walking the whole index never holds
+        more than one block of reconstructed rows.
+        """
+
+        batch_size = max(1, batch_size)
+        live_rows = np.flatnonzero(self._live[: self._size])
+        for start in range(0, live_rows.shape[0], batch_size):
+            rows = live_rows[start : start + batch_size]
+            # Points deleted since the scan started are dropped rather than yielded stale.
+            rows = rows[self._live[rows]]
+            if rows.shape[0] == 0:
+                continue
+            yield EmbeddingBlock(
+                ids=[self._ids[row] for row in rows],
+                vectors=self._unit_rows(rows) * self._norms[rows, None] if with_vectors else None,
+                payloads=[project_payload(self._payloads[row], fields) for row in rows],
+            )
+
+    def id_predicate(self, filters: Mapping[str, List[str]] | None = None) -> Callable[[str], bool]:
+        """Return a check for whether a point id is live and passes ``filters``."""
+
+        mask = self._filter_mask(filters) if filters else self._live
+
+        def accepts(point_id: str) -> bool:
+            row = self._row_by_id.get(point_id)
+            return row is not None and bool(mask[row])
+
+        return accepts
+
+    def scored_points_by_id(
+        self, ranked: Iterable[Tuple[float, str]], *, with_vectors: bool = False
+    ) -> List[qmodels.ScoredPoint]:
+        """Materialise ``(score, point_id)`` pairs, skipping ids that are no longer live."""
+
+        points: List[qmodels.ScoredPoint] = []
+        for score, point_id in ranked:
+            row = self._row_by_id.get(point_id)
+            if row is not None:
+                points.append(self._scored_point(row, float(score), with_vectors))
+        return points
+
+    def snapshot(self, directory: Path) -> None:
+        """Persist rows added or changed since the previous snapshot into ``directory``."""
+
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        manifest = self._read_manifest(directory)
+        full = (
+            manifest is None
+            or not self._manifest_matches(manifest)
+            or manifest.get("rows") != self._persisted_rows
+            or self._sidecar_records > 2 * max(self._size, 1)
+            or self._renumbered
+        )
+        if full:
+            self._persisted_rows = 0
+            self._dirty_rows.clear()
+            self._dirty_live.clear()
+            self._sidecar_records = 0
+        for name, array in self._snapshot_arrays().items():
+            self._write_rows(directory / name, array, full, self._dirty_rows)
+        # Only rows deleted since the last snapshot flip a byte below the persisted tail.
+        self._write_rows(directory / _SNAPSHOT_LIVE, self._live.view(np.uint8), full, self._dirty_live)
+        rows = sorted(self._dirty_rows) + list(range(self._persisted_rows, self._size))
+        with (directory / _SNAPSHOT_POINTS).open("w" if full else "a", encoding="utf-8") as handle:
+            for row in rows:
+                record = {"row": row, "id": self._ids[row], "payload": self._payloads[row]}
+                handle.write(json.dumps(record, default=str) + "\n")
+        self._sidecar_records += len(rows)
+        manifest = {
+            "format": _SNAPSHOT_FORMAT,
+            "dimensions": self.dimensions,
+            "quantization": self.quantization,
+            "full_precision": self._full is not None,
+            "rows": self._size,
+            "sidecar_records": self._sidecar_records,
+        }
+        self._atomic_write(directory / _SNAPSHOT_MANIFEST, json.dumps(manifest).encode("utf-8"))
+        self._persisted_rows = self._size
+        self._dirty_rows.clear()
+        self._dirty_live.clear()
+        self._renumbered = False
+
+    def load_snapshot(self, directory: Path) -> bool:
+        """Replace this (empty) index with the snapshot in ``directory``; returns whether one was loaded."""
+
+        directory = Path(directory)
+        manifest = self._read_manifest(directory)
+        if manifest is None:
+            return False
+        if not self._manifest_matches(manifest):
+            _logger.warning(
+                "Ignoring vector index snapshot with mismatched layout",
+                extra={"directory": str(directory), "manifest": manifest},
+            )
+            return False
+        rows = int(manifest["rows"])
+        if rows == 0:
+            return True
+        # Read everything before touching the index, so a torn or truncated file leaves it empty.
+        try:
+            norms = self._map_rows(directory / "norms.f32", np.float32, (rows,))
+            matrix = codes = scales = None
+            full = self._full
+            if self._matrix is not None:
+                matrix = self._map_rows(directory / "unit.f32", np.float32, (rows, self.dimensions))
+            else:
+                codes = self._map_rows(directory / "codes.i8", np.int8, (rows, self.dimensions))
+                scales = self._map_rows(directory / "scales.f32", np.float32, (rows,))
+                if full is not None:
+                    full = _MappedFloatMatrix(full.path, self.dimensions, rows, source=directory / "unit.f32")
+            live = np.fromfile(directory / _SNAPSHOT_LIVE, dtype=np.uint8, count=rows).astype(bool)
+            if live.shape[0] != rows:
+                raise ValueError(f"{_SNAPSHOT_LIVE} holds {live.shape[0]} of {rows} rows")
+            ids = [""] * rows
+            payloads: List[Dict[str, object]] = [{} for _ in range(rows)]
+            with (directory / _SNAPSHOT_POINTS).open("r", encoding="utf-8") as handle:
+                for line in handle:
+                    record = json.loads(line)
+                    row = record["row"]
+                    if row < rows:
+                        ids[row] = record["id"]
+                        payloads[row] = record["payload"]
+        except (OSError, ValueError, KeyError) as exc:
+            _logger.warning(
+                "Discarding unreadable vector index snapshot", exc_info=exc, extra={"directory": str(directory)}
+            )
+            return False
+        self._norms = norms
+        if matrix is not None:
+            self._matrix = matrix
+        else:
+            self._codes, self._scales, self._full = codes, scales, full
+        self._live = live
+        self._ids = ids
+        self._payloads = payloads
+        for row in np.flatnonzero(~self._live):
+            self._payloads[row] = {}
+        self._row_by_id = {self._ids[row]: int(row) for row in np.flatnonzero(self._live)}
+        self._payload_rows = {field: {} for field in _INDEXED_PAYLOAD_FIELDS}
+        for row in self._row_by_id.values():
+            self._index_payload(row)
+        self._size = rows
+        self._live_count = len(self._row_by_id)
+        self._persisted_rows = rows
+        self._dirty_rows.clear()
+        self._dirty_live.clear()
+        self._sidecar_records = int(manifest.get("sidecar_records", rows))
+        return True
+
+    def _snapshot_arrays(self) -> Dict[str, np.ndarray]:
+        arrays: Dict[str, np.ndarray] = {"norms.f32": self._norms}
+        if self._matrix is not None:
+            arrays["unit.f32"] = self._matrix
+        else:
+            assert self._codes is not None and self._scales is not None
+            arrays["codes.i8"] = self._codes
+            arrays["scales.f32"] = self._scales
+            if self._full is not None:
+                arrays["unit.f32"] = self._full.rows
+        return arrays
+
+    def _write_rows(self, path: Path, array: np.ndarray, full: bool, dirty_rows: set[int]) -> None:
+        if full:
+            # Write beside the target and swap, so live copy-on-write mappings keep their inode.
+            self._atomic_write(path, np.ascontiguousarray(array[: self._size]).tobytes())
+            return
+        row_bytes = array[0].nbytes if array.ndim > 1 else array.itemsize
+        with path.open("r+b") as handle:
+            for row in sorted(dirty_rows):
+                handle.seek(row * row_bytes)
+                handle.write(np.ascontiguousarray(array[row]).tobytes())
+            handle.seek(self._persisted_rows * row_bytes)
+            handle.write(np.ascontiguousarray(array[self._persisted_rows : self._size]).tobytes())
+            handle.truncate()
+
+    def _manifest_matches(self, manifest: Dict[str, Any]) -> bool:
+        return (
+            manifest.get("format") == _SNAPSHOT_FORMAT
+            and manifest.get("dimensions") == self.dimensions
+            and manifest.get("quantization") == self.quantization
+            and manifest.get("full_precision", False) == (self._full is not None)
+        )
+
+    @staticmethod
+    def _read_manifest(directory: Path) -> Dict[str, Any] | None:
+        path = directory / _SNAPSHOT_MANIFEST
+        if not path.exists():
+            return None
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            _logger.warning("Unreadable vector index snapshot manifest", exc_info=exc, extra={"path": str(path)})
+            return None
+
+    @staticmethod
+    def _atomic_write(path: Path, data: bytes) -> None:
+        temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        temp_path.write_bytes(data)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def _map_rows(path: Path, dtype: Any, shape: Tuple[int, ...]) -> np.ndarray:
+        # Copy-on-write: pages load lazily and in-process edits never touch the snapshot file.
+        return np.memmap(path, dtype=dtype, mode="c", shape=shape)
+
+    def _mark_dirty(self, row: int) -> None:
+        if row < self._persisted_rows:
+            self._dirty_rows.add(row)
+
+    def _validated_vector(self, raw: Sequence[float]) -> np.ndarray:
+        vector = np.asarray(raw, dtype=np.float32)
+        if vector.shape != (self.dimensions,):
+            raise ValueError("Vector dimensionality mismatch for in-memory index")
+        return vector
+
+    def _normalised_query(self, raw: Sequence[float]) -> np.ndarray:
+        query = np.asarray(raw, dtype=np.float32)
+        if query.shape != (self.dimensions,):
+            raise ValueError("Query dimensionality mismatch for in-memory index")
+        norm = float(np.linalg.norm(query))
+        return query / norm if norm > 0.0 else query
+
+    def _scores(self, queries: np.ndarray, rows: np.ndarray | None) -> np.ndarray:
+        """Score ``(dimensions, n)`` query columns against all rows (or ``rows``): ``(rows, n)``."""
+
+        if self._matrix is not None:
+            return (self._matrix[: self._size] if rows is None else self._matrix[rows]) @ queries
+        if rows is None:
+            return self._quantized_scores(queries)
+        assert self._codes is not None and self._scales is not None
+        return (self._codes[rows].astype(np.float32) @ queries) * self._scales[rows, None]
+
+    def _filter_mask(self, filters: Mapping[str, List[str]]) -> np.ndarray:
+        mask = self._live[: self._size].copy()
+        for field, values in filters.items():
+            index = self._payload_rows.get(field)
+            if index is None:
+                raise ValueError(f"Payload field '{field}' is not filterable in the in-memory index")
+            matches = np.zeros(self._size, dtype=bool)
+            for value in values:
+                rows = index.get(value)
+                if rows:
+                    matches[list(rows)] = True
+            mask &= matches
+        return mask
+
+    def _replace_payload(self, row: int, payload: Dict[str, object]) -> None:
+        self._unindex_payload(row)
+        self._payloads[row] = payload
+        self._index_payload(row)
+        self._mark_dirty(row)
+
+    def _index_payload(self, row: int) -> None:
+        payload = self._payloads[row]
+        for field, index in self._payload_rows.items():
+            for value in self._filter_values(payload.get(field)):
+                index.setdefault(value, set()).add(row)
+
+    def _unindex_payload(self, row: int) -> None:
+        payload = self._payloads[row]
+        for field, index in self._payload_rows.items():
+            for value in self._filter_values(payload.get(field)):
+                rows = index.get(value)
+                if rows is not None:
+                    rows.discard(row)
+                    if not rows:
+                        del index[value]
+
+    @staticmethod
+    def _filter_values(raw: object) -> List[str]:
+        if raw is None:
+            return []
+        if isinstance(raw, (list, tuple, set)):
+            return [str(value) for value in raw if value is not None]
+        return [str(raw)]
+
+    def _quantized_scores(self, queries: np.ndarray) -> np.ndarray:
+        assert self._codes is not None and self._scales is not None
+        scores = np.empty((self._size, queries.shape[1]), dtype=np.float32)
+        # Widen the codes block by block so a query never materialises the whole float matrix.
+        for start in range(0, self._size, self._SCORE_BLOCK_ROWS):
+            stop = min(start + self._SCORE_BLOCK_ROWS, self._size)
+            block = self._codes[start:stop].astype(np.float32) @ queries
+            scores[start:stop] = block * self._scales[start:stop, None]
+        return scores
+
+    def _append_row(self, point_id: str, payload: Dict[str, object]) -> int:
+        row = self._size
+        self._ensure_capacity(row + 1)
+        self._size += 1
+        self._live[row] = True
+        self._live_count += 1
+        self._row_by_id[point_id] = row
+        self._ids.append(point_id)
+        self._payloads.append(payload)
+        self._index_payload(row)
+        return row
+
+    def _write_vector(self, row: int, vector: np.ndarray) -> None:
+        norm = float(np.linalg.norm(vector))
+        unit = vector / norm if norm > 0.0 else np.zeros_like(vector)
+        self._norms[row] = norm
+        if self._matrix is not None:
+            self._matrix[row] = unit
+            return
+        assert self._codes is not None and self._scales is not None
+        peak = float(np.max(np.abs(unit)))
+        scale = peak / 127.0 if peak > 0.0 else 0.0
+        self._scales[row] = scale
+        self._codes[row] = np.rint(unit / scale) if scale else 0
+        if self._full is not None:
+            self._full[row] = unit
+
+    def _scored_point(self, row: int, score: float, with_vectors: bool = False) -> qmodels.ScoredPoint:
+        return qmodels.ScoredPoint(
+            id=self._ids[row],
+            score=score,
+            payload=self._payloads[row],
+            version=0,
+            vector=self._raw_vector(row).tolist() if with_vectors else None,
+        )
+
+    @staticmethod
+    def _top_rows(scores: np.ndarray, top_k: int) -> np.ndarray:
+        count = scores.shape[0]
+        if top_k < count:
+            candidates = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            candidates = np.arange(count)
+        # Stable sort on the winners keeps insertion order for tied scores.
+        return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+    def _unit_vector(self, row: int) -> np.ndarray:
+        if self._matrix is not None:
+            return self._matrix[row]
+        if self._full is not None:
+            return np.asarray(self._full[row])
+        assert self._codes is not None and self._scales is not None
+        return self._codes[row].astype(np.float32) * self._scales[row]
+
+    def _unit_rows(self, rows: np.ndarray) -> np.ndarray:
+        if self._matrix is not None:
+            return self._matrix[rows]
+        if self._full is not None:
+            return np.asarray(self._full[rows])
+        assert self._codes is not None and self._scales is not None
+        return self._codes[rows].astype(np.float32) * self._scales[rows, None]
+
+    def _raw_vector(self, row: int) -> np.ndarray:
+        return self._unit_vector(row) * self._norms[row]
+
+    def _ensure_capacity(self, required: int) -> None:
+        capacity = self._norms.shape[0]
+        if required <= capacity:
+            return
+        while capacity < required:
+            capacity *= 2
+        if self._matrix is not None:
+            self._matrix = self._grown(self._matrix, capacity)
+        if self._codes is not None and self._scales is not None:
+            self._codes = self._grown(self._codes, capacity)
+            self._scales = self._grown(self._scales, capacity)
+        if self._full is not None:
+            self._full.resize(capacity)
+        self._norms = self._grown(self._norms, capacity)
+        self._live = self._grown(self._live, capacity)
 
     @staticmethod
-    def _cosine_similarity(left: Sequence[float], right: Sequence[float]) -> float:
-        dot = sum(a * b for a, b in zip(left, right))
-        left_norm = math.sqrt(sum(a * a for a in left))
-        right_norm = math.sqrt(sum(b * b for b in right))
-        if left_norm == 0.0 or right_norm == 0.0:
-            return 0.0
-        return dot / (left_norm * right_norm)
+    def _compacted(array: np.ndarray, keep: np.ndarray, capacity: int) -> np.ndarray:
+        compacted = np.zeros((capacity, *array.shape[1:]), dtype=array.dtype)
+        compacted[: keep.shape[0]] = array[keep]
+        return compacted
+
+    def _grown(self, array: np.ndarray, capacity: int) -> np.ndarray:
+        grown = np.zeros((capacity, *array.shape[1:]), dtype=array.dtype)
+        grown[: self._size] = array[: self._size]
+        return grown
 
 
 class VectorService:
@@ -62,9 +778,34 @@ class VectorService:
         self.client: QdrantClient | None = None
         self._chroma_collection = None
         self._chroma_client = None
+        self.sparse_encoder: SparseTextEncoder | None = None
+        self._memory_sparse: InMemorySparseIndex | None = None
+        self._qdrant_sparse = False
+        # Memory indexes are not thread-safe: writes, reads and background compaction share this lock.
+        self._memory_lock = RLock()
+        self._memory_scans = 0
+        self._compaction_pending = False
+        self._snapshot_timer: Timer | None = None
+        if self.settings.vector_sparse_hybrid:
+            self.sparse_encoder = SparseTextEncoder(average_length=self.settings.vector_sparse_average_length)
         if backend == "memory":
             self.mode = "memory"
-            self._memory_index = InMemoryVectorIndex(self.settings.qdrant_vector_size)
+            self._memory_index = InMemoryVectorIndex(
+                self.settings.qdrant_vector_size,
+                quantization=self.settings.vector_memory_quantization,
+                rescore_path=self.settings.vector_memory_rescore_path,
+                rescore_candidates=self.settings.vector_memory_rescore_candidates,
+            )
+        elif backend == "memory-hnsw":
+            from .vector_hnsw import HnswVectorIndex
+
+            self.mode = "memory"
+            self._memory_index = HnswVectorIndex(
+                self.settings.qdrant_vector_size,
+                m=self.settings.vector_hnsw_m,
+                ef_construction=self.settings.vector_hnsw_ef_construction,
+                ef_search=self.settings.vector_hnsw_ef_search,
+            )
         elif backend == "chroma":
             self.mode = "chroma"
             try:
@@ -80,6 +821,22 @@ class VectorService:
             self.mode = "qdrant"
             self.client = self._create_client()
             self.ensure_collection()
+        self._snapshot_dir = self.settings.vector_memory_snapshot_dir if self._memory_index is not None else None
+        if self._memory_index is not None and self._snapshot_dir is not None:
+            self._memory_index.load_snapshot(self._snapshot_dir)
+        if self._memory_index is not None and self.sparse_encoder is not None:
+            # Sparse vectors are derived from payload text, so they are rebuilt rather than persisted.
+            self._memory_sparse = InMemorySparseIndex()
+            for point_id, _, payload in self._memory_index.points():
+                self._memory_sparse.upsert(point_id, self.sparse_encoder.encode_document(str(payload.get("text", ""))))
+
+    @property
+    def sparse_enabled(self) -> bool:
+        """Whether :meth:`hybrid_search_many` fuses a sparse lexical leg rather than searching dense only."""
+
+        if self.sparse_encoder is None:
+            return False
+        return self._memory_sparse is not None or (self.mode == "qdrant" and self._qdrant_sparse)
 
     def _create_client(self) -> QdrantClient:
         print(f"Initializing QdrantClient. URL: {self.settings.qdrant_url}, Path: {self.settings.qdrant_path}")
@@ -97,9 +854,18 @@ class VectorService:
             return
         collection = self.settings.qdrant_collection
         size = self.settings.qdrant_vector_size
+        self._qdrant_sparse = self.sparse_encoder is not None
         try:
             info = self.client.get_collection(collection)
             if info.config.params.vectors.size == size:
+                self._ensure_payload_indexes(collection)
+                if self._qdrant_sparse and SPARSE_VECTOR_NAME not in (info.config.params.sparse_vectors or {}):
+                    # Recreating would drop every point; keep the collection dense-only until it is rebuilt.
+                    _logger.warning(
+                        "Qdrant collection has no sparse vector config; hybrid search stays dense-only",
+                        extra={"collection": collection},
+                    )
+                    self._qdrant_sparse = False
                 return
             self.client.delete_collection(collection)
         except Exception:
@@ -114,12 +880,70 @@ class VectorService:
                 size=size,
                 distance=qmodels.Distance(self.settings.qdrant_distance),
             ),
+            sparse_vectors_config=(
+                {SPARSE_VECTOR_NAME: qmodels.SparseVectorParams(modifier=qmodels.Modifier.IDF)}
+                if self._qdrant_sparse
+                else None
+            ),
         )
+        self._ensure_payload_indexes(collection)
 
-    def upsert(self, points: Iterable[qmodels.PointStruct]) -> None:
+    def _ensure_payload_indexes(self, collection: str) -> None:
+        assert self.client is not None
+        for field in _INDEXED_PAYLOAD_FIELDS:
+            try:
+                self.client.create_payload_index(
+                    collection_name=collection,
+                    field_name=field,
+                    field_schema=qmodels.PayloadSchemaType.KEYWORD,
+                )
+            except Exception as exc:  # pragma: no cover - server-side/version specific
+                _logger.warning(
+                    "Failed to create Qdrant payload index",
+                    exc_info=exc,
+                    extra={"collection": collection, "field": field},
+                )
+
+    def upsert(self, points: Iterable[qmodels.PointStruct], *, wait: bool = True) -> None:
+        """Write ``points`` in one backend call; see :meth:`writer` for batched, parallel writes."""
+
+        self._write_batch(list(points), wait=wait)
+        self._snapshot_soon()
+
+    def writer(
+        self,
+        *,
+        batch_size: int | None = None,
+        max_in_flight: int | None = None,
+        wait: bool | None = None,
+    ) -> "VectorUpsertWriter":
+        """Return a :class:`VectorUpsertWriter` using the ``vector_upsert_*`` settings as defaults."""
+
+        return VectorUpsertWriter(
+            self,
+            batch_size=batch_size or self.settings.vector_upsert_batch_size,
+            max_in_flight=max_in_flight or self.settings.vector_upsert_parallelism,
+            wait=self.settings.vector_upsert_wait if wait is None else wait,
+        )
+
+    def bulk_upsert(self, points: Iterable[qmodels.PointStruct], **writer_options: Any) -> int:
+        """Write ``points`` through a :meth:`writer` and flush it; returns the number of points written."""
+
+        with self.writer(**writer_options) as writer:
+            writer.add(points)
+        return writer.written
+
+    def _write_batch(self, points: List[qmodels.PointStruct], *, wait: bool) -> None:
+        if not points:
+            return
         if self.mode == "memory":
             assert self._memory_index is not None
-            self._memory_index.upsert(points)
+            with self._memory_lock:
+                self._memory_index.upsert(points)
+                if self._memory_sparse is not None and self.sparse_encoder is not None:
+                    for point in points:
+                        text = str((point.payload or {}).get("text", ""))
+                        self._memory_sparse.upsert(str(point.id), self.sparse_encoder.encode_document(text))
             return
         if self.mode == "chroma":
             ids: List[str] = []
@@ -131,7 +955,7 @@ class VectorService:
                 vector = list(point.vector)
                 embeddings.append(vector)
                 payload = dict(point.payload or {})
-                metadatas.append(payload)
+                metadatas.append(self._chroma_metadata(payload))
                 documents.append(str(payload.get("text", "")))
             self._chroma_collection.upsert(
                 ids=ids,
@@ -141,120 +965,648 @@ class VectorService:
             )
             return
         assert self.client is not None
-        self.client.upsert(collection_name=self.settings.qdrant_collection, points=list(points))
+        if self.sparse_enabled:
+            points = [self._with_sparse_vector(point) for point in points]
+        self.client.upsert(collection_name=self.settings.qdrant_collection, points=points, wait=wait)
+
+    def _with_sparse_vector(self, point: qmodels.PointStruct) -> qmodels.PointStruct:
+        assert self.sparse_encoder is not None
+        if isinstance(point.vector, dict):
+            return point
+        text = str((point.payload or {}).get("text", ""))
+        return qmodels.PointStruct(
+            id=point.id,
+            vector={"": list(point.vector), SPARSE_VECTOR_NAME: self.sparse_encoder.encode_document(text)},
+            payload=point.payload,
+        )
+
+    def snapshot(self) -> None:
+        """Flush memory-mode changes to ``vector_memory_snapshot_dir`` when one is configured."""
+
+        if self._memory_index is None or self._snapshot_dir is None:
+            return
+        with self._memory_lock:
+            if self._snapshot_timer is not None:
+                self._snapshot_timer.cancel()
+                self._snapshot_timer = None
+            self._memory_index.snapshot(self._snapshot_dir)
+
+    def _snapshot_soon(self) -> None:
+        """Coalesce the snapshots of small writes into one per ``vector_memory_snapshot_interval_seconds``.
+
+        The timer thread is not a daemon, so a pending snapshot still runs before the
+        interpreter exits.
+        """
+
+        if self._memory_index is None or self._snapshot_dir is None:
+            return
+        interval = self.settings.vector_memory_snapshot_interval_seconds
+        if interval <= 0:
+            self.snapshot()
+            return
+        with self._memory_lock:
+            if self._snapshot_timer is not None:
+                return
+            self._snapshot_timer = Timer(interval, self.snapshot)
+            self._snapshot_timer.start()
+
+    def delete_by_document(self, doc_id: str, *, keep_version: str | None = None) -> int:
+        """Delete every point whose payload ``doc_id`` matches; returns how many were removed.
+
+        With ``keep_version`` only points whose ``doc_version`` differs (or is missing) are
+        removed, which is how :meth:`replace_document` drops a superseded version. Memory
+        mode tombstones the rows and compacts in the background once enough are dead.
+        """
 
-    def search(self, vector: Sequence[float], top_k: int = 8) -> List[qmodels.ScoredPoint]:
         if self.mode == "memory":
             assert self._memory_index is not None
-            return self._memory_index.search(vector, top_k)
+            with self._memory_lock:
+                point_ids = self._memory_index.document_point_ids(doc_id, keep_version=keep_version)
+                removed = self._memory_index.delete(point_ids)
+                if self._memory_sparse is not None:
+                    self._memory_sparse.delete(point_ids)
+            if removed:
+                self._snapshot_soon()
+                self._schedule_compaction()
+            return removed
         if self.mode == "chroma":
-            results = self._chroma_collection.query(
-                query_embeddings=[list(vector)],
-                n_results=top_k,
-                include=["metadatas", "distances", "embeddings", "documents"],
+            found = self._chroma_collection.get(where={DOCUMENT_ID_FIELD: str(doc_id)}, include=["metadatas"])
+            ids = found.get("ids") or []
+            metadatas = found.get("metadatas") or [{} for _ in ids]
+            stale = [
+                point_id
+                for point_id, metadata in zip(ids, metadatas)
+                if keep_version is None or (metadata or {}).get(DOCUMENT_VERSION_FIELD) != keep_version
+            ]
+            if stale:
+                self._chroma_collection.delete(ids=stale)
+            return len(stale)
+        assert self.client is not None
+        document_filter = qmodels.Filter(
+            must=[qmodels.FieldCondition(key=DOCUMENT_ID_FIELD, match=qmodels.MatchValue(value=str(doc_id)))],
+            must_not=(
+                [qmodels.FieldCondition(key=DOCUMENT_VERSION_FIELD, match=qmodels.MatchValue(value=keep_version))]
+                if keep_version is not None
+                else None
+            ),
+        )
+        removed = self.client.count(
+            collection_name=self.settings.qdrant_collection, count_filter=document_filter, exact=True
+        ).count
+        if removed:
+            self.client.delete(
+                collection_name=self.settings.qdrant_collection,
+                points_selector=qmodels.FilterSelector(filter=document_filter),
             )
-            ids = results.get("ids", [[]])[0]
-            distances = results.get("distances", [[]])[0]
-            metadatas = results.get("metadatas", [[]])[0]
-            embeddings = results.get("embeddings", [[]])[0]
-            scored: List[qmodels.ScoredPoint] = []
-            for idx, point_id in enumerate(ids):
-                metadata = metadatas[idx] if idx < len(metadatas) else {}
-                distance = distances[idx] if idx < len(distances) else 0.0
-                score = 1.0 - distance if distance is not None else 0.0
-                vector_out = embeddings[idx] if idx < len(embeddings) else []
-                scored.append(
-                    qmodels.ScoredPoint(
-                        id=point_id,
-                        score=float(score),
-                        payload=metadata,
-                        version=0,
-                        vector=vector_out,
-                    )
+        return removed
+
+    def replace_document(
+        self, doc_id: str, points: Iterable[qmodels.PointStruct], *, version: str, **writer_options: Any
+    ) -> int:
+        """Write ``points`` as ``version`` of ``doc_id``, then delete its points from other versions.
+
+        New points are stamped with ``doc_id``/``doc_version`` and written before the old
+        ones are removed, so the document never drops out of search mid-replace. Returns
+        the number of superseded points deleted.
+        """
+
+        stamped = (
+            qmodels.PointStruct(
+                id=point.id,
+                vector=point.vector,
+                payload={**(point.payload or {}), DOCUMENT_ID_FIELD: doc_id, DOCUMENT_VERSION_FIELD: version},
+            )
+            for point in points
+        )
+        self.bulk_upsert(stamped, **writer_options)
+        return self.delete_by_document(doc_id, keep_version=version)
+
+    def compact(self) -> int:
+        """Reclaim tombstoned rows in memory mode now; returns how many were dropped."""
+
+        if self._memory_index is None:
+            return 0
+        with self._memory_lock:
+            if self._memory_scans:
+                return 0
+            reclaimed = self._memory_index.compact()
+        if reclaimed:
+            self.snapshot()
+        return reclaimed
+
+    def _schedule_compaction(self) -> None:
+        index = self._memory_index
+        if index is None or self._compaction_pending:
+            return
+        rows = len(index) + index.dead_rows
+        threshold = max(_MIN_COMPACTION_DEAD, int(rows * self.settings.vector_memory_compaction_ratio))
+        if index.dead_rows < threshold:
+            return
+        self._compaction_pending = True
+        _UPSERT_EXECUTOR.submit(self._background_compaction)
+
+    def _background_compaction(self) -> None:
+        try:
+            self.compact()
+        except Exception as exc:  # pragma: no cover - defensive, the next delete retries
+            _logger.warning("Background vector index compaction failed", exc_info=exc)
+        finally:
+            self._compaction_pending = False
+
+    def search(
+        self,
+        vector: Sequence[float],
+        top_k: int = 8,
+        *,
+        filters: Mapping[str, object] | None = None,
+        with_vectors: bool = False,
+    ) -> List[qmodels.ScoredPoint]:
+        """Nearest-neighbour search, optionally restricted by ``case_id``/``source``/``doc_type``/``entity``.
+
+        Filters are applied inside each backend (payload index mask, Chroma ``where``,
+        Qdrant payload filter) so a filtered query still fills its ``top_k`` window.
+        """
+
+        payload_filters = vector_payload_filters(filters)
+        if self.mode == "memory":
+            assert self._memory_index is not None
+            with self._memory_lock:
+                return self._memory_index.search(
+                    vector, top_k, filters=payload_filters or None, with_vectors=with_vectors
                 )
-            return scored
+        if self.mode == "chroma":
+            return self._chroma_search([vector], top_k, payload_filters, with_vectors)[0]
         assert self.client is not None
         try:
             # Try newer API first (qdrant-client >= 1.16)
             results = self.client.query_points(
                 collection_name=self.settings.qdrant_collection,
                 query=list(vector),
+                query_filter=self._qdrant_filter(payload_filters),
                 limit=top_k,
                 with_payload=True,
+                with_vectors=with_vectors,
             )
             # query_points returns QueryResponse with .points attribute
-            return [
-                qmodels.ScoredPoint(
-                    id=point.id,
-                    score=point.score,
-                    payload=point.payload,
-                    version=getattr(point, 'version', 0),
-                    vector=getattr(point, 'vector', None),
-                )
-                for point in results.points
-            ]
+            return [self._qdrant_scored_point(point) for point in results.points]
         except AttributeError:
             # Fallback to older API (qdrant-client < 1.16)
             return self.client.search(
                 collection_name=self.settings.qdrant_collection,
                 query_vector=list(vector),
+                query_filter=self._qdrant_filter(payload_filters),
                 limit=top_k,
                 with_payload=True,
+                with_vectors=with_vectors,
             )
 
+    def search_many(
+        self,
+        vectors: Sequence[Sequence[float]],
+        top_k: int = 8,
+        *,
+        filters: Mapping[str, object] | None = None,
+        with_vectors: bool = False,
+    ) -> List[List[qmodels.ScoredPoint]]:
+        """Batch :meth:`search`: one backend round-trip for every query vector, results in input order."""
+
+        if not vectors:
+            return []
+        payload_filters = vector_payload_filters(filters)
+        if self.mode == "memory":
+            assert self._memory_index is not None
+            with self._memory_lock:
+                return self._memory_index.search_many(
+                    vectors, top_k, filters=payload_filters or None, with_vectors=with_vectors
+                )
+        if self.mode == "chroma":
+            return self._chroma_search(vectors, top_k, payload_filters, with_vectors)
+        assert self.client is not None
+        query_filter = self._qdrant_filter(payload_filters)
+        try:
+            responses = self.client.query_batch_points(
+                collection_name=self.settings.qdrant_collection,
+                requests=[
+                    qmodels.QueryRequest(
+                        query=list(vector),
+                        filter=query_filter,
+                        limit=top_k,
+                        with_payload=True,
+                        with_vector=with_vectors,
+                    )
+                    for vector in vectors
+                ],
+            )
+            return [[self._qdrant_scored_point(point) for point in response.points] for response in responses]
+        except AttributeError:
+            return self.client.search_batch(
+                collection_name=self.settings.qdrant_collection,
+                requests=[
+                    qmodels.SearchRequest(
+                        vector=list(vector),
+                        filter=query_filter,
+                        limit=top_k,
+                        with_payload=True,
+                        with_vector=with_vectors,
+                    )
+                    for vector in vectors
+                ],
+            )
+
+    def hybrid_search_many(
+        self,
+        vectors: Sequence[Sequence[float]],
+        texts: Sequence[str],
+        top_k: int = 8,
+        *,
+        filters: Mapping[str, object] | None = None,
+        with_vectors: bool = False,
+    ) -> List[List[qmodels.ScoredPoint]]:
+        """Dense plus sparse lexical search fused with RRF, one query per ``(vector, text)`` pair.
+
+        Qdrant runs both legs as prefetches of a single fusion query; memory mode fuses
+        the dense index with :class:`InMemorySparseIndex` the same way. Without sparse
+        support (Chroma, or a collection created without sparse vectors) this is
+        :meth:`search_many`.
+        """
+
+        if not self.sparse_enabled:
+            return self.search_many(vectors, top_k, filters=filters, with_vectors=with_vectors)
+        if not vectors:
+            return []
+        assert self.sparse_encoder is not None
+        payload_filters = vector_payload_filters(filters)
+        prefetch_limit = top_k * self.settings.vector_sparse_prefetch
+        sparse_queries = [self.sparse_encoder.encode_query(text) for text in texts]
+        if self.mode == "memory":
+            assert self._memory_index is not None and self._memory_sparse is not None
+            with self._memory_lock:
+                dense_batches = self._memory_index.search_many(
+                    vectors, prefetch_limit, filters=payload_filters or None
+                )
+                accept = self._memory_index.id_predicate(payload_filters or None)
+                results: List[List[qmodels.ScoredPoint]] = []
+                for dense, sparse_query in zip(dense_batches, sparse_queries):
+                    sparse = self._memory_sparse.search(sparse_query, prefetch_limit, accept=accept)
+                    fused = reciprocal_rank_fusion(
+                        [[str(point.id) for point in dense], [point_id for _, point_id in sparse]], top_k
+                    )
+                    results.append(self._memory_index.scored_points_by_id(fused, with_vectors=with_vectors))
+            return results
+        assert self.client is not None
+        query_filter = self._qdrant_filter(payload_filters)
+        responses = self.client.query_batch_points(
+            collection_name=self.settings.qdrant_collection,
+            requests=[
+                qmodels.QueryRequest(
+                    prefetch=[
+                        qmodels.Prefetch(query=list(vector), filter=query_filter, limit=prefetch_limit),
+                        qmodels.Prefetch(
+                            query=sparse_query, using=SPARSE_VECTOR_NAME, filter=query_filter, limit=prefetch_limit
+                        ),
+                    ],
+                    query=qmodels.FusionQuery(fusion=qmodels.Fusion.RRF),
+                    filter=query_filter,
+                    limit=top_k,
+                    with_payload=True,
+                    with_vector=[""] if with_vectors else False,
+                )
+                for vector, sparse_query in zip(vectors, sparse_queries)
+            ],
+        )
+        return [[self._qdrant_scored_point(point) for point in response.points] for response in responses]
+
+    def _chroma_search(
+        self,
+        vectors: Sequence[Sequence[float]],
+        top_k: int,
+        payload_filters: Mapping[str, List[str]],
+        with_vectors: bool,
+    ) -> List[List[qmodels.ScoredPoint]]:
+        include = ["metadatas", "distances", "documents"]
+        if with_vectors:
+            include.append("embeddings")
+        query_args: Dict[str, Any] = {}
+        where = self._chroma_where(payload_filters)
+        if where is not None:
+            query_args["where"] = where
+        results = self._chroma_collection.query(
+            query_embeddings=[list(vector) for vector in vectors],
+            n_results=top_k,
+            include=include,
+            **query_args,
+        )
+        def _column(name: str) -> Sequence[Any]:
+            values = results.get(name)
+            return values if values is not None else [[] for _ in vectors]
+
+        id_batches = _column("ids")
+        distance_batches = _column("distances")
+        metadata_batches = _column("metadatas")
+        embedding_batches = _column("embeddings") if with_vectors else [[] for _ in vectors]
+        batches: List[List[qmodels.ScoredPoint]] = []
+        for ids, distances, metadatas, embeddings in zip(
+            id_batches, distance_batches, metadata_batches, embedding_batches
+        ):
+            scored: List[qmodels.ScoredPoint] = []
+            for idx, point_id in enumerate(ids):
+                metadata = metadatas[idx] if idx < len(metadatas) else {}
+                distance = distances[idx] if idx < len(distances) else 0.0
+                score = 1.0 - distance if distance is not None else 0.0
+                vector_out = list(embeddings[idx]) if idx < len(embeddings) else None
+                scored.append(
+                    qmodels.ScoredPoint(
+                        id=point_id,
+                        score=float(score),
+                        payload=metadata,
+                        version=0,
+                        vector=vector_out,
+                    )
+                )
+            batches.append(scored)
+        return batches
+
+    @staticmethod
+    def _qdrant_scored_point(point: Any) -> qmodels.ScoredPoint:
+        vector = getattr(point, 'vector', None)
+        if isinstance(vector, dict):
+            # Collections with a sparse vector return named vectors; "" is the dense one.
+            vector = vector.get("")
+        return qmodels.ScoredPoint(
+            id=point.id,
+            score=point.score,
+            payload=point.payload,
+            version=getattr(point, 'version', 0),
+            vector=vector,
+        )
+
+    @staticmethod
+    def _qdrant_filter(payload_filters: Mapping[str, List[str]]) -> qmodels.Filter | None:
+        if not payload_filters:
+            return None
+        return qmodels.Filter(
+            must=[
+                qmodels.FieldCondition(key=field, match=qmodels.MatchAny(any=list(values)))
+                for field, values in payload_filters.items()
+            ]
+        )
+
+    @staticmethod
+    def _chroma_where(payload_filters: Mapping[str, List[str]]) -> Dict[str, Any] | None:
+        # Chroma metadata is scalar-only, so list fields (entity_keys) stay post-filtered upstream.
+        clauses = [
+            {field: {"$in": list(values)}}
+            for field, values in payload_filters.items()
+            if field != VECTOR_FILTER_FIELDS["entity"]
+        ]
+        if not clauses:
+            return None
+        return clauses[0] if len(clauses) == 1 else {"$and": clauses}
+
+    @staticmethod
+    def _chroma_metadata(payload: Dict[str, object]) -> Dict[str, object]:
+        return {
+            key: json.dumps(value, default=str) if isinstance(value, (list, tuple, dict)) else value
+            for key, value in payload.items()
+        }
+
+    def iter_embedding_blocks(
+        self,
+        *,
+        batch_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        with_vectors: bool = True,
+        limit: int | None = None,
+    ) -> Iterator[EmbeddingBlock]:
+        """Stream every stored point as :class:`EmbeddingBlock` pages of at most ``batch_size``.
+
+        Qdrant is walked with scroll offsets and Chroma with ``get`` offsets, so only one
+        page is in memory at a time. ``fields`` projects payloads to the named keys
+        (server-side for Qdrant); ``with_vectors=False`` skips reading vectors at all.
+        ``limit`` caps the total number of points yielded.
+        """
+
+        page_size = max(1, batch_size or self.settings.vector_scroll_batch_size)
+        remaining = limit
+        for block in self._embedding_pages(page_size, fields, with_vectors, limit):
+            if remaining is not None:
+                if remaining <= 0:
+                    return
+                if len(block.ids) > remaining:
+                    block = EmbeddingBlock(
+                        ids=block.ids[:remaining],
+                        vectors=block.vectors[:remaining] if block.vectors is not None else None,
+                        payloads=block.payloads[:remaining],
+                    )
+                remaining -= len(block.ids)
+            if block.ids:
+                yield block
+
+    def iter_embeddings(
+        self,
+        *,
+        batch_size: int | None = None,
+        fields: Sequence[str] | None = None,
+        with_vectors: bool = True,
+        limit: int | None = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Per-point view of :meth:`iter_embedding_blocks`: ``{'id', 'vector', 'payload'}`` dicts."""
+
+        for block in self.iter_embedding_blocks(
+            batch_size=batch_size, fields=fields, with_vectors=with_vectors, limit=limit
+        ):
+            for index, point_id in enumerate(block.ids):
+                yield {
+                    "id": point_id,
+                    "vector": block.vectors[index].tolist() if block.vectors is not None else None,
+                    "payload": block.payloads[index],
+                }
+
     def get_all_embeddings(self, limit: int = 1000) -> List[Dict[str, Any]]:
         """
-        Retrieves all embeddings from the vector store for clustering.
+        Retrieves up to ``limit`` embeddings from the vector store for clustering.
         Returns a list of dicts: {'id': str, 'vector': List[float], 'payload': Dict}
         """
-        results = []
-        
+        return list(self.iter_embeddings(limit=limit))
+
+    def _embedding_pages(
+        self,
+        page_size: int,
+        fields: Sequence[str] | None,
+        with_vectors: bool,
+        limit: int | None,
+    ) -> Iterator[EmbeddingBlock]:
         if self.mode == "memory":
             assert self._memory_index is not None
-            for point_id, (vector, payload) in self._memory_index._store.items():
-                results.append({
-                    "id": point_id,
-                    "vector": vector,
-                    "payload": payload
-                })
-                if len(results) >= limit:
-                    break
-                    
-        elif self.mode == "chroma":
-            # Chroma get()
-            data = self._chroma_collection.get(
-                include=["embeddings", "metadatas"],
-                limit=limit
-            )
-            ids = data.get("ids", [])
-            embeddings = data.get("embeddings", [])
-            metadatas = data.get("metadatas", [])
-            
-            for i, point_id in enumerate(ids):
-                results.append({
-                    "id": point_id,
-                    "vector": embeddings[i] if embeddings else [],
-                    "payload": metadatas[i] if metadatas else {}
-                })
-
-        else: # qdrant
-            assert self.client is not None
-            # Use scroll API
-            response, _ = self.client.scroll(
+            # Each block is gathered under the lock; compaction is held off while a scan is open.
+            blocks = self._memory_index.blocks(page_size, fields=fields, with_vectors=with_vectors)
+            with self._memory_lock:
+                self._memory_scans += 1
+            try:
+                while True:
+                    with self._memory_lock:
+                        block = next(blocks, None)
+                    if block is None:
+                        return
+                    yield block
+            finally:
+                with self._memory_lock:
+                    self._memory_scans -= 1
+            return
+        if self.mode == "chroma":
+            include = ["metadatas", "embeddings"] if with_vectors else ["metadatas"]
+            start = 0
+            while limit is None or start < limit:
+                data = self._chroma_collection.get(include=include, limit=page_size, offset=start)
+                ids = [str(point_id) for point_id in data.get("ids") or []]
+                if not ids:
+                    return
+                metadatas = data.get("metadatas")
+                metadatas = metadatas if metadatas is not None else [{} for _ in ids]
+                embeddings = data.get("embeddings") if with_vectors else None
+                yield EmbeddingBlock(
+                    ids=ids,
+                    vectors=np.asarray(embeddings, dtype=np.float32) if embeddings is not None else None,
+                    payloads=[project_payload(metadata, fields) for metadata in metadatas],
+                )
+                if len(ids) < page_size:
+                    return
+                start += len(ids)
+            return
+        assert self.client is not None
+        with_payload: bool | qmodels.PayloadSelectorInclude = (
+            True if fields is None else qmodels.PayloadSelectorInclude(include=list(fields))
+        )
+        # Collections with a sparse vector store named vectors; only the dense one is read.
+        vector_selector: bool | List[str] = ([""] if self._qdrant_sparse else True) if with_vectors else False
+        offset: Any = None
+        seen = 0
+        while limit is None or seen < limit:
+            records, offset = self.client.scroll(
                 collection_name=self.settings.qdrant_collection,
-                limit=limit,
-                with_payload=True,
-                with_vectors=True
+                limit=page_size if limit is None else min(page_size, limit - seen),
+                offset=offset,
+                with_payload=with_payload,
+                with_vectors=vector_selector,
             )
-            
-            for point in response:
-                results.append({
-                    "id": str(point.id),
-                    "vector": point.vector,
-                    "payload": point.payload
-                })
-                
-        return results
+            if not records:
+                return
+            vectors = None
+            if with_vectors:
+                dense = [
+                    record.vector.get("") if isinstance(record.vector, dict) else record.vector for record in records
+                ]
+                vectors = np.asarray(dense, dtype=np.float32)
+            yield EmbeddingBlock(
+                ids=[str(record.id) for record in records],
+                vectors=vectors,
+                payloads=[dict(record.payload or {}) for record in records],
+            )
+            seen += len(records)
+            if offset is None:
+                return
+
+
+class VectorUpsertWriter:
+    """Buffer points and write them in ``batch_size`` batches, up to ``max_in_flight`` at a time.
+
+    Qdrant batches go out with ``wait=wait``, so with ``wait=False`` a batch is done once
+    the server has accepted it rather than once it is indexed. Chroma has no such
+    acknowledgement and simply writes its batches in parallel. The memory indexes are
+    not thread-safe, so memory mode writes inline and only snapshots on :meth:`flush`,
+    which is its equivalent of deferred acknowledgement.
+
+    The newest batch is always held back for :meth:`flush`, which writes it with
+    ``wait=True`` once every earlier batch has been acknowledged. Qdrant applies a
+    collection's updates in order, so when ``flush`` returns everything this writer sent
+    is searchable, whatever ``wait`` the bulk of the batches used.
+
+    Use as a context manager, or call :meth:`flush` to drain pending batches and
+    surface the first write error, and :meth:`close` on error paths.
+    """
+
+    def __init__(
+        self,
+        service: VectorService,
+        *,
+        batch_size: int,
+        max_in_flight: int,
+        wait: bool,
+        executor: ThreadPoolExecutor | None = None,
+    ) -> None:
+        self.service = service
+        self.batch_size = max(1, batch_size)
+        self.max_in_flight = max(1, max_in_flight)
+        self.wait = wait
+        self.written = 0
+        self._executor = executor or _UPSERT_EXECUTOR
+        self._buffer: List[qmodels.PointStruct] = []
+        self._in_flight: List[Tuple[Future[None], int]] = []
+
+    def __enter__(self) -> "VectorUpsertWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, traceback: Any) -> None:
+        if exc_type is None:
+            self.flush()
+        else:
+            self.close()
+
+    def add(self, points: Iterable[qmodels.PointStruct]) -> None:
+        for point in points:
+            if len(self._buffer) >= self.batch_size:
+                self._submit()
+            self._buffer.append(point)
+
+    def flush(self) -> int:
+        """Write any buffered points, wait for every batch and return the running total written."""
+
+        if self.service.mode == "memory":
+            self._submit()
+            self.service.snapshot()
+            return self.written
+        self._drain(raise_errors=True)
+        batch, self._buffer = self._buffer, []
+        if batch:
+            self.service._write_batch(batch, wait=True)
+            self.written += len(batch)
+        return self.written
+
+    def close(self) -> None:
+        """Drop buffered points and wait out in-flight batches, logging rather than raising their errors."""
+
+        self._buffer = []
+        self._drain(raise_errors=False)
+
+    def _submit(self) -> None:
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        if self.service.mode == "memory":
+            self.service._write_batch(batch, wait=self.wait)
+            self.written += len(batch)
+            return
+        while len(self._in_flight) >= self.max_in_flight:
+            self._settle(*self._in_flight.pop(0))
+        self._in_flight.append((self._executor.submit(self.service._write_batch, batch, wait=self.wait), len(batch)))
+
+    def _drain(self, *, raise_errors: bool) -> None:
+        pending, self._in_flight = self._in_flight, []
+        error: Exception | None = None
+        for future, size in pending:
+            try:
+                self._settle(future, size)
+            except Exception as exc:
+                error = error or exc
+        if error is None:
+            return
+        if raise_errors:
+            raise error
+        _logger.warning("Vector upsert batch failed while discarding writer", exc_info=error)
+
+    def _settle(self, future: Future[None], size: int) -> None:
+        future.result()
+        self.written += size
 
 
 _vector_service: VectorService | None = None
@@ -268,6 +1620,9 @@ def get_vector_service() -> VectorService:
 
 
 def reset_vector_service() -> None:
+    from .retrieval import reset_retrieval_service
+
     global _vector_service
     _vector_service = None
+    reset_retrieval_service()
 
@@ -0,0 +1,360 @@
+from __future__ import annotations
+
+import heapq
+import json
+import logging
+import math
+import random
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Set, Tuple
+
+import numpy as np
+from qdrant_client.http import models as qmodels
+
+from .vector import InMemoryVectorIndex
+
+_logger = logging.getLogger(__name__)
+
+_GRAPH_MANIFEST = "hnsw.json"
+_GRAPH_LINKS = "hnsw_links.jsonl"
+
+
+class HnswVectorIndex(InMemoryVectorIndex):
+    """Hierarchical navigable small-world graph over the in-memory vector matrix.
+
+    Vectors are stored exactly as in :class:`InMemoryVectorIndex`; the graph only
+    replaces the brute-force scan at query time. ``m`` bounds the out-degree per layer
+    (``2 * m`` on the ground layer), ``ef_construction`` sizes the beam used while
+    linking new nodes and ``ef_search`` the beam used at query time, trading recall
+    for latency. Deleted points stay in the graph as navigation-only tombstones until
+    :meth:`compact` drops them and reconnects their neighbours.
+
+    Snapshots also persist the graph, as a JSON-lines sidecar of per-row link lists that
+    later snapshots append the changed rows to, so a restore does not re-insert every row.
+    """
+
+    def __init__(
+        self,
+        dimensions: int,
+        *,
+        m: int = 16,
+        ef_construction: int = 200,
+        ef_search: int = 64,
+        seed: int = 0,
+    ) -> None:
+        super().__init__(dimensions)
+        if m < 2:
+            raise ValueError("HNSW parameter m must be at least 2")
+        self.m = m
+        self.ef_construction = max(ef_construction, m)
+        self.ef_search = max(1, ef_search)
+        self._level_multiplier = 1.0 / math.log(m)
+        self._random = random.Random(seed)
+        self._links: List[List[List[int]]] = []
+        self._entry_point: int | None = None
+        self._max_level = -1
+        self._graph_dirty: Set[int] = set()
+        self._graph_persisted_rows = 0
+        self._graph_records = 0
+        self._graph_renumbered = False
+
+    def upsert(self, points: Iterable[qmodels.PointStruct]) -> None:
+        for point in points:
+            vector = self._validated_vector(point.vector)
+            point_id = str(point.id)
+            payload = dict(point.payload or {})
+            row = self._row_by_id.get(point_id)
+            if row is not None and np.allclose(self._raw_vector(row), vector):
+                self._replace_payload(row, payload)
+                continue
+            if row is not None:
+                # A moved vector needs new graph edges; retire the old node instead of rewiring it.
+                self.delete([point_id])
+            row = self._append_row(point_id, payload)
+            self._write_vector(row, vector)
+            self._insert(row)
+
+    def compact(self) -> int:
+        # Links are repaired and renumbered in place; nothing is re-inserted.
+        if self.dead_rows == 0:
+            return 0
+        live = self._live[: self._size].copy()
+        self._repair_links(live)
+        remap = np.full(self._size, -1, dtype=np.int64)
+        keep = np.flatnonzero(live)
+        remap[keep] = np.arange(keep.shape[0])
+        self._links = [
+            [[int(remap[neighbour]) for neighbour in layer] for layer in self._links[row]] for row in keep.tolist()
+        ]
+        self._entry_point = None if self._entry_point is None else int(remap[self._entry_point])
+        reclaimed = super().compact()
+        self._graph_dirty.clear()
+        self._graph_renumbered = True
+        return reclaimed
+
+    def snapshot(self, directory: Path) -> None:
+        super().snapshot(directory)
+        directory = Path(directory)
+        manifest = self._read_graph_manifest(directory)
+        full = (
+            manifest is None
+            or manifest.get("m") != self.m
+            or manifest.get("rows") != self._graph_persisted_rows
+            or self._graph_records > 2 * max(self._size, 1)
+            or self._graph_renumbered
+        )
+        rows = range(self._size) if full else sorted(self._graph_dirty)
+        with (directory / _GRAPH_LINKS).open("w" if full else "a", encoding="utf-8") as handle:
+            for row in rows:
+                handle.write(json.dumps({"row": row, "links": self._links[row]}) + "\n")
+        self._graph_records = (0 if full else self._graph_records) + len(rows)
+        manifest = {
+            "m": self.m,
+            "rows": self._size,
+            "records": self._graph_records,
+            "entry_point": self._entry_point,
+            "max_level": self._max_level,
+        }
+        self._atomic_write(directory / _GRAPH_MANIFEST, json.dumps(manifest).encode("utf-8"))
+        self._graph_persisted_rows = self._size
+        self._graph_dirty.clear()
+        self._graph_renumbered = False
+
+    def load_snapshot(self, directory: Path) -> bool:
+        if not super().load_snapshot(directory):
+            return False
+        if not self._load_graph(Path(directory)):
+            # No usable graph beside the vectors (older snapshot, interrupted write): rebuild it.
+            _logger.warning("Rebuilding HNSW graph from snapshot vectors", extra={"directory": str(directory)})
+            self._links = []
+            self._entry_point = None
+            self._max_level = -1
+            for row in range(self._size):
+                self._insert(row)
+            self._graph_renumbered = True
+        return True
+
+    def search(
+        self,
+        vector: Sequence[float],
+        top_k: int,
+        *,
+        ef: int | None = None,
+        filters: Mapping[str, List[str]] | None = None,
+        with_vectors: bool = False,
+    ) -> List[qmodels.ScoredPoint]:
+        query = self._normalised_query(vector)
+        if self._live_count == 0 or top_k <= 0 or self._entry_point is None:
+            return []
+        allowed = self._live
+        if filters:
+            allowed = self._filter_mask(filters)
+            # A graph walk through mostly filtered-out nodes degrades to a full traversal,
+            # so selective filters go straight to an exact scan of the matching rows.
+            if np.count_nonzero(allowed) * 10 < self._live_count:
+                return self._exact_search_many([vector], top_k, filters=filters, with_vectors=with_vectors)[0]
+        entry = self._entry_point
+        for level in range(self._max_level, 0, -1):
+            entry = self._search_layer(query, [entry], 1, level)[0][1]
+        beam = max(ef or self.ef_search, top_k)
+        candidates = self._search_layer(query, [entry], beam, 0, allowed=allowed)
+        return [self._scored_point(row, score, with_vectors) for score, row in candidates[:top_k]]
+
+    def search_many(
+        self,
+        vectors: Sequence[Sequence[float]],
+        top_k: int,
+        *,
+        filters: Mapping[str, List[str]] | None = None,
+        with_vectors: bool = False,
+    ) -> List[List[qmodels.ScoredPoint]]:
+        # Graph walks are per query; there is no shared matrix product to batch.
+        return [self.search(vector, top_k, filters=filters, with_vectors=with_vectors) for vector in vectors]
+
+    def _random_level(self) -> int:
+        return int(-math.log(1.0 - self._random.random()) * self._level_multiplier)
+
+    def _insert(self, row: int) -> None:
+        level = self._random_level()
+        self._links.append([[] for _ in range(level + 1)])
+        self._graph_dirty.add(row)
+        if self._entry_point is None:
+            self._entry_point = row
+            self._max_level = level
+            return
+        query = self._matrix[row]
+        entry = self._entry_point
+        for layer in range(self._max_level, level, -1):
+            entry = self._search_layer(query, [entry], 1, layer)[0][1]
+        for layer in range(min(level, self._max_level), -1, -1):
+            candidates = self._search_layer(query, [entry], self.ef_construction, layer)
+            neighbours = self._select_neighbours(candidates, self.m)
+            self._links[row][layer] = neighbours
+            for neighbour in neighbours:
+                self._link(neighbour, row, layer)
+            entry = candidates[0][1]
+        if level > self._max_level:
+            self._entry_point = row
+            self._max_level = level
+
+    def _link(self, node: int, neighbour: int, layer: int) -> None:
+        self._graph_dirty.add(node)
+        links = self._links[node][layer]
+        links.append(neighbour)
+        capacity = self.m * 2 if layer == 0 else self.m
+        if len(links) <= capacity:
+            return
+        scores = self._matrix[links] @ self._matrix[node]
+        ranked = sorted(zip(scores.tolist(), links), reverse=True)
+        self._links[node][layer] = self._select_neighbours(ranked, capacity)
+
+    def _repair_links(self, live: np.ndarray) -> None:
+        """Drop tombstoned neighbours, reconnecting each survivor through its dead neighbours' links.
+
+        Works on the current row numbering; also moves the entry point off a tombstone.
+        """
+
+        for row in np.flatnonzero(live).tolist():
+            for layer, links in enumerate(self._links[row]):
+                if all(live[neighbour] for neighbour in links):
+                    continue
+                candidates: Dict[int, None] = {}
+                for neighbour in links:
+                    if live[neighbour]:
+                        candidates[neighbour] = None
+                        continue
+                    dead_layers = self._links[neighbour]
+                    if layer < len(dead_layers):
+                        for second in dead_layers[layer]:
+                            if second != row and live[second]:
+                                candidates[second] = None
+                capacity = self.m * 2 if layer == 0 else self.m
+                rows = list(candidates)
+                if len(rows) > capacity:
+                    scores = self._matrix[rows] @ self._matrix[row]
+                    ranked = sorted(zip(scores.tolist(), rows), reverse=True)
+                    rows = self._select_neighbours(ranked, capacity)
+                self._links[row][layer] = rows
+        if self._entry_point is not None and not live[self._entry_point]:
+            survivors = np.flatnonzero(live).tolist()
+            if survivors:
+                self._entry_point = max(survivors, key=lambda row: len(self._links[row]))
+                self._max_level = len(self._links[self._entry_point]) - 1
+            else:
+                self._entry_point = None
+                self._max_level = -1
+
+    def _load_graph(self, directory: Path) -> bool:
+        manifest = self._read_graph_manifest(directory)
+        if manifest is None or manifest.get("m") != self.m or manifest.get("rows") != self._size:
+            return False
+        links: List[Any] = [None] * self._size
+        try:
+            with (directory / _GRAPH_LINKS).open("r", encoding="utf-8") as handle:
+                for line in handle:
+                    record = json.loads(line)
+                    row = record["row"]
+                    if row < self._size:
+                        links[row] = record["links"]
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        if any(layers is None for layers in links):
+            return False
+        self._links = links
+        entry_point = manifest.get("entry_point")
+        self._entry_point = None if entry_point is None else int(entry_point)
+        self._max_level = int(manifest.get("max_level", -1))
+        self._graph_persisted_rows = self._size
+        self._graph_records = int(manifest.get("records", self._size))
+        self._graph_dirty.clear()
+        return True
+
+    @staticmethod
+    def _read_graph_manifest(directory: Path) -> Dict[str, Any] | None:
+        path = directory / _GRAPH_MANIFEST
+        if not path.exists():
+            return None
+        try:
+            return json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+    def _select_neighbours(self, candidates: List[Tuple[float, int]], limit: int) -> List[int]:
+        """Pick up to ``limit`` neighbours, preferring ones that cover different directions.
+
+        ``candidates`` must be sorted by descending similarity to the base vector. A
+        candidate is kept only if it is closer to the base than to any neighbour already
+        kept; the remaining slots are back-filled with the closest discarded candidates.
+        """
+
+        if len(candidates) <= limit:
+            return [row for _, row in candidates]
+        rows = [row for _, row in candidates]
+        vectors = self._matrix[rows]
+        pairwise = vectors @ vectors.T
+        # closest_kept[i] tracks candidate i's best similarity to any neighbour kept so far.
+        closest_kept = np.full(len(rows), -np.inf, dtype=np.float32)
+        selected: List[int] = []
+        discarded: List[int] = []
+        for position, (score, _) in enumerate(candidates):
+            if len(selected) >= limit:
+                break
+            if closest_kept[position] > score:
+                discarded.append(position)
+                continue
+            selected.append(position)
+            np.maximum(closest_kept, pairwise[position], out=closest_kept)
+        for position in discarded:
+            if len(selected) >= limit:
+                break
+            selected.append(position)
+        return [rows[position] for position in selected]
+
+    def _search_layer(
+        self,
+        query: np.ndarray,
+        entry_points: List[int],
+        ef: int,
+        layer: int,
+        *,
+        allowed: np.ndarray | None = None,
+    ) -> List[Tuple[float, int]]:
+        """Best-first beam search on one layer; returns ``(score, row)`` sorted best first.
+
+        Rows outside the ``allowed`` mask (tombstones, filtered-out payloads) are still
+        expanded for navigation but never returned.
+        """
+
+        visited = set(entry_points)
+        entry_scores = (self._matrix[entry_points] @ query).tolist()
+        frontier = [(-score, row) for score, row in zip(entry_scores, entry_points)]
+        heapq.heapify(frontier)
+        results: List[Tuple[float, int]] = [
+            (score, row)
+            for score, row in zip(entry_scores, entry_points)
+            if allowed is None or allowed[row]
+        ]
+        heapq.heapify(results)
+        while len(results) > ef:
+            heapq.heappop(results)
+        while frontier:
+            negative_score, row = heapq.heappop(frontier)
+            if len(results) >= ef and -negative_score < results[0][0]:
+                break
+            neighbours = [n for n in self._links[row][layer] if n not in visited]
+            if not neighbours:
+                continue
+            visited.update(neighbours)
+            scores = (self._matrix[neighbours] @ query).tolist()
+            for score, neighbour in zip(scores, neighbours):
+                if len(results) < ef or score > results[0][0]:
+                    heapq.heappush(frontier, (-score, neighbour))
+                    if allowed is not None and not allowed[neighbour]:
+                        continue
+                    heapq.heappush(results, (score, neighbour))
+                    if len(results) > ef:
+                        heapq.heappop(results)
+        return sorted(results, reverse=True)
+
+
+__all__ = ["HnswVectorIndex"]
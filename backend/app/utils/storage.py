@@ -27,6 +27,13 @@ def sanitise_identifier(value: str) -> str:
     return cleaned
 
 
+def sha256_id(path: Path) -> str:
+    """Stable identifier for the file at ``path``: the SHA-256 of its resolved path."""
+
+    value = str(path.resolve()).encode("utf-8")
+    return sha256(value).hexdigest()
+
+
 def safe_path(root: Path, name: str, suffix: str = ".json") -> Path:
     root = root.resolve()
     safe_name = sanitise_identifier(name)
@@ -24,6 +24,11 @@ from backend.app.security.dependencies import reset_security_caches
 from backend.app.utils.audit import reset_audit_trail
 
 
+@pytest.fixture(autouse=True)
+def _isolated_corpus_version(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("RETRIEVAL_CORPUS_VERSION_PATH", str(tmp_path / "corpus_version"))
+
+
 @dataclass
 class SecurityMaterials:
     certificate_pem: str
@@ -334,6 +339,7 @@ def client(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, security_materials:
 
     from backend.app import config as app_config
     from backend.app.services import graph as graph_service
+    from backend.app.services import retrieval as retrieval_service
     from backend.app.services import vector as vector_service
     from backend.app.telemetry.billing import reset_billing_registry
 
@@ -342,6 +348,7 @@ def client(tmp_path: Path, monkeypatch: pytest.MonkeyPatch, security_materials:
     reset_audit_trail()
     vector_service.reset_vector_service()
     graph_service.reset_graph_service()
+    retrieval_service.reset_retrieval_service()
     reset_billing_registry()
 
     settings = app_config.get_settings()
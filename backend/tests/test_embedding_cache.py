@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+
+from backend.app.services.embedding_cache import QueryEmbeddingCache
+
+
+class _CountingEmbedding:
+    def __init__(self, offset: float = 0.0) -> None:
+        self.calls: list[str] = []
+        self.offset = offset
+
+    def get_query_embedding(self, text: str) -> list[float]:
+        self.calls.append(text)
+        return [float(len(text)) + self.offset, 0.5, -1.25]
+
+
+def test_memory_tier_avoids_repeat_embedding_calls() -> None:
+    model = _CountingEmbedding()
+    cache = QueryEmbeddingCache(max_entries=4)
+
+    first = cache.embed(model, "notice of termination", namespace="openai:small:native")
+    second = cache.embed(model, "notice of termination", namespace="openai:small:native")
+
+    assert first == second == [21.0, 0.5, -1.25]
+    assert model.calls == ["notice of termination"]
+
+
+def test_namespaces_do_not_share_vectors() -> None:
+    cache = QueryEmbeddingCache(max_entries=4)
+    small = cache.embed(_CountingEmbedding(), "query", namespace="openai:small:native")
+    large = cache.embed(_CountingEmbedding(offset=1.0), "query", namespace="openai:large:native")
+    assert small != large
+
+
+def test_disk_tier_survives_new_cache_instance(tmp_path: Path) -> None:
+    model = _CountingEmbedding()
+    QueryEmbeddingCache(max_entries=4, directory=tmp_path).embed(model, "query", namespace="hf:minilm:native")
+
+    restored_model = _CountingEmbedding()
+    vector = QueryEmbeddingCache(max_entries=4, directory=tmp_path).embed(
+        restored_model, "query", namespace="hf:minilm:native"
+    )
+
+    assert restored_model.calls == []
+    assert vector == [5.0, 0.5, -1.25]
+    stored = list(tmp_path.rglob("*.npy"))
+    assert len(stored) == 1
+    assert np.load(stored[0]).dtype == np.float32
+
+
+def test_embed_many_batches_only_the_misses() -> None:
+    class _BatchEmbedding(_CountingEmbedding):
+        def __init__(self) -> None:
+            super().__init__()
+            self.batches: list[list[str]] = []
+
+        def get_query_embedding_batch(self, texts: list[str]) -> list[list[float]]:
+            self.batches.append(list(texts))
+            return [[float(len(text)), 0.5, -1.25] for text in texts]
+
+    model = _BatchEmbedding()
+    cache = QueryEmbeddingCache(max_entries=8)
+    cache.embed(model, "seen", namespace="ns")
+
+    vectors = cache.embed_many(model, ["alpha", "seen", "gamma ray", "alpha"], namespace="ns")
+
+    assert vectors == [[5.0, 0.5, -1.25], [4.0, 0.5, -1.25], [9.0, 0.5, -1.25], [5.0, 0.5, -1.25]]
+    assert model.batches == [["alpha", "gamma ray"]]
+    assert cache.embed(model, "gamma ray", namespace="ns") == [9.0, 0.5, -1.25]
+    assert model.calls == ["seen"]
+
+
+def test_embed_many_never_uses_document_embeddings_for_queries() -> None:
+    class _DocumentBatchEmbedding(_CountingEmbedding):
+        def get_text_embedding_batch(self, texts: list[str]) -> list[list[float]]:
+            raise AssertionError("document embeddings must not be cached as query vectors")
+
+    model = _DocumentBatchEmbedding()
+    vectors = QueryEmbeddingCache(max_entries=8).embed_many(model, ["alpha", "beta"], namespace="ns")
+
+    assert vectors == [[5.0, 0.5, -1.25], [4.0, 0.5, -1.25]]
+    assert model.calls == ["alpha", "beta"]
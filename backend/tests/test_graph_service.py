@@ -56,6 +56,21 @@ def test_search_entities_filters_types(memory_graph: graph_module.GraphService)
     assert service.search_entities("") == []
 
 
+def test_search_entities_ranks_fuzzy_matches_and_aliases(memory_graph: graph_module.GraphService) -> None:
+    service = memory_graph
+    service.upsert_entity("person-1", "Person", {"label": "John Smith"})
+    service.upsert_entity("person-2", "Person", {"label": "Jane Smithers"})
+    service.upsert_entity("org-1", "Organization", {"label": "Acme Holdings", "aliases": ["ACME Corp."]})
+    service.upsert_entity("org-2", "Organization", {"label": "Unrelated Partners"})
+
+    assert [node.id for node in service.search_entities("Jon Smyth", limit=5)] == ["person-1"]
+    assert [node.id for node in service.search_entities("acme corp", limit=5)] == ["org-1"]
+    assert [node.id for node in service.search_entities("hold", limit=5)] == ["org-1"]
+
+    service.upsert_entity("org-1", "Evidence", {"label": "Acme Holdings"})
+    assert service.search_entities("acme", limit=5) == []
+
+
 def test_edge_key_includes_doc_id(memory_graph: graph_module.GraphService) -> None:
     key = memory_graph._edge_key("doc-1", "REL", "entity-1", {"doc_id": "case-9"})
     assert key == ("doc-1", "REL", "entity-1", "case-9")
@@ -113,6 +128,27 @@ def test_subgraph_payload(memory_graph: graph_module.GraphService) -> None:
     assert "doc-subgraph" in subgraph.document_ids()
 
 
+def test_subgraph_expands_seeds_breadth_first_with_fanout(memory_graph: graph_module.GraphService) -> None:
+    service = memory_graph
+    for entity_id in ("a", "b", "c", "d", "e"):
+        service.upsert_entity(entity_id, "Entity", {"label": entity_id})
+    service.merge_relation("a", "KNOWS", "b", {"doc_id": "doc-1"})
+    service.merge_relation("a", "KNOWS", "c", {"doc_id": "doc-1"})
+    service.merge_relation("b", "KNOWS", "d", {"doc_id": "doc-1"})
+    service.merge_relation("d", "KNOWS", "e", {"doc_id": "doc-1"})
+
+    one_hop = service.subgraph(["a", "missing"])
+    assert set(one_hop.nodes) == {"a", "b", "c"}
+
+    two_hops = service.subgraph(["a", "e"], hops=2)
+    assert set(two_hops.nodes) == {"a", "b", "c", "d", "e"}
+    assert len(two_hops.edges) == 4
+
+    capped = service.subgraph(["a"], hops=2, fanout=1)
+    assert set(capped.nodes) == {"a", "b", "d"}
+    assert [(edge.source, edge.target) for edge in capped.edges.values()] == [("a", "b"), ("b", "d")]
+
+
 def test_run_cypher_memory(memory_graph: graph_module.GraphService) -> None:
     memory_graph.upsert_document("doc-cypher", "Cypher Doc", {})
     result = memory_graph.run_cypher("MATCH (n) RETURN n")
@@ -229,14 +265,20 @@ class _DummySession:
     def execute_read(self, func):
         return func(_DummyTx(self.driver, write=False))
 
+    def close(self) -> None:
+        self.driver.closed_sessions += 1
+
 
 class _DummyDriver:
     def __init__(self) -> None:
         self.write_calls: list[tuple[str, dict[str, object]]] = []
         self.read_calls: list[tuple[str, dict[str, object]]] = []
         self.read_results: list[list[dict[str, object]]] = []
+        self.sessions = 0
+        self.closed_sessions = 0
 
     def session(self):
+        self.sessions += 1
         return _DummySession(self)
 
 
@@ -284,6 +326,10 @@ def test_graph_service_neo4j_mode(monkeypatch: pytest.MonkeyPatch) -> None:
 
     assert any("MERGE (d:Document" in call[0] for call in dummy_driver.write_calls)
     assert any("MATCH (d:Document)-[:MENTIONS]->(e:Entity)" in call[0] for call in dummy_driver.read_calls)
+    assert any("CREATE FULLTEXT INDEX entity_names" in call[0] for call in dummy_driver.write_calls)
+    fulltext_query, params = next(call for call in dummy_driver.read_calls if "fulltext.queryNodes" in call[0])
+    assert params["search"] == "+acme~ acme*"
+    assert "WHERE score >= $min_score" in fulltext_query
 
 
 def test_synthesize_strategy_brief_maps_arguments(memory_graph: graph_module.GraphService) -> None:
@@ -314,3 +360,156 @@ def test_synthesize_strategy_brief_maps_arguments(memory_graph: graph_module.Gra
     assert brief.leverage_points
     payload = brief.to_dict()
     assert payload["argument_map"][0]["node"]["id"] == "claim-alpha"
+
+
+def test_memory_adjacency_tracks_incident_edges(memory_graph: graph_module.GraphService) -> None:
+    service = memory_graph
+    service.upsert_document("doc-1", "Agreement", {})
+    service.upsert_document("doc-2", "Memo", {})
+    for entity_id in ("entity-a", "entity-b"):
+        service.upsert_entity(entity_id, "Entity", {"label": entity_id})
+    service.merge_relation("doc-1", "MENTIONS", "entity-a", {"doc_id": "doc-1"})
+    service.merge_relation("doc-2", "MENTIONS", "entity-a", {"doc_id": "doc-2"})
+    service.merge_relation("entity-a", "PARTY_TO", "entity-b", {"doc_id": "doc-1"})
+    service.merge_relation("doc-1", "MENTIONS", "entity-a", {"doc_id": "doc-1", "weight": 0.5})
+
+    nodes, edges = service.neighbors("entity-a")
+    assert {node.id for node in nodes} == {"entity-a", "doc-1", "doc-2", "entity-b"}
+    assert sorted((edge.source, edge.type, edge.target) for edge in edges) == [
+        ("doc-1", "MENTIONS", "entity-a"),
+        ("doc-2", "MENTIONS", "entity-a"),
+        ("entity-a", "PARTY_TO", "entity-b"),
+    ]
+    assert service._degree_map()["entity-a"] == 3
+    assert service._collect_documents_for_node("entity-b") == {"doc-1"}
+    assert {key[0] for key in service._adjacency.of_type("MENTIONS")} == {"doc-1", "doc-2"}
+    assert "PARTY_TO" in service.describe_schema()
+
+
+def test_graph_write_batch_unwinds_rows_in_one_transaction(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("NEO4J_URI", "bolt://neo4j")
+    config.reset_settings_cache()
+    dummy_driver = _DummyDriver()
+    monkeypatch.setattr(graph_module, "GraphDatabase", _DummyGraphDatabase(dummy_driver))
+    graph_module.reset_graph_service()
+    service = graph_module.GraphService()
+    dummy_driver.write_calls.clear()
+    sessions_before = dummy_driver.sessions
+
+    with service.batch(max_rows=100, max_delay_seconds=60.0) as batch:
+        batch.upsert_entity("entity-1", "Entity", {"label": "Acme"})
+        batch.upsert_entity("entity-1", "Entity", {"aliases": ["Acme Corp"]})
+        batch.upsert_entity("entity-2", "Entity", {"label": "Beta"})
+        batch.merge_relation("doc-1", "MENTIONS", "entity-1", {"doc_id": "doc-1", "evidence": ["p1"]})
+        batch.merge_relation("doc-1", "MENTIONS", "entity-1", {"doc_id": "doc-1", "evidence": ["p2"]})
+        batch.merge_relation("entity-1", "ACQUIRED", "entity-2", {"doc_id": "doc-1"})
+        assert dummy_driver.write_calls == []
+        assert batch.pending == 4
+        assert batch.flush() == 4
+        batch.upsert_entity("entity-3", "Entity", {"label": "Gamma"})
+
+    assert batch.flushes == 2
+    assert dummy_driver.sessions - sessions_before == 1
+    assert dummy_driver.closed_sessions == 1
+    queries = [query for query, _ in dummy_driver.write_calls]
+    assert all(query.startswith("UNWIND $rows AS row") for query in queries)
+    assert len(queries) == 4
+    entity_rows = dummy_driver.write_calls[0][1]["rows"]
+    assert entity_rows[0] == {
+        "id": "entity-1",
+        "type": "Entity",
+        "properties": {"label": "Acme", "aliases": ["Acme Corp"]},
+    }
+    mention_rows = next(params["rows"] for query, params in dummy_driver.write_calls if "[r:MENTIONS]" in query)
+    assert mention_rows == [
+        {"source_id": "doc-1", "target_id": "entity-1", "properties": {"doc_id": "doc-1", "evidence": ["p1", "p2"]}}
+    ]
+    assert service._cache_adjacency.incident("entity-2") == [("entity-1", "ACQUIRED", "entity-2", "doc-1")]
+    with pytest.raises(ValueError):
+        service.batch().merge_relation("a", "BAD TYPE", "b", {})
+
+
+def test_graph_write_batch_keeps_rows_when_the_transaction_fails(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("NEO4J_URI", "bolt://neo4j")
+    config.reset_settings_cache()
+    dummy_driver = _DummyDriver()
+    monkeypatch.setattr(graph_module, "GraphDatabase", _DummyGraphDatabase(dummy_driver))
+    graph_module.reset_graph_service()
+    service = graph_module.GraphService()
+    batch = service.batch(max_rows=100, max_delay_seconds=60.0)
+    batch.upsert_entity("entity-9", "Entity", {"label": "Delta"})
+    batch.merge_relation("doc-9", "MENTIONS", "entity-9", {"doc_id": "doc-9"})
+
+    execute_write = _DummySession.execute_write
+    attempts: list[object] = []
+
+    def _flaky_write(self, func):
+        attempts.append(func)
+        if len(attempts) == 1:
+            raise RuntimeError("transient")
+        return execute_write(self, func)
+
+    monkeypatch.setattr(_DummySession, "execute_write", _flaky_write)
+    with pytest.raises(RuntimeError):
+        batch.flush()
+    assert batch.pending == 2
+    assert service._cache_adjacency.incident("entity-9") == []
+
+    assert batch.flush() == 2
+    batch.close()
+    assert batch.pending == 0
+    assert service._cache_adjacency.incident("entity-9") == [("doc-9", "MENTIONS", "entity-9", "doc-9")]
+
+
+def test_neo4j_subgraph_expands_all_seeds_in_one_read(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("NEO4J_URI", "bolt://neo4j")
+    config.reset_settings_cache()
+    dummy_driver = _DummyDriver()
+    monkeypatch.setattr(graph_module, "GraphDatabase", _DummyGraphDatabase(dummy_driver))
+    graph_module.reset_graph_service()
+    service = graph_module.GraphService()
+    dummy_driver.read_results = [
+        [
+            _DummyRecord(
+                nodes=[
+                    {"id": "entity-1", "labels": ["Entity"], "properties": {"id": "entity-1", "label": "Acme"}},
+                    {"id": "entity-2", "labels": ["Entity"], "properties": {"id": "entity-2", "label": "Beta"}},
+                    {"id": "doc-1", "labels": ["Document"], "properties": {"id": "doc-1"}},
+                ],
+                edges=[
+                    {"source": "doc-1", "target": "entity-1", "type": "MENTIONS", "properties": {"doc_id": "doc-1"}},
+                    {"source": "doc-1", "target": "entity-2", "type": "MENTIONS", "properties": {"doc_id": "doc-1"}},
+                ],
+            )
+        ]
+    ]
+    dummy_driver.read_calls.clear()
+
+    subgraph = service.subgraph(["entity-1", "entity-2", "entity-1"], hops=2, fanout=5)
+
+    assert len(dummy_driver.read_calls) == 1
+    query, params = dummy_driver.read_calls[0]
+    assert params == {"seeds": ["entity-1", "entity-2"], "fanout": 5}
+    assert query.count("LIMIT $fanout") == 2
+    assert set(subgraph.nodes) == {"entity-1", "entity-2", "doc-1"}
+    assert subgraph.nodes["doc-1"].type == "Document"
+    assert len(subgraph.edges) == 2
+    assert subgraph.document_ids() == {"doc-1"}
+
+
+def test_neo4j_entity_search_requires_every_question_word(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("NEO4J_URI", "bolt://neo4j")
+    monkeypatch.setenv("GRAPH_ENTITY_MIN_FULLTEXT_SCORE", "0.8")
+    config.reset_settings_cache()
+    dummy_driver = _DummyDriver()
+    monkeypatch.setattr(graph_module, "GraphDatabase", _DummyGraphDatabase(dummy_driver))
+    graph_module.reset_graph_service()
+    service = graph_module.GraphService()
+    dummy_driver.read_results = [[]]
+
+    assert service.search_entities("What did Acme Corp sign?", limit=3) == []
+
+    _, params = dummy_driver.read_calls[-1]
+    assert params["search"] == "+what~ +did~ +acme~ +corp~ +sign~ sign*"
+    assert params["min_score"] == 0.8
+    assert graph_module.GraphService._fulltext_query("?!") == ""
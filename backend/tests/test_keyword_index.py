@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import math
+import random
+from pathlib import Path
+
+from backend.app.services.keyword_index import (
+    Bm25Index,
+    PhraseClause,
+    ProximityClause,
+    decode_varints,
+    encode_varints,
+    index_document_keywords,
+    parse_keyword_query,
+    tokenize,
+)
+from backend.app.services.retrieval_engine import KeywordRetrieverAdapter
+from backend.app.utils.storage import sha256_id
+
+
+def _chunks(*texts: str) -> list[dict]:
+    return [{"text": text, "chunk_index": index} for index, text in enumerate(texts)]
+
+
+def _exhaustive_bm25(corpus: dict[str, list[str]], query: str, k1: float = 1.2, b: float = 0.75) -> dict[str, float]:
+    documents = {
+        f"{doc_id}::{index}": tokenize(text) for doc_id, texts in corpus.items() for index, text in enumerate(texts)
+    }
+    documents = {key: tokens for key, tokens in documents.items() if tokens}
+    average = sum(len(tokens) for tokens in documents.values()) / len(documents)
+    scores: dict[str, float] = {}
+    for term in dict.fromkeys(tokenize(query)):
+        df = sum(1 for tokens in documents.values() if term in tokens)
+        if not df:
+            continue
+        idf = math.log1p((len(documents) - df + 0.5) / (df + 0.5))
+        for key, tokens in documents.items():
+            tf = tokens.count(term)
+            if tf:
+                norm = k1 * (1 - b + b * len(tokens) / average)
+                scores[key] = scores.get(key, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+    return scores
+
+
+def test_varint_round_trip() -> None:
+    values = [0, 1, 127, 128, 300, 2**21, 2**35 + 7]
+    assert decode_varints(encode_varints(values)) == values
+
+
+def test_max_score_pruning_matches_exhaustive_ranking() -> None:
+    rng = random.Random(7)
+    vocabulary = [f"term{index}" for index in range(40)] + ["breach", "contract", "indemnity"]
+    corpus = {
+        f"doc-{doc}": [
+            " ".join(rng.choices(vocabulary, weights=range(len(vocabulary), 0, -1), k=rng.randint(5, 40)))
+            for _ in range(rng.randint(1, 4))
+        ]
+        for doc in range(120)
+    }
+    index = Bm25Index()
+    for doc_id, texts in corpus.items():
+        index.replace_document(doc_id, _chunks(*texts))
+
+    for query in ("breach of contract indemnity", "term0 term39 indemnity", "term3 term3 term5"):
+        expected = sorted(_exhaustive_bm25(corpus, query).items(), key=lambda item: item[1], reverse=True)[:10]
+        results = index.search(query, top_k=10)
+        assert [round(score, 6) for score, _ in results] == [round(score, 6) for _, score in expected]
+
+
+def test_replaced_and_removed_documents_drop_out_after_compaction() -> None:
+    index = Bm25Index()
+    for doc in range(100):
+        index.replace_document(f"doc-{doc}", _chunks(f"routine filler {doc}"))
+    index.replace_document("doc-5", _chunks("settlement agreement signed"))
+    assert [payload["doc_id"] for _, payload in index.search("settlement", top_k=3)] == ["doc-5"]
+
+    index.replace_document("doc-5", _chunks("routine filler again"))
+    assert index.search("settlement", top_k=3) == []
+    for doc in range(10, 80):
+        index.remove_document(f"doc-{doc}")
+
+    assert len(index) == 30
+    assert len(index._chunks) < 102  # most tombstones were compacted away
+    assert {payload["doc_id"] for _, payload in index.search("filler", top_k=50)} == {
+        f"doc-{doc}" for doc in [*range(10), *range(80, 100)]
+    }
+
+
+def test_reingesting_a_file_replaces_its_chunks(tmp_path: Path) -> None:
+    index = Bm25Index()
+    path = tmp_path / "upload" / "notice.txt"
+    first = index_document_keywords(index, path, _chunks("notice of termination", "served by mail"))
+    # A second ingestion path reaching the same file keys it the same way.
+    second = index_document_keywords(index, tmp_path / "upload" / ".." / "upload" / "notice.txt", _chunks("notice of termination"))
+
+    assert first == second == sha256_id(path)
+    assert len(index) == 1
+    assert [payload["doc_id"] for _, payload in index.search('"notice of termination"', top_k=5)] == [first]
+
+
+def test_flushed_index_reloads_from_snapshot_and_journal(tmp_path: Path) -> None:
+    directory = tmp_path / "keyword"
+    index = Bm25Index(directory=directory)
+    index.replace_document("doc-a", _chunks("wire transfer to offshore account", "board minutes"))
+    index.flush()
+    index.replace_document("doc-b", [{"text": "offshore account statements", "chunk_index": 0, "title": "Ledger"}])
+    index.remove_document("doc-a")
+    index.flush()
+    assert (directory / "journal.jsonl").read_text(encoding="utf-8").count("\n") == 2
+
+    reloaded = Bm25Index(directory=directory)
+    assert len(reloaded) == 1
+    [(score, payload)] = reloaded.search("offshore account", top_k=5)
+    assert payload == {"doc_id": "doc-b", "chunk_index": 0, "text": "offshore account statements", "title": "Ledger"}
+    assert score == index.search("offshore account", top_k=5)[0][0]
+
+
+def test_parse_keyword_query_extracts_phrases_proximity_and_scopes() -> None:
+    query = parse_keyword_query('"notice of termination" title:Lease breach NEAR/3 warranty metadata:"acme corp" damages')
+
+    assert query.phrases == [
+        PhraseClause("body", ("notice", "of", "termination")),
+        PhraseClause("title", ("lease",)),
+        PhraseClause("metadata", ("acme", "corp")),
+    ]
+    assert query.proximity == [ProximityClause("body", ("breach",), ("warranty",), 3)]
+    assert query.terms == ["damages"]
+    assert query.scoring_terms() == ["damages", "notice", "of", "termination", "breach", "warranty"]
+
+
+def test_phrase_proximity_and_field_queries_use_positions() -> None:
+    index = Bm25Index()
+    index.replace_document(
+        "doc-notice",
+        [{"text": "Landlord served notice of termination on Friday", "chunk_index": 0, "title": "Lease file"}],
+    )
+    index.replace_document(
+        "doc-scrambled",
+        [{"text": "termination of the notice period was discussed", "chunk_index": 0, "title": "Minutes"}],
+    )
+    index.replace_document(
+        "doc-warranty",
+        [
+            {
+                "text": "the seller's breach of the implied warranty of fitness",
+                "chunk_index": 0,
+                "title": "Complaint",
+                "entity_labels": ["Acme Corp"],
+            }
+        ],
+    )
+
+    assert [payload["doc_id"] for _, payload in index.search('"notice of termination"', top_k=5)] == ["doc-notice"]
+    assert [payload["doc_id"] for _, payload in index.search("breach NEAR/3 warranty", top_k=5)] == ["doc-warranty"]
+    assert index.search("breach NEAR/2 warranty", top_k=5) == []
+    assert [payload["doc_id"] for _, payload in index.search("warranty NEAR/3 breach", top_k=5)] == ["doc-warranty"]
+    assert [payload["doc_id"] for _, payload in index.search("title:minutes notice", top_k=5)] == ["doc-scrambled"]
+    assert [payload["doc_id"] for _, payload in index.search('metadata:"acme corp"', top_k=5)] == ["doc-warranty"]
+    assert index.match_documents("notice termination") == {"doc-notice", "doc-scrambled"}
+    assert index.match_documents('"notice of termination"') == {"doc-notice"}
+    scoped = index.search("notice termination", top_k=5, doc_ids={"doc-scrambled", "doc-warranty"})
+    assert [payload["doc_id"] for _, payload in scoped] == ["doc-scrambled"]
+    assert index.search('"notice of termination"', top_k=5, doc_ids={"doc-scrambled"}) == []
+
+    index.replace_document("doc-notice", _chunks("lease renewed"))
+    assert index.match_documents('"notice of termination"') == set()
+
+
+def test_positions_survive_compaction_and_reload(tmp_path: Path) -> None:
+    directory = tmp_path / "keyword"
+    index = Bm25Index(directory=directory)
+    for doc in range(80):
+        index.replace_document(f"doc-{doc}", _chunks(f"routine filler {doc}"))
+    index.replace_document("doc-79", [{"text": "Bates range ABC000123 through ABC000200", "chunk_index": 0, "case_id": "c-1"}])
+    for doc in range(70):
+        index.remove_document(f"doc-{doc}")
+    index.flush()
+
+    reloaded = Bm25Index(directory=directory)
+    for candidate in (index, reloaded):
+        [(_, payload)] = candidate.search('"ABC000123 through ABC000200"', top_k=5, filters={"case_id": "c-1"})
+        assert payload["doc_id"] == "doc-79"
+        assert candidate.search('"ABC000123 through ABC000200"', top_k=5, filters={"case_id": "c-2"}) == []
+
+
+def test_keyword_adapter_prefers_index_over_document_scan() -> None:
+    class _Store:
+        def list_documents(self) -> list:
+            raise AssertionError("document store should not be scanned when the index is populated")
+
+    index = Bm25Index()
+    index.replace_document("doc-1", _chunks("Acme breached the supply contract"))
+    points = KeywordRetrieverAdapter(_Store(), index).retrieve("supply contract", top_k=5)
+
+    assert [point.id for point in points] == ["keyword::doc-1::0"]
+    assert points[0].payload["retriever"] == "keyword"
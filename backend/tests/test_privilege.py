@@ -50,6 +50,22 @@ def test_privilege_classifier_handles_empty_text(privilege_service: PrivilegeCla
     assert decision.score == 0.0
 
 
+def test_privilege_stored_fields_round_trip_against_current_threshold(
+    privilege_service: PrivilegeClassifierService,
+) -> None:
+    decision = PrivilegeDecision(doc_id="doc-stored", label="privileged", score=0.8123456, explanation="")
+    fields = privilege_service.stored_fields(decision)
+    assert fields == {"privilege_label": "privileged", "privilege_score": 0.8123}
+
+    restored = privilege_service.from_stored_fields("doc-stored", fields)
+    assert restored is not None
+    assert restored.label == "privileged"
+    assert restored.source == "ingestion"
+    privilege_service.threshold = 0.9
+    assert privilege_service.from_stored_fields("doc-stored", fields).label == "non_privileged"
+    assert privilege_service.from_stored_fields("doc-stored", {"privilege_label": "unknown"}) is None
+
+
 def test_privilege_policy_engine_blocks_high_risk(tmp_path: Path) -> None:
     audit = AuditTrail(tmp_path / "audit.log")
     engine = PrivilegePolicyEngine(review_threshold=0.6, block_threshold=0.9, audit_trail=audit)
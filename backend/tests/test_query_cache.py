@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import pytest
+
+from backend.app.config import get_settings
+from backend.app.services import query_cache as cache_module
+
+
+def test_query_result_cache_evicts_least_recently_used() -> None:
+    cache: cache_module.QueryResultCache[str] = cache_module.QueryResultCache(2, 60.0)
+    cache.put("a", "alpha")
+    cache.put("b", "bravo")
+    assert cache.get("a") == "alpha"
+    cache.put("c", "charlie")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "alpha"
+    assert cache.get("c") == "charlie"
+    assert len(cache) == 2
+
+
+def test_query_result_cache_expires_entries_after_ttl() -> None:
+    now = [100.0]
+    cache: cache_module.QueryResultCache[str] = cache_module.QueryResultCache(
+        4, 10.0, clock=lambda: now[0]
+    )
+    cache.put("key", "value")
+    now[0] += 9.0
+    assert cache.get("key") == "value"
+    now[0] += 2.0
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_query_result_cache_disabled_when_sized_to_zero() -> None:
+    cache: cache_module.QueryResultCache[str] = cache_module.QueryResultCache(0, 60.0)
+    cache.put("key", "value")
+    assert cache.get("key") is None
+
+
+def test_bump_corpus_version_is_monotonic() -> None:
+    before = cache_module.get_corpus_version()
+    first = cache_module.bump_corpus_version()
+    assert first > before
+    assert cache_module.bump_corpus_version() == first + 1
+    assert cache_module.get_corpus_version() == first + 1
+
+
+def test_corpus_version_is_shared_through_the_version_file(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    path = tmp_path / "corpus_version"
+    monkeypatch.setenv("RETRIEVAL_CORPUS_VERSION_PATH", str(path))
+    get_settings.cache_clear()
+    try:
+        bumped = cache_module.bump_corpus_version()
+        assert int(path.read_text()) == bumped
+        # Another worker's bump is picked up once the refresh interval has passed.
+        path.write_text(str(bumped + 5))
+        assert cache_module.get_corpus_version() == bumped
+        monkeypatch.setattr(cache_module, "_shared_checked_at", float("-inf"))
+        assert cache_module.get_corpus_version() == bumped + 5
+        # A deleted file never takes the version backwards.
+        path.unlink()
+        monkeypatch.setattr(cache_module, "_shared_checked_at", float("-inf"))
+        assert cache_module.get_corpus_version() == bumped + 5
+        assert cache_module.bump_corpus_version() > bumped + 5
+    finally:
+        get_settings.cache_clear()
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+from qdrant_client.http import models as qmodels
+
+from backend.app.services import query_cache as cache_module
+from backend.app.services import retrieval_engine as engine_module
+from backend.app.services.reranker import CrossEncoderReranker
+
+
+class _LengthModel:
+    """Scores a pair by passage length and records every predict call."""
+
+    def __init__(self) -> None:
+        self.calls: list[tuple[list[tuple[str, str]], int]] = []
+
+    def predict(self, pairs, *, batch_size: int, show_progress_bar: bool = False) -> list[float]:
+        self.calls.append((list(pairs), batch_size))
+        return [float(len(passage)) for _, passage in pairs]
+
+
+def _point(point_id: str, text: str) -> qmodels.ScoredPoint:
+    return qmodels.ScoredPoint(
+        id=point_id,
+        score=0.1,
+        payload={"doc_id": f"doc-{point_id}", "chunk_index": 0, "text": text},
+        version=1,
+    )
+
+
+def _reranker(model: _LengthModel, **kwargs: object) -> CrossEncoderReranker:
+    reranker = CrossEncoderReranker("stub-model", **kwargs)
+    reranker._model = model
+    return reranker
+
+
+def test_rerank_orders_by_score_and_predicts_in_one_batch() -> None:
+    model = _LengthModel()
+    reranker = _reranker(model, batch_size=8)
+
+    reordered = reranker.rerank("which clause", [_point("a", "short"), _point("b", "a longer passage")])
+
+    assert [point.id for point in reordered] == ["b", "a"]
+    assert reordered[0].payload["cross_encoder_score"] == float(len("a longer passage"))
+    assert len(model.calls) == 1
+    assert model.calls[0][1] == 8
+
+
+def test_pair_scores_are_cached_per_query_and_chunk() -> None:
+    model = _LengthModel()
+    reranker = _reranker(model)
+    first = [_point("a", "alpha"), _point("b", "beta")]
+
+    reranker.score("termination notice", first)
+    reranker.score("  termination   notice ", first + [_point("c", "gamma")])
+
+    assert [len(pairs) for pairs, _ in model.calls] == [2, 1]
+    assert model.calls[1][0] == [("  termination   notice ", "gamma")]
+
+    reranker.score("another question", first)
+    assert [len(pairs) for pairs, _ in model.calls] == [2, 1, 2]
+
+
+def test_pair_cache_is_bounded_and_invalidated_by_corpus_changes() -> None:
+    model = _LengthModel()
+    reranker = _reranker(model, cache_size=2)
+    points = [_point("a", "alpha"), _point("b", "beta"), _point("c", "gamma")]
+
+    reranker.score("query", points)
+    assert len(reranker) == 2
+
+    reranker.score("query", points[1:])
+    assert len(model.calls) == 1
+
+    cache_module.bump_corpus_version()
+    reranker.score("query", points[1:])
+    assert len(model.calls) == 2
+
+
+def test_unavailable_model_leaves_fusion_order() -> None:
+    reranker = CrossEncoderReranker("missing-model")
+    reranker._load_error = ModuleNotFoundError("sentence_transformers")
+
+    assert reranker.rerank("query", [_point("a", "alpha")]) is None
+    assert reranker.warm_up() is False
+
+
+def test_hybrid_engine_reranks_through_shared_reranker() -> None:
+    model = _LengthModel()
+
+    class _Adapter:
+        def __init__(self, points: list[qmodels.ScoredPoint]) -> None:
+            self.points = points
+
+        def retrieve(self, query: str, *, top_k: int, **_: object):
+            return self.points[:top_k]
+
+    class _GraphAdapter(_Adapter):
+        def retrieve(self, query: str, *, top_k: int, **_: object):
+            return [], []
+
+    engine = engine_module.HybridQueryEngine(
+        _Adapter([_point("a", "brief"), _point("b", "considerably longer passage")]),
+        _GraphAdapter([]),
+        _Adapter([]),
+        reranker=_reranker(model),
+    )
+    engine.warm_up()
+
+    bundle = engine.retrieve(
+        "query", top_k=2, vector_window=2, graph_window=1, keyword_window=1, use_cross_encoder=True
+    )
+
+    assert bundle.reranker == "cross_encoder"
+    assert [point.id for point in bundle.fused_points] == ["b", "a"]
+    assert model.calls[0][0] == [("warm-up", "warm-up")]
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import asyncio
 import json
+from dataclasses import replace
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Callable
@@ -12,7 +14,11 @@ from qdrant_client.http import models as qmodels
 from backend.app import config
 from backend.app.services import graph as graph_module
 from backend.app.services import retrieval as retrieval_module
-from backend.app.services.retrieval_engine import HybridRetrievalBundle
+from backend.app.services import vector as vector_module
+from backend.app.services.external_http import AsyncHttpPool
+from backend.app.services.keyword_index import Bm25Index
+from backend.app.services.privilege import PrivilegeClassifierService
+from backend.app.services.retrieval_engine import HybridQueryEngine, HybridRetrievalBundle, KeywordRetrieverAdapter
 from backend.app.storage.document_store import DocumentStore
 from backend.app.storage.timeline_store import TimelineEvent, TimelineStore
 
@@ -31,6 +37,9 @@ class _DummyAggregate:
 
 
 class _DummyPrivilege:
+    threshold = 0.5
+    from_stored_fields = PrivilegeClassifierService.from_stored_fields
+
     def classify(self, doc_id: str, text: str, metadata: dict) -> retrieval_module.PrivilegeDecision:
         return retrieval_module.PrivilegeDecision(
             doc_id=doc_id,
@@ -201,7 +210,7 @@ def test_courtlistener_adapter_uses_cassette(cassette_loader) -> None:
     adapter = retrieval_module.CourtListenerCaseLawAdapter(
         endpoint="https://www.courtlistener.com/api/rest/v3/opinions/",
         token=None,
-        client_factory=lambda: httpx.Client(transport=httpx.MockTransport(handler)),
+        client_factory=lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
     )
     points = adapter.search("Miranda", limit=3)
     assert points
@@ -221,7 +230,7 @@ def test_caselaw_adapter_uses_cassette(cassette_loader) -> None:
         endpoint="https://api.case.law/v1/cases/",
         api_key=None,
         max_results=5,
-        client_factory=lambda: httpx.Client(transport=httpx.MockTransport(handler)),
+        client_factory=lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
     )
     points = adapter.search("Miranda", limit=2)
     assert points
@@ -230,6 +239,130 @@ def test_caselaw_adapter_uses_cassette(cassette_loader) -> None:
     assert "Miranda" in first.payload["case_name"]
 
 
+def _opinion(identifier: int) -> dict:
+    return {
+        "id": identifier,
+        "case_name": f"Case {identifier}",
+        "plain_text": f"Opinion {identifier} holds the search was unlawful. More text.",
+    }
+
+
+def test_courtlistener_adapter_fetches_numbered_pages_concurrently_and_caches() -> None:
+    in_flight = 0
+    peak = 0
+    requests: list[str] = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal in_flight, peak
+        requests.append(str(request.url))
+        page = int(request.url.params.get("page", "1"))
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.05)
+        in_flight -= 1
+        next_url = f"https://courtlistener.test/api/?q=fourth&page={page + 1}" if page < 3 else None
+        return httpx.Response(200, json={"next": next_url, "results": [_opinion(page * 10 + i) for i in range(2)]})
+
+    pool = AsyncHttpPool()
+    try:
+        adapter = retrieval_module.CourtListenerCaseLawAdapter(
+            endpoint="https://courtlistener.test/api/",
+            token="secret",
+            pool=pool,
+            client_factory=lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            cache_ttl_seconds=60.0,
+            cache_max_entries=8,
+        )
+        points = adapter.search("Fourth  Amendment", limit=6)
+        assert [point.payload["case_name"] for point in points] == [
+            "Case 10", "Case 11", "Case 20", "Case 21", "Case 30", "Case 31"
+        ]
+        assert len(requests) == 3
+        assert peak == 2  # pages 2 and 3 were requested together
+
+        cached = adapter.search("fourth amendment", limit=6)
+        assert [point.id for point in cached] == [point.id for point in points]
+        assert len(requests) == 3
+    finally:
+        pool.close()
+
+
+def test_external_case_law_deadline_keeps_partial_results(monkeypatch: pytest.MonkeyPatch) -> None:
+    release = asyncio.Event()
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if "cursor" in request.url.params:
+            await release.wait()
+        return httpx.Response(
+            200,
+            json={"next": "https://courtlistener.test/api/?cursor=abc", "results": [_opinion(1), _opinion(2)]},
+        )
+
+    pool = AsyncHttpPool()
+    try:
+        service = retrieval_module.RetrievalService.__new__(retrieval_module.RetrievalService)
+        service.settings = type("S", (), {"case_law_deadline_seconds": 0.2})()
+        service.query_engine = type("E", (), {"rrf_constant": 60.0})()
+        service.courtlistener_adapter = retrieval_module.CourtListenerCaseLawAdapter(
+            endpoint="https://courtlistener.test/api/",
+            token=None,
+            pool=pool,
+            client_factory=lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            cache_ttl_seconds=60.0,
+            cache_max_entries=8,
+        )
+        monkeypatch.setattr(service, "_lookups", lambda: retrieval_module._LookupCache(inventory=[]))
+
+        pending = service._start_external_case_law("search", top_k=4, source_filter="courtlistener")
+        points = service._collect_external_case_law(pending, top_k=4)
+
+        assert [point.payload["case_name"] for point in points] == ["Case 1", "Case 2"]
+        assert all(point.payload["external_case_law"] for point in points)
+        _, future, _ = pending.searches[0]
+        assert future.cancelled()
+        # A search cut off at the deadline is never cached as if it were complete.
+        assert len(service.courtlistener_adapter._cache) == 0
+    finally:
+        pool.close()
+
+
+def test_keyword_filter_restricts_candidates_to_phrase_matches(monkeypatch: pytest.MonkeyPatch) -> None:
+    index = Bm25Index()
+    index.replace_document("doc-phrase", [{"text": "we hereby give notice of termination", "chunk_index": 0}])
+    index.replace_document("doc-loose", [{"text": "termination notice pending", "chunk_index": 0}])
+
+    class _Vector:
+        def retrieve(self, query: str, *, top_k: int, **_: object) -> list:
+            return [
+                qmodels.ScoredPoint(id=f"vec-{doc_id}", score=0.9, payload={"doc_id": doc_id, "text": query}, version=1)
+                for doc_id in ("doc-loose", "doc-phrase")
+            ]
+
+    class _Graph:
+        def retrieve(self, query: str, *, top_k: int) -> tuple:
+            return [], []
+
+    service = retrieval_module.RetrievalService.__new__(retrieval_module.RetrievalService)
+    service.query_engine = HybridQueryEngine(_Vector(), _Graph(), KeywordRetrieverAdapter(None, index))
+    monkeypatch.setattr(service, "_start_external_case_law", lambda *args, **kwargs: None)
+
+    candidates = service._retrieve_candidates(
+        "termination letters",
+        search_window=5,
+        vector_window=5,
+        graph_window=5,
+        keyword_window=5,
+        use_cross_encoder=False,
+        vector_filters={},
+        vector_points=None,
+        field_filters={},
+        keyword_query='"notice of termination"',
+    )
+
+    assert {point.payload["doc_id"] for point in candidates.results} == {"doc-phrase"}
+    assert "keyword" in candidates.results[0].payload["retrievers"]
+
+
 def test_join_external_results_links_internal_case(
     retrieval_service: retrieval_module.RetrievalService,
 ) -> None:
@@ -389,3 +522,339 @@ def test_stream_result_generates_events(
     assert "ASSOCIATED_WITH" in relation_types
     event_doc_ids = {citation for event in graph_payload["events"] for citation in event.get("citations", [])}
     assert "doc-trace" in event_doc_ids
+
+
+def test_get_retrieval_service_is_shared_until_reset(monkeypatch: pytest.MonkeyPatch) -> None:
+    built: list[object] = []
+
+    class _CountingService:
+        def __init__(self) -> None:
+            built.append(self)
+
+        def warm_up(self) -> None:
+            self.warmed = True
+
+    monkeypatch.setattr(retrieval_module, "RetrievalService", _CountingService)
+    retrieval_module.reset_retrieval_service()
+    try:
+        first = retrieval_module.warm_retrieval_service()
+        assert first.warmed
+        assert retrieval_module.get_retrieval_service() is first
+        retrieval_module.reset_retrieval_service()
+        assert retrieval_module.get_retrieval_service() is not first
+        assert len(built) == 2
+        # Resetting any backend it captured rebuilds it too.
+        for reset in (vector_module.reset_vector_service, graph_module.reset_graph_service, config.reset_settings_cache):
+            previous = retrieval_module.get_retrieval_service()
+            reset()
+            assert retrieval_module.get_retrieval_service() is not previous
+        assert len(built) == 5
+    finally:
+        retrieval_module.reset_retrieval_service()
+
+
+def test_query_reuses_cached_result_until_corpus_changes(monkeypatch: pytest.MonkeyPatch) -> None:
+    from backend.app.services import query_cache as cache_module
+
+    service = retrieval_module.RetrievalService.__new__(retrieval_module.RetrievalService)
+    service.result_cache = cache_module.QueryResultCache(8, 60.0)
+    executions: list[str] = []
+
+    def _fake_execute(question: str, **_: object) -> object:
+        executions.append(question)
+        return retrieval_module.QueryResult(
+            answer=question,
+            citations=[],
+            trace=retrieval_module.Trace(vector=[], graph={}, forensics=[]),
+            meta=None,  # type: ignore[arg-type]
+            has_evidence=False,
+        )
+
+    monkeypatch.setattr(service, "_execute_query", _fake_execute)
+
+    first = service.query("Case  summary", filters={"source": "local"})
+    second = service.query("case summary", filters={"source": " LOCAL "})
+    assert second is first
+    assert executions == ["Case  summary"]
+
+    cache_module.bump_corpus_version()
+    third = service.query("case summary", filters={"source": "local"})
+    assert third is not first
+    assert len(executions) == 2
+
+
+def test_query_many_batches_vector_search_and_reuses_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    from backend.app.services import query_cache as cache_module
+
+    service = retrieval_module.RetrievalService.__new__(retrieval_module.RetrievalService)
+    service.settings = config.get_settings()
+    service.result_cache = cache_module.QueryResultCache(8, 60.0)
+    batches: list[list[str]] = []
+    executions: list[tuple[str, object]] = []
+
+    class _Engine:
+        def retrieve_vectors_many(self, questions, *, vector_window, vector_filters=None):
+            batches.append(list(questions))
+            assert vector_filters == {"source": "local"}
+            return [[f"vector::{question}"] for question in questions]
+
+    def _fake_execute(question: str, **kwargs: object) -> object:
+        executions.append((question, kwargs.get("vector_points")))
+        assert retrieval_module._LOOKUP_CACHE.get() is not None
+        return retrieval_module.QueryResult(
+            answer=question,
+            citations=[],
+            trace=retrieval_module.Trace(vector=[], graph={}, forensics=[]),
+            meta=None,  # type: ignore[arg-type]
+            has_evidence=False,
+        )
+
+    service.query_engine = _Engine()
+    monkeypatch.setattr(service, "_execute_query", _fake_execute)
+    cached = service.query("already asked", filters={"source": "local"})
+    executions.clear()
+
+    results = service.query_many(
+        ["first question", "already asked", "First  question", "second question"],
+        filters={"source": " Local "},
+    )
+
+    assert [result.answer for result in results] == [
+        "first question",
+        "already asked",
+        "first question",
+        "second question",
+    ]
+    assert results[1] is cached
+    assert batches == [["first question", "second question"]]
+    assert executions == [
+        ("first question", ["vector::first question"]),
+        ("second question", ["vector::second question"]),
+    ]
+
+
+def _paged_query_service(monkeypatch: pytest.MonkeyPatch, stored_scores: dict[str, float] | None = None):
+    """RetrievalService over twelve fused hits that records retrievals and privilege calls.
+
+    Every hit carries an ingestion-time privilege score of 0.1 unless ``stored_scores`` overrides it.
+    """
+
+    from backend.app.security.privilege_policy import PrivilegePolicyEngine
+    from backend.app.services import query_cache as cache_module
+
+    points = [
+        qmodels.ScoredPoint(
+            id=f"chunk-{index}",
+            version=1,
+            score=1.0 - index / 100,
+            payload={
+                "doc_id": f"doc-{index}",
+                "text": f"Evidence sentence {index}.",
+                "source_type": "local",
+                "privilege_label": "non_privileged",
+                "privilege_score": (stored_scores or {}).get(f"doc-{index}", 0.1),
+            },
+        )
+        for index in range(12)
+    ]
+    retrieve_calls: list[int] = []
+    classified: list[str] = []
+
+    class _Engine:
+        def retrieve(self, question: str, *, top_k: int, **_: object) -> HybridRetrievalBundle:
+            retrieve_calls.append(top_k)
+            return HybridRetrievalBundle(
+                fused_points=points[:top_k],
+                vector_points=points[:top_k],
+                graph_points=[],
+                keyword_points=[],
+                relation_statements=[],
+                reranker="rrf",
+                fusion_scores={},
+            )
+
+    class _CountingPrivilege(_DummyPrivilege):
+        def classify(self, doc_id: str, text: str, metadata: dict) -> retrieval_module.PrivilegeDecision:
+            classified.append(doc_id)
+            return super().classify(doc_id, text, metadata)
+
+        def format_trace(self, decisions):
+            return {"decisions": [decision.to_dict() for decision in decisions], "aggregate": {}}
+
+    class _Graph:
+        def subgraph(self, _entity_ids):
+            return graph_module.GraphSubgraph()
+
+        def communities_for_nodes(self, _node_ids):
+            return []
+
+        def search_entities(self, _question):
+            return []
+
+    class _Documents:
+        def read_document(self, doc_id: str) -> dict:
+            raise FileNotFoundError(doc_id)
+
+        def list_documents(self) -> list:
+            return []
+
+    class _Timeline:
+        def read_all(self) -> list:
+            return []
+
+    service = retrieval_module.RetrievalService.__new__(retrieval_module.RetrievalService)
+    service.settings = config.get_settings()
+    service.result_cache = cache_module.QueryResultCache(8, 60.0)
+    service.candidate_cache = cache_module.QueryResultCache(8, 60.0)
+    service.query_engine = _Engine()
+    service.graph_service = _Graph()
+    service.document_store = _Documents()
+    service.timeline_store = _Timeline()
+    service.forensics_service = _DummyForensics()
+    service.privilege_classifier = _CountingPrivilege()
+    service.privilege_policy_engine = PrivilegePolicyEngine(review_threshold=0.8, block_threshold=0.95)
+    for attribute in ("llm_provider_id", "llm_model_id", "embedding_provider_id", "embedding_model_id"):
+        setattr(service, attribute, "test")
+    monkeypatch.setattr(service, "_start_external_case_law", lambda *_, **__: None)
+    return service, retrieve_calls, classified
+
+
+def test_query_enriches_only_the_page_and_cursor_reuses_candidates(monkeypatch: pytest.MonkeyPatch) -> None:
+    service, retrieve_calls, classified = _paged_query_service(monkeypatch)
+
+    first = service.query("what happened", page=1, page_size=5, mode="recall")
+    assert [citation.doc_id for citation in first.citations] == [f"doc-{index}" for index in range(5)]
+    assert sorted(classified) == sorted(f"doc-{index}" for index in range(5))
+    assert len(first.trace.vector) == 5
+    assert first.meta.total_items == 12
+    assert first.meta.has_next is True
+    assert first.meta.next_cursor
+
+    classified.clear()
+    second = service.query("what happened", page_size=5, mode="recall", cursor=first.meta.next_cursor)
+    assert retrieve_calls == [30]
+    assert second.meta.page == 2
+    assert [citation.doc_id for citation in second.citations] == [f"doc-{index}" for index in range(5, 10)]
+    assert sorted(classified) == sorted(f"doc-{index}" for index in range(5, 10))
+
+    with pytest.raises(ValueError):
+        service.query("what happened", page_size=5, mode="recall", cursor="@@bad")
+
+
+def test_privilege_gate_screens_the_window_and_graph_documents(monkeypatch: pytest.MonkeyPatch) -> None:
+    from backend.app.services.errors import WorkflowAbort
+
+    service, _, classified = _paged_query_service(monkeypatch, stored_scores={"doc-9": 0.99})
+    with pytest.raises(WorkflowAbort):
+        service.query("what happened", page=1, page_size=5, mode="recall")
+    assert sorted(classified) == sorted(f"doc-{index}" for index in range(5))
+
+    service, _, _ = _paged_query_service(monkeypatch)
+    subgraph = graph_module.GraphSubgraph()
+    subgraph.edges[("entity-a", "PRIVILEGED", "entity-b", "doc-graph")] = graph_module.GraphEdge(
+        source="entity-a", target="entity-b", type="PRIVILEGED", properties={"doc_id": "doc-graph"}
+    )
+    monkeypatch.setattr(service.graph_service, "subgraph", lambda _entity_ids: subgraph, raising=False)
+    records = {"doc-graph": {"id": "doc-graph", "privilege_label": "privileged", "privilege_score": 0.85}}
+
+    def _read_document(doc_id: str) -> dict:
+        if doc_id not in records:
+            raise FileNotFoundError(doc_id)
+        return records[doc_id]
+
+    monkeypatch.setattr(service.document_store, "read_document", _read_document, raising=False)
+    result = service.query("what happened", page=1, page_size=5, mode="recall")
+    assert result.policy["status"] == "review"
+    assert result.policy["flagged_documents"] == ["doc-graph"]
+
+
+def test_privilege_gate_classifies_graph_documents_without_stored_scores(monkeypatch: pytest.MonkeyPatch) -> None:
+    service, _, classified = _paged_query_service(monkeypatch)
+    subgraph = graph_module.GraphSubgraph()
+    subgraph.edges[("entity-a", "ADVISED", "entity-b", "doc-legacy")] = graph_module.GraphEdge(
+        source="entity-a", target="entity-b", type="ADVISED", properties={"doc_id": "doc-legacy"}
+    )
+    monkeypatch.setattr(service.graph_service, "subgraph", lambda _entity_ids: subgraph, raising=False)
+    index = Bm25Index()
+    index.replace_document(
+        "doc-legacy",
+        [
+            {"text": "Routine scheduling note.", "chunk_index": 0},
+            {"text": "Attorney advice on the settlement.", "chunk_index": 1},
+        ],
+    )
+    monkeypatch.setattr(retrieval_module, "get_keyword_index", lambda: index)
+    base_classify = service.privilege_classifier.classify
+
+    def _classify(doc_id: str, text: str, metadata: dict) -> retrieval_module.PrivilegeDecision:
+        if "Attorney" in text:
+            classified.append(doc_id)
+            return retrieval_module.PrivilegeDecision(
+                doc_id=doc_id, label="privileged", score=0.85, explanation=text, source="test"
+            )
+        return base_classify(doc_id, text, metadata)
+
+    monkeypatch.setattr(service.privilege_classifier, "classify", _classify)
+
+    # The legacy record has no stored score, so its indexed chunks are classified one by one.
+    result = service.query("what happened", page=1, page_size=5, mode="recall")
+    assert "doc-legacy" in classified
+    assert result.policy["status"] == "review"
+    assert result.policy["flagged_documents"] == ["doc-legacy"]
+
+
+def test_query_meta_lists_retrievers_dropped_from_fusion(monkeypatch: pytest.MonkeyPatch) -> None:
+    service, _, _ = _paged_query_service(monkeypatch)
+    retrieve = service.query_engine.retrieve
+
+    def _degraded(question: str, **kwargs: object) -> HybridRetrievalBundle:
+        return replace(retrieve(question, **kwargs), timed_out_retrievers=["graph"], starved_retrievers=["keyword"])
+
+    monkeypatch.setattr(service.query_engine, "retrieve", _degraded)
+    meta = service.query("what happened", page_size=5, mode="recall").meta.to_dict()
+
+    assert meta["timed_out_retrievers"] == ["graph"]
+    assert meta["starved_retrievers"] == ["keyword"]
+
+
+def test_stream_query_emits_citations_before_answer_and_trace_last(monkeypatch: pytest.MonkeyPatch) -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    service, retrieve_calls, _ = _paged_query_service(monkeypatch)
+    events = service.stream_query("what happened", page_size=3, attributes={"stream": True})
+
+    # Advance the stream from worker threads, as the ASGI server does.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        frames = []
+        while True:
+            frame = pool.submit(next, events, None).result()
+            if frame is None:
+                break
+            frames.append(json.loads(frame))
+
+    assert [frame["type"] for frame in frames[:2]] == ["meta", "answer"]
+    assert frames[-1]["type"] == "final"
+    assert [citation["docId"] for citation in frames[0]["citations"]] == ["doc-0", "doc-1", "doc-2"]
+    assert "traces" not in frames[0]
+    deltas = "".join(frame["delta"] for frame in frames if frame["type"] == "answer")
+    assert deltas == frames[-1]["answer"]
+    assert len(frames[-1]["traces"]["vector"]) == 3
+
+    replay = [json.loads(frame) for frame in service.stream_query("what happened", page_size=3, attributes={})]
+    assert retrieve_calls == [12]
+    assert replay[-1]["answer"] == frames[-1]["answer"]
+
+
+def test_debug_query_reports_stage_timings_and_bypasses_caches(monkeypatch: pytest.MonkeyPatch) -> None:
+    service, retrieve_calls, _ = _paged_query_service(monkeypatch)
+
+    plain = service.query("what happened", page_size=3)
+    assert "timings" not in plain.meta.to_dict()
+
+    debug = service.query("what happened", page_size=3, debug=True)
+    timings = debug.meta.to_dict()["timings"]
+    assert {"external_case_law", "privilege", "trace_build", "answer", "total"} <= set(timings)
+    assert timings["total"] >= timings["privilege"]
+    # Debug runs measure a cold pipeline and never populate the result cache.
+    assert retrieve_calls == [12, 12]
+    assert service.query("what happened", page_size=3) is plain
@@ -6,6 +6,7 @@ import pytest
 from qdrant_client.http import models as qmodels
 
 from backend.app.services import retrieval_engine as engine_module
+from backend.app.services.stage_timing import collect_stage_timings
 
 
 class _StubVectorAdapter:
@@ -90,7 +91,7 @@ def test_rrf_fusion_preserves_retriever_provenance(hybrid_engine: engine_module.
         payload = point.payload or {}
         assert "retrievers" in payload
         assert payload["fusion_score"] == pytest.approx(point.score)
-        key = engine_module._point_key(point)
+        key = engine_module.chunk_key(point)
         assert key in bundle.fusion_scores
         assert bundle.fusion_scores[key] == pytest.approx(payload["fusion_score"])
 
@@ -121,3 +122,218 @@ def test_cross_encoder_fallback_when_unavailable(
     assert calls["count"] == 1
     assert bundle.reranker == "rrf"
     assert all("cross_encoder_score" not in (point.payload or {}) for point in bundle.fused_points)
+
+
+def test_concurrent_mode_drops_retriever_that_misses_deadline() -> None:
+    import time
+
+    class _SlowGraphAdapter(_StubGraphAdapter):
+        def retrieve(self, query: str, *, top_k: int):
+            time.sleep(0.5)
+            return super().retrieve(query, top_k=top_k)
+
+    vector_point = qmodels.ScoredPoint(
+        id="vector::1", score=0.9, payload={"doc_id": "doc-vec", "text": "vector"}, version=1
+    )
+    graph_point = qmodels.ScoredPoint(
+        id="graph::edge", score=0.6, payload={"doc_id": "doc-graph", "text": "graph"}, version=1
+    )
+    engine = engine_module.HybridQueryEngine(
+        vector=_StubVectorAdapter([vector_point]),
+        graph=_SlowGraphAdapter([graph_point], [("Graph relation", "doc-graph")]),
+        keyword=_StubKeywordAdapter([]),
+        concurrent=True,
+        retriever_timeout=0.05,
+    )
+
+    bundle = engine.retrieve(
+        "query",
+        top_k=3,
+        vector_window=3,
+        graph_window=3,
+        keyword_window=3,
+        use_cross_encoder=False,
+    )
+
+    assert bundle.timed_out_retrievers == ["graph"]
+    assert bundle.graph_points == []
+    assert bundle.relation_statements == []
+    assert [point.id for point in bundle.fused_points] == ["vector::1"]
+
+
+def test_concurrent_deadline_starts_when_leg_leaves_the_queue() -> None:
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+
+    class _SlowVectorAdapter(_StubVectorAdapter):
+        def __init__(self, points: List[qmodels.ScoredPoint], delay: float):
+            super().__init__(points)
+            self.delay = delay
+
+        def retrieve(self, query: str, *, top_k: int) -> List[qmodels.ScoredPoint]:
+            time.sleep(self.delay)
+            return super().retrieve(query, top_k=top_k)
+
+    class _SlowGraphAdapter(_StubGraphAdapter):
+        def retrieve(self, query: str, *, top_k: int):
+            time.sleep(0.15)
+            return super().retrieve(query, top_k=top_k)
+
+    vector_point = qmodels.ScoredPoint(
+        id="vector::1", score=0.9, payload={"doc_id": "doc-vec", "text": "vector"}, version=1
+    )
+    graph_point = qmodels.ScoredPoint(
+        id="graph::edge", score=0.6, payload={"doc_id": "doc-graph", "text": "graph"}, version=1
+    )
+    kwargs = dict(top_k=3, vector_window=3, graph_window=3, keyword_window=3, use_cross_encoder=False)
+
+    # One worker: the graph leg queues behind the vector leg but still gets its full deadline.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        engine = engine_module.HybridQueryEngine(
+            vector=_SlowVectorAdapter([vector_point], delay=0.15),
+            graph=_SlowGraphAdapter([graph_point], [("Graph relation", "doc-graph")]),
+            keyword=_StubKeywordAdapter([]),
+            concurrent=True,
+            retriever_timeout=0.25,
+            executor=pool,
+        )
+        bundle = engine.retrieve("query", **kwargs)
+    assert bundle.timed_out_retrievers == []
+    assert bundle.starved_retrievers == []
+    assert [point.id for point in bundle.graph_points] == ["graph::edge"]
+
+    # A leg that never reaches a worker is reported separately from one that overran.
+    pool = ThreadPoolExecutor(max_workers=1)
+    try:
+        engine = engine_module.HybridQueryEngine(
+            vector=_SlowVectorAdapter([vector_point], delay=0.4),
+            graph=_StubGraphAdapter([graph_point], [("Graph relation", "doc-graph")]),
+            keyword=_StubKeywordAdapter([]),
+            concurrent=True,
+            retriever_timeout=0.1,
+            executor=pool,
+        )
+        bundle = engine.retrieve("query", **kwargs)
+    finally:
+        pool.shutdown(wait=False)
+    assert bundle.timed_out_retrievers == ["vector"]
+    assert bundle.starved_retrievers == ["graph", "keyword"]
+    assert bundle.fused_points == []
+
+
+def test_concurrent_vector_deadline_starts_after_the_query_is_embedded() -> None:
+    import time
+
+    class _VectorService:
+        def search(self, vector, top_k: int = 8, **kwargs):
+            return [qmodels.ScoredPoint(id="vector::1", score=0.9, payload={"doc_id": "doc-vec"}, version=1)]
+
+    class _SlowEmbedding:
+        def get_query_embedding(self, _text: str) -> list[float]:
+            time.sleep(0.2)
+            return [1.0, 0.0]
+
+    engine = engine_module.HybridQueryEngine(
+        vector=engine_module.VectorRetrieverAdapter(_VectorService(), _SlowEmbedding()),
+        graph=_StubGraphAdapter([], []),
+        keyword=_StubKeywordAdapter([]),
+        concurrent=True,
+        retriever_timeout=0.1,
+    )
+    bundle = engine.retrieve(
+        "query", top_k=3, vector_window=3, graph_window=3, keyword_window=3, use_cross_encoder=False
+    )
+
+    assert bundle.timed_out_retrievers == []
+    assert [point.id for point in bundle.fused_points] == ["vector::1"]
+
+
+def test_vector_filters_are_pushed_into_vector_search() -> None:
+    calls: list[dict] = []
+
+    class _RecordingVectorService:
+        def search(self, vector, top_k: int = 8, **kwargs):
+            calls.append({"top_k": top_k, **kwargs})
+            return []
+
+    class _Embedding:
+        def get_query_embedding(self, _text: str) -> list[float]:
+            return [1.0, 0.0]
+
+    adapter = engine_module.VectorRetrieverAdapter(_RecordingVectorService(), _Embedding())
+    engine = engine_module.HybridQueryEngine(
+        vector=adapter,
+        graph=_StubGraphAdapter([], []),
+        keyword=_StubKeywordAdapter([]),
+    )
+    engine.retrieve(
+        "query",
+        top_k=5,
+        vector_window=4,
+        graph_window=1,
+        keyword_window=1,
+        use_cross_encoder=False,
+        vector_filters={"source": "local", "case_id": "case-1"},
+    )
+
+    assert calls == [{"top_k": 4, "filters": {"source": "local", "case_id": "case-1"}}]
+
+
+def test_stage_timings_cover_every_leg_including_concurrent_ones() -> None:
+    class _VectorService:
+        def search(self, vector, top_k: int = 8, **kwargs):
+            return [qmodels.ScoredPoint(id="vector::1", score=0.9, payload={"doc_id": "doc-vec"}, version=1)]
+
+    class _Embedding:
+        def get_query_embedding(self, _text: str) -> list[float]:
+            return [1.0, 0.0]
+
+    engine = engine_module.HybridQueryEngine(
+        vector=engine_module.VectorRetrieverAdapter(_VectorService(), _Embedding()),
+        graph=_StubGraphAdapter([], []),
+        keyword=_StubKeywordAdapter([]),
+        concurrent=True,
+    )
+    with collect_stage_timings() as timings:
+        engine.retrieve(
+            "query",
+            top_k=3,
+            vector_window=3,
+            graph_window=3,
+            keyword_window=3,
+            use_cross_encoder=True,
+        )
+
+    assert set(timings) == {"embed", "vector_search", "graph", "keyword", "fusion", "rerank"}
+    assert all(elapsed >= 0.0 for elapsed in timings.values())
+
+
+def test_lexical_vector_leg_replaces_keyword_leg_unless_expression_given() -> None:
+    class _LexicalVector(_StubVectorAdapter):
+        lexical = True
+
+    class _CountingKeyword(_StubKeywordAdapter):
+        queries: List[str] = []
+
+        def retrieve(self, query: str, *, top_k: int) -> List[qmodels.ScoredPoint]:
+            self.queries.append(query)
+            return super().retrieve(query, top_k=top_k)
+
+    keyword = _CountingKeyword(
+        [qmodels.ScoredPoint(id="keyword::1", score=0.5, payload={"doc_id": "doc-key", "text": "match"}, version=1)]
+    )
+    engine = engine_module.HybridQueryEngine(
+        vector=_LexicalVector(
+            [qmodels.ScoredPoint(id="vector::1", score=0.9, payload={"doc_id": "doc-vec", "text": "hit"}, version=1)]
+        ),
+        graph=_StubGraphAdapter([], []),
+        keyword=keyword,
+    )
+    options = dict(top_k=5, vector_window=5, graph_window=5, keyword_window=5, use_cross_encoder=False)
+
+    bundle = engine.retrieve("indemnity", **options)
+    assert bundle.keyword_points == [] and keyword.queries == []
+
+    bundle = engine.retrieve("indemnity", keyword_query='"indemnity cap"', **options)
+    assert [point.id for point in bundle.keyword_points] == ["keyword::1"]
+    assert keyword.queries == ['"indemnity cap"']
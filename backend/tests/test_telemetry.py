@@ -147,7 +147,7 @@ class DummyGraphService:
     def search_entities(self, query: str, limit: int | None = None) -> List[GraphNode]:
         return []
 
-    def subgraph(self, entity_ids: List[str]) -> GraphSubgraph:
+    def subgraph(self, entity_ids: List[str], **_: object) -> GraphSubgraph:
         subgraph = GraphSubgraph()
         for entity_id in entity_ids:
             subgraph.nodes[entity_id] = GraphNode(id=entity_id, type="Entity", properties={"label": entity_id})
@@ -0,0 +1,475 @@
+from __future__ import annotations
+
+import math
+import random
+
+import numpy as np
+import pytest
+from qdrant_client.http import models as qmodels
+
+from backend.app.config import get_settings
+from backend.app.services.vector import (
+    InMemoryVectorIndex,
+    VectorService,
+    entity_filter_keys,
+    vector_payload_filters,
+    vector_point_id,
+)
+from backend.app.services.vector_hnsw import HnswVectorIndex
+
+
+def _point(point_id: str, vector: list[float], **payload: object) -> qmodels.PointStruct:
+    return qmodels.PointStruct(id=point_id, vector=vector, payload=payload)
+
+
+def _cosine(left: list[float], right: list[float]) -> float:
+    dot = sum(a * b for a, b in zip(left, right))
+    norm = math.sqrt(sum(a * a for a in left)) * math.sqrt(sum(b * b for b in right))
+    return 0.0 if norm == 0.0 else dot / norm
+
+
+def test_memory_index_matches_brute_force_cosine_ranking() -> None:
+    rng = random.Random(7)
+    index = InMemoryVectorIndex(8)
+    vectors = {f"p{i}": [rng.uniform(-1.0, 1.0) for _ in range(8)] for i in range(50)}
+    index.upsert(_point(point_id, vector, doc_id=point_id) for point_id, vector in vectors.items())
+    query = [rng.uniform(-1.0, 1.0) for _ in range(8)]
+
+    results = index.search(query, top_k=5, with_vectors=True)
+
+    expected = sorted(vectors, key=lambda point_id: _cosine(query, vectors[point_id]), reverse=True)[:5]
+    assert [point.id for point in results] == expected
+    for point in results:
+        assert point.score == pytest.approx(_cosine(query, vectors[str(point.id)]), abs=1e-5)
+        assert point.payload == {"doc_id": point.id}
+        assert point.vector == pytest.approx(vectors[str(point.id)], abs=1e-5)
+
+
+def test_memory_index_upsert_overwrites_and_grows() -> None:
+    index = InMemoryVectorIndex(2)
+    index.upsert(_point(f"p{i}", [1.0, float(i)]) for i in range(InMemoryVectorIndex._INITIAL_CAPACITY + 10))
+    index.upsert([_point("p0", [0.0, 1.0], replaced=True)])
+
+    assert len(index) == InMemoryVectorIndex._INITIAL_CAPACITY + 10
+    top = index.search([0.0, 1.0], top_k=1)[0]
+    assert top.id == "p0"
+    assert top.payload == {"replaced": True}
+    assert top.score == pytest.approx(1.0)
+
+
+def test_memory_index_handles_zero_vectors_and_dimension_errors() -> None:
+    index = InMemoryVectorIndex(3)
+    index.upsert([_point("zero", [0.0, 0.0, 0.0])])
+    assert index.search([1.0, 0.0, 0.0], top_k=3)[0].score == 0.0
+    with pytest.raises(ValueError):
+        index.upsert([_point("bad", [1.0, 2.0])])
+    with pytest.raises(ValueError):
+        index.search([1.0], top_k=1)
+
+
+def test_memory_index_omits_vectors_unless_requested() -> None:
+    index = InMemoryVectorIndex(2)
+    index.upsert([_point("a", [3.0, 4.0])])
+
+    assert index.search([1.0, 0.0], top_k=1)[0].vector is None
+    assert index.search([1.0, 0.0], top_k=1, with_vectors=True)[0].vector == pytest.approx([3.0, 4.0])
+
+
+def test_int8_index_ranks_close_to_float_and_rescores_from_mapped_file(tmp_path) -> None:
+    rng = np.random.default_rng(5)
+    vectors = rng.normal(size=(400, 32)).astype(np.float32)
+    points = [_point(f"p{i}", vector.tolist()) for i, vector in enumerate(vectors)]
+    exact = InMemoryVectorIndex(32)
+    codes_only = InMemoryVectorIndex(32, quantization="int8")
+    rescored = InMemoryVectorIndex(32, quantization="int8", rescore_path=tmp_path / "full.f32")
+    for index in (exact, codes_only, rescored):
+        index.upsert(points)
+    assert codes_only._matrix is None and codes_only._codes.dtype == np.int8
+
+    for query in rng.normal(size=(10, 32)):
+        expected = exact.search(query.tolist(), top_k=5)
+        approximate = codes_only.search(query.tolist(), top_k=5)
+        assert len({p.id for p in expected} & {p.id for p in approximate}) >= 4
+        assert approximate[0].score == pytest.approx(expected[0].score, abs=0.02)
+        assert [(p.id, round(p.score, 5)) for p in rescored.search(query.tolist(), top_k=5)] == [
+            (p.id, round(p.score, 5)) for p in expected
+        ]
+    _, vector, _ = next(iter(rescored.points()))
+    assert vector == pytest.approx(vectors[0].tolist(), abs=1e-5)
+
+
+def test_memory_index_delete_excludes_points() -> None:
+    index = InMemoryVectorIndex(2)
+    index.upsert([_point("a", [1.0, 0.0]), _point("b", [0.9, 0.1]), _point("c", [0.0, 1.0])])
+
+    assert index.delete(["a", "missing"]) == 1
+    assert len(index) == 2
+    assert [point.id for point in index.search([1.0, 0.0], top_k=5)] == ["b", "c"]
+    assert [point_id for point_id, _, _ in index.points()] == ["b", "c"]
+
+
+def test_hnsw_index_recall_tracks_exact_search() -> None:
+    rng = np.random.default_rng(11)
+    vectors = rng.normal(size=(600, 16)).astype(np.float32)
+    exact = InMemoryVectorIndex(16)
+    approximate = HnswVectorIndex(16, m=8, ef_construction=64, ef_search=48)
+    points = [_point(f"p{i}", vector.tolist()) for i, vector in enumerate(vectors)]
+    exact.upsert(points)
+    approximate.upsert(points)
+
+    hits = 0
+    queries = rng.normal(size=(25, 16))
+    for query in queries:
+        expected = {point.id for point in exact.search(query.tolist(), top_k=10)}
+        hits += len(expected & {point.id for point in approximate.search(query.tolist(), top_k=10)})
+    assert hits / (10 * len(queries)) >= 0.9
+
+
+def test_hnsw_index_handles_updates_and_deletes() -> None:
+    index = HnswVectorIndex(2, m=4, ef_construction=16, ef_search=8)
+    index.upsert(_point(f"p{i}", [math.cos(i / 10), math.sin(i / 10)]) for i in range(40))
+
+    index.upsert([_point("p0", [0.0, -1.0], moved=True)])
+    index.delete(["p15"])
+
+    assert len(index) == 39
+    top = index.search([0.0, -1.0], top_k=1)[0]
+    assert top.id == "p0" and top.payload == {"moved": True}
+    assert "p15" not in {point.id for point in index.search([math.cos(1.5), math.sin(1.5)], top_k=5)}
+
+
+def test_hnsw_index_restores_and_compacts_without_reinserting(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    rng = np.random.default_rng(5)
+    vectors = rng.normal(size=(300, 8)).astype(np.float32)
+    index = HnswVectorIndex(8, m=6, ef_construction=48, ef_search=48)
+    index.upsert(_point(f"p{i}", vector.tolist()) for i, vector in enumerate(vectors[:200]))
+    index.snapshot(tmp_path)
+    index.upsert(_point(f"p{i}", vector.tolist()) for i, vector in enumerate(vectors[200:], start=200))
+    index.snapshot(tmp_path)
+    queries = rng.normal(size=(10, 8)).tolist()
+    expected = [[hit.id for hit in index.search(query, top_k=5)] for query in queries]
+
+    def _no_insert(self, row: int) -> None:
+        raise AssertionError("graph should not be rebuilt")
+
+    monkeypatch.setattr(HnswVectorIndex, "_insert", _no_insert)
+    restored = HnswVectorIndex(8, m=6, ef_construction=48, ef_search=48)
+    assert restored.load_snapshot(tmp_path)
+    assert [[hit.id for hit in restored.search(query, top_k=5)] for query in queries] == expected
+
+    exact = InMemoryVectorIndex(8)
+    exact.upsert(_point(f"p{i}", vector.tolist()) for i, vector in enumerate(vectors) if i % 3)
+    restored.delete([f"p{i}" for i in range(0, 300, 3)])
+    assert restored.compact() == 100
+    hits = 0
+    for query in queries:
+        truth = {hit.id for hit in exact.search(query, top_k=10)}
+        hits += len(truth & {hit.id for hit in restored.search(query, top_k=10)})
+    assert hits / (10 * len(queries)) >= 0.9
+
+
+def test_vector_service_memory_hnsw_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("VECTOR_BACKEND", "memory-hnsw")
+    monkeypatch.setenv("QDRANT_VECTOR_SIZE", "3")
+    monkeypatch.setenv("VECTOR_HNSW_M", "4")
+    get_settings.cache_clear()
+    try:
+        service = VectorService()
+    finally:
+        get_settings.cache_clear()
+
+    assert service.mode == "memory"
+    assert isinstance(service._memory_index, HnswVectorIndex)
+    assert service._memory_index.m == 4
+
+
+@pytest.mark.parametrize("quantization", ["none", "int8"])
+def test_memory_index_snapshot_round_trips_incrementally(tmp_path, quantization: str) -> None:
+    snapshot_dir = tmp_path / "snapshot"
+    index = InMemoryVectorIndex(2, quantization=quantization)
+    index.upsert([_point("a", [1.0, 0.0], n=1), _point("b", [0.0, 2.0], n=2), _point("c", [1.0, 1.0], n=3)])
+    index.snapshot(snapshot_dir)
+    first_size = (snapshot_dir / "points.jsonl").stat().st_size
+
+    index.upsert([_point("a", [0.0, -1.0], n=10), _point("d", [-1.0, 0.0], n=4)])
+    index.delete(["c"])
+    index.snapshot(snapshot_dir)
+    assert (snapshot_dir / "points.jsonl").stat().st_size > first_size
+
+    restored = InMemoryVectorIndex(2, quantization=quantization)
+    assert restored.load_snapshot(snapshot_dir)
+    assert isinstance(restored._norms, np.memmap)
+    assert len(restored) == 3
+    assert [(point_id, payload) for point_id, _, payload in restored.points()] == [
+        ("a", {"n": 10}),
+        ("b", {"n": 2}),
+        ("d", {"n": 4}),
+    ]
+    top = restored.search([0.0, -1.0], top_k=1, with_vectors=True)[0]
+    assert top.id == "a"
+    assert top.vector == pytest.approx([0.0, -1.0], abs=1e-2)
+
+    restored.upsert(_point(f"n{i}", [1.0, float(i)]) for i in range(10))
+    assert len(restored) == 13
+    assert InMemoryVectorIndex(3).load_snapshot(snapshot_dir) is False
+
+
+def test_vector_service_restores_memory_snapshot(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    monkeypatch.setenv("VECTOR_BACKEND", "memory")
+    monkeypatch.setenv("QDRANT_VECTOR_SIZE", "2")
+    monkeypatch.setenv("VECTOR_MEMORY_SNAPSHOT_DIR", str(tmp_path / "snapshot"))
+    monkeypatch.setenv("VECTOR_MEMORY_SNAPSHOT_INTERVAL_SECONDS", "60")
+    get_settings.cache_clear()
+    try:
+        service = VectorService()
+        service.upsert([_point("a", [1.0, 0.0], doc_id="doc-1")])
+        service.upsert([_point("b", [0.0, 1.0], doc_id="doc-2")])
+        # Small upserts share one deferred snapshot rather than writing one each.
+        assert not (tmp_path / "snapshot" / "manifest.json").exists()
+        service.snapshot()
+        restored = VectorService()
+    finally:
+        get_settings.cache_clear()
+
+    assert service._snapshot_timer is None
+    assert [point.payload for point in restored.search([1.0, 0.0], top_k=1)] == [{"doc_id": "doc-1"}]
+    assert len(restored._memory_index) == 2
+
+
+def test_vector_service_starts_empty_after_a_torn_snapshot(monkeypatch: pytest.MonkeyPatch, tmp_path) -> None:
+    snapshot_dir = tmp_path / "snapshot"
+    index = InMemoryVectorIndex(2)
+    index.upsert([_point("a", [1.0, 0.0]), _point("b", [0.0, 1.0])])
+    index.snapshot(snapshot_dir)
+    sidecar = snapshot_dir / "points.jsonl"
+    sidecar.write_bytes(sidecar.read_bytes()[:-7])
+
+    monkeypatch.setenv("VECTOR_BACKEND", "memory")
+    monkeypatch.setenv("QDRANT_VECTOR_SIZE", "2")
+    monkeypatch.setenv("VECTOR_MEMORY_SNAPSHOT_DIR", str(snapshot_dir))
+    get_settings.cache_clear()
+    try:
+        service = VectorService()
+        assert service.search([1.0, 0.0], top_k=1) == []
+        service.upsert([_point("c", [1.0, 1.0])])
+        service.snapshot()
+        restored = VectorService()
+    finally:
+        get_settings.cache_clear()
+
+    assert [point.id for point in restored.search([1.0, 1.0], top_k=5)] == ["c"]
+
+
+def test_int8_snapshot_maps_full_precision_rows_in_place(tmp_path) -> None:
+    snapshot_dir = tmp_path / "snapshot"
+    index = InMemoryVectorIndex(2, quantization="int8", rescore_path=tmp_path / "rescore.f32")
+    index.upsert(_point(f"p{i}", [1.0, float(i)]) for i in range(5))
+    index.snapshot(snapshot_dir)
+    index.delete(["p1"])
+    index.snapshot(snapshot_dir)
+    assert (snapshot_dir / "live.u8").read_bytes() == bytes([1, 0, 1, 1, 1])
+
+    restored_path = tmp_path / "restored.f32"
+    restored = InMemoryVectorIndex(2, quantization="int8", rescore_path=restored_path)
+    restored_path.unlink()
+    assert restored.load_snapshot(snapshot_dir)
+    assert restored._full is not None and str(restored._full.rows.filename) == str(snapshot_dir / "unit.f32")
+    assert not restored_path.exists()
+    assert restored.search([1.0, 4.0], top_k=1, with_vectors=True)[0].vector == pytest.approx([1.0, 4.0])
+
+    restored.upsert(_point(f"n{i}", [0.0, 1.0]) for i in range(1100))
+    assert restored_path.exists()
+    assert restored.search([1.0, 4.0], top_k=1)[0].id == "p4"
+    assert np.fromfile(snapshot_dir / "unit.f32", dtype=np.float32).shape == (10,)
+
+
+def test_vector_payload_filters_normalise_request_filters() -> None:
+    assert vector_payload_filters({"source": " Local ", "case_id": "Case-7", "entity": ["Acme", ""], "doc_type": None}) == {
+        "source_type": ["local"],
+        "case_id": ["Case-7"],
+        "entity_keys": ["acme"],
+    }
+    assert entity_filter_keys(["ENT-1"], ["Acme Corp"]) == ["acme", "acme corp", "corp", "ent-1"]
+    with pytest.raises(ValueError):
+        vector_payload_filters({"author": "x"})
+
+
+@pytest.mark.parametrize("index_factory", [InMemoryVectorIndex, lambda dims: HnswVectorIndex(dims, m=4)])
+def test_memory_indexes_push_filters_into_search(index_factory) -> None:
+    index = index_factory(2)
+    index.upsert(
+        _point(f"p{i}", [1.0, i / 100], source_type="local" if i % 10 else "s3", case_id=f"case-{i % 2}")
+        for i in range(200)
+    )
+
+    s3_hits = index.search([1.0, 0.0], top_k=8, filters=vector_payload_filters({"source": "S3"}))
+    assert len(s3_hits) == 8
+    assert all(hit.payload["source_type"] == "s3" for hit in s3_hits)
+    case_hits = index.search([1.0, 0.0], top_k=50, filters=vector_payload_filters({"case_id": "case-1"}))
+    assert len(case_hits) == 50 and all(hit.payload["case_id"] == "case-1" for hit in case_hits)
+
+    index.upsert([_point("p10", [1.0, 0.1], source_type="local", case_id="case-0")])
+    index.delete(["p20"])
+    remaining = index.search([1.0, 0.0], top_k=50, filters=vector_payload_filters({"source": "s3"}))
+    assert {hit.id for hit in remaining} == {f"p{i}" for i in range(0, 200, 10)} - {"p10", "p20"}
+    assert index.search([1.0, 0.0], top_k=5, filters={"source_type": ["sharepoint"]}) == []
+
+
+def test_vector_service_translates_filters_for_qdrant_and_chroma() -> None:
+    payload_filters = vector_payload_filters({"source": "local", "entity": "Acme"})
+
+    qdrant_filter = VectorService._qdrant_filter(payload_filters)
+    assert {(condition.key, tuple(condition.match.any)) for condition in qdrant_filter.must} == {
+        ("source_type", ("local",)),
+        ("entity_keys", ("acme",)),
+    }
+    assert VectorService._chroma_where(payload_filters) == {"source_type": {"$in": ["local"]}}
+    assert VectorService._chroma_where(vector_payload_filters({"source": "s3", "case_id": "c"})) == {
+        "$and": [{"source_type": {"$in": ["s3"]}}, {"case_id": {"$in": ["c"]}}]
+    }
+
+
+@pytest.mark.parametrize("backend", ["memory", "qdrant"])
+def test_hybrid_search_fuses_dense_and_sparse_legs(monkeypatch: pytest.MonkeyPatch, tmp_path, backend: str) -> None:
+    monkeypatch.setenv("VECTOR_BACKEND", backend)
+    monkeypatch.setenv("VECTOR_SPARSE_HYBRID", "true")
+    monkeypatch.setenv("QDRANT_VECTOR_SIZE", "2")
+    monkeypatch.setenv("QDRANT_URL", "")
+    monkeypatch.setenv("QDRANT_PATH", str(tmp_path / "qdrant"))
+    get_settings.cache_clear()
+    try:
+        service = VectorService()
+        service.upsert(
+            [
+                _point(1, [1.0, 0.0], text="routine memo", case_id="c-1"),
+                _point(2, [0.0, 1.0], text="indemnification clause breach", case_id="c-2"),
+                _point(3, [0.7, 0.7], text="routine notes", case_id="c-1"),
+            ]
+        )
+        [hybrid] = service.hybrid_search_many([[1.0, 0.0]], ["indemnification"], top_k=3)
+        [filtered] = service.hybrid_search_many(
+            [[1.0, 0.0]], ["indemnification"], top_k=3, filters={"case_id": "c-1"}, with_vectors=True
+        )
+    finally:
+        get_settings.cache_clear()
+
+    assert service.sparse_enabled
+    assert [int(point.id) for point in hybrid] == [2, 1, 3]
+    assert hybrid[0].score == pytest.approx(1 / 4 + 1 / 2)
+    assert [int(point.id) for point in filtered] == [1, 3]
+    assert filtered[0].vector == pytest.approx([1.0, 0.0], abs=1e-5)
+
+
+@pytest.mark.parametrize("backend", ["memory", "qdrant"])
+def test_embedding_blocks_follow_scroll_pages(monkeypatch: pytest.MonkeyPatch, tmp_path, backend: str) -> None:
+    monkeypatch.setenv("VECTOR_BACKEND", backend)
+    monkeypatch.setenv("QDRANT_VECTOR_SIZE", "2")
+    # Cosine collections store normalised vectors; Dot keeps the raw ones for the comparison below.
+    monkeypatch.setenv("QDRANT_DISTANCE", "Dot")
+    monkeypatch.setenv("QDRANT_URL", "")
+    monkeypatch.setenv("QDRANT_PATH", str(tmp_path / "qdrant"))
+    get_settings.cache_clear()
+    try:
+        service = VectorService()
+        service.upsert([_point(i, [1.0, float(i)], doc_id=f"doc-{i}", text="chunk") for i in range(1, 8)])
+        if backend == "memory":
+            service._memory_index.delete(["3"])
+        blocks = list(service.iter_embedding_blocks(batch_size=3, fields=["doc_id"]))
+        capped = list(service.iter_embeddings(batch_size=2, limit=3, with_vectors=False))
+    finally:
+        get_settings.cache_clear()
+
+    live = [i for i in range(1, 8) if backend != "memory" or i != 3]
+    assert all(len(block.ids) <= 3 for block in blocks)
+    assert [point_id for block in blocks for point_id in block.ids] == [str(i) for i in live]
+    vectors = np.concatenate([block.vectors for block in blocks])
+    assert vectors.dtype == np.float32
+    assert vectors == pytest.approx(np.array([[1.0, float(i)] for i in live], dtype=np.float32))
+    assert [payload for block in blocks for payload in block.payloads] == [{"doc_id": f"doc-{i}"} for i in live]
+    assert [point["id"] for point in capped] == [str(i) for i in live[:3]]
+    assert all(point["vector"] is None for point in capped)
+
+
+@pytest.mark.parametrize("backend", ["memory", "qdrant"])
+def test_bulk_upsert_batches_and_overwrites_deterministic_ids(
+    monkeypatch: pytest.MonkeyPatch, tmp_path, backend: str
+) -> None:
+    monkeypatch.setenv("VECTOR_BACKEND", backend)
+    monkeypatch.setenv("QDRANT_VECTOR_SIZE", "2")
+    monkeypatch.setenv("QDRANT_URL", "")
+    monkeypatch.setenv("QDRANT_PATH", str(tmp_path / "qdrant"))
+    get_settings.cache_clear()
+    try:
+        service = VectorService()
+        batches: list[int] = []
+        waits: list[bool] = []
+        write_batch = service._write_batch
+
+        def _recording_write(points, *, wait):
+            batches.append(len(points))
+            waits.append(wait)
+            write_batch(points, wait=wait)
+
+        monkeypatch.setattr(service, "_write_batch", _recording_write)
+        first = [_point(vector_point_id("doc-1", i), [1.0, float(i)], version=1) for i in range(7)]
+        assert service.bulk_upsert(first, batch_size=3, max_in_flight=2, wait=False) == 7
+        first_waits, waits[:] = list(waits), []
+        second = [_point(vector_point_id("doc-1", i), [1.0, float(i)], version=2) for i in range(7)]
+        assert service.bulk_upsert(second, batch_size=3, wait=True) == 7
+        stored = list(service.iter_embeddings(with_vectors=False))
+    finally:
+        get_settings.cache_clear()
+
+    assert sorted(batches) == [1, 1, 3, 3, 3, 3]
+    if backend == "qdrant":
+        # Only the held-back final batch waits for indexing; it is written after the others settle.
+        assert first_waits == [False, False, True] and batches[2] == 1
+    assert len(stored) == 7
+    assert {point["payload"]["version"] for point in stored} == {2}
+    assert vector_point_id("doc-1", 0) == vector_point_id("doc-1", 0) != vector_point_id("doc-2", 0)
+
+
+@pytest.mark.parametrize("index_factory", [InMemoryVectorIndex, lambda dims: HnswVectorIndex(dims, m=4)])
+def test_memory_index_compaction_reclaims_tombstones(index_factory) -> None:
+    index = index_factory(2)
+    index.upsert(_point(f"p{i}", [1.0, i / 10], doc_id=f"doc-{i % 3}") for i in range(30))
+    index.delete(index.document_point_ids("doc-1"))
+    assert index.dead_rows == 10
+
+    assert index.compact() == 10
+    assert index.dead_rows == 0 and len(index) == 20
+    assert index.document_point_ids("doc-1") == []
+    assert len(index.document_point_ids("doc-2")) == 10
+    hits = index.search([1.0, 2.9], top_k=3)
+    assert [hit.id for hit in hits] == ["p29", "p27", "p26"]
+
+
+@pytest.mark.parametrize("backend", ["memory", "qdrant"])
+def test_replace_document_drops_superseded_points(monkeypatch: pytest.MonkeyPatch, tmp_path, backend: str) -> None:
+    monkeypatch.setenv("VECTOR_BACKEND", backend)
+    monkeypatch.setenv("QDRANT_VECTOR_SIZE", "2")
+    monkeypatch.setenv("QDRANT_URL", "")
+    monkeypatch.setenv("QDRANT_PATH", str(tmp_path / "qdrant"))
+    get_settings.cache_clear()
+
+    def chunks(count: int) -> list[qmodels.PointStruct]:
+        return [_point(vector_point_id("doc-1", i), [1.0, float(i)], text="t") for i in range(count)]
+
+    try:
+        service = VectorService()
+        assert service.replace_document("doc-1", chunks(5), version="v1") == 0
+        service.upsert([_point(vector_point_id("doc-2", 0), [0.0, 1.0], doc_id="doc-2")])
+        assert service.replace_document("doc-1", chunks(3), version="v2") == 2
+        after_replace = list(service.iter_embeddings(with_vectors=False))
+        assert service.delete_by_document("doc-1") == 3
+        remaining = list(service.iter_embeddings(with_vectors=False))
+    finally:
+        get_settings.cache_clear()
+
+    assert sorted((point["payload"]["doc_id"], point["payload"].get("doc_version")) for point in after_replace) == [
+        ("doc-1", "v2"),
+        ("doc-1", "v2"),
+        ("doc-1", "v2"),
+        ("doc-2", None),
+    ]
+    assert [point["payload"]["doc_id"] for point in remaining] == ["doc-2"]
@@ -1,5 +1,10 @@
 #!/usr/bin/env python3
-"""Synthetic load generator for query latency and ingest throughput SLO validation."""
+"""Synthetic load generator for query latency and ingest throughput SLO validation.
+
+With ``--stage-breakdown`` every query is sent with ``debug=true`` and the per-stage
+timings reported in the response meta are aggregated, including how the slowest
+(p99 and above) queries split their time between stages.
+"""
 
 from __future__ import annotations
 
@@ -72,24 +77,77 @@ def _wait_for_job(client: httpx.Client, job_id: str, delay_seconds: float = 0.2,
     raise TimeoutError(f"Job {job_id} did not complete within {timeout_seconds} seconds")
 
 
-def _exercise_query(client: httpx.Client, question: str) -> float:
+def _exercise_query(
+    client: httpx.Client,
+    question: str,
+    *,
+    path: str = "/query",
+    param: str = "q",
+    debug: bool = False,
+) -> tuple[float, Dict[str, float]]:
+    params: Dict[str, object] = {param: question}
+    if debug:
+        params["debug"] = "true"
     start = time.perf_counter()
-    response = client.get("/query", params={"q": question})
+    response = client.get(path, params=params)
     response.raise_for_status()
+    elapsed_ms = (time.perf_counter() - start) * 1000.0
     payload = response.json()
     if "answer" not in payload:
         raise RuntimeError(f"Query response missing answer field: {json.dumps(payload)}")
-    return (time.perf_counter() - start) * 1000.0
+    timings = (payload.get("meta") or {}).get("timings") or {}
+    return elapsed_ms, {str(stage): float(value) for stage, value in timings.items()}
 
 
-def _run_iterations(client: httpx.Client, runs: int, question: str) -> List[float]:
+def _run_iterations(
+    client: httpx.Client,
+    runs: int,
+    question: str,
+    **query_options: object,
+) -> tuple[List[float], List[Dict[str, float]]]:
     latencies: List[float] = []
+    breakdowns: List[Dict[str, float]] = []
     for _ in range(runs):
-        latencies.append(_exercise_query(client, question))
-    return latencies
-
-
-def validate(base_url: str, runs: int, skip_ingest: bool) -> Dict[str, object]:
+        elapsed_ms, timings = _exercise_query(client, question, **query_options)
+        latencies.append(elapsed_ms)
+        breakdowns.append(timings)
+    return latencies, breakdowns
+
+
+def _summarise_stages(latencies_ms: Sequence[float], breakdowns: Sequence[Dict[str, float]]) -> Dict[str, object]:
+    stages = sorted({stage for timings in breakdowns for stage in timings if stage != "total"})
+    per_stage: Dict[str, Dict[str, float]] = {}
+    for stage in stages:
+        values = [timings.get(stage, 0.0) for timings in breakdowns]
+        per_stage[stage] = {
+            "p50_ms": _percentile(values, 0.50),
+            "p95_ms": _percentile(values, 0.95),
+            "p99_ms": _percentile(values, 0.99),
+            "mean_ms": statistics.fmean(values),
+        }
+    # Attribute the tail: average each stage's share over the runs at or above p99.
+    threshold = _percentile(latencies_ms, 0.99)
+    tail = [timings for latency, timings in zip(latencies_ms, breakdowns) if latency >= threshold]
+    tail_share: Dict[str, float] = {}
+    for stage in stages:
+        shares = [
+            timings.get(stage, 0.0) / timings["total"]
+            for timings in tail
+            if timings.get("total")
+        ]
+        tail_share[stage] = statistics.fmean(shares) if shares else 0.0
+    return {"stages": per_stage, "p99_tail_share": tail_share, "p99_tail_runs": len(tail)}
+
+
+def validate(
+    base_url: str,
+    runs: int,
+    skip_ingest: bool,
+    *,
+    query_path: str = "/query",
+    query_param: str = "q",
+    stage_breakdown: bool = False,
+) -> Dict[str, object]:
     with httpx.Client(base_url=base_url, timeout=30.0) as client:
         if not skip_ingest:
             with tempfile.TemporaryDirectory(prefix="nfr_workspace_") as tmp:
@@ -101,14 +159,25 @@ def validate(base_url: str, runs: int, skip_ingest: bool) -> Dict[str, object]:
                 except httpx.HTTPStatusError:
                     # Some deployments surface ingestion completion immediately without job polling.
                     pass
-        latencies_ms = _run_iterations(client, runs, "Summarize the Acme settlement")
-    return {
+        latencies_ms, breakdowns = _run_iterations(
+            client,
+            runs,
+            "Summarize the Acme settlement",
+            path=query_path,
+            param=query_param,
+            debug=stage_breakdown,
+        )
+    metrics: Dict[str, object] = {
         "runs": runs,
         "p95_ms": _percentile(latencies_ms, 0.95),
+        "p99_ms": _percentile(latencies_ms, 0.99),
         "mean_ms": statistics.fmean(latencies_ms),
         "min_ms": min(latencies_ms),
         "max_ms": max(latencies_ms),
     }
+    if stage_breakdown:
+        metrics["breakdown"] = _summarise_stages(latencies_ms, breakdowns)
+    return metrics
 
 
 def main() -> None:
@@ -116,9 +185,23 @@ def main() -> None:
     parser.add_argument("--base-url", default=os.environ.get("NFR_BASE_URL", "http://localhost:8000"))
     parser.add_argument("--runs", type=int, default=20, help="Number of query iterations")
     parser.add_argument("--skip-ingest", action="store_true", help="Assume data already loaded")
+    parser.add_argument("--query-path", default="/query", help="Query endpoint, e.g. /api/retrieval")
+    parser.add_argument("--query-param", default="q", help="Name of the question parameter, e.g. query")
+    parser.add_argument(
+        "--stage-breakdown",
+        action="store_true",
+        help="Request debug timings and aggregate per-stage latency (bypasses server-side caches)",
+    )
     args = parser.parse_args()
 
-    metrics = validate(args.base_url, args.runs, args.skip_ingest)
+    metrics = validate(
+        args.base_url,
+        args.runs,
+        args.skip_ingest,
+        query_path=args.query_path,
+        query_param=args.query_param,
+        stage_breakdown=args.stage_breakdown,
+    )
     print(json.dumps(metrics, indent=2, sort_keys=True))
 
 
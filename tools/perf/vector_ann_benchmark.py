@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""Recall-vs-latency benchmark for the exact and HNSW in-memory vector indexes."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+from qdrant_client.http import models as qmodels
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from backend.app.services.vector import InMemoryVectorIndex  # noqa: E402
+from backend.app.services.vector_hnsw import HnswVectorIndex  # noqa: E402
+
+
+def _percentile(values: Sequence[float], percentile: float) -> float:
+    if not values:
+        raise ValueError("Cannot compute percentile of empty sequence")
+    ordered = sorted(values)
+    rank = percentile * (len(ordered) - 1)
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    if lower == upper:
+        return ordered[int(rank)]
+    weight = rank - lower
+    return ordered[lower] * (1 - weight) + ordered[upper] * weight
+
+
+def _clustered_vectors(count: int, dimensions: int, clusters: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centres = rng.normal(size=(clusters, dimensions))
+    assignments = rng.integers(0, clusters, size=count)
+    return (centres[assignments] + 0.35 * rng.normal(size=(count, dimensions))).astype(np.float32)
+
+
+def _build(index: InMemoryVectorIndex, vectors: np.ndarray) -> float:
+    start = time.perf_counter()
+    index.upsert(
+        qmodels.PointStruct(id=str(row), vector=vector.tolist(), payload={}) for row, vector in enumerate(vectors)
+    )
+    return time.perf_counter() - start
+
+
+def _timed_search(index: InMemoryVectorIndex, queries: np.ndarray, top_k: int, **kwargs: int) -> tuple[List[set], List[float]]:
+    hits: List[set] = []
+    latencies_ms: List[float] = []
+    for query in queries:
+        start = time.perf_counter()
+        points = index.search(query.tolist(), top_k, **kwargs)
+        latencies_ms.append((time.perf_counter() - start) * 1000.0)
+        hits.append({point.id for point in points})
+    return hits, latencies_ms
+
+
+def run(
+    count: int,
+    dimensions: int,
+    queries: int,
+    top_k: int,
+    m: int,
+    ef_construction: int,
+    ef_values: Sequence[int],
+    seed: int,
+) -> Dict[str, object]:
+    vectors = _clustered_vectors(count, dimensions, clusters=max(1, count // 500), seed=seed)
+    probes = _clustered_vectors(queries, dimensions, clusters=max(1, count // 500), seed=seed + 1)
+
+    exact = InMemoryVectorIndex(dimensions)
+    approximate = HnswVectorIndex(dimensions, m=m, ef_construction=ef_construction, seed=seed)
+    exact_build = _build(exact, vectors)
+    hnsw_build = _build(approximate, vectors)
+
+    truth, exact_latencies = _timed_search(exact, probes, top_k)
+    sweep: List[Dict[str, float]] = []
+    for ef in ef_values:
+        found, latencies = _timed_search(approximate, probes, top_k, ef=ef)
+        recall = sum(len(expected & actual) for expected, actual in zip(truth, found)) / (top_k * len(truth))
+        sweep.append(
+            {
+                "ef_search": ef,
+                "recall_at_k": recall,
+                "p50_ms": _percentile(latencies, 0.50),
+                "p95_ms": _percentile(latencies, 0.95),
+                "mean_ms": statistics.fmean(latencies),
+            }
+        )
+    return {
+        "points": count,
+        "dimensions": dimensions,
+        "queries": queries,
+        "top_k": top_k,
+        "hnsw": {"m": m, "ef_construction": ef_construction, "build_seconds": hnsw_build, "sweep": sweep},
+        "exact": {
+            "build_seconds": exact_build,
+            "p50_ms": _percentile(exact_latencies, 0.50),
+            "p95_ms": _percentile(exact_latencies, 0.95),
+            "mean_ms": statistics.fmean(exact_latencies),
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare exact and HNSW in-memory vector search.")
+    parser.add_argument("--points", type=int, default=20000, help="Number of indexed vectors")
+    parser.add_argument("--dimensions", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200, help="Number of probe queries")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--m", type=int, default=16, help="HNSW out-degree per layer")
+    parser.add_argument("--ef-construction", type=int, default=200)
+    parser.add_argument("--ef", type=int, nargs="+", default=[16, 32, 64, 128, 256], help="ef_search values to sweep")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    metrics = run(
+        args.points,
+        args.dimensions,
+        args.queries,
+        args.top_k,
+        args.m,
+        args.ef_construction,
+        args.ef,
+        args.seed,
+    )
+    print(json.dumps(metrics, indent=2, sort_keys=True))
+
+
+if __name__ == "__main__":
+    main()